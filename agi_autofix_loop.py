@@ -7,9 +7,11 @@ kernel = RC25SKernel()
 # RC25H Hybrid Kernel | AutoFix Loop v2.0
 # Reads reflection goal → proposes and applies code updates
 # =======================================================
-import os, json, datetime, subprocess, re, traceback
+import os, json, datetime, subprocess, traceback
 import sys; sys.path.append("/srv/repo/vibecoding")
-from openai import OpenAI
+from rc25s_json_extract import extract_json
+from rc25s_llm_gateway import estimate_tokens, get_gateway
+from rc25s_openai_clients import get_openai_client, resolve_api_key
 
 BASE = "/srv/repo/vibecoding"
 LOG_PATH = f"{BASE}/logs/agi_autofix.log"
@@ -35,14 +37,11 @@ def run_autofix():
             return
         log(f"🧩 Improvement goal: {goal}")
 
-        api_key = os.getenv("OPENAI_API_KEY") or ""
-        if not api_key and os.path.exists("/etc/openai_api_key.txt"):
-            api_key = open("/etc/openai_api_key.txt").read().strip()
-        if not api_key:
+        if not resolve_api_key():
             log("❌ No API key found.")
             return
 
-#        client = OpenAI(api_key=api_key)
+        client = get_openai_client()
         prompt = f"""
 You are an autonomous AGI AutoFix agent.
 Analyze the following improvement goal and propose a minimal safe code patch (in JSON):
@@ -56,16 +55,16 @@ Output JSON only:
   "code_patch": "replacement Python code"
 }}
 """
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-        )
+        with get_gateway().slot("background", estimate_tokens(prompt), caller="agi_autofix"):
+            response = client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[{"role": "user", "content": prompt}],
+            )
         text = getattr(response.choices[0].message, "content", "").strip()
-        match = re.search(r"\{[\s\S]*\}", text)
-        if not match:
+        patch = extract_json(text)
+        if not isinstance(patch, dict):
             log("⚠️ No valid JSON returned.")
             return
-        patch = json.loads(match.group(0))
         path = os.path.join(BASE, patch.get("target_file", ""))
         code = patch.get("code_patch", "")
         if not os.path.exists(path):
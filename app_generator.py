@@ -3,8 +3,10 @@
 RC25H Hybrid Kernel | AGI App Generator v1.0
 Generates and deploys full-stack applications (FastAPI + React)
 """
-import os, json, subprocess, datetime
-from openai import OpenAI
+import os, subprocess, datetime
+from rc25s_json_extract import extract_json_stream
+from rc25s_llm_gateway import estimate_tokens, get_gateway
+from rc25s_openai_clients import get_openai_client, resolve_api_key
 
 BASE = "/srv/repo/vibecoding"
 GEN_PATH = f"{BASE}/generated_apps"
@@ -22,14 +24,11 @@ def log(msg):
 
 def generate_app(app_name, description=""):
     log(f"🚀 App generation requested: {app_name}")
-    api_key = os.getenv("OPENAI_API_KEY") or ""
-    if not api_key and os.path.exists("/etc/openai_api_key.txt"):
-        api_key = open("/etc/openai_api_key.txt").read().strip()
-    if not api_key:
+    if not resolve_api_key():
         log("❌ No API key found.")
         return {"error": "No API key"}
 
-    client = OpenAI(api_key=api_key)
+    client = get_openai_client()
     prompt = f"""
 You are an autonomous AGI App Builder.
 Build a complete production-ready FastAPI + React app based on the following idea:
@@ -43,17 +42,20 @@ Respond with a JSON structure:
   "summary": "short overview of the app"
 }}
 """
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[{"role": "user", "content": prompt}],
-    )
-    content = response.choices[0].message.content
-    start = content.find("{")
-    end = content.rfind("}")
-    if start == -1 or end == -1:
+    with get_gateway().slot("background", estimate_tokens(prompt), caller="app_generator"):
+        stream = client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[{"role": "user", "content": prompt}],
+            stream=True,
+        )
+        try:
+            # 토큰이 오는 대로 파싱하고, JSON 객체가 닫히면 뒤에 붙는 설명은 기다리지 않는다.
+            result = extract_json_stream(chunk.choices[0].delta.content or "" for chunk in stream if chunk.choices)
+        finally:
+            stream.close()
+    if not isinstance(result, dict):
         log("⚠️ Could not parse JSON from GPT output.")
         return
-    result = json.loads(content[start:end+1])
     app_dir = os.path.join(GEN_PATH, app_name.replace(" ", "_"))
     os.makedirs(app_dir, exist_ok=True)
     backend_path = os.path.join(app_dir, "backend.py")
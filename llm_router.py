@@ -1,4 +1,55 @@
-import os, json, requests
+#!/usr/bin/env python3
+"""
+🧭 RC25S LLM Router
+
+OpenAI / 로컬 Ollama(HTTP API) / free_llm_server(/generate) 중에서 지연과 상태를 보고 provider를 고르는 라우터.
+
+- provider마다 최근 WINDOW건의 지연 p50/p95와 에러율을 기록한다 (stats()).
+- circuit breaker:
+  - 연속 FAILURE_THRESHOLD번 실패하거나, 최근 MIN_SAMPLES건 이상에서 에러율이 ERROR_RATE_OPEN 이상이면 open.
+  - open 이면 COOLDOWN초 동안 건너뛰고, 그 뒤 시험 호출 1건만 보낸다(half_open). 성공하면 closed, 실패하면 다시 open.
+- hedged request:
+  - 1순위 provider가 hedge 지연(그 provider p95 × HEDGE_FACTOR, 기록이 없으면 정책의 hedge_after) 안에 답하지 않으면
+    다음 provider에도 같은 요청을 보내고, 먼저 온 성공 응답을 쓴다 (동시에 최대 max_parallel개).
+  - 1순위가 실패하면 기다리지 않고 바로 다음 provider로 넘어간다.
+  - 진 쪽 요청은 취소하지 않는다. 끝까지 돌고 지연/성공 기록만 남긴다.
+- caller별 정책(DEFAULT_POLICIES):
+  - providers 순서, order("policy" 그대로 | "latency" 점수순), hedge, hedge_after, max_parallel, timeout, priority(OpenAI gateway 우선순위).
+  - RC25S_LLM_ROUTER_POLICY JSON 파일({"caller": {...}})이나 set_policy()로 덮어쓸 수 있다.
+- get_router().route(prompt, caller) → RouteResult(text, provider, latency, hedged, attempts)
+- call_free_llm(prompt): 예전 함수 이름 (free_llm → ollama → ollama_phi, 실패하면 예전처럼 에러 문자열)
+
+환경변수:
+- RC25S_OLLAMA_URL         (기본 http://127.0.0.1:11434)
+- RC25S_OLLAMA_MODEL       (기본 qwen2.5:7b-instruct, 느리거나 죽으면 phi 로 hedge/failover)
+- RC25S_FREE_LLM_URL       (기본 free_llm_port.json 의 port → http://localhost:<port>/generate)
+- RC25S_LLM_ROUTER_POLICY  (기본 config/llm_router.json, 있으면 사용)
+"""
+
+from __future__ import annotations
+
+import collections
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import requests
+
+ROOT = Path(__file__).resolve().parent
+
+WINDOW = 100
+MIN_SAMPLES = 10
+FAILURE_THRESHOLD = 5
+ERROR_RATE_OPEN = 0.5
+COOLDOWN = 30.0
+HEDGE_FACTOR = 1.0
+HEDGE_MIN = 0.05
+MAX_WORKERS = 16
 
 # --- Dynamic LLM Port Config ---
 FREE_LLM_PORT = 8001
@@ -11,19 +62,323 @@ try:
 except Exception as e:
     print(f"[LLM Router] Warning: failed to load port config: {e}")
 
-FREE_LLM_URL = f"http://localhost:{FREE_LLM_PORT}/generate"
+FREE_LLM_URL = os.getenv("RC25S_FREE_LLM_URL", f"http://localhost:{FREE_LLM_PORT}/generate")
+OLLAMA_URL = os.getenv("RC25S_OLLAMA_URL", "http://127.0.0.1:11434")
+OLLAMA_MODEL = os.getenv("RC25S_OLLAMA_MODEL", "qwen2.5:7b-instruct")
+POLICY_PATH = Path(os.getenv("RC25S_LLM_ROUTER_POLICY", str(ROOT / "config" / "llm_router.json")))
+
+DEFAULT_POLICIES: Dict[str, Dict[str, Any]] = {
+    "default": {
+        "providers": ["free_llm", "ollama", "ollama_phi", "openai"],
+        "order": "latency",
+        "hedge": True,
+        "hedge_after": 2.0,
+        "max_parallel": 2,
+        "timeout": 60.0,
+        "priority": "background",
+    },
+    # 대시보드 채팅처럼 사람이 기다리는 호출: OpenAI 우선, 느리면 로컬 모델로 hedge
+    "interactive": {"providers": ["openai", "ollama"], "order": "policy", "timeout": 30.0, "priority": "interactive"},
+    # rc25s_dashboard/agi_status_dashboard.py 의 /llm (provider=local | openai)
+    "agi_status_dashboard": {"providers": ["ollama", "ollama_phi", "free_llm"], "priority": "interactive"},
+    "agi_status_dashboard_openai": {"providers": ["openai", "ollama"], "order": "policy", "priority": "interactive"},
+    # 예전 call_free_llm(): free_llm_server 우선, 안 되면 Ollama (qwen → phi)
+    "free_llm": {"providers": ["free_llm", "ollama", "ollama_phi"], "order": "policy"},
+}
+
+
+class ProviderError(RuntimeError):
+    """provider 호출 실패 (HTTP 에러, 빈 응답, 모든 provider 실패 등)."""
+
+
+# ---------- providers ----------
+class OllamaProvider:
+    def __init__(self, model: str, base_url: str = OLLAMA_URL):
+        self.model = model
+        self.url = base_url.rstrip("/") + "/api/generate"
+        self.session = requests.Session()
+
+    def generate(self, prompt: str, timeout: float, priority: str) -> str:
+        r = self.session.post(self.url, json={"model": self.model, "prompt": prompt, "stream": False}, timeout=timeout)
+        if r.status_code != 200:
+            raise ProviderError(f"ollama {r.status_code}: {r.text[:200]}")
+        return r.json().get("response", "")
+
+
+class FreeLLMProvider:
+    def __init__(self, url: str = FREE_LLM_URL):
+        self.url = url
+        self.session = requests.Session()
+
+    def generate(self, prompt: str, timeout: float, priority: str) -> str:
+        r = self.session.post(self.url, json={"prompt": prompt}, timeout=timeout)
+        if r.status_code != 200:
+            raise ProviderError(f"free_llm {r.status_code}: {r.text[:200]}")
+        data = r.json()
+        if data.get("error"):
+            raise ProviderError(f"free_llm: {data['error']}")
+        return data.get("response") or data.get("output") or ""
+
+
+class OpenAIProvider:
+    """rc25s_openai_clients 공용 클라이언트 + LLM gateway 슬롯 (OPENAI_BASE_URL 로 stand-in 서버 지정 가능)."""
+
+    def __init__(self, model: str = "gpt-4o-mini"):
+        self.model = model
+
+    def generate(self, prompt: str, timeout: float, priority: str) -> str:
+        from rc25s_llm_gateway import estimate_tokens, get_gateway
+        from rc25s_openai_clients import get_openai_client
+
+        client = get_openai_client().with_options(timeout=timeout)
+        with get_gateway().slot(priority, estimate_tokens(prompt), caller="llm_router") as lease:
+            response = client.chat.completions.create(model=self.model, messages=[{"role": "user", "content": prompt}])
+            lease.used_tokens = getattr(getattr(response, "usage", None), "total_tokens", None)
+        return response.choices[0].message.content or ""
+
+
+def default_providers() -> Dict[str, Any]:
+    return {
+        "openai": OpenAIProvider(),
+        "ollama": OllamaProvider(OLLAMA_MODEL),
+        "ollama_phi": OllamaProvider("phi"),
+        "free_llm": FreeLLMProvider(),
+    }
+
+
+# ---------- 상태 / circuit breaker ----------
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100.0 * (len(values) - 1))))]
+
+
+class ProviderHealth:
+    def __init__(self, window: int = WINDOW):
+        self._lock = threading.Lock()
+        self.samples: Deque[Tuple[float, bool]] = collections.deque(maxlen=window)  # (지연, 성공)
+        self.state = "closed"
+        self.opened_at = 0.0
+        self.consecutive_failures = 0
+        self._trial_running = False
+        self.calls = 0
+        self.failures = 0
+
+    def allow(self) -> bool:
+        """지금 이 provider로 요청을 보내도 되는지 (half_open 이면 시험 호출 1건만 허용)."""
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self.opened_at >= COOLDOWN:
+                self.state = "half_open"
+                self._trial_running = False
+            if self.state == "closed":
+                return True
+            if self.state == "half_open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record(self, latency: float, ok: bool) -> None:
+        with self._lock:
+            self.calls += 1
+            self.samples.append((latency, ok))
+            self._trial_running = False
+            if ok:
+                self.consecutive_failures = 0
+                if self.state != "closed":
+                    # 회복: 예전 실패 기록 때문에 바로 다시 열리지 않게 성공 기록만 남긴다.
+                    self.samples = collections.deque((s for s in self.samples if s[1]), maxlen=self.samples.maxlen)
+                    self.state = "closed"
+                return
+            self.failures += 1
+            self.consecutive_failures += 1
+            if self.state == "half_open" or self._should_open():
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def _should_open(self) -> bool:
+        if self.consecutive_failures >= FAILURE_THRESHOLD:
+            return True
+        return len(self.samples) >= MIN_SAMPLES and self._error_rate() >= ERROR_RATE_OPEN
+
+    def _error_rate(self) -> float:
+        if not self.samples:
+            return 0.0
+        return sum(1 for _, ok in self.samples if not ok) / float(len(self.samples))
+
+    def latency(self, pct: float) -> Optional[float]:
+        with self._lock:
+            return _percentile([lat for lat, ok in self.samples if ok], pct)
+
+    def score(self, default: float) -> float:
+        """latency 정렬용 점수 (낮을수록 먼저): p50 × (1 + 4 × 에러율). 기록이 없으면 default."""
+        p50 = self.latency(50)
+        with self._lock:
+            error_rate = self._error_rate()
+        return (p50 if p50 is not None else default) * (1 + 4 * error_rate)
+
+    def snapshot(self) -> Dict[str, Any]:
+        p50, p95 = self.latency(50), self.latency(95)
+        with self._lock:
+            return {
+                "state": self.state,
+                "samples": len(self.samples),
+                "p50": round(p50, 3) if p50 is not None else None,
+                "p95": round(p95, 3) if p95 is not None else None,
+                "error_rate": round(self._error_rate(), 3),
+                "calls": self.calls,
+                "failures": self.failures,
+            }
+
+
+@dataclass
+class RouteResult:
+    text: str
+    provider: str
+    latency: float
+    hedged: bool = False
+    attempts: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+
+# ---------- router ----------
+class LLMRouter:
+    def __init__(self, providers: Optional[Dict[str, Any]] = None, policies: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.providers = providers if providers is not None else default_providers()
+        self.health: Dict[str, ProviderHealth] = {name: ProviderHealth() for name in self.providers}
+        self.policies: Dict[str, Dict[str, Any]] = {k: dict(v) for k, v in DEFAULT_POLICIES.items()}
+        for caller, overrides in (policies if policies is not None else _load_policy_file()).items():
+            self.set_policy(caller, **overrides)
+        self._pool = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="llm_router")
+        self._counter_lock = threading.Lock()
+        self.counters = collections.Counter()
+
+    # ---------- 정책 ----------
+    def set_policy(self, caller: str, **fields: Any) -> None:
+        self.policies.setdefault(caller, {}).update(fields)
+
+    def policy(self, caller: str) -> Dict[str, Any]:
+        merged = dict(DEFAULT_POLICIES["default"])
+        merged.update(self.policies.get("default", {}))
+        merged.update(self.policies.get(caller, {}))
+        merged["providers"] = [p for p in merged["providers"] if p in self.providers]
+        return merged
+
+    def _ordered(self, policy: Dict[str, Any]) -> List[str]:
+        names = list(policy["providers"])
+        if policy.get("order") == "latency":
+            default = float(policy["hedge_after"])
+            names.sort(key=lambda name: self.health[name].score(default))  # 동점이면 정책 순서 유지
+        return names
+
+    def _hedge_delay(self, name: str, policy: Dict[str, Any]) -> float:
+        p95 = self.health[name].latency(95)
+        if p95 is None:
+            return float(policy["hedge_after"])
+        return min(float(policy["timeout"]), max(HEDGE_MIN, p95 * HEDGE_FACTOR))
+
+    # ---------- 호출 ----------
+    def _call(self, name: str, prompt: str, policy: Dict[str, Any], deadline: float) -> str:
+        started = time.monotonic()
+        try:
+            text = self.providers[name].generate(prompt, max(0.1, deadline - started), policy.get("priority", "background"))
+            if not (text or "").strip():
+                raise ProviderError(f"{name}: empty response")
+        except Exception:
+            self.health[name].record(time.monotonic() - started, False)
+            raise
+        self.health[name].record(time.monotonic() - started, True)
+        return text
+
+    def _count(self, *names: str) -> None:
+        with self._counter_lock:
+            self.counters.update(names)
+
+    def route(self, prompt: str, caller: str = "default", timeout: Optional[float] = None) -> RouteResult:
+        policy = self.policy(caller)
+        started = time.monotonic()
+        deadline = started + float(timeout if timeout is not None else policy["timeout"])
+        queue = self._ordered(policy)
+        pending: Dict[Future, str] = {}
+        result = RouteResult(text="", provider="", latency=0.0)
+        self._count("routes")
+
+        def launch() -> Optional[str]:
+            while queue:
+                name = queue.pop(0)
+                if self.health[name].allow():
+                    pending[self._pool.submit(self._call, name, prompt, policy, deadline)] = name
+                    result.attempts.append(name)
+                    return name
+                result.errors.append(f"{name}: circuit open")
+            return None
+
+        current = launch()
+        next_hedge = time.monotonic() + self._hedge_delay(current, policy) if current and policy.get("hedge") else None
+        while pending:
+            wake_at = min(deadline, next_hedge) if next_hedge is not None else deadline
+            done, _ = wait(list(pending), timeout=max(0.0, wake_at - time.monotonic()), return_when=FIRST_COMPLETED)
+            failed = False
+            for future in done:
+                name = pending.pop(future)
+                try:
+                    text = future.result()
+                except Exception as e:
+                    result.errors.append(f"{name}: {e}")
+                    failed = True
+                    continue
+                result.text, result.provider = text, name
+                result.latency = round(time.monotonic() - started, 3)
+                self._count("hedge_wins" if result.hedged and name != result.attempts[0] else "primary_wins")
+                return result
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            hedge_due = next_hedge is not None and now >= next_hedge
+            if (failed or hedge_due) and len(pending) < int(policy["max_parallel"]):
+                self._count("failovers" if failed else "hedged")
+                result.hedged = result.hedged or not failed
+                current = launch()
+                next_hedge = now + self._hedge_delay(current, policy) if current and policy.get("hedge") else None
+            elif hedge_due:
+                next_hedge = None  # 동시 실행 한도: 지금 도는 요청 중 하나가 끝나기를 기다린다
+        self._count("failures")
+        detail = "; ".join(result.errors) or "timeout"
+        raise ProviderError(f"all providers failed for caller={caller}: {detail}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._counter_lock:
+            counters = dict(self.counters)
+        return {"providers": {name: h.snapshot() for name, h in self.health.items()}, **counters}
+
+
+def _load_policy_file() -> Dict[str, Dict[str, Any]]:
+    try:
+        return json.loads(POLICY_PATH.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"[LLM Router] Warning: failed to load policy {POLICY_PATH}: {e}")
+        return {}
+
+
+_router: Optional[LLMRouter] = None
+_router_lock = threading.Lock()
+
+
+def get_router() -> LLMRouter:
+    global _router
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                _router = LLMRouter()
+    return _router
+
 
 def call_free_llm(prompt):
-    """로컬 LLM 호출"""
+    """로컬 LLM 호출 (free_llm → ollama → phi 순서로 라우팅)"""
     try:
-        response = requests.post(FREE_LLM_URL, json={"prompt": prompt}, timeout=30)
-    elapsed = time.time() - start_time
-    if elapsed > 15:
-        print("⚠️ Qwen2.5 응답 지연 — phi로 자동 전환");
-        response = requests.post("http://127.0.0.1:11434/api/generate", json={"model": "phi", "prompt": prompt}, timeout=60)
-        if response.status_code == 200:
-            return response.json().get("output", "")
-        else:
-            return f"⚠️ LLM error: {response.status_code} {response.text}"
+        return get_router().route(prompt, caller="free_llm").text
     except Exception as e:
         return f"❌ LLM connection failed: {e}"
+
@@ -1,23 +1,37 @@
 from fastapi import FastAPI, WebSocket, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 import json
 import datetime
 import asyncio
-import psutil
-import subprocess
+import contextlib
+import math
 import socket
 import os
+import sys
+import time
 from pathlib import Path
 
-from world_state import load_world_state
-from rc25s_planner import run_planner, PLANNER_STATE_PATH
-from rc25s_task_executor import main as run_executor
-from rc25s_openai_wrapper import rc25s_chat
+from world_state import (
+    HISTORY_INTERVAL,
+    achanges_since,
+    aload_world_state,
+    arecord_history,
+    aworld_state_history,
+    run_io,
+)
+from rc25s_planner import approve_goal_tasks
+from rc25s_intent import get_intent_router, status_summary
+from rc25s_jobs import JobManager, run_subprocess
+from rc25s_llm_gateway import LLMShedError, get_gateway
+from rc25s_openai_clients import stats as openai_client_stats
+from rc25s_openai_wrapper import async_context, latency_summary, llm_cache, rc25s_achat, rc25s_achat_stream
+from rc25s_log_tail import decode_cursors, encode_cursors, read_since, tail
+from rc25s_log_stream import LogStreamHub
+from rc25s_system_stats import get_system_stats_sampler
+from rc25s_ws_hub import WorldStateBroadcaster
 
 app = FastAPI(title="MCP Realtime API", version="2.0.0")
 
-# 연결된 클라이언트 저장용 (필요 시 broadcast 가능)
-connected_clients = set()
 
 
 @app.get("/")
@@ -33,43 +47,118 @@ def health():
             "message": "RC25S MCP Realtime API active",
             "server": socket.gethostname(),
             "time": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "ws_agi": world_state_hub.stats(),
+            "ws_system": system_stats.stats(),
+            "ws_logs": log_stream.stats(),
+            "jobs": jobs.stats(),
+            "llm_latency": latency_summary(),
+            "llm_cache": llm_cache.stats(),
+            "llm_context": async_context.stats(),
+            "llm_gateway": get_gateway().stats(),
+            "openai_clients": openai_client_stats(),
+            "intent_fast_path": get_intent_router().stats(),
         }
     )
 
 
+async def _history_recorder():
+    """world_state가 바뀌었으면 HISTORY_INTERVAL 초마다 history 스냅샷을 남긴다."""
+    while True:
+        await asyncio.sleep(HISTORY_INTERVAL)
+        try:
+            await arecord_history()
+        except Exception as e:
+            print(f"⚠️ world_state history 기록 실패: {e}")
+
+
+@app.on_event("startup")
+async def _start_background_tasks():
+    if HISTORY_INTERVAL > 0:
+        asyncio.create_task(_history_recorder())
+    world_state_hub.start()
+
+
+@app.get("/world_state/history")
+async def world_state_history_endpoint(start: str = None, end: str = None, limit: int = 500, at: str = None):
+    """
+    world_state 과거 기록 조회.
+    - ?start=...&end=... (epoch 또는 ISO8601): 그 사이에 기록된 revision 목록
+    - ?at=...: 그 시각의 world_state 전체 (예: reflection confidence가 떨어지기 1시간 전 planner/reflection 확인)
+    """
+    try:
+        if at:
+            state = await aload_world_state(mutable=True, at=at)
+            return JSONResponse({"at": at, "revision": state.get("revision"), "world_state": state})
+        revisions = await aworld_state_history(start, end, limit)
+        return JSONResponse({"start": start, "end": end, "count": len(revisions), "revisions": revisions})
+    except LookupError as e:
+        return JSONResponse({"error": "history_not_found", "message": str(e)}, status_code=404)
+    except ValueError as e:
+        return JSONResponse({"error": "invalid_time", "message": str(e)}, status_code=400)
+
+
+# /rc25s/logs, /ws/logs 에서 보여주는 로그 파일
+RC25S_LOG_FILES = {
+    "autoheal": "/var/log/rc25s-autoheal.log",
+    "autoheal_ai": "/var/log/rc25s-autoheal-ai.log",
+    "centralcore": "/srv/repo/vibecoding/logs/centralcore.log",
+    "reflection": "/srv/repo/vibecoding/logs/agi_reflection.log",
+    "executor": "/srv/repo/vibecoding/logs/rc25s_executor.log",
+}
+
+
 @app.get("/rc25s/logs")
-def get_rc25s_logs():
+def get_rc25s_logs(since: str = None, lines: int = 40):
     """
     RC25S 관련 주요 로그들을 tail 해서 JSON으로 반환한다.
     - Autoheal, Self-Check, Reflection, Executor 로그 등을 모아서
       대시보드에서 한 번에 볼 수 있도록 한다.
+    - 응답의 "cursor"를 ?since=<cursor>로 다시 보내면 그 이후 새로 추가된 줄만 받는다.
+      (로테이션/truncate된 파일 이름은 "reset" 목록에 들어간다)
+    - 셸을 띄우지 않고 rc25s_log_tail로 파일 끝만 읽는다.
     """
-    log_files = {
-        "autoheal": "/var/log/rc25s-autoheal.log",
-        "autoheal_ai": "/var/log/rc25s-autoheal-ai.log",
-        "centralcore": "/srv/repo/vibecoding/logs/centralcore.log",
-        "reflection": "/srv/repo/vibecoding/logs/agi_reflection.log",
-        "executor": "/srv/repo/vibecoding/logs/rc25s_executor.log",
-    }
+    cursors = decode_cursors(since)
     logs = {}
-    for name, path in log_files.items():
+    next_cursors = {}
+    reset = []
+    for name, path in RC25S_LOG_FILES.items():
         try:
-            if os.path.exists(path):
-                # tail -n 40 정도만 보여준다.
-                logs[name] = subprocess.getoutput(f"tail -n 40 {path}")
-            else:
+            if not os.path.exists(path):
                 logs[name] = f"Log file not found: {path}"
+                continue
+            if since:
+                result = read_since(path, cursors.get(name), n=lines)
+                if result["reset"]:
+                    reset.append(name)
+                text_lines, next_cursors[name] = result["lines"], result["cursor"]
+            else:
+                text_lines, next_cursors[name] = tail(path, lines)
+            logs[name] = "\n".join(text_lines)
         except Exception as e:
             logs[name] = f"Failed to read log {path}: {e}"
+    logs["cursor"] = encode_cursors(next_cursors)
+    if since:
+        logs["reset"] = reset
     return JSONResponse(logs)
 
 
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
 @app.post("/llm")
 async def http_llm(request: Request):
     """
     HTTP 기반 LLM 엔드포인트.
     - 대시보드 프리 텍스트 입력이 이 경로로 POST를 보내며,
-    - rc25s_openai_wrapper.rc25s_chat 을 사용해 답변을 생성한다.
+    - rc25s_openai_wrapper.rc25s_achat(스트리밍은 rc25s_achat_stream)으로 이벤트 루프에서 바로 답변을 생성한다 (스레드를 잡지 않는다).
+    - {"stream": true} 또는 Accept: text/event-stream 이면 SSE로 토큰을 바로 흘려보낸다:
+      event: delta  data: {"text": ...}   (여러 번)
+      event: done   data: {"provider", "output", "metrics": {"ttft", "response_time", ...}}
+      event: error  data: {"error", "message"}
+    - {"cache": false} 이면 응답 캐시를 건너뛴다. "ping" 같은 헬스 체크는 OpenAI까지 가지 않는다.
+    - {"priority": "interactive"|"planner"|"background", "caller": ...} 로 LLM gateway 우선순위를 고른다 (기본 interactive).
+      background 호출이 버려지면 503 {"error": "llm_shed"} + Retry-After.
     """
     body = await request.json()
     prompt = (body.get("prompt") or "").strip()
@@ -77,107 +166,254 @@ async def http_llm(request: Request):
         return JSONResponse(
             {"error": "empty_prompt", "message": "프롬프트가 비어 있습니다."}, status_code=400
         )
+    stream = bool(body.get("stream")) or "text/event-stream" in request.headers.get("accept", "")
+    use_cache = bool(body.get("cache", True))
+    priority = body.get("priority") or "interactive"
+    caller = str(body.get("caller") or "http_llm")
+    if stream:
+
+        async def events():
+            try:
+                # 클라이언트가 끊기면 aclosing 으로 provider 스트림과 gateway 슬롯까지 바로 정리된다.
+                chunks = rc25s_achat_stream(prompt, source=caller, cache=use_cache, priority=priority)
+                async with contextlib.aclosing(chunks):
+                    async for event in chunks:
+                        if event["type"] == "delta":
+                            yield _sse("delta", {"text": event["text"]})
+                        else:
+                            yield _sse(
+                                "done",
+                                {"provider": "rc25s_openai", "output": event["response"], "metrics": event["metrics"]},
+                            )
+            except LLMShedError as e:
+                yield _sse("error", {"error": "llm_shed", "message": str(e)})
+            except Exception as e:
+                yield _sse("error", {"error": "llm_error", "message": str(e)})
+
+        return StreamingResponse(
+            events(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
     try:
-        result = rc25s_chat(prompt)
+        result = await rc25s_achat(prompt, cache=use_cache, priority=priority, caller=caller)
         text = (result or {}).get("response") or ""
-        return JSONResponse({"provider": "rc25s_openai", "output": text})
+        return JSONResponse(
+            {"provider": "rc25s_openai", "output": text, "cache": ((result or {}).get("metrics") or {}).get("cache")}
+        )
+    except LLMShedError as e:
+        return JSONResponse(
+            {"error": "llm_shed", "message": str(e), "output": ""},
+            status_code=503,
+            headers={"Retry-After": "30"},
+        )
     except Exception as e:
         return JSONResponse(
             {"error": "llm_error", "message": str(e)}, status_code=500
         )
 
 
-async def _run_executor_once() -> int:
+APP_DIR = Path(__file__).resolve().parent
+SELFCHECK_SCRIPT = "/srv/repo/vibecoding/rc25s-selfcheck.sh"
+
+# planner / executor / selfcheck 백그라운드 작업 관리자 (프로세스당 1개, 종류별 동시 실행 한도)
+jobs = JobManager()
+
+
+async def _run_planner_job(job) -> int:
+    return await run_subprocess(job, [sys.executable, str(APP_DIR / "rc25s_planner.py")], cwd=str(APP_DIR))
+
+
+async def _run_executor_job(job) -> int:
+    """rc25s_task_executor 를 1회 실행 (별도 프로세스라 취소 가능, exit code가 그대로 결과)."""
+    return await run_subprocess(job, [sys.executable, str(APP_DIR / "rc25s_task_executor.py")], cwd=str(APP_DIR))
+
+
+async def _run_selfcheck_job(job) -> int:
+    return await run_subprocess(job, ["bash", SELFCHECK_SCRIPT])
+
+
+JOB_RUNNERS = {
+    "planner": _run_planner_job,
+    "executor": _run_executor_job,
+    "selfcheck": _run_selfcheck_job,
+}
+
+# 같은 종류가 이미 대기/실행 중이면 새로 실행하지 않고 그 작업에 붙는 종류 (single-flight)
+SINGLE_FLIGHT_KINDS = {"planner", "selfcheck"}
+# 이 시간(초) 안에 성공한 같은 작업이 있으면 다시 실행하지 않고 그 결과를 돌려준다 (명령 payload의 fresh_within으로 덮어쓰기 가능)
+JOB_FRESH_SECONDS = float(os.getenv("RC25S_JOB_FRESH_SECONDS", "0"))
+
+# /ws/agi 명령 → 작업 종류
+JOB_COMMANDS = {
+    "command_planner": "planner",
+    "command_executor": "executor",
+    "trigger_task": "executor",
+    "command_selfcheck": "selfcheck",
+}
+
+
+async def _reply(websocket: WebSocket, correlation_id, message: dict):
+    if correlation_id is not None:
+        message["correlation_id"] = correlation_id
+    await websocket.send_json(message)
+
+
+def _submit_job(kind: str, websocket: WebSocket, session: dict, correlation_id=None, label=None, fresh_within=None):
     """
-    rc25s_task_executor.main() 을 1회 실행하고 exit code를 정수로 반환.
-    SystemExit 예외도 안전하게 처리한다.
+    작업을 제출하고 바로 돌려준다.
+    - 이 소켓으로 accepted → (queued) → started → output/progress → finished 이벤트가 간다.
+    - planner / selfcheck 는 동시에 여러 번 요청돼도 한 번만 실행하고 모두 같은 결과를 받는다.
+    - 끝나면 최신 world_state를 한 번 내려준다.
     """
 
-    def _inner():
-        try:
-            return run_executor()
-        except SystemExit as se:
-            return se.code if isinstance(se.code, int) else 0
+    async def listener(message: dict):
+        await websocket.send_json(message)
+        if message["event"] == "finished":
+            await _send_world_state(websocket, session)
+
+    single_flight = kind in SINGLE_FLIGHT_KINDS
+    if fresh_within is None:
+        fresh_within = JOB_FRESH_SECONDS
+    return jobs.submit(
+        kind,
+        JOB_RUNNERS[kind],
+        listener=listener,
+        correlation_id=correlation_id,
+        label=label,
+        key=kind if single_flight else None,
+        fresh_within=float(fresh_within) if single_flight else 0.0,
+    )
+
 
-    return await asyncio.to_thread(_inner)
+@app.get("/jobs")
+def list_jobs():
+    """실행 중/최근 작업 목록 (대시보드에서 이미 돌고 있는 작업 확인용)."""
+    return JSONResponse({"jobs": jobs.list(), "stats": jobs.stats()})
 
 
-async def _apply_llm_actions(actions, websocket: WebSocket):
+def _world_state_message(state) -> dict:
+    return {
+        "type": "world_state",
+        "world_state": state,
+        "timestamp": state.get("updated_at"),
+        "revision": state.get("revision"),
+    }
+
+
+async def _send_world_state(websocket: WebSocket, session: dict, since=None):
     """
-    rc25s_openai_wrapper 가 반환한 actions 배열을 해석해서
-    실제 RC25S Planner / Executor / Self-Check 를 실행한다.
+    최신 world_state를 클라이언트에 내려준다.
+    - broadcaster와 같은 세션 lock으로 직렬화해, 같은 패치가 두 번 전송되지 않게 한다.
     """
-    if not actions:
-        return
+    async with session["lock"]:
+        await _write_world_state(websocket, session, since)
 
-    for action in actions:
-        atype = (action or {}).get("type")
-        if atype == "run_planner":
-            await websocket.send_json(
-                {"type": "event", "message": "🧠 LLM 요청: Planner 실행"}
-            )
-            await asyncio.to_thread(run_planner)
-        elif atype == "run_executor":
-            await websocket.send_json(
-                {"type": "event", "message": "🧩 LLM 요청: Executor 1회 실행"}
-            )
-            exit_code = await _run_executor_once()
+
+async def _write_world_state(websocket: WebSocket, session: dict, since=None):
+    """
+    _send_world_state 본체 (세션 lock을 잡은 상태에서 호출).
+    - 핸드셰이크에서 {"delta": true}를 보낸 세션이면, 마지막으로 보낸 revision 이후의
+      RFC 6902 패치만 world_state_delta 로 보낸다 (전체 상태 대신 수백 바이트).
+    - change log에서 해당 revision이 이미 밀려났으면(resync) 전체 상태를 보낸다.
+    - 파일 읽기는 world_state I/O 스레드 풀에서 실행한다 (이벤트 루프를 막지 않음).
+    """
+    if since is None and session.get("delta"):
+        since = session.get("revision")
+    if since is not None:
+        feed = await achanges_since(int(since))
+        if not feed["resync"]:
             await websocket.send_json(
                 {
-                    "type": "event",
-                    "message": f"🧩 Executor 실행 종료 (exit_code={exit_code})",
+                    "type": "world_state_delta",
+                    "from_revision": int(since),
+                    "revision": feed["revision"],
+                    "changes": feed["changes"],
                 }
             )
-        elif atype == "run_selfcheck":
-            script = "/srv/repo/vibecoding/rc25s-selfcheck.sh"
-            await websocket.send_json(
-                {"type": "event", "message": "🩺 LLM 요청: Self-Check 실행"}
-            )
-            try:
-                result = await asyncio.to_thread(
-                    subprocess.run,
-                    ["bash", script],
-                    capture_output=True,
-                    text=True,
-                )
-                await websocket.send_json(
-                    {
-                        "type": "event",
-                        "message": "🩺 Self-Check 스크립트 실행 완료",
-                        "stdout": result.stdout[-800:],
-                        "stderr": result.stderr[-800:],
-                        "returncode": result.returncode,
-                    }
-                )
-            except Exception as e:
-                await websocket.send_json(
-                    {
-                        "type": "error",
-                        "message": f"Self-Check 실행 실패: {e}",
-                    }
-                )
+            session["revision"] = feed["revision"]
+            return
+    state = await aload_world_state()
+    await websocket.send_json(_world_state_message(state))
+    session["revision"] = state.get("revision")
 
-    # 액션 실행 후 최신 world_state를 한 번 내려준다.
-    try:
-        state = load_world_state()
-        await websocket.send_json(
-            {
-                "type": "world_state",
-                "world_state": state,
-                "timestamp": state.get("updated_at"),
-            }
-        )
-    except Exception as e:
-        await websocket.send_json(
-            {"type": "error", "message": f"world_state 갱신 로드 실패: {e}"}
-        )
+
+# 모든 /ws/agi 클라이언트에 world_state 변경을 밀어주는 broadcaster (프로세스당 1개)
+world_state_hub = WorldStateBroadcaster(_world_state_message, _write_world_state)
+# 연결된 클라이언트 (websocket → 전송 채널)
+connected_clients = world_state_hub.channels
+
+
+async def _apply_llm_actions(actions, websocket: WebSocket, session: dict, correlation_id=None):
+    """
+    rc25s_openai_wrapper 가 반환한 actions 배열을 해석해서
+    실제 RC25S Planner / Executor / Self-Check 를 백그라운드 작업으로 제출한다.
+    (진행/결과는 job 이벤트로, 끝나면 world_state가 다시 내려간다)
+    """
+    labels = {
+        "run_planner": "🧠 LLM 요청: Planner 실행",
+        "run_executor": "🧩 LLM 요청: Executor 1회 실행",
+        "run_selfcheck": "🩺 LLM 요청: Self-Check 실행",
+    }
+    for action in actions or []:
+        atype = (action or {}).get("type")
+        if atype not in labels:
+            continue
+        await _reply(websocket, correlation_id, {"type": "event", "message": labels[atype]})
+        _submit_job(atype[len("run_"):], websocket, session, correlation_id, f"llm:{atype}")
+
+
+INTENT_LABELS = {
+    "planner": "🧠 Planner 실행",
+    "executor": "🧩 Executor 1회 실행",
+    "selfcheck": "🩺 Self-Check 실행",
+}
+
+
+async def _dispatch_intent(intent, websocket: WebSocket, session: dict, correlation_id=None):
+    """
+    rc25s_intent 빠른 경로: LLM을 거치지 않고 intent를 바로 처리한다.
+    - planner / executor / selfcheck → 백그라운드 작업 제출 (진행/결과는 job 이벤트)
+    - status → async_context 캐시(world_state 요약 / 리소스) + 작업 현황으로 요약
+    답은 LLM 경로와 같은 llm_response 로 보내고, metrics.fast_path=True 로 구분한다.
+    """
+    start = time.perf_counter()
+    if intent.job:
+        task_id = intent.slots.get("task_id")
+        label = f"intent:{intent.name}" + (f":{task_id}" if task_id else "")
+        job = _submit_job(intent.job, websocket, session, correlation_id, label)
+        text = f"⚡ {INTENT_LABELS[intent.name]} (job_id={job.id})"
+        if task_id:
+            # trigger_task 와 같이, 개별 task_id 실행은 아직 지원하지 않아 우선순위가 가장 높은 pending task 1개를 실행한다.
+            text += f"\n- task_id={task_id} 지정 실행은 아직 지원하지 않아 우선순위가 가장 높은 pending task 1개를 실행합니다."
+    else:
+        world_state_json, system_summary, revision = await async_context.get()
+        text = status_summary(world_state_json, system_summary, revision, jobs.stats())
+    await _reply(
+        websocket,
+        correlation_id,
+        {
+            "type": "llm_response",
+            "message": text,
+            "metrics": {
+                "fast_path": True,
+                "intent": intent.name,
+                "confidence": intent.confidence,
+                "slots": intent.slots,
+                "response_time": round(time.perf_counter() - start, 4),
+            },
+            "timestamp": datetime.datetime.now().isoformat(),
+        }
+    )
 
 
 @app.websocket("/ws/agi")
 async def agi_ws(websocket: WebSocket):
     await websocket.accept()
-    connected_clients.add(websocket)
     print("🔌 WebSocket client connected")
+    # 연결별 상태: delta 모드 여부, 마지막으로 내려준 world_state revision, broadcast 구독 여부
+    session = {"delta": False, "revision": None, "subscribed": True, "lock": asyncio.Lock()}
+    world_state_hub.register(websocket, session)
 
     try:
         while True:
@@ -196,18 +432,15 @@ async def agi_ws(websocket: WebSocket):
 
             # 1) 핸드셰이크: 대시보드 최초 연결
             if msg_type == "handshake":
+                session["delta"] = bool(payload.get("delta"))
+                session["subscribed"] = bool(payload.get("subscribe", True))
+                if payload.get("revision") is not None:
+                    session["revision"] = payload.get("revision")
                 await websocket.send_json(
                     {"type": "event", "message": "✅ 대시보드 클라이언트 핸드셰이크 완료"}
                 )
                 try:
-                    state = load_world_state()
-                    await websocket.send_json(
-                        {
-                            "type": "world_state",
-                            "world_state": state,
-                            "timestamp": state.get("updated_at"),
-                        }
-                    )
+                    await _send_world_state(websocket, session)
                 except Exception as e:
                     await websocket.send_json(
                         {"type": "error", "message": f"world_state 로드 실패: {e}"}
@@ -218,131 +451,100 @@ async def agi_ws(websocket: WebSocket):
             if msg_type == "command":
                 command = payload.get("command") or ""
                 cmd_payload = payload.get("payload") or {}
+                # 클라이언트가 붙인 correlation_id는 이 명령의 모든 응답/작업 이벤트에 그대로 실려 간다.
+                correlation_id = payload.get("correlation_id")
 
                 # 2-1) 월드 상태 동기화
                 if command == "request_world_state":
                     try:
-                        state = load_world_state()
-                        await websocket.send_json(
-                            {
-                                "type": "world_state",
-                                "world_state": state,
-                                "timestamp": state.get("updated_at"),
-                            }
-                        )
+                        await _send_world_state(websocket, session, since=cmd_payload.get("since"))
                     except Exception as e:
-                        await websocket.send_json(
+                        await _reply(
+                            websocket,
+                            correlation_id,
                             {"type": "error", "message": f"world_state 로드 실패: {e}"}
                         )
                     continue
 
-                # 2-2) Planner 실행
-                if command == "command_planner":
-                    try:
-                        await asyncio.to_thread(run_planner)
-                        await websocket.send_json(
-                            {"type": "event", "message": "🧠 Planner 실행 완료"}
-                        )
-                        state = load_world_state()
-                        await websocket.send_json(
-                            {
-                                "type": "world_state",
-                                "world_state": state,
-                                "timestamp": state.get("updated_at"),
-                            }
-                        )
-                    except Exception as e:
-                        await websocket.send_json(
-                            {"type": "error", "message": f"Planner 실행 실패: {e}"}
-                        )
-                    continue
-
-                # 2-3) Executor 1회 실행
-                if command == "command_executor":
-                    try:
-                        await websocket.send_json(
-                            {
-                                "type": "event",
-                                "message": "🧩 Executor 1회 실행 요청 수신",
-                            }
-                        )
-                        exit_code = await _run_executor_once()
-                        await websocket.send_json(
-                            {
-                                "type": "event",
-                                "message": f"🧩 Executor 실행 종료 (exit_code={exit_code})",
-                            }
-                        )
-                        state = load_world_state()
-                        await websocket.send_json(
-                            {
-                                "type": "world_state",
-                                "world_state": state,
-                                "timestamp": state.get("updated_at"),
-                            }
-                        )
-                    except Exception as e:
-                        await websocket.send_json(
-                            {"type": "error", "message": f"Executor 실행 실패: {e}"}
-                        )
+                # 2-1-b) world_state broadcast 구독 켜기/끄기
+                if command == "subscribe_world_state":
+                    session["subscribed"] = bool(cmd_payload.get("enabled", True))
+                    await _reply(
+                        websocket,
+                        correlation_id,
+                        {"type": "event", "message": f"📡 world_state 구독: {session['subscribed']}"}
+                    )
                     continue
 
-                # 2-3-확장) 특정 task_id를 지정한 실행 요청 (trigger_task)
-                if command == "trigger_task":
-                    task_id = cmd_payload.get("task_id")
-                    try:
-                        await websocket.send_json(
-                            {
-                                "type": "event",
-                                "message": f"🧩 trigger_task 실행 요청 수신 (task_id={task_id})",
-                            }
-                        )
+                # 2-2) Planner / Executor / Self-Check: 백그라운드 작업으로 실행
+                #      (job_id를 바로 돌려주고 진행/출력은 job 이벤트로 전송, 수신 루프는 막지 않음)
+                if command in JOB_COMMANDS:
+                    kind = JOB_COMMANDS[command]
+                    label = command
+                    if command == "trigger_task":
                         # 현재 rc25s_task_executor는 개별 task_id 실행을 직접 지원하지 않으므로,
                         # 우선순위가 가장 높은 pending task 1개를 실행하는 기존 로직을 재사용한다.
-                        exit_code = await _run_executor_once()
-                        await websocket.send_json(
-                            {
-                                "type": "event",
-                                "message": f"🧩 trigger_task 실행 종료 (exit_code={exit_code}, task_id={task_id})",
-                            }
-                        )
-                        state = load_world_state()
-                        await websocket.send_json(
-                            {
-                                "type": "world_state",
-                                "world_state": state,
-                                "timestamp": state.get("updated_at"),
-                            }
-                        )
-                    except Exception as e:
-                        await websocket.send_json(
-                            {"type": "error", "message": f"trigger_task 실행 실패: {e}"}
+                        label = f"trigger_task:{cmd_payload.get('task_id')}"
+                    fresh_within = cmd_payload.get("fresh_within")
+                    if fresh_within is not None:
+                        # 클라이언트가 보낸 값: 잘못된 값은 이 명령만 거절한다 (연결은 유지).
+                        try:
+                            fresh_within = float(fresh_within)
+                        except (ValueError, TypeError):
+                            fresh_within = None
+                        if fresh_within is None or not math.isfinite(fresh_within) or fresh_within < 0:
+                            await _reply(
+                                websocket,
+                                correlation_id,
+                                {
+                                    "type": "error",
+                                    "ok": False,
+                                    "error": "invalid_fresh_within",
+                                    "message": f"fresh_within은 0 이상의 초 단위 숫자여야 합니다: {cmd_payload.get('fresh_within')!r}",
+                                },
+                            )
+                            continue
+                    _submit_job(kind, websocket, session, correlation_id, label, fresh_within)
+                    continue
+
+                # 2-3) 작업 조회 / 취소 / 이어 받기
+                if command == "list_jobs":
+                    await _reply(websocket, correlation_id, {"type": "jobs", "jobs": jobs.list()})
+                    continue
+
+                if command == "cancel_job":
+                    job_id = cmd_payload.get("job_id")
+                    cancelled = jobs.cancel(job_id)
+                    await _reply(
+                        websocket,
+                        correlation_id,
+                        {"type": "event", "message": f"🛑 작업 취소 요청 (job_id={job_id}, cancelled={cancelled})"},
+                    )
+                    continue
+
+                if command == "watch_job":
+                    job = jobs.watch(cmd_payload.get("job_id"), websocket.send_json, correlation_id)
+                    if job is None:
+                        await _reply(websocket, correlation_id, {"type": "error", "message": "Unknown job_id"})
+                    else:
+                        await _reply(
+                            websocket,
+                            correlation_id,
+                            {"type": "jobs", "jobs": [job.info()], "output": list(job.output)},
                         )
                     continue
 
-                # 2-3-보완) 목표 승인 (approve_goal)
+                # 2-4) 목표 승인 (approve_goal)
                 if command == "approve_goal":
                     goal_id = cmd_payload.get("goal_id")
                     try:
                         # 로컬 플래너 상태 파일에서 해당 goal_id에 속한 작업을 approved=True로 표시
-                        try:
-                            with open(PLANNER_STATE_PATH, "r", encoding="utf-8") as f:
-                                planner_state = json.load(f)
-                        except FileNotFoundError:
-                            planner_state = {}
-
-                        changed = False
-                        for t in planner_state.get("tasks", []):
-                            if t.get("goal_id") == goal_id:
-                                if not t.get("approved"):
-                                    t["approved"] = True
-                                    changed = True
-
-                        if changed:
-                            with open(PLANNER_STATE_PATH, "w", encoding="utf-8") as f:
-                                json.dump(planner_state, f, ensure_ascii=False, indent=2)
-
-                        await websocket.send_json(
+                        # (파일 읽기/쓰기는 I/O 스레드 풀에서)
+                        changed = await run_io(approve_goal_tasks, goal_id)
+
+                        await _reply(
+                            websocket,
+                            correlation_id,
                             {
                                 "type": "event",
                                 "message": f"✅ Goal 승인 처리 완료 (goal_id={goal_id}, changed={changed})",
@@ -350,77 +552,81 @@ async def agi_ws(websocket: WebSocket):
                         )
 
                         # world_state도 최신 상태로 다시 내려준다.
-                        state = load_world_state()
-                        await websocket.send_json(
-                            {
-                                "type": "world_state",
-                                "world_state": state,
-                                "timestamp": state.get("updated_at"),
-                            }
-                        )
+                        await _send_world_state(websocket, session)
                     except Exception as e:
-                        await websocket.send_json(
+                        await _reply(
+                            websocket,
+                            correlation_id,
                             {"type": "error", "message": f"approve_goal 처리 실패: {e}"}
                         )
                     continue
 
-                # 2-4) Self-Check 실행
-                if command == "command_selfcheck":
-                    script = "/srv/repo/vibecoding/rc25s-selfcheck.sh"
-                    try:
-                        result = await asyncio.to_thread(
-                            subprocess.run,
-                            ["bash", script],
-                            capture_output=True,
-                            text=True,
-                        )
-                        await websocket.send_json(
-                            {
-                                "type": "event",
-                                "message": "🩺 Self-Check 스크립트 실행 완료",
-                                "stdout": result.stdout[-1000:],
-                                "stderr": result.stderr[-1000:],
-                                "returncode": result.returncode,
-                            }
-                        )
-                    except Exception as e:
-                        await websocket.send_json(
-                            {"type": "error", "message": f"Self-Check 실행 실패: {e}"}
-                        )
-                    continue
-
                 # 2-5) 프리 텍스트 LLM 대화 + 액션 실행
                 if command == "free_text":
                     message = (cmd_payload.get("message") or "").strip()
                     if not message:
-                        await websocket.send_json(
+                        await _reply(
+                            websocket,
+                            correlation_id,
                             {
                                 "type": "error",
                                 "message": "빈 메시지는 처리할 수 없습니다.",
                             }
                         )
                         continue
+                    # 뻔한 대시보드 명령은 LLM 없이 바로 처리 (payload {"fast_path": false} 면 항상 LLM)
+                    intent = get_intent_router().route(message) if cmd_payload.get("fast_path", True) else None
+                    if intent is not None:
+                        try:
+                            await _dispatch_intent(intent, websocket, session, correlation_id)
+                        except Exception as e:
+                            await _reply(
+                                websocket,
+                                correlation_id,
+                                {"type": "error", "message": f"intent 처리 실패: {e}"}
+                            )
+                        continue
                     try:
-                        llm_result = await asyncio.to_thread(rc25s_chat, message)
+                        # 기본은 스트리밍: 토큰이 오는 대로 llm_delta, 끝나면 전체 답변을 llm_response 로 보낸다.
+                        # (payload {"stream": false} 이면 기존처럼 llm_response 한 번)
+                        use_cache = bool(cmd_payload.get("cache", True))
+                        if cmd_payload.get("stream", True):
+                            llm_result = {}
+                            stream = rc25s_achat_stream(message, source="ws_free_text", cache=use_cache)
+                            async with contextlib.aclosing(stream):
+                                async for event in stream:
+                                    if event["type"] == "delta":
+                                        await _reply(websocket, correlation_id, {"type": "llm_delta", "delta": event["text"]})
+                                    else:
+                                        llm_result = event
+                        else:
+                            llm_result = await rc25s_achat(message, cache=use_cache, caller="ws_free_text")
                         text = (llm_result or {}).get("response", "")
                         actions = (llm_result or {}).get("actions") or []
-                        await websocket.send_json(
+                        await _reply(
+                            websocket,
+                            correlation_id,
                             {
                                 "type": "llm_response",
                                 "message": text,
+                                "metrics": (llm_result or {}).get("metrics"),
                                 "timestamp": datetime.datetime.now().isoformat(),
                             }
                         )
                         # 선택적으로, LLM이 제안한 actions를 실제로 실행
-                        await _apply_llm_actions(actions, websocket)
+                        await _apply_llm_actions(actions, websocket, session, correlation_id)
                     except Exception as e:
-                        await websocket.send_json(
+                        await _reply(
+                            websocket,
+                            correlation_id,
                             {"type": "error", "message": f"LLM 처리 실패: {e}"}
                         )
                     continue
 
                 # 알 수 없는 명령
-                await websocket.send_json(
+                await _reply(
+                    websocket,
+                    correlation_id,
                     {"type": "error", "message": f"Unknown command: {command}"}
                 )
                 continue
@@ -440,35 +646,98 @@ async def agi_ws(websocket: WebSocket):
     except Exception as e:
         print(f"⚠️ WebSocket error: {e}")
     finally:
-        connected_clients.remove(websocket)
+        world_state_hub.unregister(websocket)
         print("❌ WebSocket client disconnected")
 
 
+# /ws/system2 구독자 전체가 공유하는 샘플러 (프로세스당 1개, LLM 프롬프트의 리소스 요약도 같은 샘플을 쓴다)
+system_stats = get_system_stats_sampler()
+
+
 @app.websocket("/ws/system2")
 async def system_ws(websocket: WebSocket):
     """
     시스템 상태 모니터링용 WebSocket 채널.
     - dashboard/src/App.jsx 에서 /ws/system2 으로 연결을 시도하며,
       type === "system_stats" 인 JSON을 기대한다.
+    - 샘플링은 공유 SystemStatsSampler가 한 번만 하고, 접속 즉시 마지막 샘플을 보내준다.
+    - 전송 주기: /ws/system2?rate=1|5|30 (기본 5초), 접속 중에는 {"rate": 30} 메시지로 변경.
     """
     await websocket.accept()
+    system_stats.subscribe(websocket, websocket.query_params.get("rate", 5))
     try:
         while True:
-            cpu = psutil.cpu_percent(interval=None)
-            mem = psutil.virtual_memory().percent
-            disk = psutil.disk_usage("/").percent
-            payload = {
-                "type": "system_stats",
-                "cpu": cpu,
-                "memory": mem,
-                "disk": disk,
-                "time": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            }
-            await websocket.send_text(json.dumps(payload, ensure_ascii=False))
-            await asyncio.sleep(5)
+            # 클라이언트 메시지는 주기 변경만 처리한다. 끊기면 예외로 빠져나간다.
+            data = await websocket.receive_text()
+            try:
+                rate = (json.loads(data) or {}).get("rate")
+            except Exception:
+                rate = None
+            if rate is not None:
+                system_stats.set_rate(websocket, rate)
     except Exception as e:
         print(f"⚠️ system WS error: {e}")
     finally:
+        system_stats.unsubscribe(websocket)
+        try:
+            await websocket.close()
+        except Exception:
+            pass
+
+
+# /ws/logs 구독자 전체가 공유하는 로그 follower (파일당 1개, 프로세스당 1개)
+log_stream = LogStreamHub(RC25S_LOG_FILES, logs_dir=Path(__file__).resolve().parent / "logs")
+
+
+def _split_sources(value):
+    if isinstance(value, str):
+        return [s.strip() for s in value.split(",") if s.strip()]
+    return [str(s) for s in (value or [])]
+
+
+@app.websocket("/ws/logs")
+async def logs_ws(websocket: WebSocket):
+    """
+    RC25S 로그 실시간 follow 채널 (tail -f 여러 개를 한 소켓으로).
+    - 접속 직후 {"type": "log_sources", "sources": [...]}: RC25S_LOG_FILES 이름 + "logs/<파일명>"
+    - 구독: /ws/logs?sources=autoheal,executor&level=warning&contains=timeout&backlog=50
+      또는 접속 중 {"type": "subscribe", "sources": [...], "level": ..., "contains": ..., "backlog": N}
+      (다시 보내면 구독 목록/필터가 그 내용으로 바뀐다)
+    - 새 줄은 ~100ms 단위로 묶어서 {"type": "log_lines", "lines": [{"source", "line", "level"}]}로 온다.
+    - 파일 읽기와 level/contains 필터링은 서버에서 파일당 한 번만 하고 모든 구독자가 공유한다.
+    """
+    await websocket.accept()
+    params = websocket.query_params
+    try:
+        await websocket.send_json({"type": "log_sources", "sources": sorted(log_stream.available_sources())})
+        if params.get("sources"):
+            subscribed = await log_stream.subscribe(
+                websocket,
+                _split_sources(params.get("sources")),
+                level=params.get("level"),
+                contains=params.get("contains"),
+                backlog=int(params.get("backlog") or 0),
+            )
+            await websocket.send_json({"type": "log_subscribed", "sources": subscribed})
+        while True:
+            data = await websocket.receive_text()
+            try:
+                msg = json.loads(data) or {}
+            except Exception:
+                continue
+            if msg.get("type") == "subscribe":
+                subscribed = await log_stream.subscribe(
+                    websocket,
+                    _split_sources(msg.get("sources")),
+                    level=msg.get("level"),
+                    contains=msg.get("contains"),
+                    backlog=int(msg.get("backlog") or 0),
+                )
+                await websocket.send_json({"type": "log_subscribed", "sources": subscribed})
+    except Exception as e:
+        print(f"⚠️ logs WS error: {e}")
+    finally:
+        log_stream.unsubscribe(websocket)
         try:
             await websocket.close()
         except Exception:
@@ -3,8 +3,149 @@ RC-25S Sentient Kernel | Full Feature Implementation
 Version: 2025-11-08 (ko-KR)
 """
 
-import time, json, random
+import time, json, random, os, re, sys, threading
 from dataclasses import dataclass, asdict
+from pathlib import Path
+
+# mode routing 표: mode → 키워드 목록 또는 {키워드: 가중치}. 순서는 점수가 같을 때의 우선순위.
+DEFAULT_ROUTING = {
+    "EMPATHY": ["속상", "불안", "위로", "우울", "기뻐"],
+    "RAG": ["최신", "뉴스", "법", "정책", "업데이트"],
+    "CODE": ["코드", "오류", "Error", "함수", "API"],
+    "PLAN": ["계획", "일정", "로드맵", "예산"],
+    "IDEA": ["아이디어", "컨셉", "새로운"],
+    "VISION": ["이미지", "사진", "시각화"],
+}
+# 이 파일이 있으면 DEFAULT_ROUTING 대신 쓴다 (바뀌면 RELOAD_INTERVAL초 안에 다시 컴파일, 지우면 기본 표로 돌아간다).
+# 저장소의 config/kernel_routing.json 은 DEFAULT_ROUTING 과 같은 표 — 운영에서 이 파일을 고친다.
+ROUTING_CONFIG = os.getenv("RC25S_ROUTING_CONFIG", str(Path(__file__).resolve().parent / "config" / "kernel_routing.json"))
+RELOAD_INTERVAL = float(os.getenv("RC25S_ROUTING_RELOAD_INTERVAL", "2.0"))
+
+
+def validate_routing(routing):
+    """
+    routing 표 형식 검사 → [(mode, [(keyword, weight), ...]), ...] (표 순서 유지).
+    - {mode: [키워드, ...]} 또는 {mode: {키워드: 숫자 가중치}}. 빈 키워드는 건너뛴다.
+    - 문자열 하나("코드")는 목록이 아니다 — 글자 단위로 쪼개지지 않도록 ValueError.
+    """
+    if not isinstance(routing, dict):
+        raise ValueError(f"routing 표는 {{mode: 키워드}} 객체여야 한다: {type(routing).__name__}")
+    table = []
+    for mode, keywords in routing.items():
+        if not isinstance(mode, str) or not mode:
+            raise ValueError(f"mode 이름은 빈 문자열이 아닌 문자열이어야 한다: {mode!r}")
+        if isinstance(keywords, dict):
+            items = list(keywords.items())
+        elif isinstance(keywords, (list, tuple)):
+            items = [(k, 1.0) for k in keywords]
+        else:
+            raise ValueError(f"{mode}: 키워드는 목록 또는 {{키워드: 가중치}} 여야 한다: {keywords!r}")
+        checked = []
+        for keyword, weight in items:
+            if not isinstance(keyword, str):
+                raise ValueError(f"{mode}: 키워드는 문자열이어야 한다: {keyword!r}")
+            if isinstance(weight, bool) or not isinstance(weight, (int, float)):
+                raise ValueError(f"{mode}: {keyword!r} 가중치는 숫자여야 한다: {weight!r}")
+            if keyword:
+                checked.append((keyword, float(weight)))
+        table.append((mode, checked))
+    return table
+
+
+class ModeRouter:
+    """
+    routing 표를 정규식 하나(긴 키워드 우선 alternation)로 한 번 컴파일해 두고,
+    prompt를 한 번만 훑어서 모든 mode의 점수(키워드 일치 횟수 × 가중치)를 같이 매긴다.
+    - detect(): 점수가 가장 높은 mode (같으면 표 순서가 앞선 mode, 아무 일치도 없으면 AUTO)
+    - 표는 ROUTING_CONFIG 파일에서 hot reload 한다 (mtime 확인은 RELOAD_INTERVAL초에 한 번).
+      형식이 틀린 표(validate_routing)는 ValueError — reload 중이면 이전 표를 유지한다.
+    - 여러 mode에 같은 키워드가 있으면 일치할 때마다 그 mode들이 각자의 가중치를 받는다.
+    """
+
+    def __init__(self, routing=None, config_path=ROUTING_CONFIG, reload_interval=RELOAD_INTERVAL):
+        self.config_path = Path(config_path) if config_path else None
+        self.reload_interval = reload_interval
+        self._config_mtime = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.reloads = 0
+        self.compile(routing or DEFAULT_ROUTING)
+        if routing is None:
+            self.maybe_reload(force=True)
+
+    def compile(self, routing):
+        order, weights = [], {}
+        for mode, items in validate_routing(routing):
+            order.append(mode)
+            for keyword, weight in items:
+                weights.setdefault(keyword, []).append((mode, weight))
+        pattern = None
+        if weights:
+            pattern = re.compile("|".join(re.escape(k) for k in sorted(weights, key=len, reverse=True)))
+        # 한 번에 바꿔 끼운다 (detect 중인 다른 스레드는 이전 표나 새 표 중 하나를 온전히 본다)
+        self._compiled = (pattern, weights, order)
+        self.routing = routing
+
+    def maybe_reload(self, force=False):
+        if self.config_path is None:
+            return False
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.reload_interval:
+            return False
+        with self._lock:
+            self._checked_at = now
+            try:
+                mtime = self.config_path.stat().st_mtime
+            except OSError:
+                mtime = None
+            if mtime == self._config_mtime:
+                return False
+            try:
+                routing = DEFAULT_ROUTING
+                if mtime is not None:
+                    with open(self.config_path, encoding="utf-8") as f:
+                        routing = json.load(f)
+                self.compile(routing)
+            except Exception as e:
+                print(f"⚠️ routing 표 로드 실패 ({self.config_path}): {e}")
+            self._config_mtime = mtime
+            self.reloads += 1
+            return True
+
+    def scores(self, prompt):
+        pattern, weights, _ = self._compiled
+        scores = {}
+        if pattern is None or not prompt:
+            return scores
+        for keyword in pattern.findall(prompt):
+            for mode, weight in weights[keyword]:
+                scores[mode] = scores.get(mode, 0.0) + weight
+        return scores
+
+    def detect(self, prompt):
+        self.maybe_reload()
+        return self._best(self.scores(prompt))
+
+    def detect_batch(self, prompts):
+        self.maybe_reload()
+        return [self._best(self.scores(p)) for p in prompts]
+
+    def _best(self, scores):
+        best, best_score = "AUTO", 0.0
+        for mode in self._compiled[2]:
+            if scores.get(mode, 0.0) > best_score:
+                best, best_score = mode, scores[mode]
+        return best
+
+
+_mode_router = None
+
+
+def get_mode_router():
+    global _mode_router
+    if _mode_router is None:
+        _mode_router = ModeRouter()
+    return _mode_router
 
 @dataclass
 class Metrics:
@@ -25,6 +166,7 @@ class RC25SKernel:
         self.mode = "AUTO"
         self.kpi = Metrics()
         self.last_reflection = None
+        self.router = get_mode_router()
 
     # ---------- Core reasoning ----------
     def run_turn(self, history, prompt):
@@ -40,20 +182,13 @@ class RC25SKernel:
 
     # ---------- Mode routing ----------
     def detect_mode(self, prompt: str) -> str:
-        routing = {
-            "EMPATHY": ["속상", "불안", "위로", "우울", "기뻐"],
-            "RAG": ["최신", "뉴스", "법", "정책", "업데이트"],
-            "CODE": ["코드", "오류", "Error", "함수", "API"],
-            "PLAN": ["계획", "일정", "로드맵", "예산"],
-            "IDEA": ["아이디어", "컨셉", "새로운"],
-            "VISION": ["이미지", "사진", "시각화"],
-        }
-        for mode, keywords in routing.items():
-            if any(k in prompt for k in keywords):
-                self.mode = mode
-                return mode
-        self.mode = "AUTO"
-        return "AUTO"
+        # 모든 mode를 한 번에 점수 매겨서 가장 잘 맞는 mode (first-match가 아니라 best-match)
+        self.mode = self.router.detect(prompt)
+        return self.mode
+
+    def detect_modes_batch(self, prompts):
+        """여러 prompt의 mode 목록 (오프라인 분석용, self.mode는 바꾸지 않는다)."""
+        return self.router.detect_batch(prompts)
 
     # ---------- Reasoning ----------
     def reason(self, mode, prompt, reflection):
@@ -89,3 +224,22 @@ class RC25SKernel:
     # ---------- KPI ----------
     def report_kpi(self):
         return asdict(self.kpi)
+
+
+if __name__ == "__main__":
+    # logs/chatlog.jsonl (또는 인자로 준 jsonl) 사용자 메시지의 mode 분포
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 else Path(__file__).resolve().parent / "logs" / "chatlog.jsonl"
+    prompts = []
+    if path.exists():
+        for line in path.read_text(encoding="utf-8").splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            text = (entry.get("message") or entry.get("text") or "").strip()
+            if text:
+                prompts.append(text)
+    counts = {}
+    for mode in RC25SKernel().detect_modes_batch(prompts):
+        counts[mode] = counts.get(mode, 0) + 1
+    print(json.dumps({"path": str(path), "prompts": len(prompts), "modes": counts}, ensure_ascii=False))
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+🧵 RC25S Async Chat Concurrency Benchmark
+
+- 목적:
+  - 느린 LLM 응답(기본 1초, ±10%)을 주는 로컬 OpenAI 호환 stand-in 서버(rc25s_llm_standin)를 띄워 두고
+    채팅 N건(기본 200)을 동시에 보냈을 때
+    - thread: asyncio.to_thread(rc25s_chat)  (예전 /llm, free_text 방식 — 기본 스레드 풀 크기만큼만 동시에 나간다)
+    - async:  await rc25s_achat()             (AsyncOpenAI, 스레드를 잡지 않는다)
+    의 전체 시간, stand-in 서버에 동시에 걸려 있던 요청 수(peak in-flight), 프로세스 스레드 수 최대값을 비교한다.
+  - 캐시는 끄고(cache=False), gateway 동시 한도는 N으로 올려서 측정한다 (ledger는 임시 파일).
+
+- 사용:
+  python3 rc25s_bench_achat.py                         # 200건, 응답 지연 1초, thread vs async
+  python3 rc25s_bench_achat.py --chats 500 --delay 2 --mode async
+  (openai, fastapi, uvicorn 패키지 필요)
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT))
+
+if TYPE_CHECKING:
+    from rc25s_llm_standin import StandIn
+
+
+async def _thread_peak(stop: asyncio.Event, result: Dict[str, int]) -> None:
+    while not stop.is_set():
+        result["peak_threads"] = max(result["peak_threads"], threading.active_count())
+        await asyncio.sleep(0.01)
+
+
+async def _run(mode: str, chats: int, delay: float, stand_in: "StandIn") -> Dict[str, Any]:
+    import rc25s_openai_wrapper as wrapper
+
+    stand_in.reset()
+    threads = {"peak_threads": threading.active_count()}
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_thread_peak(stop, threads))
+    prompts = [f"bench question #{i}" for i in range(chats)]
+    start = time.perf_counter()
+    if mode == "thread":
+        calls = [asyncio.to_thread(wrapper.rc25s_chat, p, cache=False) for p in prompts]
+    else:
+        calls = [wrapper.rc25s_achat(p, cache=False, caller="bench") for p in prompts]
+    results = await asyncio.gather(*calls, return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await probe
+    errors = [r for r in results if isinstance(r, BaseException)]
+    return {
+        "mode": mode,
+        "chats": chats,
+        "delay_s": delay,
+        "wall_s": round(elapsed, 3),
+        "server_peak_in_flight": stand_in.stats()["peak_in_flight"],
+        "peak_threads": threads["peak_threads"],
+        "errors": len(errors),
+        "first_error": repr(errors[0]) if errors else None,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["all", "thread", "async"], default="all")
+    parser.add_argument("--chats", type=int, default=200)
+    parser.add_argument("--delay", type=float, default=1.0, help="stand-in 응답 지연 (초)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="rc25s-bench-achat-") as tmp:
+        workdir = Path(tmp)
+        (workdir / "key.txt").write_text("sk-bench\n")
+        # gateway / 클라이언트 설정은 import 시점에 읽으므로 stand-in(→ gateway)을 import 하기 전에 env부터.
+        os.environ.update(
+            RC25S_OPENAI_KEY_FILE=str(workdir / "key.txt"),
+            RC25S_OPENAI_MAX_CONNECTIONS=str(args.chats),
+            RC25S_LLM_GATEWAY_STATE=str(workdir / "llm_gateway.json"),
+            RC25S_LLM_MAX_CONCURRENCY=str(args.chats),
+            RC25S_LLM_TPM_BUDGET="0",
+        )
+        from rc25s_llm_standin import StandInConfig, serve_in_thread, stop_server
+
+        # 응답은 토큰 1개짜리 합성 텍스트, 지연은 거의 전부 첫 토큰까지(ttfb).
+        server, base_url = serve_in_thread(StandInConfig(ttfb=f"1:{args.delay}", rate="1:100000", completion_tokens="1:1"))
+        os.environ["OPENAI_BASE_URL"] = base_url
+        import rc25s_openai_wrapper as wrapper
+
+        wrapper.LATENCY_LOG_PATH = workdir / "llm_latency.jsonl"
+        modes = ["thread", "async"] if args.mode == "all" else [args.mode]
+        try:
+            for mode in modes:
+                print(json.dumps(asyncio.run(_run(mode, args.chats, args.delay, server.stand_in)), ensure_ascii=False))
+        finally:
+            stop_server(server)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+⏱️ RC25S Event Loop Lag Benchmark
+
+- 목적:
+  - /ws/agi 핸들러처럼 동시 접속한 WebSocket 클라이언트 N명이 world_state를 읽고 쓸 때,
+    이벤트 루프가 얼마나 멈추는지(loop lag) 측정한다.
+  - 모드:
+    - sync:  핸들러가 load_world_state() / append_action_log()를 이벤트 루프에서 직접 호출 (기존 방식)
+    - async: aload_world_state() / aappend_action_log() (world_state I/O 스레드 풀)
+  - lag: 10ms 간격으로 깨어나는 probe 코루틴이 예정보다 얼마나 늦게 깨어났는지.
+
+- 사용:
+  python3 rc25s_bench_event_loop_lag.py                    # sync vs async, 클라이언트 50명 시뮬레이션
+  python3 rc25s_bench_event_loop_lag.py --stall-ms 50      # 읽기마다 50ms 디스크 지연 주입
+  python3 rc25s_bench_event_loop_lag.py --url ws://127.0.0.1:8000/ws/agi
+      # 실행 중인 서버에 실제 WebSocket 50개 접속 + ping 왕복 시간 측정 (websockets 패키지 필요)
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import multiprocessing as mp
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parent
+
+PROBE_INTERVAL = 0.01
+
+
+def _percentiles(samples: List[float]) -> Dict[str, Any]:
+    if not samples:
+        return {"samples": 0}
+    data = sorted(samples)
+
+    def pick(q: float) -> float:
+        return round(data[min(len(data) - 1, int(q * len(data)))] * 1000, 2)
+
+    return {
+        "samples": len(data),
+        "p50_ms": pick(0.50),
+        "p95_ms": pick(0.95),
+        "p99_ms": pick(0.99),
+        "max_ms": round(data[-1] * 1000, 2),
+    }
+
+
+async def _probe(lags: List[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(max(0.0, time.perf_counter() - start - PROBE_INTERVAL))
+
+
+# ---------- 프로세스 내 시뮬레이션 ----------
+def _simulate(mode: str, args: Dict[str, Any], out: "mp.Queue") -> None:
+    # 자식 프로세스에서 환경변수를 먼저 잡고 world_state를 import 해야 설정이 반영된다.
+    os.environ["RC25S_WORLD_STATE_PATH"] = args["state_path"]
+    os.environ["RC25S_WORLD_STATE_BACKEND"] = args["backend"]
+    sys.path.insert(0, str(ROOT))
+    import world_state
+
+    # 대시보드가 받는 상태와 비슷한 크기가 되도록 memory 섹션을 채운다.
+    world_state.update_sections({"memory": [{"id": i, "text": "x" * 200} for i in range(args["memory_items"])]})
+
+    store = world_state.get_store()
+    if args["stall_ms"] > 0:
+        # 느린 디스크 흉내: 저장소 읽기마다 지연을 넣는다.
+        stall = args["stall_ms"] / 1000.0
+        for attr in ("read_all", "read_lazy", "read_sections"):
+            original = getattr(store, attr)
+
+            def _slow(*a: Any, _original: Any = original, **kw: Any) -> Any:
+                time.sleep(stall)
+                return _original(*a, **kw)
+
+            setattr(store, attr, _slow)
+
+    ops = {"reads": 0, "writes": 0}
+
+    async def _client(cid: int, stop: asyncio.Event) -> None:
+        rng = random.Random(cid)
+        while not stop.is_set():
+            if rng.random() < args["write_ratio"]:
+                action = {"id": f"bench_{cid}", "status": "done", "time": time.time()}
+                if mode == "async":
+                    await world_state.aappend_action_log(action)
+                else:
+                    world_state.append_action_log(action)
+                ops["writes"] += 1
+            else:
+                if mode == "async":
+                    state = await world_state.aload_world_state()
+                else:
+                    state = world_state.load_world_state()
+                json.dumps(state, ensure_ascii=False)  # send_json 직렬화 비용
+                ops["reads"] += 1
+            await asyncio.sleep(args["interval_ms"] / 1000.0)
+
+    async def _run() -> Dict[str, Any]:
+        stop = asyncio.Event()
+        lags: List[float] = []
+        tasks = [asyncio.create_task(_probe(lags, stop))]
+        tasks += [asyncio.create_task(_client(i, stop)) for i in range(args["clients"])]
+        await asyncio.sleep(args["duration"])
+        stop.set()
+        await asyncio.gather(*tasks)
+        return {"mode": mode, "loop_lag": _percentiles(lags), **ops}
+
+    out.put(asyncio.run(_run()))
+
+
+def run_simulation(args: argparse.Namespace) -> Dict[str, Any]:
+    modes = ["sync", "async"] if args.mode == "both" else [args.mode]
+    results = []
+    ctx = mp.get_context("spawn")
+    for mode in modes:
+        with tempfile.TemporaryDirectory(prefix="rc25s_lag_bench_") as tmp:
+            sim_args = {
+                "state_path": str(Path(tmp) / "world_state.json"),
+                "backend": args.backend,
+                "clients": args.clients,
+                "duration": args.duration,
+                "interval_ms": args.interval_ms,
+                "write_ratio": args.write_ratio,
+                "stall_ms": args.stall_ms,
+                "memory_items": args.memory_items,
+            }
+            out = ctx.Queue()
+            proc = ctx.Process(target=_simulate, args=(mode, sim_args, out))
+            proc.start()
+            results.append(out.get())
+            proc.join()
+    return {
+        "backend": args.backend,
+        "clients": args.clients,
+        "duration_sec": args.duration,
+        "stall_ms": args.stall_ms,
+        "results": results,
+    }
+
+
+# ---------- 실제 서버 대상 ----------
+async def _run_live(args: argparse.Namespace) -> Dict[str, Any]:
+    try:
+        import websockets
+    except ImportError:
+        raise SystemExit("--url 모드는 websockets 패키지가 필요합니다: pip install websockets")
+
+    stop = asyncio.Event()
+    rtts: List[float] = []
+    counts = {"world_state_frames": 0}
+
+    async def _client() -> None:
+        async with websockets.connect(args.url, max_size=None) as ws:
+            await ws.send(json.dumps({"type": "handshake"}))
+            while not stop.is_set():
+                await ws.send(json.dumps({"type": "command", "command": "request_world_state"}))
+                while True:
+                    msg = json.loads(await ws.recv())
+                    if msg.get("type") in ("world_state", "world_state_delta", "error"):
+                        counts["world_state_frames"] += 1
+                        break
+                await asyncio.sleep(args.interval_ms / 1000.0)
+
+    async def _pinger() -> None:
+        # 구 버전 호환 ping → heartbeat 는 I/O 없이 바로 답하므로, 왕복 시간이 곧 서버 루프 지연이다.
+        async with websockets.connect(args.url) as ws:
+            while not stop.is_set():
+                start = time.perf_counter()
+                await ws.send(json.dumps({"message": "ping"}))
+                while json.loads(await ws.recv()).get("type") != "heartbeat":
+                    pass
+                rtts.append(time.perf_counter() - start)
+                await asyncio.sleep(0.1)
+
+    tasks = [asyncio.create_task(_client()) for _ in range(args.clients)]
+    tasks.append(asyncio.create_task(_pinger()))
+    await asyncio.sleep(args.duration)
+    stop.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return {"url": args.url, "clients": args.clients, "ping_rtt": _percentiles(rtts), **counts}
+
+
+def main(argv: list) -> int:
+    parser = argparse.ArgumentParser(description="world_state event loop lag benchmark")
+    parser.add_argument("--clients", type=int, default=50, help="동시 WebSocket 클라이언트 수")
+    parser.add_argument("--duration", type=float, default=5.0, help="측정 시간(초)")
+    parser.add_argument("--interval-ms", type=float, default=50.0, help="클라이언트별 요청 간격")
+    parser.add_argument("--mode", choices=["sync", "async", "both"], default="both")
+    parser.add_argument("--backend", choices=["json", "sqlite", "sharded"], default="json")
+    parser.add_argument("--write-ratio", type=float, default=0.2, help="요청 중 쓰기 비율")
+    parser.add_argument("--stall-ms", type=float, default=0.0, help="저장소 읽기마다 주입할 지연")
+    parser.add_argument("--memory-items", type=int, default=500, help="memory 섹션 항목 수 (상태 크기)")
+    parser.add_argument("--url", default=None, help="실행 중인 서버의 /ws/agi 주소 (지정 시 실제 접속)")
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(_run_live(args)) if args.url else run_simulation(args)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+🧲 RC25S JSON Extract Benchmark
+
+- 목적:
+  - LLM 응답에서 JSON을 꺼내는 예전 방식과 rc25s_json_extract 를 같은 응답으로 비교한다.
+    - regex : re.search(r"\\{[\\s\\S]*\\}") + json.loads  (reflection_engine / agi_autofix_loop 예전 방식)
+    - find  : find("{") / rfind("}") + json.loads     (LogRCA / app_generator 예전 방식)
+    - extract: extract_json(text)                      (한 번 훑기)
+    - stream : JSONExtractor.feed(16자 chunk)          (토큰 스트림 흉내, 객체가 닫히면 멈춤)
+  - 응답 종류 (크기는 --sizes, 기본 100KB / 500KB / 1MB):
+    - clean : ```json 펜스 + JSON 만 (예전 방식도 성공하는 경우 — 순수 속도 비교)
+    - app   : 설명 + ```json 펜스 + {"backend_code", "frontend_code", "summary"} (코드 안에 중괄호 / 따옴표 / 개행)
+              + 뒤에 {placeholder} 가 들어간 설명
+    - prose : 앞 설명에 {placeholder} 중괄호가 있는 응답 (예전 방식은 엉뚱한 범위를 잡아 실패)
+    - cut   : 생성이 중간에 잘려서 닫히지 않은 응답 (모두 실패해야 정상, 실패까지 걸리는 시간)
+  - 결과: 방식별 ms(중앙값), 성공 여부, stream 은 마지막 chunk 이후 파싱 지연과 읽지 않고 끝낸 글자 수
+
+- 사용:
+  python3 rc25s_bench_json_extract.py
+  python3 rc25s_bench_json_extract.py --sizes 100000,2000000 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT))
+
+from rc25s_json_extract import JSONExtractor, extract_json  # noqa: E402
+
+BACKEND_SNIPPET = '''@app.get("/items/{item_id}")
+def read_item(item_id: int, q: str = None):
+    data = {"id": item_id, "q": q, "tags": ["a", "b"]}
+    if not data.get("q"):
+        return {"error": "missing \\"q\\" parameter"}
+    return data
+
+'''
+FRONTEND_SNIPPET = '''export function Item({ id, title }) {
+  const style = { color: "red", margin: 4 };
+  return <div style={style} onClick={() => setOpen(!open)}>{title} #{id}</div>;
+}
+
+'''
+
+
+def _repeat_to(snippet: str, size: int) -> str:
+    return (snippet * (size // len(snippet) + 1))[:size]
+
+
+def make_payload(kind: str, size: int) -> str:
+    code = {
+        "backend_code": _repeat_to(BACKEND_SNIPPET, size // 2),
+        "frontend_code": _repeat_to(FRONTEND_SNIPPET, size // 2),
+        "summary": "Todo app with FastAPI + React",
+    }
+    body = json.dumps(code, ensure_ascii=False)
+    if kind == "clean":
+        return "```json\n" + body + "\n```"
+    if kind == "app":
+        return "Here is your app:\n```json\n" + body + "\n```\nReplace {API_URL} and {TOKEN} before deploying."
+    if kind == "prose":
+        return "Set {API_URL} in .env first, then use this:\n```json\n" + body + "\n```\nDone {ok}."
+    if kind == "cut":
+        return "Here is your app:\n```json\n" + body[: int(len(body) * 0.9)]
+    raise ValueError(kind)
+
+
+def old_regex(text: str) -> Optional[Any]:
+    text = re.sub(r"[\u200B-\u200D\uFEFF]", "", text)
+    text = re.sub(r"```[a-zA-Z]*", "", text).replace("```", "").strip()
+    match = re.search(r"\{[\s\S]*\}", text)
+    if not match:
+        return None
+    try:
+        return json.loads(match.group(0))
+    except ValueError:
+        return None
+
+
+def old_find(text: str) -> Optional[Any]:
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end == -1 or end <= start:
+        return None
+    try:
+        return json.loads(text[start : end + 1])
+    except ValueError:
+        return None
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    samples, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    return {"ms": round(statistics.median(samples) * 1000, 3), "ok": isinstance(result, dict) and "backend_code" in result}
+
+
+def _stream(text: str, chunk: int, repeat: int) -> Dict[str, Any]:
+    totals, tails, unread, ok = [], [], 0, False
+    for _ in range(repeat):
+        extractor = JSONExtractor()
+        start = time.perf_counter()
+        last = 0.0
+        consumed = 0
+        for i in range(0, len(text), chunk):
+            t = time.perf_counter()
+            extractor.feed(text[i : i + chunk])
+            last = time.perf_counter() - t
+            consumed = i + chunk
+            if extractor.done:
+                break
+        totals.append(time.perf_counter() - start)
+        tails.append(last)
+        unread = max(0, len(text) - consumed)
+        ok = isinstance(extractor.value, dict) and "backend_code" in extractor.value
+    return {
+        "ms": round(statistics.median(totals) * 1000, 3),
+        "ok": ok,
+        "last_chunk_ms": round(statistics.median(tails) * 1000, 3),
+        "unread_chars": unread,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="100000,500000,1000000", help="응답 크기 (글자, 쉼표 구분)")
+    parser.add_argument("--kinds", default="clean,app,prose,cut")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--chunk", type=int, default=16, help="stream 모드 chunk 크기 (글자)")
+    args = parser.parse_args()
+
+    for kind in args.kinds.split(","):
+        for size in [int(s) for s in args.sizes.split(",")]:
+            text = make_payload(kind, size)
+            result: Dict[str, Any] = {"kind": kind, "chars": len(text)}
+            result["regex"] = _time(lambda: old_regex(text), args.repeat)
+            result["find"] = _time(lambda: old_find(text), args.repeat)
+            result["extract"] = _time(lambda: extract_json(text), args.repeat)
+            result["stream"] = _stream(text, args.chunk, max(1, args.repeat // 2))
+            print(json.dumps(result, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+🧭 RC25S LLM Router Benchmark
+
+- 목적:
+  - llm_router 를 실제 Ollama / free_llm_server 대신 로컬 stand-in 서버(rc25s_llm_standin)에 붙여,
+    지연 분포와 에러율을 주입한 상태에서 hedging / circuit breaker 효과를 잰다.
+  - stand-in 이 /api/generate (Ollama)와 /generate (free_llm_server)를 둘 다 흉내 낸다 (provider마다 하나씩).
+  - 지연 분포: "확률:초" 목록 (예: "0.96:0.1,0.04:2.0" → 96%는 0.1초, 4%는 2초, 각 ±10% 흔들림)
+  - 시나리오:
+    - tail:   1순위(ollama)가 가끔 아주 느림 → hedge 끔 / 켬 비교 (p50 / p95 / p99, hedge 횟수)
+    - outage: 1순위가 전부 500 → circuit breaker가 열린 뒤에는 1순위를 건너뛰고 바로 2순위로 간다
+
+- 사용:
+  python3 rc25s_bench_llm_router.py
+  python3 rc25s_bench_llm_router.py --requests 300 --primary "0.95:0.05,0.05:3" --backup "1:0.2"
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT))
+
+import llm_router  # noqa: E402
+from rc25s_llm_standin import StandInConfig, serve_in_thread, stop_server  # noqa: E402
+
+
+def _stand_in(distribution: str, error_rate: float = 0.0, seed: int = 0):
+    """지연 분포 / 에러율을 주입한 rc25s_llm_standin → (server, provider base url)."""
+    config = StandInConfig(ttfb=distribution, rate="1:1000000", completion_tokens="1:2", error_rate=error_rate, seed=seed)
+    server, base_url = serve_in_thread(config)
+    return server, base_url[: -len("/v1")]
+
+
+def _summary(latencies: List[float]) -> Dict[str, Any]:
+    data = sorted(latencies)
+    if not data:
+        return {"count": 0}
+
+    def pick(q: float) -> float:
+        return round(data[min(len(data) - 1, int(q * len(data)))] * 1000, 1)
+
+    return {"count": len(data), "p50_ms": pick(0.50), "p95_ms": pick(0.95), "p99_ms": pick(0.99), "max_ms": round(data[-1] * 1000, 1)}
+
+
+def _run(router: llm_router.LLMRouter, caller: str, requests_n: int, concurrency: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    winners: Dict[str, int] = {}
+    errors = 0
+    lock = threading.Lock()
+
+    def one(i: int) -> None:
+        nonlocal errors
+        start = time.perf_counter()
+        try:
+            result = router.route(f"bench #{i}", caller=caller)
+        except llm_router.ProviderError:
+            with lock:
+                errors += 1
+            return
+        with lock:
+            latencies.append(time.perf_counter() - start)
+            winners[result.provider] = winners.get(result.provider, 0) + 1
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(requests_n)))
+    return {"latency": _summary(latencies), "winners": winners, "errors": errors}
+
+
+def _router(primary_url: str, backup_url: str, hedge: bool) -> llm_router.LLMRouter:
+    providers = {
+        "ollama": llm_router.OllamaProvider("qwen2.5:7b-instruct", base_url=primary_url),
+        "free_llm": llm_router.FreeLLMProvider(url=backup_url + "/generate"),
+    }
+    policy = {"providers": ["ollama", "free_llm"], "order": "policy", "hedge": hedge, "hedge_after": 0.5, "timeout": 10.0}
+    return llm_router.LLMRouter(providers=providers, policies={"bench": policy})
+
+
+def scenario_tail(args) -> List[Dict[str, Any]]:
+    out = []
+    for hedge in (False, True):
+        primary, primary_url = _stand_in(args.primary, seed=1)
+        backup, backup_url = _stand_in(args.backup, seed=2)
+        router = _router(primary_url, backup_url, hedge)
+        _run(router, "bench", 30, args.concurrency)  # p95 기록 워밍업
+        result = _run(router, "bench", args.requests, args.concurrency)
+        stats = router.stats()
+        result.update(
+            scenario="tail",
+            hedge=hedge,
+            hedged=stats.get("hedged", 0),
+            hedge_wins=stats.get("hedge_wins", 0),
+            primary_p95_ms=round((stats["providers"]["ollama"]["p95"] or 0) * 1000, 1),
+        )
+        out.append(result)
+        stop_server(primary)
+        stop_server(backup)
+    return out
+
+
+def scenario_outage(args) -> Dict[str, Any]:
+    primary, primary_url = _stand_in("1:0.05", error_rate=1.0, seed=3)
+    backup, backup_url = _stand_in(args.backup, seed=4)
+    router = _router(primary_url, backup_url, hedge=True)
+    result = _run(router, "bench", args.requests, 1)
+    stats = router.stats()
+    result.update(
+        scenario="outage",
+        primary_state=stats["providers"]["ollama"]["state"],
+        primary_calls=stats["providers"]["ollama"]["calls"],
+        failovers=stats.get("failovers", 0),
+    )
+    stop_server(primary)
+    stop_server(backup)
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--primary", default="0.96:0.1,0.04:2.0", help="1순위(ollama) 지연 분포")
+    parser.add_argument("--backup", default="1:0.3", help="2순위(free_llm) 지연 분포")
+    parser.add_argument("--scenario", choices=["all", "tail", "outage"], default="all")
+    args = parser.parse_args()
+
+    if args.scenario in ("all", "tail"):
+        for result in scenario_tail(args):
+            print(json.dumps(result, ensure_ascii=False))
+    if args.scenario in ("all", "outage"):
+        print(json.dumps(scenario_outage(args), ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
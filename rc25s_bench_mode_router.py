@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+🧭 RC25S Mode Router Benchmark
+
+- 목적:
+  - RC25SKernel.detect_mode 예전 방식과 컴파일된 ModeRouter 를 긴 prompt(기본 10,000자)로 비교한다.
+    - naive      : mode마다 any(k in prompt) (예전 detect_mode, first-match — 키워드 수만큼 prompt를 다시 훑는다)
+    - naive_best : 키워드마다 prompt.count(k) 로 모든 mode 점수 (예전 방식으로 best-match를 하면)
+    - automaton  : rc25s_keyword_automaton.KeywordAutomaton.count (순수 파이썬 Aho–Corasick, 참고용)
+    - router     : ModeRouter.detect (routing 표를 정규식 하나로 컴파일, 한 번 훑어서 모든 mode 점수)
+  - prompt 종류:
+    - none  : 키워드가 하나도 없다 (AUTO — 예전 방식은 모든 키워드로 끝까지 훑는다)
+    - late  : 키워드가 prompt 끝 쪽에 한 번 (예전 방식도 뒤쪽 mode까지 가야 찾는다)
+    - dense : 여러 mode 키워드가 섞여 있다 (first-match 와 best-match 결과가 다를 수 있다)
+  - 결과: 방식별 µs(중앙값)와 고른 mode, 그리고 detect_batch 처리량(prompt/s, 같은 best-match 인 naive_best 와 비교)
+
+- 사용:
+  python3 rc25s_bench_mode_router.py
+  python3 rc25s_bench_mode_router.py --chars 10000,100000 --repeat 200 --batch 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT))
+
+from rc25_kernel_RC25S import DEFAULT_ROUTING, ModeRouter  # noqa: E402
+from rc25s_keyword_automaton import KeywordAutomaton  # noqa: E402
+
+# 키워드가 아닌 대시보드 / 로그 어휘 (키워드 첫 글자와 겹치는 음절도 섞여 있다)
+FILLER = (
+    "서버 배포 상태 점검 다시 요청 사용자 데이터 처리 결과 확인 모듈 테스트 실행 환경 변수 설정 파일 경로 "
+    "로그 메시지 이벤트 연결 세션 작업 대기 완료 시작 종료 응답 지연 재시도 캐시 갱신 "
+    "request handler timeout retry queue worker"
+).split()
+
+
+def make_prompt(kind: str, chars: int, rng: random.Random) -> str:
+    words = []
+    size = 0
+    while size < chars:
+        word = rng.choice(FILLER)
+        words.append(word)
+        size += len(word) + 1
+    if kind == "late":
+        words.insert(len(words) - 5, "예산")
+    elif kind == "dense":
+        keywords = [k for ks in DEFAULT_ROUTING.values() for k in ks]
+        for _ in range(max(1, len(words) // 20)):
+            words.insert(rng.randrange(len(words)), rng.choice(keywords))
+    elif kind != "none":
+        raise ValueError(kind)
+    return " ".join(words)
+
+
+def naive(prompt: str) -> str:
+    for mode, keywords in DEFAULT_ROUTING.items():
+        if any(k in prompt for k in keywords):
+            return mode
+    return "AUTO"
+
+
+def naive_best(prompt: str) -> str:
+    best, best_score = "AUTO", 0
+    for mode, keywords in DEFAULT_ROUTING.items():
+        score = sum(prompt.count(k) for k in keywords)
+        if score > best_score:
+            best, best_score = mode, score
+    return best
+
+
+_automaton = KeywordAutomaton([(k, mode) for mode, ks in DEFAULT_ROUTING.items() for k in ks])
+
+
+def automaton(prompt: str) -> str:
+    counts = _automaton.count(prompt)
+    best, best_score = "AUTO", 0
+    for mode in DEFAULT_ROUTING:
+        if counts.get(mode, 0) > best_score:
+            best, best_score = mode, counts[mode]
+    return best
+
+
+def _time(fn: Callable[[str], str], prompt: str, repeat: int) -> Dict[str, Any]:
+    samples = []
+    mode = ""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        mode = fn(prompt)
+        samples.append(time.perf_counter() - start)
+    return {"us": round(statistics.median(samples) * 1e6, 1), "mode": mode}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chars", default="10000", help="prompt 길이 (글자, 쉼표 구분)")
+    parser.add_argument("--kinds", default="none,late,dense")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=1000, help="detect_batch 처리량 측정용 prompt 수")
+    parser.add_argument("--seed", type=int, default=25)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    router = ModeRouter(config_path=None)
+    for chars in [int(c) for c in args.chars.split(",")]:
+        for kind in args.kinds.split(","):
+            prompt = make_prompt(kind, chars, rng)
+            result: Dict[str, Any] = {"kind": kind, "chars": len(prompt)}
+            result["naive"] = _time(naive, prompt, args.repeat)
+            result["naive_best"] = _time(naive_best, prompt, args.repeat)
+            result["automaton"] = _time(automaton, prompt, max(1, args.repeat // 4))
+            result["router"] = _time(router.detect, prompt, args.repeat)
+            print(json.dumps(result, ensure_ascii=False))
+
+        prompts = [make_prompt(rng.choice(["none", "late", "dense"]), chars, rng) for _ in range(args.batch)]
+        start = time.perf_counter()
+        for prompt in prompts:
+            naive_best(prompt)
+        naive_s = time.perf_counter() - start
+        start = time.perf_counter()
+        router.detect_batch(prompts)
+        router_s = time.perf_counter() - start
+        print(json.dumps({
+            "batch": len(prompts),
+            "chars": chars,
+            "naive_best_prompts_per_s": round(len(prompts) / naive_s),
+            "router_prompts_per_s": round(len(prompts) / router_s),
+        }))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
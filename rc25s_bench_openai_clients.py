@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+🔌 RC25S OpenAI Client Benchmark
+
+- 목적:
+  - 호출마다 키 파일을 읽고 OpenAI()를 새로 만드는 예전 방식(fresh)과
+    rc25s_openai_clients 공용 클라이언트(pooled, keep-alive)의 호출당 지연 차이를 잰다.
+  - 지연 없는 로컬 OpenAI 호환 stand-in 서버(rc25s_llm_standin, /v1/chat/completions)를 띄워서 측정한다.
+    openssl 이 있으면 자체 서명 인증서로 HTTPS (TLS 핸드셰이크 비용 포함), 없으면 HTTP.
+  - 모드:
+    - openai: fresh OpenAI() vs get_openai_client() (openai 패키지 필요)
+    - raw:    호출마다 새 HTTPSConnection vs keep-alive 커넥션 1개 (표준 라이브러리만, TLS + TCP 비용만)
+
+- 사용:
+  python3 rc25s_bench_openai_clients.py                 # 가능한 모드 모두, 200회
+  python3 rc25s_bench_openai_clients.py --mode raw --calls 500
+  python3 rc25s_bench_openai_clients.py --no-tls        # TLS 없이 (클라이언트 생성 비용만)
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import shutil
+import ssl
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT))
+
+from rc25s_llm_standin import StandInConfig, serve_in_thread, stop_server  # noqa: E402
+
+
+def _make_cert(workdir: Path) -> Optional[Tuple[Path, Path]]:
+    openssl = shutil.which("openssl")
+    if not openssl:
+        return None
+    cert, key = workdir / "cert.pem", workdir / "key.pem"
+    subprocess.run(
+        [
+            openssl, "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+            "-keyout", str(key), "-out", str(cert),
+            "-subj", "/CN=127.0.0.1", "-addext", "subjectAltName=IP:127.0.0.1",
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return cert, key
+
+
+def _start_server(workdir: Path, tls: bool):
+    pair = _make_cert(workdir) if tls else None
+    cert, key = pair if pair is not None else (None, None)
+    # 응답은 토큰 1개짜리 합성 텍스트, 지연 0 — 클라이언트 생성 / 연결 비용만 남는다.
+    server, base_url = serve_in_thread(
+        StandInConfig(ttfb="1:0", rate="1:1000000", completion_tokens="1:1"),
+        ssl_certfile=str(cert) if cert else None,
+        ssl_keyfile=str(key) if key else None,
+    )
+    port = int(base_url.rsplit(":", 1)[1].split("/", 1)[0])
+    return server, port, cert
+
+
+def _measure(fn: Callable[[], Any], calls: int) -> Dict[str, Any]:
+    fn()  # 워밍업 (import, 첫 연결)
+    samples: List[float] = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    data = sorted(samples)
+    return {
+        "calls": calls,
+        "mean_ms": round(sum(data) / len(data) * 1000, 3),
+        "p50_ms": round(data[len(data) // 2] * 1000, 3),
+        "p95_ms": round(data[min(len(data) - 1, int(0.95 * len(data)))] * 1000, 3),
+    }
+
+
+def _compare(name: str, fresh: Dict[str, Any], pooled: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "mode": name,
+        "fresh": fresh,
+        "pooled": pooled,
+        "saving_per_call_ms": round(fresh["mean_ms"] - pooled["mean_ms"], 3),
+    }
+
+
+def bench_raw(port: int, cert: Optional[Path], calls: int) -> Dict[str, Any]:
+    payload = json.dumps({"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "ping"}]}).encode()
+    headers = {"Content-Type": "application/json", "Authorization": "Bearer sk-bench"}
+
+    def connect(context: Optional[ssl.SSLContext]):
+        if cert is None:
+            return http.client.HTTPConnection("127.0.0.1", port)
+        return http.client.HTTPSConnection("127.0.0.1", port, context=context)
+
+    def post(conn) -> None:
+        conn.request("POST", "/v1/chat/completions", body=payload, headers=headers)
+        conn.getresponse().read()
+
+    def fresh() -> None:
+        context = ssl.create_default_context(cafile=str(cert)) if cert is not None else None
+        conn = connect(context)
+        post(conn)
+        conn.close()
+
+    shared = connect(ssl.create_default_context(cafile=str(cert)) if cert is not None else None)
+    try:
+        return _compare("raw", _measure(fresh, calls), _measure(lambda: post(shared), calls))
+    finally:
+        shared.close()
+
+
+def bench_openai(port: int, cert: Optional[Path], calls: int, key_file: Path) -> Dict[str, Any]:
+    scheme = "https" if cert is not None else "http"
+    os.environ["OPENAI_BASE_URL"] = f"{scheme}://127.0.0.1:{port}/v1"
+    if cert is not None:
+        os.environ["SSL_CERT_FILE"] = str(cert)  # httpx 가 신뢰할 CA
+    os.environ["RC25S_OPENAI_KEY_FILE"] = str(key_file)
+    from openai import OpenAI
+
+    import rc25s_openai_clients
+
+    messages = [{"role": "user", "content": "ping"}]
+
+    def fresh() -> None:
+        # 예전 _get_openai_client(): 매번 키 파일을 읽고 클라이언트를 새로 만든다.
+        api_key = key_file.read_text().strip()
+        client = OpenAI(api_key=api_key)
+        client.chat.completions.create(model="gpt-4o-mini", messages=messages)
+        client.close()
+
+    def pooled() -> None:
+        rc25s_openai_clients.get_openai_client().chat.completions.create(model="gpt-4o-mini", messages=messages)
+
+    result = _compare("openai", _measure(fresh, calls), _measure(pooled, calls))
+    result["client_stats"] = rc25s_openai_clients.stats()
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["all", "openai", "raw"], default="all")
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--no-tls", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="rc25s-bench-openai-") as tmp:
+        workdir = Path(tmp)
+        key_file = workdir / "openai_api_key.txt"
+        key_file.write_text("sk-bench\n")
+        server, port, cert = _start_server(workdir, tls=not args.no_tls)
+        print(f"stand-in server: {'https' if cert else 'http'}://127.0.0.1:{port}/v1/chat/completions")
+        results = []
+        try:
+            if args.mode in ("all", "raw"):
+                results.append(bench_raw(port, cert, args.calls))
+            if args.mode in ("all", "openai"):
+                try:
+                    results.append(bench_openai(port, cert, args.calls, key_file))
+                except ImportError as e:
+                    print(f"openai 모드 건너뜀: {e}")
+        finally:
+            stop_server(server)
+        for result in results:
+            print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+🏋️ RC25S world_state Stress Benchmark
+
+- 목적:
+  - 여러 writer 프로세스(각각 여러 스레드)가 동시에 world_state를 갱신할 때
+    잃어버리는 갱신(lost update)이 없는지, 초당 몇 건을 처리하는지 측정한다.
+  - 모드:
+    - sections: world_state의 섹션 갱신 API 사용 (잠금 + 병합 커밋)
+    - legacy:   load_world_state() → 수정 → save_world_state() (기존 패턴, 비교용)
+
+- 사용:
+  python3 rc25s_bench_world_state.py --writers 4 --threads 4 --updates 100
+  python3 rc25s_bench_world_state.py --backend sqlite
+  python3 rc25s_bench_world_state.py --backend sharded
+  python3 rc25s_bench_world_state.py --mode legacy
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+ROOT = Path(__file__).resolve().parent
+
+
+def _writer(worker_id: int, args: Dict[str, Any], out: "mp.Queue") -> None:
+    # 자식 프로세스에서 환경변수를 먼저 잡고 world_state를 import 해야 설정이 반영된다.
+    os.environ["RC25S_WORLD_STATE_PATH"] = args["state_path"]
+    os.environ["RC25S_WORLD_STATE_BACKEND"] = args["backend"]
+    os.environ["RC25S_WORLD_STATE_COALESCE_MS"] = str(args["coalesce_ms"])
+    sys.path.insert(0, str(ROOT))
+    import world_state
+
+    def _run_thread(thread_id: int) -> None:
+        key = f"w{worker_id}_t{thread_id}"
+        for _ in range(args["updates"]):
+            if args["mode"] == "legacy":
+                state = world_state.load_world_state(mutable=True)
+                counters = state.setdefault("bench_counters", {})
+                counters[key] = counters.get(key, 0) + 1
+                world_state.save_world_state(state)
+            else:
+
+                def _inc(current: Dict[str, Any]) -> Dict[str, Any]:
+                    counters = dict(current.get("bench_counters") or {})
+                    counters[key] = counters.get(key, 0) + 1
+                    return {"bench_counters": counters}
+
+                world_state._mutate_sections(["bench_counters"], _inc)
+
+    threads = [threading.Thread(target=_run_thread, args=(t,)) for t in range(args["threads"])]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    committer = getattr(world_state.get_store(), "committer", None)
+    out.put({"worker": worker_id, "commits": committer.commits if committer else None})
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix="rc25s_ws_bench_") as tmp:
+        worker_args = {
+            "state_path": str(Path(tmp) / "world_state.json"),
+            "backend": args.backend,
+            "coalesce_ms": args.coalesce_ms,
+            "mode": args.mode,
+            "threads": args.threads,
+            "updates": args.updates,
+        }
+        ctx = mp.get_context("spawn")
+        out = ctx.Queue()
+        procs = [ctx.Process(target=_writer, args=(i, worker_args, out)) for i in range(args.writers)]
+
+        start = time.perf_counter()
+        for p in procs:
+            p.start()
+        reports = [out.get() for _ in procs]
+        for p in procs:
+            p.join()
+        elapsed = time.perf_counter() - start
+
+        os.environ["RC25S_WORLD_STATE_PATH"] = worker_args["state_path"]
+        os.environ["RC25S_WORLD_STATE_BACKEND"] = args.backend
+        sys.path.insert(0, str(ROOT))
+        import world_state
+
+        counters = world_state.load_section("bench_counters") or {}
+        expected = args.writers * args.threads * args.updates
+        applied = sum(int(v) for v in counters.values())
+        commits = [r["commits"] for r in reports if r["commits"] is not None]
+
+    return {
+        "backend": args.backend,
+        "mode": args.mode,
+        "writers": args.writers,
+        "threads_per_writer": args.threads,
+        "coalesce_ms": args.coalesce_ms,
+        "expected_updates": expected,
+        "applied_updates": applied,
+        "lost_updates": expected - applied,
+        "physical_commits": sum(commits) if commits else None,
+        "elapsed_sec": round(elapsed, 3),
+        "updates_per_sec": round(expected / elapsed, 1) if elapsed else None,
+    }
+
+
+def main(argv: list) -> int:
+    parser = argparse.ArgumentParser(description="world_state concurrent writer stress benchmark")
+    parser.add_argument("--writers", type=int, default=4, help="writer 프로세스 수")
+    parser.add_argument("--threads", type=int, default=4, help="프로세스당 writer 스레드 수")
+    parser.add_argument("--updates", type=int, default=50, help="스레드당 갱신 횟수")
+    parser.add_argument("--backend", choices=["json", "sqlite", "sharded"], default="json")
+    parser.add_argument("--mode", choices=["sections", "legacy"], default="sections")
+    parser.add_argument("--coalesce-ms", type=float, default=10.0)
+    args = parser.parse_args(argv)
+
+    result = run_benchmark(args)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0 if result["lost_updates"] == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -1,8 +1,8 @@
 from fastapi import FastAPI, WebSocket, Request
 from fastapi.middleware.cors import CORSMiddleware
-import psutil, datetime, subprocess, os, json
+import asyncio, psutil, datetime, json
 
-from vibecoding.rc25s_openai_wrapper import rc25s_chat
+from vibecoding.llm_router import ProviderError, get_router
 
 app = FastAPI()
 app.add_middleware(
@@ -14,7 +14,8 @@ app.add_middleware(
 @app.get("/health")
 def health():
     return {"status":"ok","model":"RC25S","cpu":psutil.cpu_percent(interval=None),
-            "memory":psutil.virtual_memory().percent,"time":datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+            "memory":psutil.virtual_memory().percent,"time":datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "llm_router":get_router().stats()}
 
 @app.post("/llm")
 async def llm(req: Request):
@@ -22,22 +23,13 @@ async def llm(req: Request):
     prompt = data.get("prompt", "")
     provider = data.get("provider", "local")
 
-    if provider == "local":
-        cmd = ["ollama", "run", "qwen2.5:7b-instruct", prompt]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        output = (result.stdout or "").strip()
-        if not output:
-            output = "⚠️ 모델이 응답하지 않았습니다. 입력을 조금 더 구체적으로 작성해보세요."
-        return {"provider": "qwen2.5", "output": output}
-
-    else:
-        import openai
-        openai.api_key = os.getenv("OPENAI_API_KEY")
-        completion = openai.ChatCompletion.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}]
-        )
-        return {"provider": "openai", "output": completion.choices[0].message.content}
+    # local: Ollama(qwen → phi) / free_llm_server, openai: OpenAI 우선 — llm_router가 지연/상태를 보고 고르고 느리면 hedge 한다.
+    caller = "agi_status_dashboard" if provider == "local" else "agi_status_dashboard_openai"
+    try:
+        result = await asyncio.to_thread(get_router().route, prompt, caller)
+    except ProviderError:
+        return {"provider": provider, "output": "⚠️ 모델이 응답하지 않았습니다. 입력을 조금 더 구체적으로 작성해보세요."}
+    return {"provider": result.provider, "output": result.text.strip(), "latency": result.latency, "hedged": result.hedged}
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+📜 RC25S Segmented Event Log
+
+last_actions / failures_learned / rca_history / log_rules 처럼 "계속 쌓이기만 하는" 기록을
+world_state 전체를 다시 쓰지 않고 보관하기 위한 append-only JSONL 로그.
+
+- 디렉터리 하나 = 스트림 하나
+  - <첫 seq 12자리>.jsonl: 세그먼트 (한 줄 = {"seq", "t", "data"})
+  - <첫 seq 12자리>.idx:   희소 인덱스 (INDEX_EVERY개마다 [seq, t, 바이트 오프셋])
+- append: 활성 세그먼트 끝에 한 줄 추가 (O(1)). 세그먼트가 segment_bytes를 넘으면 새 세그먼트를 열고,
+  max_segments를 넘은 가장 오래된 세그먼트는 삭제한다 (디스크 사용량 상한).
+- tail(n): 최신 세그먼트 끝에서부터 거꾸로 n줄만 읽는다.
+- range(start, end) / at_or_before(t): 세그먼트의 첫/마지막 시각으로 걸러낸 뒤,
+  희소 인덱스로 시작 위치로 바로 seek 한다. (기록 시각 t는 추가 순서대로 증가한다고 가정한다.)
+- read_seqs(first, last): seq 범위 읽기 (세그먼트 파일 이름 = 첫 seq 이므로 바로 찾아간다).
+- 여러 프로세스의 append는 <디렉터리>/.lock fcntl 잠금으로 직렬화한다.
+
+환경변수:
+- RC25S_EVENT_LOG_SEGMENT_BYTES (기본 4MB)
+- RC25S_EVENT_LOG_MAX_SEGMENTS  (기본 64 → 스트림당 최대 약 256MB)
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from world_state_store import file_lock, iter_lines_reverse
+
+SEGMENT_BYTES = int(os.getenv("RC25S_EVENT_LOG_SEGMENT_BYTES", str(4 * 1024 * 1024)))
+MAX_SEGMENTS = int(os.getenv("RC25S_EVENT_LOG_MAX_SEGMENTS", "64"))
+# 몇 개의 기록마다 인덱스 항목을 하나 남길지
+INDEX_EVERY = 64
+
+Entry = Dict[str, Any]
+
+
+def _to_epoch(value: Any) -> Optional[float]:
+    """epoch 초 / ISO8601 문자열 / datetime 을 epoch 초로 바꾼다. 해석할 수 없으면 None."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.timestamp()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+class SegmentedEventLog:
+    """스트림 하나를 담당하는 append-only 세그먼트 로그."""
+
+    def __init__(self, directory: Path, segment_bytes: int = SEGMENT_BYTES, max_segments: int = MAX_SEGMENTS):
+        self.directory = Path(directory)
+        self.segment_bytes = segment_bytes
+        self.max_segments = max(1, max_segments)
+        self.lock_path = self.directory / ".lock"
+        self._local_lock = threading.Lock()
+        # (세그먼트 경로, 파일 크기, 마지막 seq): 크기가 그대로면 마지막 줄을 다시 읽지 않는다.
+        self._head: Optional[Tuple[Path, int, int]] = None
+
+    # ---------- 세그먼트 ----------
+    def segments(self) -> List[Path]:
+        """오래된 것부터 정렬된 세그먼트 목록."""
+        if not self.directory.exists():
+            return []
+        return sorted(self.directory.glob("*.jsonl"))
+
+    @staticmethod
+    def _index_path(segment: Path) -> Path:
+        return segment.with_suffix(".idx")
+
+    @staticmethod
+    def _first_seq(segment: Path) -> int:
+        return int(segment.stem)
+
+    @staticmethod
+    def _last_entry(segment: Path) -> Optional[Entry]:
+        for line in iter_lines_reverse(segment):
+            try:
+                return json.loads(line)
+            except ValueError:
+                continue  # 비정상 종료로 잘린 마지막 줄
+        return None
+
+    @staticmethod
+    def _first_entry(segment: Path) -> Optional[Entry]:
+        with open(segment, "rb") as f:
+            for line in f:
+                try:
+                    return json.loads(line)
+                except ValueError:
+                    continue
+        return None
+
+    def _last_seq(self, segments: List[Path]) -> int:
+        """잠금 안에서 호출: 마지막으로 기록된 seq (없으면 0)."""
+        if not segments:
+            return 0
+        active = segments[-1]
+        size = active.stat().st_size
+        if self._head is not None and self._head[0] == active and self._head[1] == size:
+            return self._head[2]
+        entry = self._last_entry(active)
+        return int(entry["seq"]) if entry else self._first_seq(active) - 1
+
+    # ---------- 쓰기 ----------
+    def append(self, record: Any, ts: Any = None) -> int:
+        """기록 하나를 추가하고 seq를 돌려준다."""
+        return self.append_many([record], ts=ts)[-1]
+
+    def append_many(self, records: Iterable[Any], ts: Any = None) -> List[int]:
+        """
+        여러 기록을 한 번의 잠금/쓰기로 추가한다.
+        - ts: 기록 시각 (epoch/ISO8601). 없으면 현재 시각.
+        """
+        records = list(records)
+        if not records:
+            return []
+        t = _to_epoch(ts)
+        if t is None:
+            t = time.time()
+        seqs: List[int] = []
+        with self._local_lock, file_lock(self.lock_path):
+            segments = self.segments()
+            seq = self._last_seq(segments)
+            active = segments[-1] if segments else None
+            offset = active.stat().st_size if active else 0
+            f = open(active, "ab") if active else None
+            idx = open(self._index_path(active), "a", encoding="utf-8") if active else None
+            try:
+                for record in records:
+                    seq += 1
+                    if f is None or offset >= self.segment_bytes:
+                        if f is not None:
+                            f.close()
+                            idx.close()
+                        active = self.directory / f"{seq:012d}.jsonl"
+                        active.parent.mkdir(parents=True, exist_ok=True)
+                        f = open(active, "ab")
+                        idx = open(self._index_path(active), "a", encoding="utf-8")
+                        offset = 0
+                        segments.append(active)
+                    line = (json.dumps({"seq": seq, "t": t, "data": record}, ensure_ascii=False) + "\n").encode("utf-8")
+                    if offset == 0 or seq % INDEX_EVERY == 0:
+                        idx.write(json.dumps([seq, t, offset]) + "\n")
+                    f.write(line)
+                    offset += len(line)
+                    seqs.append(seq)
+                f.flush()
+                idx.flush()
+            finally:
+                if f is not None:
+                    f.close()
+                    idx.close()
+            self._head = (active, offset, seq)
+            for old in segments[: max(0, len(segments) - self.max_segments)]:
+                for path in (old, self._index_path(old)):
+                    try:
+                        path.unlink()
+                    except FileNotFoundError:
+                        pass
+        return seqs
+
+    # ---------- 읽기 ----------
+    def last_seq(self) -> int:
+        """마지막 seq = 지금까지 추가된 기록 수 (오래된 세그먼트가 지워져도 줄지 않는다)."""
+        segments = self.segments()
+        if not segments:
+            return 0
+        entry = self._last_entry(segments[-1])
+        return int(entry["seq"]) if entry else self._first_seq(segments[-1]) - 1
+
+    def tail(self, n: int) -> List[Entry]:
+        """최근 n개 기록 (오래된 것 → 최신 순)."""
+        if n <= 0:
+            return []
+        out: List[Entry] = []
+        for segment in reversed(self.segments()):
+            try:
+                for line in iter_lines_reverse(segment):
+                    try:
+                        out.append(json.loads(line))
+                    except ValueError:
+                        continue
+                    if len(out) >= n:
+                        return out[::-1]
+            except FileNotFoundError:
+                continue  # 읽는 사이 보존 한도로 삭제됨
+        return out[::-1]
+
+    def _load_index(self, segment: Path) -> List[List[Any]]:
+        try:
+            with open(self._index_path(segment), encoding="utf-8") as f:
+                return [json.loads(line) for line in f if line.strip()]
+        except (FileNotFoundError, ValueError):
+            return []
+
+    def _scan(self, segment: Path, offset: int) -> Iterator[Entry]:
+        with open(segment, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    def range(self, start: Any = None, end: Any = None, limit: Optional[int] = None) -> List[Entry]:
+        """start <= t <= end 인 기록 (오래된 것 → 최신 순). start/end는 epoch 또는 ISO8601."""
+        t0, t1 = _to_epoch(start), _to_epoch(end)
+        segments = self.segments()
+        out: List[Entry] = []
+        for i, segment in enumerate(segments):
+            try:
+                if t0 is not None:
+                    last = self._last_entry(segment)
+                    if last is None or float(last["t"]) < t0:
+                        continue
+                if t1 is not None:
+                    first = self._first_entry(segment)
+                    if first is None or float(first["t"]) > t1:
+                        break
+                offset = 0
+                if t0 is not None:
+                    index = self._load_index(segment)
+                    # t0보다 엄격히 이른 마지막 인덱스 지점부터 읽기 시작한다.
+                    pos = bisect.bisect_left([e[1] for e in index], t0) - 1
+                    if pos >= 0:
+                        offset = int(index[pos][2])
+                for entry in self._scan(segment, offset):
+                    t = float(entry["t"])
+                    if t0 is not None and t < t0:
+                        continue
+                    if t1 is not None and t > t1:
+                        return out
+                    out.append(entry)
+                    if limit is not None and len(out) >= limit:
+                        return out
+            except FileNotFoundError:
+                continue
+        return out
+
+    def read_seqs(self, first: int, last: int) -> List[Entry]:
+        """first <= seq <= last 인 기록. 세그먼트 파일 이름(첫 seq)과 인덱스로 바로 찾아간다."""
+        segments = self.segments()
+        starts = [self._first_seq(p) for p in segments]
+        begin = max(0, bisect.bisect_right(starts, first) - 1)
+        out: List[Entry] = []
+        for segment in segments[begin:]:
+            if self._first_seq(segment) > last:
+                break
+            index = self._load_index(segment)
+            pos = bisect.bisect_right([e[0] for e in index], first) - 1
+            offset = int(index[pos][2]) if pos >= 0 else 0
+            try:
+                for entry in self._scan(segment, offset):
+                    seq = int(entry["seq"])
+                    if seq < first:
+                        continue
+                    if seq > last:
+                        return out
+                    out.append(entry)
+            except FileNotFoundError:
+                continue
+        return out
+
+    def at_or_before(self, ts: Any) -> Optional[Entry]:
+        """시각 ts 이전(포함)의 마지막 기록. 없으면 None."""
+        t = _to_epoch(ts)
+        if t is None:
+            raise ValueError(f"Invalid timestamp: {ts!r}")
+        for segment in reversed(self.segments()):
+            try:
+                first = self._first_entry(segment)
+                if first is None or float(first["t"]) > t:
+                    continue
+                index = self._load_index(segment)
+                pos = bisect.bisect_right([e[1] for e in index], t) - 1
+                found = None
+                for entry in self._scan(segment, int(index[pos][2]) if pos >= 0 else 0):
+                    if float(entry["t"]) > t:
+                        break
+                    found = entry
+                return found
+            except FileNotFoundError:
+                continue
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        segments = self.segments()
+        return {
+            "segments": len(segments),
+            "bytes": sum(p.stat().st_size for p in segments if p.exists()),
+            "last_seq": self.last_seq(),
+        }
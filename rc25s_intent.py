@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+⚡ RC25S Intent Fast-Path
+
+/ws/agi free_text 메시지 중 뻔한 대시보드 명령("플래너 실행", "셀프체크 돌려줘", "서버 상태 알려줘")을
+LLM 왕복 없이 바로 처리하기 위한 로컬 intent 분류기.
+
+- RC25SKernel.detect_mode 식 키워드 라우팅을 KeywordAutomaton 하나로 컴파일해서 메시지를 한 번만 훑는다.
+  - target(대상: 플래너 / 익스큐터 / 셀프체크 / 상태), negation(왜 / 어떻게 / 방법 / 말고 / 취소 ...)
+  - verb 는 intent 종류별로 나뉜다: 작업 intent(planner / executor / selfcheck)는 실행 동사(실행 / 돌려 / run ...)만,
+    status 는 조회 동사(알려 / 보여 / 확인 ...)만 인정한다.
+  - 작업 대상에 조회 동사가 붙으면("executor 로그 보여줘", "셀프체크 결과 알려줘") 작업을 실행하지 않고 LLM으로 넘긴다 (reason=query).
+  - 작업 intent 가 질문("?"로 끝남, 됐어 / 했어 / 끝났 / 중이야 / 할까 / 해도 돼 / 언제 / 결과 ...)이거나
+    부정(안 / 않 / 말고 ...)이면 실행 명령이 아니므로 LLM으로 넘긴다 (reason=question).
+    ("플래너 실행됐어?", "셀프체크 다시 해야 할까?", "플래너 실행 안 해도 돼" 가 작업을 새로 띄우지 않도록)
+  - 라틴 문자 키워드(run, planner, cpu ...)는 단어 경계에서만 인정한다 ("running", "planners" 는 일치하지 않는다).
+  - slot: task_id (goal_xxx / task_xxx / ltg_xxx) — 있으면 executor 대상으로 본다.
+- 신뢰도: target 0.6 + 맞는 종류의 verb 0.3 + 짧은 메시지(SHORT_CHARS 이하) 0.1 − negation 0.5 − 여러 intent 동시 일치 0.4
+  - THRESHOLD 이상이고 MAX_CHARS 이하인 메시지만 빠른 경로로 보낸다. 나머지는 전부 기존 LLM 경로 (fallback).
+  - 질문/부정("플래너가 왜 실패했어?", "셀프체크 말고 ...")은 LLM이 답하도록 일부러 보수적으로 잡는다.
+- IntentRouter.route(message) → 신뢰할 만하면 Intent, 아니면 None. stats() 에 hit rate / intent별 / fallback 이유별 횟수.
+- 사용 (hit rate 확인):
+    python3 rc25s_intent.py                     # logs/chatlog.jsonl 의 사용자 메시지
+    python3 rc25s_intent.py "플래너 실행" "오늘 일정 정리해줘"
+
+환경변수:
+- RC25S_INTENT_FAST_PATH (기본 1, 0이면 항상 LLM)
+- RC25S_INTENT_THRESHOLD (기본 0.8)
+- RC25S_INTENT_MAX_CHARS (기본 80, 이보다 긴 메시지는 빠른 경로로 보내지 않는다)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from rc25s_keyword_automaton import KeywordAutomaton
+
+FAST_PATH_ENABLED = os.getenv("RC25S_INTENT_FAST_PATH", "1") != "0"
+THRESHOLD = float(os.getenv("RC25S_INTENT_THRESHOLD", "0.8"))
+MAX_CHARS = int(os.getenv("RC25S_INTENT_MAX_CHARS", "80"))
+SHORT_CHARS = 30
+
+# intent → (실행할 작업 종류 | None, 인정하는 verb 종류, 대상 키워드). 키워드는 소문자 비교.
+INTENTS: Dict[str, Dict[str, Any]] = {
+    "planner": {
+        "job": "planner",
+        "verbs": "run",
+        "targets": ["플래너", "planner", "플랜", "계획 다시", "계획 세워", "목표 갱신"],
+    },
+    "executor": {
+        "job": "executor",
+        "verbs": "run",
+        "targets": ["익스큐터", "executor", "실행기", "태스크 실행", "작업 실행", "task 실행", "다음 작업", "다음 태스크"],
+    },
+    "selfcheck": {
+        "job": "selfcheck",
+        "verbs": "run",
+        "targets": ["셀프체크", "셀프 체크", "selfcheck", "self-check", "self check", "자가진단", "자가 진단", "헬스체크", "헬스 체크"],
+    },
+    "status": {
+        "job": None,
+        "verbs": "query",
+        "targets": ["서버 상태", "시스템 상태", "대시보드 상태", "상태 알려", "상태 보여", "상태 확인", "상태 어때", "상태 요약", "status", "리소스", "cpu", "메모리"],
+    },
+}
+VERBS: Dict[str, List[str]] = {
+    "run": ["실행", "돌려", "돌리", "시작", "켜", "다시 해", "run", "start", "trigger"],
+    "query": ["알려", "보여", "확인", "어때", "조회", "show", "check"],
+}
+# 작업 intent 에서만 보는 질문 / 완료·진행 / 부정 표현 (하나라도 있으면 실행 명령으로 보지 않는다)
+QUESTIONS = [
+    "됐어", "됐나", "됐니", "됐는지", "됐지", "했어", "했나", "했니", "했는지", "했지", "끝났", "끝난", "중이야", "중이에요", "중인가",
+    "중인지", "켜져 있", "돌고 있", "돼 있", "되어 있", "할까", "해야 하", "해도 돼", "해도 되", "되나", "언제", "결과", "안 ", "안해", "않", "못 ",
+]
+NEGATIONS = ["왜", "어떻게", "뭐야", "무엇", "뭔지", "방법", "설명", "차이", "코드", "말고", "취소", "하지마", "하지 마", "멈춰", "중지", "why", "how", "what", "don't", "stop", "cancel"]
+TASK_ID_RE = re.compile(r"\b(?:goal|task|ltg)_[A-Za-z0-9_\-]+")
+
+W_TARGET, W_VERB, W_SHORT, W_NEGATION, W_AMBIGUOUS = 0.6, 0.3, 0.1, 0.5, 0.4
+
+
+@dataclass
+class Intent:
+    name: str
+    confidence: float
+    job: Optional[str] = None
+    slots: Dict[str, str] = field(default_factory=dict)
+    matched: List[str] = field(default_factory=list)
+    confident: bool = False
+    reason: str = ""  # confident=False 일 때 fallback 이유 (no_match / too_long / query / question / low_confidence)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _latin(ch: str) -> bool:
+    return ch.isascii() and (ch.isalnum() or ch == "_")
+
+
+def _on_word_boundary(text: str, start: int, end: int) -> bool:
+    """라틴 문자로 시작/끝나는 키워드는 앞뒤가 라틴 글자/숫자/_ 가 아닐 때만 인정한다 (한글 조사는 붙어도 된다)."""
+    if _latin(text[start]) and start > 0 and _latin(text[start - 1]):
+        return False
+    if _latin(text[end - 1]) and end < len(text) and _latin(text[end]):
+        return False
+    return True
+
+
+def _compile() -> KeywordAutomaton:
+    keywords = [(k, ("target", name)) for name, spec in INTENTS.items() for k in spec["targets"]]
+    keywords += [(k, ("verb", kind)) for kind, verbs in VERBS.items() for k in verbs]
+    keywords += [(k, ("negation", "")) for k in NEGATIONS]
+    keywords += [(k, ("question", "")) for k in QUESTIONS]
+    return KeywordAutomaton(keywords, ignore_case=True)
+
+
+class IntentRouter:
+    def __init__(self, threshold: float = THRESHOLD, max_chars: int = MAX_CHARS, enabled: bool = FAST_PATH_ENABLED):
+        self.threshold = threshold
+        self.max_chars = max_chars
+        self.enabled = enabled
+        self._automaton = _compile()
+        self._lock = threading.Lock()
+        self.total = 0
+        self.hits = 0
+        self.by_intent: Dict[str, int] = {}
+        self.fallbacks: Dict[str, int] = {}
+        self.classify_s = 0.0
+
+    def classify(self, message: str) -> Intent:
+        """점수만 계산한다 (부수효과 없음)."""
+        text = (message or "").strip()
+        targets: Dict[str, int] = {}
+        verbs: Dict[str, int] = {}
+        negations = 0
+        questions = 0
+        matched: List[str] = []
+        lowered = text.lower()
+        for start, end, keyword, (kind, name) in self._automaton.finditer(text):
+            if not _on_word_boundary(lowered, start, end):
+                continue
+            matched.append(keyword)
+            if kind == "target":
+                targets[name] = targets.get(name, 0) + 1
+            elif kind == "verb":
+                verbs[name] = verbs.get(name, 0) + 1
+            elif kind == "question":
+                questions += 1
+            else:
+                negations += 1
+        slots: Dict[str, str] = {}
+        task_id = TASK_ID_RE.search(text)
+        if task_id:
+            slots["task_id"] = task_id.group()
+            targets.setdefault("executor", 1)
+        matched = list(dict.fromkeys(matched))
+
+        if not targets:
+            return Intent("none", 0.0, matched=matched, reason="no_match")
+        name = max(targets, key=lambda n: targets[n])
+        spec = INTENTS[name]
+        score = W_TARGET
+        if verbs.get(spec["verbs"]):
+            score += W_VERB
+        if len(text) <= SHORT_CHARS:
+            score += W_SHORT
+        if negations:
+            score -= W_NEGATION
+        if len(targets) > 1:
+            score -= W_AMBIGUOUS
+        score = round(max(0.0, min(1.0, score)), 2)
+        intent = Intent(name, score, spec["job"], slots, matched)
+        if len(text) > self.max_chars:
+            intent.reason = "too_long"
+        elif spec["job"] and verbs.get("query"):
+            # 작업 대상 + 조회 동사 = 작업 결과 / 로그를 묻는 질문이다. 작업을 새로 띄우지 않는다.
+            intent.reason = "query"
+        elif spec["job"] and (questions or text.rstrip(" .~!").endswith(("?", "？"))):
+            # 작업 대상에 대한 질문 / 완료·진행 확인 / 부정 — 실행 명령이 아니다.
+            intent.reason = "question"
+        elif score < self.threshold:
+            intent.reason = "low_confidence"
+        else:
+            intent.confident = True
+        return intent
+
+    def route(self, message: str) -> Optional[Intent]:
+        """빠른 경로로 처리할 Intent, 아니면 None (LLM fallback). 통계를 남긴다."""
+        if not self.enabled:
+            return None
+        start = time.perf_counter()
+        intent = self.classify(message)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.total += 1
+            self.classify_s += elapsed
+            if intent.confident:
+                self.hits += 1
+                self.by_intent[intent.name] = self.by_intent.get(intent.name, 0) + 1
+            else:
+                self.fallbacks[intent.reason] = self.fallbacks.get(intent.reason, 0) + 1
+        return intent if intent.confident else None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "threshold": self.threshold,
+                "total": self.total,
+                "hits": self.hits,
+                "hit_rate": round(self.hits / self.total, 3) if self.total else 0.0,
+                "by_intent": dict(self.by_intent),
+                "fallbacks": dict(self.fallbacks),
+                "avg_classify_us": round(self.classify_s / self.total * 1e6, 1) if self.total else 0.0,
+            }
+
+
+def status_summary(world_state_json: str, system_stats: str, revision: Any, job_stats: Dict[str, Any]) -> str:
+    """status intent 답변: async_context 캐시(world_state 요약 / 리소스 / revision) + 작업 현황."""
+    try:
+        world = json.loads(world_state_json or "{}")
+    except ValueError:
+        world = {}
+    planner = world.get("planner") or {}
+    lines = [
+        "📊 서버 상태 요약",
+        f"- 리소스: {system_stats or '알 수 없음'}",
+        f"- world_state: revision={revision}, updated_at={world.get('updated_at')}",
+        f"- planner: goals={planner.get('goals_count', 0)}, tasks={planner.get('tasks_count', 0)}, generated_at={planner.get('generated_at')}",
+        f"- 작업: running={job_stats.get('running')}, {json.dumps(job_stats.get('jobs') or {}, ensure_ascii=False)}",
+    ]
+    return "\n".join(lines)
+
+
+_router: Optional[IntentRouter] = None
+
+
+def get_intent_router() -> IntentRouter:
+    global _router
+    if _router is None:
+        _router = IntentRouter()
+    return _router
+
+
+def _chatlog_messages(path: Path) -> List[str]:
+    messages: List[str] = []
+    if not path.exists():
+        return messages
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if entry.get("sender", "user") != "user":
+                continue
+            text = (entry.get("message") or entry.get("text") or "").strip()
+            if text:
+                messages.append(text)
+    return messages
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("messages", nargs="*", help="분류할 메시지 (없으면 --chatlog)")
+    parser.add_argument("--chatlog", default=str(Path(__file__).resolve().parent / "logs" / "chatlog.jsonl"))
+    parser.add_argument("--quiet", action="store_true", help="메시지별 결과는 찍지 않고 요약만")
+    args = parser.parse_args()
+
+    messages = args.messages or _chatlog_messages(Path(args.chatlog))
+    router = IntentRouter(enabled=True)
+    for message in messages:
+        router.route(message)
+        if not args.quiet:
+            intent = router.classify(message)
+            print(json.dumps({"message": message, **intent.to_dict()}, ensure_ascii=False))
+    print(json.dumps({"messages": len(messages), **router.stats()}, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
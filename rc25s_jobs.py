@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+🧵 RC25S Job Manager
+
+/ws/agi 명령(planner / executor / selfcheck)을 소켓 수신 루프 밖에서 실행하는 프로세스 내 작업 관리자.
+
+- submit() 은 바로 Job을 돌려준다 (job_id). 실행은 백그라운드 asyncio task.
+- 종류(kind)별 동시 실행 한도: 한도를 넘으면 "queued" 상태로 기다린다.
+  (기본: executor 1개 — 전역 executor 슬롯, planner 1개, selfcheck 1개)
+- 이벤트: 작업마다 구독 콜백(보통 요청한 소켓)으로
+  {"type": "job", "event": "accepted"|"queued"|"started"|"progress"|"output"|"finished", "job_id", "kind", "correlation_id", ...}
+  - output: 서브프로세스 stdout/stderr 한 줄씩 ({"stream": "stdout"|"stderr", "text": ...})
+  - finished: {"status": "succeeded"|"failed"|"cancelled", "returncode", "error"}
+- cancel(job_id): 대기 중이면 바로 취소, 실행 중이면 서브프로세스에 SIGTERM → 5초 뒤 SIGKILL.
+- 끝난 작업은 최근 MAX_FINISHED개만 보관 (list_jobs / get 으로 조회).
+- single-flight: key를 주고 제출하면
+  - 같은 key의 작업이 대기/실행 중일 때 새로 실행하지 않고 그 작업에 붙는다 (accepted 이벤트에 "coalesced": true).
+  - fresh_within초 안에 같은 key로 성공한 작업이 있으면 실행하지 않고 그 결과를 바로 돌려준다 ("cached": true).
+  - 붙은 구독자도 자기 correlation_id로 이벤트를 받는다.
+
+환경변수:
+- RC25S_JOB_LIMITS (기본 "executor=1,planner=1,selfcheck=1", 목록에 없는 종류는 1)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import os
+import signal
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_LIMITS = "executor=1,planner=1,selfcheck=1"
+MAX_FINISHED = 100
+OUTPUT_TAIL = 200  # 작업마다 보관하는 마지막 출력 줄 수 (나중에 watch 하는 클라이언트용)
+KILL_AFTER = 5.0
+
+Listener = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+def _parse_limits(spec: str) -> Dict[str, int]:
+    limits: Dict[str, int] = {}
+    for part in spec.split(","):
+        name, _, value = part.partition("=")
+        if name.strip():
+            try:
+                limits[name.strip()] = max(1, int(value))
+            except ValueError:
+                continue
+    return limits
+
+
+class Job:
+    def __init__(self, kind: str, correlation_id: Optional[str] = None, label: Optional[str] = None):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.label = label or kind
+        self.correlation_id = correlation_id
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.returncode: Optional[int] = None
+        self.error: Optional[str] = None
+        self.key: Optional[str] = None
+        self.output: Deque[Dict[str, str]] = collections.deque(maxlen=OUTPUT_TAIL)
+        # (구독 콜백, 그 구독자의 correlation_id)
+        self.listeners: List[Tuple[Listener, Optional[str]]] = []
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("succeeded", "failed", "cancelled")
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "label": self.label,
+            "correlation_id": self.correlation_id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "returncode": self.returncode,
+            "error": self.error,
+        }
+
+    def add_listener(self, listener: Listener, correlation_id: Optional[str] = None) -> None:
+        if all(existing != listener for existing, _ in self.listeners):
+            self.listeners.append((listener, correlation_id))
+
+    async def emit(self, event: str, **fields: Any) -> None:
+        for entry in list(self.listeners):
+            if not await self.emit_to(entry, event, **fields) and entry in self.listeners:
+                # 끊긴 소켓 등: 그 구독자만 뺀다 (작업은 계속 실행).
+                # stdout / stderr pump 가 동시에 같은 구독자에서 실패할 수 있으니 이미 빠졌으면 그냥 넘어간다.
+                self.listeners.remove(entry)
+
+    async def emit_to(self, entry: Tuple[Listener, Optional[str]], event: str, **fields: Any) -> bool:
+        listener, correlation_id = entry
+        message = {
+            "type": "job",
+            "event": event,
+            "job_id": self.id,
+            "kind": self.kind,
+            "correlation_id": correlation_id,
+            **fields,
+        }
+        try:
+            await listener(message)
+            return True
+        except Exception:
+            return False
+
+    async def progress(self, message: str, percent: Optional[float] = None) -> None:
+        await self.emit("progress", message=message, percent=percent)
+
+
+# runner(job) → returncode (0이면 성공)
+Runner = Callable[[Job], Awaitable[int]]
+
+
+class JobManager:
+    def __init__(self, limits: Optional[Dict[str, int]] = None):
+        self.limits = limits if limits is not None else _parse_limits(os.getenv("RC25S_JOB_LIMITS", DEFAULT_LIMITS))
+        self.jobs: Dict[str, Job] = {}
+        self._finished: Deque[str] = collections.deque()
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._by_key: Dict[str, Job] = {}  # key → 가장 최근 작업 (single-flight)
+        self.coalesced = 0
+        self.cached = 0
+
+    def _slot(self, kind: str) -> asyncio.Semaphore:
+        if kind not in self._slots:
+            self._slots[kind] = asyncio.Semaphore(self.limits.get(kind, 1))
+        return self._slots[kind]
+
+    # ---------- 제출 / 취소 ----------
+    def submit(
+        self,
+        kind: str,
+        runner: Runner,
+        listener: Optional[Listener] = None,
+        correlation_id: Optional[str] = None,
+        label: Optional[str] = None,
+        key: Optional[str] = None,
+        fresh_within: float = 0.0,
+    ) -> Job:
+        if key is not None:
+            previous = self._by_key.get(key)
+            if previous is not None and not previous.done:
+                self.coalesced += 1
+                if listener is not None:
+                    asyncio.create_task(self._attach(previous, (listener, correlation_id)))
+                return previous
+            if (
+                previous is not None
+                and previous.status == "succeeded"
+                and fresh_within > 0
+                and time.time() - (previous.finished_at or 0) <= fresh_within
+            ):
+                self.cached += 1
+                if listener is not None:
+                    asyncio.create_task(self._replay(previous, (listener, correlation_id)))
+                return previous
+
+        job = Job(kind, correlation_id=correlation_id, label=label)
+        job.key = key
+        if listener is not None:
+            job.add_listener(listener, correlation_id)
+        self.jobs[job.id] = job
+        if key is not None:
+            self._by_key[key] = job
+        job.task = asyncio.create_task(self._run(job, runner))
+        return job
+
+    async def _attach(self, job: Job, entry: Tuple[Listener, Optional[str]]) -> None:
+        """진행 중인 작업에 붙는다: 현재 상태를 알리고 이후 이벤트를 같이 받는다."""
+        await job.emit_to(entry, "accepted", label=job.label, coalesced=True, status=job.status)
+        if not job.done:
+            job.add_listener(*entry)
+        else:
+            await job.emit_to(entry, "finished", status=job.status, returncode=job.returncode, error=job.error)
+
+    async def _replay(self, job: Job, entry: Tuple[Listener, Optional[str]]) -> None:
+        """fresh 결과: 다시 실행하지 않고 마지막 결과를 그대로 보낸다."""
+        await job.emit_to(entry, "accepted", label=job.label, cached=True)
+        await job.emit_to(
+            entry,
+            "finished",
+            status=job.status,
+            returncode=job.returncode,
+            error=job.error,
+            cached=True,
+            finished_at=job.finished_at,
+            output=list(job.output),
+        )
+
+    async def _run(self, job: Job, runner: Runner) -> None:
+        slot = self._slot(job.kind)
+        try:
+            await job.emit("accepted", label=job.label)
+            if slot.locked():
+                await job.emit("queued", running=self.running(job.kind))
+            async with slot:
+                job.status = "running"
+                job.started_at = time.time()
+                await job.emit("started", label=job.label)
+                job.returncode = await runner(job)
+                job.status = "succeeded" if job.returncode == 0 else "failed"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+            self._retire(job)
+        await job.emit("finished", status=job.status, returncode=job.returncode, error=job.error)
+
+    def _retire(self, job: Job) -> None:
+        self._finished.append(job.id)
+        while len(self._finished) > MAX_FINISHED:
+            old = self.jobs.pop(self._finished.popleft(), None)
+            if old is not None and old.key is not None and self._by_key.get(old.key) is old:
+                del self._by_key[old.key]
+
+    def cancel(self, job_id: str) -> bool:
+        job = self.jobs.get(job_id)
+        if job is None or job.done or job.task is None:
+            return False
+        job.task.cancel()
+        return True
+
+    # ---------- 조회 ----------
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    def running(self, kind: Optional[str] = None) -> List[str]:
+        return [j.id for j in self.jobs.values() if j.status == "running" and (kind is None or j.kind == kind)]
+
+    def list(self, include_finished: bool = True) -> List[Dict[str, Any]]:
+        return [j.info() for j in self.jobs.values() if include_finished or not j.done]
+
+    def watch(self, job_id: str, listener: Listener, correlation_id: Optional[str] = None) -> Optional[Job]:
+        """다른 소켓이 실행 중인 작업 이벤트를 이어 받는다 (이미 나온 출력은 job.output 참고)."""
+        job = self.jobs.get(job_id)
+        if job is not None and not job.done:
+            job.add_listener(listener, correlation_id)
+        return job
+
+    def stats(self) -> Dict[str, Any]:
+        by_status: Dict[str, int] = {}
+        for job in self.jobs.values():
+            by_status[job.status] = by_status.get(job.status, 0) + 1
+        return {
+            "limits": self.limits,
+            "jobs": by_status,
+            "running": self.running(),
+            "coalesced": self.coalesced,
+            "cached": self.cached,
+        }
+
+
+async def _pump(job: Job, stream: Optional[asyncio.StreamReader], name: str) -> None:
+    if stream is None:
+        return
+    while True:
+        line = await stream.readline()
+        if not line:
+            return
+        text = line.decode("utf-8", errors="replace").rstrip("\n")
+        job.output.append({"stream": name, "text": text})
+        await job.emit("output", stream=name, text=text)
+
+
+async def _terminate(proc: asyncio.subprocess.Process) -> None:
+    """프로세스 그룹에 SIGTERM, KILL_AFTER초 뒤에도 살아 있으면 SIGKILL (이미 끝났으면 아무것도 하지 않는다)."""
+    if proc.returncode is not None:
+        return
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+        await asyncio.wait_for(asyncio.shield(proc.wait()), KILL_AFTER)
+    except asyncio.TimeoutError:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    except ProcessLookupError:
+        pass
+
+
+async def run_subprocess(job: Job, argv: Sequence[str], cwd: Optional[str] = None) -> int:
+    """
+    서브프로세스를 실행하고 stdout/stderr 줄을 job output 이벤트로 흘려보낸다.
+    작업이 취소되거나 pump 중 예외가 나면 프로세스 그룹을 정리한다
+    (SIGTERM, KILL_AFTER초 뒤에도 살아 있으면 SIGKILL — 파이프를 아무도 읽지 않는 프로세스를 남기지 않는다).
+    """
+    env = dict(os.environ, PYTHONUNBUFFERED="1")
+    proc = await asyncio.create_subprocess_exec(
+        *argv,
+        cwd=cwd,
+        env=env,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        start_new_session=True,
+    )
+    try:
+        await asyncio.gather(_pump(job, proc.stdout, "stdout"), _pump(job, proc.stderr, "stderr"))
+        return await proc.wait()
+    except BaseException:
+        await _terminate(proc)
+        raise
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+🧲 RC25S JSON Extract
+
+LLM 응답(설명 문장 + ```json 코드펜스 + JSON)에서 첫 번째 완성된 top-level {...} 객체를 한 번 훑어서 꺼낸다.
+
+- 예전 방식(`re.search(r"\\{[\\s\\S]*\\}")`, find("{")/rfind("}"))의 문제:
+  - 닫는 } 가 없는 잘린 출력에서는 "{" 마다 끝까지 다시 훑는다 (출력 크기 × "{" 개수).
+  - 설명 문장에 {placeholder} 같은 중괄호가 있으면 엉뚱한 범위를 잡아서 json.loads 가 실패한다.
+- 상태 머신 (문자열 / 이스케이프 / 괄호 스택):
+  - 객체 밖에서는 "{" 만 찾고, 객체 안에서는 괄호 / 따옴표 / JSON에 나올 수 없는 글자만 정규식으로 건너뛰며 찾는다.
+    문자열은 닫는 따옴표까지 정규식 한 번으로 넘긴다 (코드 payload 처럼 긴 문자열도 C 속도).
+  - 문자열 안의 중괄호, \\" 는 무시한다. 괄호 짝이 안 맞거나 문자열 밖에 JSON이 아닌 글자가 나오면
+    그 후보를 버리고 다음 "{" 부터 다시 본다 (따옴표 / 닫는 괄호가 없던 후보는 문제 글자 뒤에서 바로 이어 간다).
+  - 단, 키로 시작한 후보({"...)는 진짜 top-level 값이다. 닫히지 않고 깨지면 그 안의 중첩 객체를 꺼내지 않고
+    (잘린 출력에서 안쪽 객체를 답으로 돌려주지 않도록) 깨진 글자 뒤에서 다음 객체를 찾는다.
+  - 괄호가 닫히면 그 구간만 json.loads(strict=False) — 코드 payload 안의 날 개행도 받아 준다.
+  - zero-width 문자(\\u200b-\\u200d, \\ufeff)는 미리 지운다. 코드펜스는 객체 밖 글자라서 그냥 건너뛴다.
+- 스트리밍: JSONExtractor.feed(chunk) 를 토큰이 오는 대로 부르면, 객체가 닫히는 순간 값을 돌려준다
+  (생성이 끝나기 전에 파싱이 끝나고, 뒤에 붙는 설명은 읽지 않아도 된다).
+  후보 객체의 chunk 들은 리스트로 모아 두었다가 닫힐 때 한 번만 합친다 (chunk 마다 버퍼를 복사하지 않는다).
+
+- 사용:
+    value = extract_json(text)                       # 없으면 None
+    value = extract_json_stream(delta_iterator)      # 객체가 닫히면 거기서 멈춘다
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, AsyncIterable, Iterable, List, Optional
+
+_ZERO_WIDTH = dict.fromkeys(map(ord, "\u200b\u200c\u200d\ufeff"))
+# 문자열 나머지를 닫는 따옴표까지 한 번에 (이스케이프 포함, 되돌아가기 없는 unrolled 패턴)
+_STRING_REST = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+# 객체 안, 문자열 밖에서 볼 글자: 괄호 / 따옴표 / JSON 값에 나올 수 없는 글자
+_IN_OBJECT = re.compile(r'[{}\[\]"]|[^\s0-9:,.+\-eEtrufalsn]')
+_CLOSE = {"}": "{", "]": "["}
+
+
+class JSONExtractor:
+    """chunk 단위로 feed 하면 첫 번째 완성된 top-level 객체를 돌려준다 (한 번 찾으면 done)."""
+
+    def __init__(self) -> None:
+        self._parts: List[str] = []  # 현재 후보 객체의 지난 chunk 들 (객체가 닫힐 때만 합친다)
+        self._inside = False
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._nested = False  # 후보 안에서 따옴표나 닫는 괄호를 봤는지 (다시 훑어야 하는지)
+        self._keyed: Optional[bool] = None  # 후보가 {"키 로 시작했는지 (None: 아직 모름)
+        self.done = False
+        self.value: Optional[Any] = None
+
+    def feed(self, chunk: str) -> Optional[Any]:
+        if not self.done:
+            self._scan(chunk.translate(_ZERO_WIDTH))
+        return self.value
+
+    def _open(self) -> None:
+        self._inside, self._parts, self._stack = True, [], ["{"]
+        self._in_string = self._escape = self._nested = False
+        self._keyed = None
+
+    def _scan(self, text: str) -> None:
+        pos = 0
+        seg = 0  # text 안에서 현재 후보가 시작된 위치 (이어지는 chunk면 0)
+        while True:
+            if not self._inside:
+                i = text.find("{", pos)
+                if i < 0:
+                    return
+                self._open()
+                seg, pos = i, i + 1
+            elif self._escape:
+                if pos >= len(text):
+                    break
+                self._escape = False
+                pos += 1
+            elif self._in_string:
+                m = _STRING_REST.match(text, pos)
+                if m is not None:
+                    self._in_string = False
+                    pos = m.end()
+                    continue
+                # 이 chunk 안에서는 문자열이 닫히지 않는다 → 끝에 걸린 이스케이프(\)만 확인
+                while True:
+                    i = text.find("\\", pos)
+                    if i < 0:
+                        break
+                    if i + 1 >= len(text):
+                        self._escape = True
+                        break
+                    pos = i + 2
+                pos = len(text)
+                break
+            else:
+                m = _IN_OBJECT.search(text, pos)
+                if self._keyed is None:
+                    end = len(text) if m is None else m.start()
+                    if m is not None or text[pos:end].strip():
+                        self._keyed = m is not None and m.group() == '"' and not text[pos:end].strip()
+                if m is None:
+                    break
+                ch = m.group()
+                pos = m.end()
+                if ch == '"':
+                    self._in_string = self._nested = True
+                elif ch in "{[":
+                    self._stack.append(ch)
+                elif ch in "}]":
+                    self._nested = True
+                    if self._stack.pop() == _CLOSE[ch] and self._stack:
+                        continue
+                    candidate = "".join(self._parts) + text[seg:pos]
+                    if not self._stack:
+                        try:
+                            self.value, self.done = json.loads(candidate, strict=False), True
+                            return
+                        except ValueError:
+                            pass
+                    self._inside = False
+                    if self._keyed:
+                        # 키로 시작한 top-level 값이 깨졌다 → 안쪽 객체는 답이 아니다. 닫는 괄호 뒤에서 이어 간다.
+                        continue
+                    # 괄호 짝이 안 맞거나 JSON이 아니다 → 이 "{" 다음부터 다시 훑는다.
+                    text, pos = candidate[1:] + text[pos:], 0
+                elif self._keyed:
+                    # 키로 시작한 top-level 값 사이에 JSON이 아닌 글자 → 잘리거나 깨진 값. 이 글자 뒤에서 이어 간다.
+                    self._inside = False
+                elif self._nested:
+                    # 문자열 밖에 JSON이 아닌 글자 → 설명 문장의 중괄호였다. 이 "{" 다음부터 다시 훑는다.
+                    self._inside = False
+                    text, pos = ("".join(self._parts) + text[seg:])[1:], 0
+                else:
+                    # 따옴표도 닫는 괄호도 없었다면 안쪽 "{" 후보들도 같은 글자에서 막히므로 바로 뒤에서 이어 간다.
+                    self._inside = False
+        self._parts.append(text[seg:])
+
+
+def extract_json(text: str, default: Optional[Any] = None) -> Optional[Any]:
+    """text 안의 첫 번째 완성된 top-level JSON 객체 (없으면 default)."""
+    if not text or not isinstance(text, str):
+        return default
+    extractor = JSONExtractor()
+    extractor.feed(text)
+    return extractor.value if extractor.done else default
+
+
+def extract_json_stream(chunks: Iterable[str], default: Optional[Any] = None) -> Optional[Any]:
+    """chunk 를 읽다가 객체가 닫히면 거기서 멈추고 값을 돌려준다 (나머지 chunk 는 읽지 않는다)."""
+    extractor = JSONExtractor()
+    for chunk in chunks:
+        if chunk and extractor.feed(chunk) is not None:
+            return extractor.value
+    return extractor.value if extractor.done else default
+
+
+async def aextract_json_stream(chunks: AsyncIterable[str], default: Optional[Any] = None) -> Optional[Any]:
+    extractor = JSONExtractor()
+    async for chunk in chunks:
+        if chunk and extractor.feed(chunk) is not None:
+            return extractor.value
+    return extractor.value if extractor.done else default
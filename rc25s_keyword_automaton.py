@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+🔤 RC25S Keyword Automaton
+
+여러 키워드를 한 번에 찾는 Aho–Corasick 자동자 (rc25s_intent 빠른 경로용).
+커널 mode 라우팅(rc25_kernel_RC25S.ModeRouter)은 이 자동자를 쓰지 않는다 — 키워드 표가 작아서 정규식 alternation 한 번이
+순수 파이썬 자동자보다 빠르다 (rc25s_bench_mode_router.py 에서 비교).
+
+- (키워드, payload) 목록을 한 번 컴파일해 두고, 텍스트를 한 번만 훑어서 모든 일치(겹치는 것 포함)를 찾는다.
+  키워드마다 `k in text` 로 텍스트를 다시 훑는 O(키워드 수 × 길이) 대신 O(길이 + 일치 수).
+- 루트 상태(진행 중인 부분 일치가 없을 때)에서는 키워드 첫 글자 집합 정규식으로 다음 후보 위치까지 건너뛴다
+  → 키워드와 상관없는 글자들은 C 속도로 넘어간다.
+- ignore_case=True 면 키워드와 텍스트를 lower() 로 맞춰서 비교한다.
+- 사용:
+    ac = KeywordAutomaton([("플래너", "planner"), ("셀프체크", "selfcheck")])
+    for start, end, keyword, payload in ac.finditer(text): ...
+    ac.count(text)  → {payload: 일치 횟수}
+"""
+
+from __future__ import annotations
+
+import collections
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Pattern, Tuple
+
+
+class KeywordAutomaton:
+    def __init__(self, keywords: Iterable[Tuple[str, Any]], ignore_case: bool = False):
+        self.ignore_case = ignore_case
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        self._patterns: List[Tuple[str, Any, int]] = []  # (원래 키워드, payload, 길이)
+        for keyword, payload in keywords:
+            key = keyword.lower() if ignore_case else keyword
+            if not key:
+                continue
+            state = 0
+            for ch in key:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                    self._goto[state][ch] = nxt
+                state = nxt
+            self._out[state].append(len(self._patterns))
+            self._patterns.append((keyword, payload, len(key)))
+
+        # 실패 링크 (BFS). 각 상태의 출력에는 실패 링크 쪽 출력(더 짧은 접미사 키워드)도 합쳐 둔다.
+        queue = collections.deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+        first_chars = "".join(sorted(self._goto[0]))
+        self._skip: Optional[Pattern[str]] = re.compile("[" + re.escape(first_chars) + "]") if first_chars else None
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    @property
+    def states(self) -> int:
+        return len(self._goto)
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, str, Any]]:
+        """(start, end, keyword, payload) 를 끝 위치 순서로."""
+        if self._skip is None or not text:
+            return
+        if self.ignore_case:
+            text = text.lower()
+        goto, fail, out, patterns, skip = self._goto, self._fail, self._out, self._patterns, self._skip
+        state, i, n = 0, 0, len(text)
+        while i < n:
+            if state == 0:
+                m = skip.search(text, i)
+                if m is None:
+                    return
+                i = m.start()
+            ch = text[i]
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            i += 1
+            for index in out[state]:
+                keyword, payload, length = patterns[index]
+                yield i - length, i, keyword, payload
+
+    def count(self, text: str) -> Dict[Any, int]:
+        """payload 별 일치 횟수."""
+        counts: Dict[Any, int] = {}
+        for _, _, _, payload in self.finditer(text):
+            counts[payload] = counts.get(payload, 0) + 1
+        return counts
+
+    def matched(self, text: str) -> List[str]:
+        """일치한 키워드 (중복 없이, 처음 나온 순서)."""
+        return list(dict.fromkeys(keyword for _, _, keyword, _ in self.finditer(text)))
@@ -1,9 +1,13 @@
-import os, json, time, datetime, requests, subprocess, traceback
+import os, json, time, datetime, subprocess, traceback
+
+from rc25s_llm_http import LLMShedError, call_background_llm
+from rc25s_prompt_builder import PromptBuilder, budget_for
 
 REFLECTION_PATH = "/srv/repo/vibecoding/memory_store/reflection.json"
 MEMORY_PATH = "/srv/repo/vibecoding/memory_store/memory_vector.json"
 LOG_PATH = "/srv/repo/vibecoding/logs/knowledge_fusion.log"
 SRC_PATH = "/srv/repo/vibecoding"
+FUSION_PROMPT_BUDGET = 4000  # RC25S_PROMPT_BUDGET_FUSION 으로 덮어쓴다
 
 def log(msg):
     t = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -12,9 +16,11 @@ def log(msg):
         f.write(f"[{t}] {msg}\n")
 
 def call_llm(prompt):
+    """LLM 답변. gateway가 background 호출을 버리면 None."""
     try:
-        r = requests.post("http://127.0.0.1:4545/llm", json={"prompt": prompt}, timeout=180)
-        return r.json().get("output", "")
+        return call_background_llm(prompt, caller="knowledge_fusion")
+    except LLMShedError:
+        return None
     except Exception as e:
         return f"❌ LLM 호출 실패: {e}"
 
@@ -41,19 +47,23 @@ def fuse_knowledge():
             memory = []
 
         # 4️⃣ LLM에 코드개선 요청
-        prompt = f"""
-다음은 RC25S AGI 시스템의 최근 검색 결과 및 내부 기억입니다.
-이 정보를 기반으로 코드 품질, 보안, 효율성 개선 아이디어를 제안하고 
-필요한 Python 코드 조각을 출력하세요.
-
-검색 및 기억:
-{ref_text[:10000]}
+        # 검색 결과는 앞쪽(요약)부터 남기고, 토큰 예산(RC25S_PROMPT_BUDGET_FUSION)을 넘는 뒷부분만 줄인다.
+        builder = PromptBuilder(budget_for("fusion", FUSION_PROMPT_BUDGET))
+        builder.text(
+            "다음은 RC25S AGI 시스템의 최근 검색 결과 및 내부 기억입니다.\n"
+            "이 정보를 기반으로 코드 품질, 보안, 효율성 개선 아이디어를 제안하고\n"
+            "필요한 Python 코드 조각을 출력하세요."
+        )
+        builder.section("reflection", ref_text, priority=50, keep="head", header="검색 및 기억:")
+        builder.text("출력 형식:\n- 개선 요약\n- 적용 가능한 코드 (전체 코드 또는 함수 단위)")
+        built = builder.build(caller="fusion")
+        log(f"🧱 {built.report()}")
+        prompt = built.text
 
-출력 형식:
-- 개선 요약
-- 적용 가능한 코드 (전체 코드 또는 함수 단위)
-"""
         result = call_llm(prompt)
+        if result is None:
+            log("⏳ LLM 부하로 background 호출이 미뤄짐 — 다음 사이클에 다시 시도.")
+            return
 
         # 5️⃣ 결과 저장
         ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
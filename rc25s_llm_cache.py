@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+🗃️ RC25S LLM Response Cache
+
+rc25s_chat 앞단의 2단계 응답 캐시 (프로세스당 1개, 스레드 안전).
+
+- 1단계(exact): 정규화한 프롬프트 + model + world_state revision 의 해시가 같으면 그대로 재사용.
+  - 정규화: NFKC, 제로폭 문자 제거, 소문자, 공백 압축, 끝 문장부호 제거
+    ("서버 상태 알려줘!" == "서버  상태 알려줘")
+- 2단계(near): 같은 model + revision 안에서 거의 같은 질문이면 재사용.
+  - 문자 2-gram 집합의 MinHash(NUM_PERM개) → LSH 밴드(BANDS개)로 후보를 찾고,
+    실제 2-gram Jaccard 유사도가 NEAR_THRESHOLD 이상일 때만 hit.
+    (한국어 짧은 질문에서 조사/어미 차이 "돌려줘"/"돌려줘요"는 hit, "실행"/"중지" 차이는 miss 되는 수준)
+  - 숫자가 든 토큰(1234, 0.2, v2)과 식별자(goal_xxx, task_id)는 순서까지 정확히 같아야 한다.
+    긴 프롬프트에서는 "task 1234"/"task 1235", "0.2야"/"0.9야" 도 Jaccard 0.85~0.95 라서,
+    이 토큰들을 LSH 밴드 키에 넣어 다른 ID / 숫자의 답은 후보로도 찾지 않는다.
+- 두 단계 모두 LRU + TTL, 최대 MAX_ENTRIES개. world_state revision이 바뀌면 키가 달라지므로 예전 답은 자연히 안 쓰인다.
+- get(..., bypass=True) / put 생략으로 요청별 우회 가능.
+- stats(): lookups / exact_hits / near_hits / misses / hit_rate / evictions
+
+환경변수:
+- RC25S_LLM_CACHE_TTL            (기본 300초, 0이면 캐시 끔)
+- RC25S_LLM_CACHE_SIZE           (기본 512)
+- RC25S_LLM_CACHE_NEAR_THRESHOLD (기본 0.8, 1.0 이상이면 near 단계 끔)
+"""
+
+from __future__ import annotations
+
+import collections
+import hashlib
+import os
+import re
+import struct
+import threading
+import time
+import unicodedata
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+TTL = float(os.getenv("RC25S_LLM_CACHE_TTL", "300"))
+MAX_ENTRIES = int(os.getenv("RC25S_LLM_CACHE_SIZE", "512"))
+NEAR_THRESHOLD = float(os.getenv("RC25S_LLM_CACHE_NEAR_THRESHOLD", "0.8"))
+
+NUM_PERM = 32
+BANDS = 8  # 밴드당 NUM_PERM // BANDS 개 → Jaccard 0.8 쌍은 거의 항상 후보가 된다
+_ROWS = NUM_PERM // BANDS
+MAX_CANDIDATES = 16
+_PRIME = (1 << 61) - 1
+_MASK = (1 << 64) - 1
+
+_ZERO_WIDTH_RE = re.compile("[\u200b\u200c\u200d\u2060\ufeff]")
+_SPACE_RE = re.compile(r"\s+")
+_TRAILING_PUNCT = " .!?~。！？…"
+# near 단계에서 정확히 같아야 하는 토큰: 숫자가 든 토큰, snake_case 식별자
+_EXACT_TOKEN_RE = re.compile(r"[a-z0-9_.\-]*[0-9][a-z0-9_.\-]*|[a-z][a-z0-9]*(?:_[a-z0-9]+)+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    text = unicodedata.normalize("NFKC", prompt or "")
+    text = _ZERO_WIDTH_RE.sub("", text).lower()
+    return _SPACE_RE.sub(" ", text).strip().rstrip(_TRAILING_PUNCT)
+
+
+def _exact_tokens(text: str) -> Tuple[str, ...]:
+    return tuple(t.strip(".-") for t in _EXACT_TOKEN_RE.findall(text))
+
+
+def _shingles(text: str, n: int = 2) -> FrozenSet[str]:
+    if len(text) <= n:
+        return frozenset([text]) if text else frozenset()
+    return frozenset(text[i : i + n] for i in range(len(text) - n + 1))
+
+
+def _perm_params() -> List[Tuple[int, int]]:
+    params = []
+    for i in range(NUM_PERM):
+        digest = hashlib.blake2b(f"rc25s-minhash-{i}".encode(), digest_size=16).digest()
+        a, b = struct.unpack("<QQ", digest)
+        params.append((a % (_PRIME - 1) + 1, b % _PRIME))
+    return params
+
+
+_PERMS = _perm_params()
+
+
+def _minhash(shingles: FrozenSet[str]) -> Tuple[int, ...]:
+    hashes = [struct.unpack("<Q", hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest())[0] for s in shingles]
+    if not hashes:
+        return tuple([_MASK] * NUM_PERM)
+    return tuple(min(((a * h + b) % _PRIME) for h in hashes) for a, b in _PERMS)
+
+
+def _jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / float(len(a | b))
+
+
+class _Entry:
+    __slots__ = ("key", "scope", "value", "expires_at", "shingles", "bands")
+
+    def __init__(self, key: str, scope: str, value: Any, expires_at: float, shingles: FrozenSet[str], bands: List[Tuple]):
+        self.key = key
+        self.scope = scope
+        self.value = value
+        self.expires_at = expires_at
+        self.shingles = shingles
+        self.bands = bands
+
+
+class LLMResponseCache:
+    def __init__(self, ttl: float = TTL, max_entries: int = MAX_ENTRIES, near_threshold: float = NEAR_THRESHOLD):
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self.near_threshold = near_threshold
+        self._lock = threading.Lock()
+        self._entries: "collections.OrderedDict[str, _Entry]" = collections.OrderedDict()
+        self._bands: Dict[Tuple, set] = collections.defaultdict(set)  # (scope, 숫자/식별자 토큰, band#, 값) → entry key 집합
+        self.lookups = 0
+        self.exact_hits = 0
+        self.near_hits = 0
+        self.bypassed = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    @staticmethod
+    def _scope(model: str, revision: Any) -> str:
+        return f"{model}@{revision}"
+
+    @staticmethod
+    def _key(scope: str, normalized: str) -> str:
+        return hashlib.sha1(f"{scope}\n{normalized}".encode("utf-8")).hexdigest()
+
+    # ---------- 조회 ----------
+    def get(self, prompt: str, model: str, revision: Any = None, bypass: bool = False) -> Optional[Tuple[str, Any]]:
+        """캐시 hit이면 ("exact"|"near", 값), 아니면 None."""
+        if bypass or not self.enabled:
+            self.bypassed += 1
+            return None
+        scope = self._scope(model, revision)
+        normalized = normalize_prompt(prompt)
+        key = self._key(scope, normalized)
+        now = time.time()
+        with self._lock:
+            self.lookups += 1
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > now:
+                self._entries.move_to_end(key)
+                self.exact_hits += 1
+                return "exact", entry.value
+            if self.near_threshold < 1.0:
+                shingles = _shingles(normalized)
+                best: Optional[_Entry] = None
+                best_score = self.near_threshold
+                votes: "collections.Counter[str]" = collections.Counter()
+                for band in self._band_keys(scope, normalized, _minhash(shingles)):
+                    votes.update(self._bands.get(band, ()))
+                # 겹치는 밴드가 많은 후보부터 MAX_CANDIDATES개만 실제 Jaccard로 확인한다.
+                for candidate_key, _count in votes.most_common(MAX_CANDIDATES):
+                    candidate = self._entries.get(candidate_key)
+                    if candidate is None or candidate.expires_at <= now:
+                        continue
+                    score = _jaccard(shingles, candidate.shingles)
+                    if score >= best_score:
+                        best, best_score = candidate, score
+                if best is not None:
+                    self._entries.move_to_end(best.key)
+                    self.near_hits += 1
+                    return "near", best.value
+        return None
+
+    @staticmethod
+    def _band_keys(scope: str, normalized: str, signature: Tuple[int, ...]) -> List[Tuple]:
+        """밴드 키에 숫자 / 식별자 토큰을 넣어, 이 토큰이 다른 항목은 near 후보가 되지 않게 한다."""
+        tokens = _exact_tokens(normalized)
+        return [(scope, tokens, i, signature[i * _ROWS : (i + 1) * _ROWS]) for i in range(BANDS)]
+
+    # ---------- 저장 / 삭제 ----------
+    def put(self, prompt: str, model: str, value: Any, revision: Any = None) -> None:
+        if not self.enabled:
+            return
+        scope = self._scope(model, revision)
+        normalized = normalize_prompt(prompt)
+        key = self._key(scope, normalized)
+        shingles = _shingles(normalized)
+        bands = self._band_keys(scope, normalized, _minhash(shingles)) if self.near_threshold < 1.0 else []
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(key, scope, value, time.time() + self.ttl, shingles, bands)
+            for band in bands:
+                self._bands[band].add(key)
+            self._evict(time.time())
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        for band in entry.bands:
+            keys = self._bands.get(band)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._bands[band]
+
+    def _evict(self, now: float) -> None:
+        expired = [k for k, e in self._entries.items() if e.expires_at <= now]
+        for key in expired:
+            self._remove(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+        self.evictions += len(expired)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bands.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.exact_hits + self.near_hits
+        return {
+            "entries": len(self._entries),
+            "lookups": self.lookups,
+            "exact_hits": self.exact_hits,
+            "near_hits": self.near_hits,
+            "misses": self.lookups - hits,
+            "bypassed": self.bypassed,
+            "hit_rate": round(hits / self.lookups, 3) if self.lookups else None,
+            "evictions": self.evictions,
+        }
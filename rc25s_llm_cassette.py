@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+📼 RC25S LLM Cassette (녹화 / 재생)
+
+- 녹화: RC25S_LLM_RECORD=<디렉터리> 로 켜면 rc25s_openai_clients 의 공용 OpenAI 클라이언트(sync/async)가
+  httpx transport 단에서 요청/응답을 cassette 파일에 그대로 남긴다.
+  - rc25s_chat / rc25s_achat / 스트리밍, LogRCA, reflection_engine(rc25s_chat 경유), app_generator,
+    agi_autofix, llm_router(OpenAI) 가 전부 같은 클라이언트를 쓰므로 한 군데서 다 잡힌다.
+  - 파일: <dir>/<caller>.jsonl — caller 는 gateway 슬롯의 caller(rc25s_llm_gateway.current_caller), 없으면 "unknown".
+  - 한 줄 = 한 호출: {ts, caller, method, path, key, prompt_key, request, status, response | stream, ttfb_s, elapsed_s}
+    - 스트리밍 응답은 응답을 흘려보내면서(tee) SSE data 줄 목록(stream)으로 남긴다.
+    - Authorization 등 헤더는 남기지 않는다. 녹화 중에는 Accept-Encoding: identity 로 받는다.
+- 재생: CassetteLibrary(dir).lookup(request_body) — rc25s_llm_standin 이 쓴다.
+  - key        : model + messages (+ tools / response_format) 의 sha256 (stream, temperature 등은 무시)
+  - prompt_key : model + 마지막 user 메시지 (system 프롬프트에 시각/상태가 섞여 있어도 맞도록)
+  - 같은 key 로 여러 번 녹화됐으면 돌아가며 준다. fallback_any=True 면 아무 녹화나 돌아가며 준다.
+
+환경변수:
+- RC25S_LLM_RECORD (cassette 디렉터리, 비어 있으면 녹화하지 않는다)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import itertools
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+from rc25s_llm_gateway import current_caller
+
+RECORD_DIR = os.getenv("RC25S_LLM_RECORD", "")
+KEY_FIELDS = ("model", "messages", "tools", "tool_choice", "functions", "response_format")
+
+
+# ---------- 키 ----------
+def _digest(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()[:32]
+
+
+def request_key(body: Dict[str, Any]) -> str:
+    return _digest({k: body.get(k) for k in KEY_FIELDS if body.get(k) is not None})
+
+
+def prompt_key(body: Dict[str, Any]) -> str:
+    last_user = ""
+    for message in body.get("messages") or []:
+        if isinstance(message, dict) and message.get("role") == "user":
+            last_user = message.get("content")
+    return _digest({"model": body.get("model"), "user": last_user})
+
+
+def response_text(entry: Dict[str, Any]) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """녹화된 응답(일반 / 스트리밍)에서 (답변 텍스트, usage)."""
+    if entry.get("stream") is not None:
+        parts: List[str] = []
+        usage = None
+        for data in entry["stream"]:
+            try:
+                chunk = json.loads(data)
+            except ValueError:
+                continue
+            usage = chunk.get("usage") or usage
+            for choice in chunk.get("choices") or []:
+                parts.append(((choice.get("delta") or {}).get("content")) or "")
+        return "".join(parts), usage
+    response = entry.get("response")
+    if not isinstance(response, dict):
+        return str(response or ""), None
+    choices = response.get("choices") or [{}]
+    return ((choices[0].get("message") or {}).get("content")) or "", response.get("usage")
+
+
+# ---------- 녹화 ----------
+class CassetteWriter:
+    """<dir>/<caller>.jsonl 에 한 줄씩 덧붙인다 (프로세스 안에서는 lock, 줄 단위 append)."""
+
+    def __init__(self, directory: os.PathLike):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.recorded = 0
+
+    def write(self, entry: Dict[str, Any]) -> None:
+        name = re.sub(r"[^A-Za-z0-9_.-]+", "_", entry.get("caller") or "unknown")
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            with open(self.directory / f"{name}.jsonl", "a", encoding="utf-8") as f:
+                f.write(line)
+            self.recorded += 1
+
+
+class _Recording:
+    """요청 하나의 녹화 상태 (응답 스트림이 닫힐 때 한 번 기록)."""
+
+    def __init__(self, request: httpx.Request, writer: CassetteWriter):
+        self.writer = writer
+        self.caller = current_caller.get() or "unknown"
+        self.method = request.method
+        self.path = request.url.path
+        try:
+            self.request = json.loads(request.read() or b"null")
+        except ValueError:
+            self.request = None
+        self.status = 0
+        self.content_type = ""
+        self.chunks: List[bytes] = []
+        self.started = time.perf_counter()
+        self.ttfb: Optional[float] = None
+        self.done = False
+
+    def feed(self, chunk: bytes) -> None:
+        if self.ttfb is None:
+            self.ttfb = time.perf_counter() - self.started
+        self.chunks.append(chunk)
+
+    def finish(self) -> None:
+        if self.done:
+            return
+        self.done = True
+        body = b"".join(self.chunks).decode("utf-8", errors="replace")
+        request = self.request if isinstance(self.request, dict) else {}
+        entry: Dict[str, Any] = {
+            "ts": time.time(),
+            "caller": self.caller,
+            "method": self.method,
+            "path": self.path,
+            "key": request_key(request),
+            "prompt_key": prompt_key(request),
+            "request": self.request,
+            "status": self.status,
+            "ttfb_s": round(self.ttfb if self.ttfb is not None else 0.0, 4),
+            "elapsed_s": round(time.perf_counter() - self.started, 4),
+        }
+        if "text/event-stream" in self.content_type:
+            entry["stream"] = [line[5:].strip() for line in body.splitlines() if line.startswith("data:") and line[5:].strip() != "[DONE]"]
+        else:
+            try:
+                entry["response"] = json.loads(body)
+            except ValueError:
+                entry["response"] = body
+        self.writer.write(entry)
+
+
+class _RecordingStream(httpx.SyncByteStream):
+    def __init__(self, stream: Any, recording: _Recording):
+        self._stream = stream
+        self._recording = recording
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self._stream:
+            self._recording.feed(chunk)
+            yield chunk
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            self._recording.finish()
+
+
+class _AsyncRecordingStream(httpx.AsyncByteStream):
+    def __init__(self, stream: Any, recording: _Recording):
+        self._stream = stream
+        self._recording = recording
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            self._recording.feed(chunk)
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._recording.finish()
+
+
+def _start(request: httpx.Request, writer: CassetteWriter) -> _Recording:
+    recording = _Recording(request, writer)
+    request.headers["Accept-Encoding"] = "identity"
+    return recording
+
+
+def _wrap(response: httpx.Response, recording: _Recording, stream: Any) -> httpx.Response:
+    recording.status = response.status_code
+    recording.content_type = response.headers.get("content-type", "")
+    return httpx.Response(response.status_code, headers=response.headers, stream=stream, extensions=response.extensions)
+
+
+class RecordingTransport(httpx.BaseTransport):
+    """sync httpx transport 래퍼: 응답을 그대로 넘기면서 cassette 에 기록한다."""
+
+    def __init__(self, inner: httpx.BaseTransport, writer: CassetteWriter):
+        self.inner = inner
+        self.writer = writer
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        recording = _start(request, self.writer)
+        response = self.inner.handle_request(request)
+        return _wrap(response, recording, _RecordingStream(response.stream, recording))
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+class AsyncRecordingTransport(httpx.AsyncBaseTransport):
+    """async httpx transport 래퍼 (AsyncOpenAI 용)."""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, writer: CassetteWriter):
+        self.inner = inner
+        self.writer = writer
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        recording = _start(request, self.writer)
+        response = await self.inner.handle_async_request(request)
+        return _wrap(response, recording, _AsyncRecordingStream(response.stream, recording))
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+
+_writer: Optional[CassetteWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_writer() -> Optional[CassetteWriter]:
+    """RC25S_LLM_RECORD 가 설정돼 있으면 프로세스 공용 writer, 아니면 None."""
+    global _writer
+    if not RECORD_DIR:
+        return None
+    with _writer_lock:
+        if _writer is None:
+            _writer = CassetteWriter(RECORD_DIR)
+        return _writer
+
+
+# ---------- 재생 ----------
+class CassetteLibrary:
+    """cassette 디렉터리의 *.jsonl 을 읽어 key / prompt_key 로 찾는다 (성공 응답만)."""
+
+    def __init__(self, directory: os.PathLike):
+        self.directory = Path(directory)
+        self.entries: List[Dict[str, Any]] = []
+        self._by_key: Dict[str, List[Dict[str, Any]]] = {}
+        self._by_prompt: Dict[str, List[Dict[str, Any]]] = {}
+        self._cursors: Dict[Tuple[str, str], "itertools.count[int]"] = {}
+        self._lock = threading.Lock()
+        for path in sorted(self.directory.glob("*.jsonl")):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    if entry.get("status") != 200 or not str(entry.get("path", "")).endswith("/chat/completions"):
+                        continue
+                    self.entries.append(entry)
+                    self._by_key.setdefault(entry.get("key", ""), []).append(entry)
+                    self._by_prompt.setdefault(entry.get("prompt_key", ""), []).append(entry)
+
+    def _next(self, kind: str, key: str, entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        with self._lock:
+            cursor = self._cursors.setdefault((kind, key), itertools.count())
+            return entries[next(cursor) % len(entries)]
+
+    def lookup(self, body: Dict[str, Any], fallback_any: bool = False) -> Optional[Tuple[Dict[str, Any], str]]:
+        """(녹화 entry, "exact" | "prompt" | "any") 또는 None."""
+        key = request_key(body)
+        if key in self._by_key:
+            return self._next("exact", key, self._by_key[key]), "exact"
+        key = prompt_key(body)
+        if key in self._by_prompt:
+            return self._next("prompt", key, self._by_prompt[key]), "prompt"
+        if fallback_any and self.entries:
+            return self._next("any", "", self.entries), "any"
+        return None
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+🚦 RC25S LLM Gateway
+
+모든 에이전트의 LLM 호출 앞에 두는 우선순위 기반 입장 제어 (admission control).
+
+- 우선순위: interactive(대시보드 채팅) > planner(플래너 / LogRCA / 리플렉션) > background(지식 융합, selfevo, 리팩터 등)
+- 전역 동시 실행 한도(MAX_CONCURRENCY)와 분당 토큰 예산(TPM_BUDGET)
+  - 여러 프로세스(서버, reflection_engine, rc25s_log_rca_agent ...)가 같은 ledger 파일(flock)을 공유하므로
+    한도는 프로세스별이 아니라 서버 전체 기준이다.
+  - 대기열은 우선순위 → 도착 순서. 높은 우선순위가 기다리고 있으면 낮은 우선순위는 들어가지 못한다.
+  - 클래스별 토큰 예산 비율(TOKEN_SHARE): background는 예산의 60%까지만 써서 interactive 여유를 남긴다.
+  - background는 슬롯도 RESERVED_INTERACTIVE개를 남겨 두고 쓴다.
+- interactive 지연이 나빠지면(대기 중인 interactive가 있거나 최근 60초 interactive 대기 p95 > INTERACTIVE_SLO)
+  background는 미뤄지고, BACKGROUND_MAX_DEFER초를 넘기면 LLMShedError로 버려진다.
+- 사용:
+    with get_gateway().slot("planner", est_tokens=estimate_tokens(prompt), caller="log_rca") as lease:
+        response = client.chat.completions.create(...)
+        lease.used_tokens = response.usage.total_tokens   # 선택 (없으면 추정치로 계산)
+  async 코드에서는 `async with gateway.aslot(...)`.
+- ledger 접근:
+  - 입장 / 퇴장만 flock 안에서 읽고 고쳐 쓴다 (내용이 바뀌지 않았으면 다시 쓰지 않는다).
+  - 대기 중 poll 은 잠금 없이 ledger를 읽어 보고, 들어갈 수 있어 보일 때만 잠금을 잡는다.
+    poll 간격은 우선순위별 상한(POLL_MAX)까지 늘려 간다. 같은 프로세스의 release는 바로 깨운다.
+  - async 경로의 ledger I/O는 gateway 전용 I/O 풀(RC25S_LLM_GATEWAY_IO_WORKERS)에서 한다.
+    대기자가 수백 명이어도 world_state I/O 풀(run_io)이나 asyncio 기본 스레드 풀을 잡지 않는다.
+- stats(): 잠금 없이 읽은 ledger 기준 클래스별 실행/대기 수, 분당 토큰, (이 프로세스의) 입장 수 / shed 수 / 대기시간 p50·p95
+- current_caller: 슬롯 안에서는 lease의 caller(없으면 priority)가 들어 있는 ContextVar
+  (rc25s_llm_cassette 녹화가 호출 출처를 붙일 때 쓴다).
+
+환경변수:
+- RC25S_LLM_GATEWAY_STATE          (기본 memory_store/llm_gateway.json)
+- RC25S_LLM_MAX_CONCURRENCY        (기본 4)
+- RC25S_LLM_TPM_BUDGET             (기본 200000, 0이면 토큰 예산 없음)
+- RC25S_LLM_INTERACTIVE_SLO        (기본 2초, interactive 대기 p95 목표)
+- RC25S_LLM_BACKGROUND_MAX_DEFER   (기본 120초)
+- RC25S_LLM_GATEWAY_IO_WORKERS     (기본 2, async 경로의 ledger I/O 스레드 수)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from rc25s_prompt_builder import count_tokens
+from world_state_store import file_lock
+
+ROOT = Path(__file__).resolve().parent
+STATE_PATH = Path(os.getenv("RC25S_LLM_GATEWAY_STATE", str(ROOT / "memory_store" / "llm_gateway.json")))
+MAX_CONCURRENCY = int(os.getenv("RC25S_LLM_MAX_CONCURRENCY", "4"))
+TPM_BUDGET = int(os.getenv("RC25S_LLM_TPM_BUDGET", "200000"))
+INTERACTIVE_SLO = float(os.getenv("RC25S_LLM_INTERACTIVE_SLO", "2"))
+BACKGROUND_MAX_DEFER = float(os.getenv("RC25S_LLM_BACKGROUND_MAX_DEFER", "120"))
+IO_WORKERS = max(1, int(os.getenv("RC25S_LLM_GATEWAY_IO_WORKERS", "2")))
+
+PRIORITIES = {"interactive": 0, "planner": 1, "background": 2}
+ALIASES = {"dashboard": "interactive", "chat": "interactive", "rca": "planner", "reflection": "planner", "refactor": "background"}
+TOKEN_SHARE = {"interactive": 1.0, "planner": 0.85, "background": 0.6}
+RESERVED_INTERACTIVE = 1
+EXPECTED_COMPLETION_TOKENS = 400
+LEASE_TTL = 900.0  # 이보다 오래된 lease는 죽은 호출로 보고 정리
+WINDOW = 60.0
+POLL_MIN = 0.02
+# 다른 프로세스의 release는 poll로만 알 수 있다. 우선순위가 낮을수록 더 느긋하게 본다.
+POLL_MAX = {"interactive": 0.25, "planner": 0.5, "background": 1.0}
+
+current_caller: "contextvars.ContextVar[str]" = contextvars.ContextVar("rc25s_llm_caller", default="")
+
+_io_pool: Optional[ThreadPoolExecutor] = None
+_io_pool_lock = threading.Lock()
+
+
+def _get_io_pool() -> ThreadPoolExecutor:
+    global _io_pool
+    if _io_pool is None:
+        with _io_pool_lock:
+            if _io_pool is None:
+                _io_pool = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="llm_gateway_io")
+    return _io_pool
+
+
+async def _run_io(func: Callable[..., Any], *args: Any) -> Any:
+    """ledger I/O를 gateway 전용 스레드 풀에서 실행한다 (대기자 poll이 world_state I/O를 밀어내지 않도록)."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_io_pool(), functools.partial(func, *args))
+
+
+class LLMShedError(RuntimeError):
+    """interactive 부하 때문에 background LLM 호출이 버려졌다 (다음 주기에 다시 시도)."""
+
+
+def normalize_priority(priority: Any) -> str:
+    name = str(priority or "interactive").lower()
+    name = ALIASES.get(name, name)
+    return name if name in PRIORITIES else "interactive"
+
+
+def estimate_tokens(*texts: Any, completion: int = EXPECTED_COMPLETION_TOKENS) -> int:
+    """로컬 토큰 수 추정 (rc25s_prompt_builder.count_tokens) + 예상 응답 토큰."""
+    return sum(count_tokens(text) for text in texts) + completion
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(round(pct / 100.0 * (len(values) - 1))))], 3)
+
+
+class Lease:
+    def __init__(self, lease_id: str, priority: str, caller: str, est_tokens: int, waited: float):
+        self.id = lease_id
+        self.priority = priority
+        self.caller = caller
+        self.est_tokens = est_tokens
+        self.waited = waited
+        self.used_tokens: Optional[int] = None
+
+
+class LLMGateway:
+    def __init__(
+        self,
+        state_path: Path = STATE_PATH,
+        max_concurrency: int = MAX_CONCURRENCY,
+        tpm_budget: int = TPM_BUDGET,
+        interactive_slo: float = INTERACTIVE_SLO,
+        background_max_defer: float = BACKGROUND_MAX_DEFER,
+    ):
+        self.state_path = Path(state_path)
+        self.lock_path = self.state_path.with_name(self.state_path.name + ".lock")
+        self.max_concurrency = max(1, max_concurrency)
+        self.tpm_budget = tpm_budget
+        self.interactive_slo = interactive_slo
+        self.background_max_defer = background_max_defer
+        self._counter_lock = threading.Lock()
+        self._admitted: Dict[str, int] = collections.Counter()
+        self._shed: Dict[str, int] = collections.Counter()
+        self._waits: Dict[str, Deque[float]] = {p: collections.deque(maxlen=500) for p in PRIORITIES}
+        # 같은 프로세스 안의 대기자는 release 때 바로 깨운다 (다른 프로세스의 release는 polling으로 감지).
+        self._wake = threading.Condition()
+        self._async_waiters: set = set()
+        self._releases = 0  # release 횟수: poll 하는 사이에 온 release를 놓치지 않기 위해
+
+    # ---------- ledger (프로세스 간 공유) ----------
+    def _read(self) -> Tuple[Dict[str, Any], str]:
+        """ledger를 잠금 없이 읽는다 (쓰기는 os.replace 라서 항상 온전한 파일이 보인다). → (정리된 state, 원문)"""
+        try:
+            raw = self.state_path.read_text(encoding="utf-8")
+            state = json.loads(raw)
+        except (FileNotFoundError, ValueError):
+            raw, state = "", {}
+        for key, empty in (("leases", {}), ("waiters", {}), ("tokens", []), ("interactive_waits", [])):
+            state.setdefault(key, empty)
+        self._cleanup(state, time.time())
+        return state, raw
+
+    def _transact(self, fn):
+        with file_lock(self.lock_path):
+            state, raw = self._read()
+            result = fn(state, time.time())
+            data = json.dumps(state, separators=(",", ":"))
+            if data != raw:
+                tmp = self.state_path.with_name(self.state_path.name + ".tmp")
+                tmp.write_text(data, encoding="utf-8")
+                os.replace(tmp, self.state_path)
+            return result
+
+    @staticmethod
+    def _cleanup(state: Dict[str, Any], now: float) -> None:
+        for key, item in list(state["leases"].items()):
+            if now - item["since"] > LEASE_TTL or not _pid_alive(int(item["pid"])):
+                del state["leases"][key]
+        for key, item in list(state["waiters"].items()):
+            if not _pid_alive(int(item["pid"])):
+                del state["waiters"][key]
+        state["tokens"] = [t for t in state["tokens"] if now - t[0] <= WINDOW]
+        state["interactive_waits"] = [w for w in state["interactive_waits"] if now - w[0] <= WINDOW]
+
+    def _degraded(self, state: Dict[str, Any]) -> bool:
+        if any(w["priority"] == "interactive" for w in state["waiters"].values()):
+            return True
+        p95 = _percentile([w[1] for w in state["interactive_waits"]], 95)
+        return p95 is not None and p95 > self.interactive_slo
+
+    def _try_admit(self, state: Dict[str, Any], now: float, waiter_id: str) -> bool:
+        me = state["waiters"][waiter_id]
+        rank = (PRIORITIES[me["priority"]], me["since"])
+        # 나보다 앞선(우선순위가 높거나 같은 우선순위에서 먼저 온) 대기자가 있으면 기다린다.
+        for other_id, other in state["waiters"].items():
+            if other_id != waiter_id and (PRIORITIES[other["priority"]], other["since"]) < rank:
+                return False
+        limit = self.max_concurrency
+        if me["priority"] == "background":
+            limit = max(1, limit - RESERVED_INTERACTIVE)
+            if self._degraded(state):
+                return False
+        if len(state["leases"]) >= limit:
+            return False
+        if self.tpm_budget > 0:
+            used = sum(t[1] for t in state["tokens"])
+            # 아무것도 안 돌고 있으면 예산보다 큰 요청도 하나는 들여보낸다 (영원히 막히지 않도록).
+            if state["leases"] and used + me["tokens"] > self.tpm_budget * TOKEN_SHARE[me["priority"]]:
+                return False
+        del state["waiters"][waiter_id]
+        state["leases"][waiter_id] = dict(me, since=now)
+        state["tokens"].append([now, me["tokens"], waiter_id])
+        return True
+
+    # ---------- 입장 / 퇴장 ----------
+    def _enqueue(self, priority: str, est_tokens: int, caller: str) -> Tuple[str, bool]:
+        """대기열에 등록하고 바로 들어갈 수 있으면 들어간다. → (id, 입장 여부)"""
+        waiter_id = uuid.uuid4().hex[:12]
+
+        def register(state, now):
+            state["waiters"][waiter_id] = {
+                "pid": os.getpid(),
+                "priority": priority,
+                "caller": caller,
+                "tokens": est_tokens,
+                "since": now,
+            }
+            return self._try_admit(state, now, waiter_id)
+
+        return waiter_id, self._transact(register)
+
+    def _poll(self, waiter_id: str) -> bool:
+        # 잠금 없이 먼저 보고, 들어갈 수 있어 보일 때만 잠금을 잡고 다시 확인한다.
+        state, _ = self._read()
+        if waiter_id in state["waiters"] and not self._try_admit(state, time.time(), waiter_id):
+            return False
+        return self._transact(lambda state, now: waiter_id in state["leases"] or self._try_admit(state, now, waiter_id))
+
+    def _abandon(self, waiter_id: str) -> None:
+        self._transact(lambda state, now: state["waiters"].pop(waiter_id, None))
+
+    def _deadline(self, priority: str, timeout: Optional[float]) -> Optional[float]:
+        if timeout is None and priority == "background":
+            timeout = self.background_max_defer
+        return time.monotonic() + timeout if timeout is not None else None
+
+    def _admitted_lease(self, waiter_id: str, priority: str, caller: str, est_tokens: int, started: float) -> Lease:
+        waited = time.monotonic() - started
+        with self._counter_lock:
+            self._admitted[priority] += 1
+            self._waits[priority].append(waited)
+        return Lease(waiter_id, priority, caller, est_tokens, waited)
+
+    def _shed_error(self, priority: str, caller: str) -> LLMShedError:
+        with self._counter_lock:
+            self._shed[priority] += 1
+        return LLMShedError(f"LLM call shed ({priority}, caller={caller}): interactive load is high")
+
+    def acquire(self, priority: Any = "interactive", est_tokens: int = EXPECTED_COMPLETION_TOKENS, caller: str = "", timeout: Optional[float] = None) -> Lease:
+        priority = normalize_priority(priority)
+        started = time.monotonic()
+        deadline = self._deadline(priority, timeout)
+        waiter_id, admitted = self._enqueue(priority, est_tokens, caller)
+        if admitted:
+            return self._admitted_lease(waiter_id, priority, caller, est_tokens, started)
+        delay = POLL_MIN
+        seen = self._releases
+        try:
+            while True:
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise self._shed_error(priority, caller)
+                with self._wake:
+                    if seen == self._releases:
+                        self._wake.wait(timeout=delay)
+                    seen = self._releases
+                delay = min(POLL_MAX[priority], delay * 1.5)
+                if self._poll(waiter_id):
+                    return self._admitted_lease(waiter_id, priority, caller, est_tokens, started)
+        except BaseException:
+            self._abandon(waiter_id)
+            raise
+
+    async def aacquire(self, priority: Any = "interactive", est_tokens: int = EXPECTED_COMPLETION_TOKENS, caller: str = "", timeout: Optional[float] = None) -> Lease:
+        """acquire 의 async 버전: 기다리는 동안 스레드를 잡지 않는다 (ledger 접근만 잠깐 gateway I/O 풀에서)."""
+        priority = normalize_priority(priority)
+        started = time.monotonic()
+        deadline = self._deadline(priority, timeout)
+        waiter_id, admitted = await _run_io(self._enqueue, priority, est_tokens, caller)
+        if admitted:
+            return self._admitted_lease(waiter_id, priority, caller, est_tokens, started)
+        delay = POLL_MIN
+        seen = self._releases
+        try:
+            while True:
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise self._shed_error(priority, caller)
+                if seen == self._releases:
+                    await self._async_wait(delay)
+                seen = self._releases
+                delay = min(POLL_MAX[priority], delay * 1.5)
+                if await _run_io(self._poll, waiter_id):
+                    return self._admitted_lease(waiter_id, priority, caller, est_tokens, started)
+        except BaseException:
+            await asyncio.shield(_run_io(self._abandon, waiter_id))
+            raise
+
+    async def _async_wait(self, delay: float) -> None:
+        event = asyncio.Event()
+        entry = (asyncio.get_running_loop(), event)
+        self._async_waiters.add(entry)
+        try:
+            await asyncio.wait_for(event.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._async_waiters.discard(entry)
+
+    def _notify(self) -> None:
+        with self._wake:
+            self._releases += 1
+            self._wake.notify_all()
+        for loop, event in list(self._async_waiters):
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                pass  # 닫힌 루프
+
+    def release(self, lease: Lease) -> None:
+        def finish(state, now):
+            state["leases"].pop(lease.id, None)
+            if lease.used_tokens is not None:
+                for entry in state["tokens"]:
+                    if entry[2] == lease.id:
+                        entry[1] = int(lease.used_tokens)
+            if lease.priority == "interactive":
+                state["interactive_waits"].append([now, round(lease.waited, 3)])
+
+        self._transact(finish)
+        self._notify()
+
+    @contextlib.contextmanager
+    def slot(self, priority: Any = "interactive", est_tokens: int = EXPECTED_COMPLETION_TOKENS, caller: str = "", timeout: Optional[float] = None) -> Iterator[Lease]:
+        lease = self.acquire(priority, est_tokens, caller, timeout)
+        previous = current_caller.get()
+        current_caller.set(lease.caller or lease.priority)
+        try:
+            yield lease
+        finally:
+            current_caller.set(previous)
+            self.release(lease)
+
+    @contextlib.asynccontextmanager
+    async def aslot(self, priority: Any = "interactive", est_tokens: int = EXPECTED_COMPLETION_TOKENS, caller: str = "", timeout: Optional[float] = None) -> AsyncIterator[Lease]:
+        lease = await self.aacquire(priority, est_tokens, caller, timeout)
+        previous = current_caller.get()
+        current_caller.set(lease.caller or lease.priority)
+        try:
+            yield lease
+        finally:
+            current_caller.set(previous)
+            await asyncio.shield(_run_io(self.release, lease))
+
+    # ---------- 지표 ----------
+    def stats(self) -> Dict[str, Any]:
+        """/health 용: ledger를 잠금 없이 읽기만 한다 (쓰지 않는다)."""
+
+        def snapshot(state, now):
+            in_flight: Dict[str, int] = collections.Counter(l["priority"] for l in state["leases"].values())
+            waiting: Dict[str, int] = collections.Counter(w["priority"] for w in state["waiters"].values())
+            oldest = {}
+            for w in state["waiters"].values():
+                oldest[w["priority"]] = max(oldest.get(w["priority"], 0.0), round(now - w["since"], 3))
+            return {
+                "in_flight": dict(in_flight),
+                "queue_depth": dict(waiting),
+                "oldest_wait": oldest,
+                "tokens_last_minute": sum(t[1] for t in state["tokens"]),
+                "degraded": self._degraded(state),
+            }
+
+        shared = snapshot(self._read()[0], time.time())
+        with self._counter_lock:
+            local = {
+                p: {
+                    "admitted": self._admitted[p],
+                    "shed": self._shed[p],
+                    "wait_p50": _percentile(list(self._waits[p]), 50),
+                    "wait_p95": _percentile(list(self._waits[p]), 95),
+                }
+                for p in PRIORITIES
+            }
+        return {
+            "max_concurrency": self.max_concurrency,
+            "tpm_budget": self.tpm_budget,
+            **shared,
+            "this_process": local,
+        }
+
+
+_gateway: Optional[LLMGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway() -> LLMGateway:
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = LLMGateway()
+        return _gateway
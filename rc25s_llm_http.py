@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+📮 RC25S /llm HTTP client (background 에이전트용)
+
+selfevo / knowledge_fusion / project_orchestrator / selfupdate 처럼 mcp_server_realtime 의 POST /llm 을 부르는
+background 에이전트가 같이 쓰는 호출 함수.
+
+- LLM gateway가 background 호출을 버리면(503 {"error": "llm_shed"}) 빈 output을 정상 결과로 돌려주지 않고,
+  Retry-After 만큼 쉬었다가 다시 시도한다. 그래도 버려지면 LLMShedError — 호출한 쪽은 이번 주기를 건너뛴다.
+- 요청 timeout은 gateway가 background 호출을 붙잡아 둘 수 있는 시간(BACKGROUND_MAX_DEFER)
+  + LLM 호출 자체 시간(RC25S_OPENAI_TIMEOUT) 이상이다. 미뤄진 호출이 실행되기 전에 클라이언트가 먼저 끊지 않도록.
+- 사용:
+    try:
+        text = call_background_llm(prompt, caller="selfevo")
+    except LLMShedError:
+        log("LLM 부하로 이번 주기는 건너뜀")
+
+환경변수:
+- RC25S_LLM_URL              (기본 http://127.0.0.1:4545/llm)
+- RC25S_LLM_SHED_RETRIES     (기본 1, 버려졌을 때 다시 시도하는 횟수)
+- RC25S_OPENAI_TIMEOUT       (기본 120초, rc25s_openai_clients 와 같은 값)
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from typing import Optional
+
+import requests
+
+from rc25s_llm_gateway import BACKGROUND_MAX_DEFER, LLMShedError
+
+LLM_URL = os.getenv("RC25S_LLM_URL", "http://127.0.0.1:4545/llm")
+SHED_RETRIES = int(os.getenv("RC25S_LLM_SHED_RETRIES", "1"))
+LLM_CALL_TIMEOUT = float(os.getenv("RC25S_OPENAI_TIMEOUT", "120"))
+REQUEST_TIMEOUT = BACKGROUND_MAX_DEFER + LLM_CALL_TIMEOUT
+DEFAULT_RETRY_AFTER = 30.0
+
+
+def _retry_after(response: requests.Response) -> float:
+    try:
+        return max(0.0, float(response.headers.get("Retry-After", DEFAULT_RETRY_AFTER)))
+    except ValueError:
+        return DEFAULT_RETRY_AFTER
+
+
+def call_background_llm(prompt: str, caller: str, retries: Optional[int] = None, timeout: Optional[float] = None) -> str:
+    """
+    background 우선순위로 /llm 을 호출해 output을 돌려준다.
+    - 버려지면(503 llm_shed) retries번 다시 시도하고, 끝까지 버려지면 LLMShedError.
+    - 그 밖의 HTTP / 네트워크 오류는 그대로 올라간다 (requests 예외).
+    """
+    retries = SHED_RETRIES if retries is None else retries
+    timeout = REQUEST_TIMEOUT if timeout is None else max(timeout, REQUEST_TIMEOUT)
+    for attempt in range(retries + 1):
+        response = requests.post(
+            LLM_URL,
+            json={"prompt": prompt, "priority": "background", "caller": caller},
+            timeout=timeout,
+        )
+        try:
+            data = response.json()
+        except ValueError:
+            data = {}
+        if data.get("error") != "llm_shed":
+            response.raise_for_status()
+            return data.get("output", "")
+        if attempt < retries:
+            time.sleep(_retry_after(response))
+    raise LLMShedError(f"LLM call shed ({caller}) after {retries + 1} attempts")
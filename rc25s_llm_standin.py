@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+🎭 RC25S LLM Stand-in Server
+
+OpenAI chat-completions 호환 로컬 서버 (FastAPI). OPENAI_BASE_URL 만 바꾸면
+rc25s_chat / rc25s_achat / LogRCA / reflection / app_generator 가 키·네트워크 없이 돈다.
+
+- POST /v1/chat/completions (stream=true 면 SSE chunk + "data: [DONE]", stream_options.include_usage 지원)
+- POST /api/generate (Ollama), /generate (free_llm_server) — llm_router provider 벤치용, 같은 지연 / 에러 주입
+- GET  /v1/models, /health, /stats (요청 수, 동시 요청 peak, replay hit 종류별 수)
+- 응답 텍스트:
+  - cassette 디렉터리(rc25s_llm_cassette 녹화)가 있으면 key → prompt_key 순으로 찾아서 재생
+  - 못 찾으면 fallback: synth(합성 응답) 또는 any(아무 녹화나 돌아가며)
+  - 합성 응답은 completion 토큰 분포만큼의 filler 텍스트
+    (요청에 "json"이 들어 있으면 {"stand_in": true, ...} JSON 한 덩어리 — reflection / LogRCA 파서가 기본값으로 채운다)
+- 지연: 분포는 "확률:값" 목록 (예: "0.9:0.3,0.1:2.0"), 뽑은 값에 ±10% 흔들림
+  - ttfb   : 첫 토큰까지 초
+  - rate   : 초당 토큰 수 (스트리밍이면 토큰마다, 아니면 전체 길이만큼 기다린다)
+  - recorded_latency=True 면 재생한 녹화의 ttfb_s / elapsed_s 를 그대로 쓴다
+- error_rate 만큼 500 (OpenAI 형식 error body) — gateway / 재시도 경로 벤치용
+
+- 사용:
+  python3 rc25s_llm_standin.py --port 8799 --cassettes logs/cassettes --ttfb "0.9:0.4,0.1:2" --rate "1:50"
+  OPENAI_BASE_URL=http://127.0.0.1:8799/v1 OPENAI_API_KEY=sk-standin python3 reflection_engine.py
+  벤치 코드에서는 serve_in_thread(StandInConfig(...)) → (server, base_url)
+    - server.stand_in.stats() / reset() 으로 벤치 구간별 요청 수, peak in-flight
+    - ssl_certfile / ssl_keyfile 을 주면 HTTPS (TLS 핸드셰이크 비용까지 재는 벤치)
+
+환경변수 (uvicorn rc25s_llm_standin:app 으로 띄울 때):
+- RC25S_STANDIN_CASSETTES          (cassette 디렉터리, 없으면 항상 합성)
+- RC25S_STANDIN_FALLBACK           (synth | any, 기본 synth)
+- RC25S_STANDIN_TTFB               (기본 "1:0.3")
+- RC25S_STANDIN_RATE               (기본 "1:60")
+- RC25S_STANDIN_COMPLETION_TOKENS  (기본 "1:120")
+- RC25S_STANDIN_RECORDED_LATENCY   (1이면 녹화된 지연 사용)
+- RC25S_STANDIN_ERROR_RATE         (기본 0)
+- RC25S_STANDIN_SEED               (기본 0)
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import re
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from rc25s_llm_cassette import CassetteLibrary, response_text
+from rc25s_prompt_builder import count_tokens
+
+FILLER = "the stand-in model reports that all rc25s subsystems look nominal for this benchmark cycle".split()
+
+
+def parse_distribution(spec: str) -> List[Tuple[float, float]]:
+    parts = []
+    for item in spec.split(","):
+        prob, _, value = item.partition(":")
+        parts.append((float(prob), float(value)))
+    return parts
+
+
+def draw(rng: random.Random, distribution: List[Tuple[float, float]]) -> float:
+    r, acc = rng.random(), 0.0
+    value = distribution[-1][1]
+    for prob, candidate in distribution:
+        acc += prob
+        if r <= acc:
+            value = candidate
+            break
+    return value * rng.uniform(0.9, 1.1)
+
+
+@dataclass
+class StandInConfig:
+    cassettes: str = ""
+    fallback: str = "synth"
+    ttfb: str = "1:0.3"
+    rate: str = "1:60"
+    completion_tokens: str = "1:120"
+    recorded_latency: bool = False
+    error_rate: float = 0.0
+    seed: int = 0
+
+    @classmethod
+    def from_env(cls) -> "StandInConfig":
+        return cls(
+            cassettes=os.getenv("RC25S_STANDIN_CASSETTES", ""),
+            fallback=os.getenv("RC25S_STANDIN_FALLBACK", "synth"),
+            ttfb=os.getenv("RC25S_STANDIN_TTFB", "1:0.3"),
+            rate=os.getenv("RC25S_STANDIN_RATE", "1:60"),
+            completion_tokens=os.getenv("RC25S_STANDIN_COMPLETION_TOKENS", "1:120"),
+            recorded_latency=os.getenv("RC25S_STANDIN_RECORDED_LATENCY", "0") == "1",
+            error_rate=float(os.getenv("RC25S_STANDIN_ERROR_RATE", "0")),
+            seed=int(os.getenv("RC25S_STANDIN_SEED", "0")),
+        )
+
+
+@dataclass
+class _Plan:
+    """요청 하나에 대해 돌려줄 텍스트와 지연."""
+
+    text: str
+    source: str
+    ttfb: float
+    per_token: float
+    fail: bool
+
+
+class StandIn:
+    def __init__(self, config: StandInConfig):
+        self.config = config
+        self.library = CassetteLibrary(config.cassettes) if config.cassettes and os.path.isdir(config.cassettes) else None
+        self.ttfb = parse_distribution(config.ttfb)
+        self.rate = parse_distribution(config.rate)
+        self.completion_tokens = parse_distribution(config.completion_tokens)
+        self._rng = random.Random(config.seed)
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.counters: Dict[str, int] = {"requests": 0, "streams": 0, "errors": 0, "in_flight": 0, "peak_in_flight": 0}
+        self.sources: Dict[str, int] = {}
+
+    # ---------- 응답 계획 ----------
+    def _synth(self, body: Dict[str, Any], rng: random.Random) -> str:
+        n = max(1, int(draw(rng, self.completion_tokens)))
+        words = [FILLER[i % len(FILLER)] for i in range(n)]
+        wants_json = (body.get("response_format") or {}).get("type") == "json_object" or "json" in json.dumps(
+            body.get("messages") or [], ensure_ascii=False
+        ).lower()
+        if wants_json:
+            return json.dumps({"stand_in": True, "insight": " ".join(words[:12]), "notes": " ".join(words)}, ensure_ascii=False)
+        return " ".join(words)
+
+    def plan(self, body: Dict[str, Any]) -> _Plan:
+        with self._lock:
+            rng = random.Random(self._rng.random())
+            fail = self._rng.random() < self.config.error_rate
+        found = self.library.lookup(body, fallback_any=self.config.fallback == "any") if self.library else None
+        if found is not None:
+            entry, source = found
+            text = response_text(entry)[0]
+        else:
+            entry, source = None, "synth"
+            text = self._synth(body, rng)
+        tokens = max(1, count_tokens(text))
+        if entry is not None and self.config.recorded_latency:
+            ttfb = float(entry.get("ttfb_s") or 0.0)
+            per_token = max(0.0, float(entry.get("elapsed_s") or 0.0) - ttfb) / tokens
+        else:
+            ttfb = draw(rng, self.ttfb)
+            per_token = 1.0 / max(1e-6, draw(rng, self.rate))
+        with self._lock:
+            self.sources[source] = self.sources.get(source, 0) + 1
+        return _Plan(text=text, source=source, ttfb=ttfb, per_token=per_token, fail=fail)
+
+    def _enter(self, stream: bool) -> None:
+        with self._lock:
+            self.counters["requests"] += 1
+            self.counters["streams"] += int(stream)
+            self.counters["in_flight"] += 1
+            self.counters["peak_in_flight"] = max(self.counters["peak_in_flight"], self.counters["in_flight"])
+
+    def _exit(self, failed: bool) -> None:
+        with self._lock:
+            self.counters["in_flight"] -= 1
+            self.counters["errors"] += int(failed)
+
+    def reset(self) -> None:
+        with self._lock:
+            for name in self.counters:
+                if name != "in_flight":
+                    self.counters[name] = 0
+            self.sources.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.counters,
+                "sources": dict(self.sources),
+                "cassette_entries": len(self.library) if self.library else 0,
+            }
+
+    # ---------- OpenAI 형식 ----------
+    def _usage(self, body: Dict[str, Any], plan: _Plan) -> Dict[str, int]:
+        prompt_tokens = count_tokens(body.get("messages") or [])
+        completion = count_tokens(plan.text)
+        return {"prompt_tokens": prompt_tokens, "completion_tokens": completion, "total_tokens": prompt_tokens + completion}
+
+    def completion(self, body: Dict[str, Any], plan: _Plan) -> Dict[str, Any]:
+        return {
+            "id": f"chatcmpl-standin-{next(self._ids)}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model") or "gpt-4o-mini",
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": plan.text}, "finish_reason": "stop"}],
+            "usage": self._usage(body, plan),
+            "system_fingerprint": f"rc25s-standin-{plan.source}",
+        }
+
+    async def chunks(self, body: Dict[str, Any], plan: _Plan):
+        chunk_id = f"chatcmpl-standin-{next(self._ids)}"
+        base = {"id": chunk_id, "object": "chat.completion.chunk", "created": int(time.time()), "model": body.get("model") or "gpt-4o-mini"}
+
+        def event(choices: List[Dict[str, Any]], **extra: Any) -> str:
+            return "data: " + json.dumps({**base, "choices": choices, **extra}, ensure_ascii=False) + "\n\n"
+
+        try:
+            await asyncio.sleep(plan.ttfb)
+            yield event([{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}])
+            for piece in re.findall(r"\s*\S+", plan.text) or [plan.text]:
+                yield event([{"index": 0, "delta": {"content": piece}, "finish_reason": None}])
+                await asyncio.sleep(plan.per_token * max(1, count_tokens(piece)))
+            yield event([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+            if (body.get("stream_options") or {}).get("include_usage"):
+                yield event([], usage=self._usage(body, plan))
+            yield "data: [DONE]\n\n"
+        finally:
+            self._exit(failed=False)
+
+
+def _error(status: int, message: str) -> JSONResponse:
+    return JSONResponse({"error": {"message": message, "type": "server_error", "code": None}}, status_code=status)
+
+
+def create_app(config: StandInConfig) -> FastAPI:
+    stand_in = StandIn(config)
+    app = FastAPI(title="RC25S LLM Stand-in")
+    app.state.stand_in = stand_in
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok", "model": "rc25s-standin"}
+
+    @app.get("/stats")
+    async def stats():
+        return stand_in.stats()
+
+    @app.get("/v1/models")
+    @app.get("/models")
+    async def models():
+        return {"object": "list", "data": [{"id": "gpt-4o-mini", "object": "model", "owned_by": "rc25s-standin"}]}
+
+    @app.post("/v1/chat/completions")
+    @app.post("/chat/completions")
+    async def chat_completions(req: Request):
+        try:
+            body = await req.json()
+        except ValueError:
+            return _error(400, "invalid JSON body")
+        stream = bool(body.get("stream"))
+        stand_in._enter(stream)
+        plan = stand_in.plan(body)
+        if plan.fail:
+            await asyncio.sleep(plan.ttfb)
+            stand_in._exit(failed=True)
+            return _error(500, "injected stand-in failure")
+        if stream:
+            return StreamingResponse(
+                stand_in.chunks(body, plan),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            )
+        try:
+            await asyncio.sleep(plan.ttfb + plan.per_token * count_tokens(plan.text))
+            return JSONResponse(stand_in.completion(body, plan))
+        finally:
+            stand_in._exit(failed=False)
+
+    async def generate(req: Request, reply) -> JSONResponse:
+        try:
+            body = await req.json()
+        except ValueError:
+            return JSONResponse({"error": "invalid JSON body"}, status_code=400)
+        chat_body = {"model": body.get("model"), "messages": [{"role": "user", "content": str(body.get("prompt") or "")}]}
+        stand_in._enter(False)
+        plan = stand_in.plan(chat_body)
+        try:
+            if plan.fail:
+                await asyncio.sleep(plan.ttfb)
+                return JSONResponse({"error": "injected stand-in failure"}, status_code=500)
+            await asyncio.sleep(plan.ttfb + plan.per_token * count_tokens(plan.text))
+            return JSONResponse(reply(plan.text))
+        finally:
+            stand_in._exit(failed=plan.fail)
+
+    @app.post("/api/generate")
+    async def ollama_generate(req: Request):
+        return await generate(req, lambda text: {"model": "rc25s-standin", "response": text, "done": True})
+
+    @app.post("/generate")
+    async def free_llm_generate(req: Request):
+        return await generate(req, lambda text: {"response": text, "metrics": {}})
+
+    return app
+
+
+def serve_in_thread(
+    config: StandInConfig,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    ssl_certfile: Optional[str] = None,
+    ssl_keyfile: Optional[str] = None,
+):
+    """
+    벤치용: 별도 스레드에서 uvicorn 으로 띄운다 → (uvicorn.Server, base_url).
+    server.stand_in 으로 카운터를 읽고, 끝낼 때 stop_server(server).
+    """
+    import uvicorn
+
+    # proto=IPPROTO_TCP 여야 asyncio가 accept한 연결에 TCP_NODELAY를 건다 (헤더 / 본문 write 사이 delayed ACK 40ms 방지).
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    app = create_app(config)
+    server = uvicorn.Server(
+        uvicorn.Config(app, log_level="warning", backlog=2048, ssl_certfile=ssl_certfile, ssl_keyfile=ssl_keyfile)
+    )
+    server.stand_in = app.state.stand_in
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True)
+    server.thread = thread
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    scheme = "https" if ssl_certfile else "http"
+    return server, f"{scheme}://{host}:{sock.getsockname()[1]}/v1"
+
+
+def stop_server(server, timeout: float = 5.0) -> None:
+    server.should_exit = True
+    server.thread.join(timeout)
+
+
+app = create_app(StandInConfig.from_env())
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    defaults = StandInConfig.from_env()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--cassettes", default=defaults.cassettes, help="rc25s_llm_cassette 녹화 디렉터리")
+    parser.add_argument("--fallback", choices=["synth", "any"], default=defaults.fallback)
+    parser.add_argument("--ttfb", default=defaults.ttfb, help="첫 토큰까지 지연 분포 (확률:초)")
+    parser.add_argument("--rate", default=defaults.rate, help="토큰 속도 분포 (확률:토큰/초)")
+    parser.add_argument("--completion-tokens", default=defaults.completion_tokens, help="합성 응답 길이 분포 (확률:토큰)")
+    parser.add_argument("--recorded-latency", action="store_true", default=defaults.recorded_latency)
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    config = StandInConfig(
+        cassettes=args.cassettes,
+        fallback=args.fallback,
+        ttfb=args.ttfb,
+        rate=args.rate,
+        completion_tokens=args.completion_tokens,
+        recorded_latency=args.recorded_latency,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -15,13 +15,16 @@
 from __future__ import annotations
 
 import json
-import os
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List
 
-from openai import OpenAI
-from world_state import load_world_state, save_world_state
+from rc25s_json_extract import extract_json
+from rc25s_llm_gateway import estimate_tokens, get_gateway
+from rc25s_log_tail import tail_lines
+from rc25s_openai_clients import get_openai_client
+from rc25s_prompt_builder import PromptBuilder, budget_for
+from world_state import append_log_rca, load_sections
 
 
 ROOT = Path(__file__).resolve().parent
@@ -34,38 +37,37 @@ LOG_FILES = {
     "executor": ROOT / "logs" / "rc25s_executor.log",
 }
 
+LOG_RCA_PROMPT_BUDGET = 6000  # RC25S_PROMPT_BUDGET_LOG_RCA 으로 덮어쓴다
 
-def _get_openai_client() -> OpenAI:
-    """
-    rc25s_openai_wrapper와 동일한 방식으로 API 키를 읽어 OpenAI 클라이언트를 생성한다.
-    - 1) /etc/openai_api_key.txt 우선
-    - 2) 없으면 환경변수 OPENAI_API_KEY 사용
-    """
-    api_key = None
-    key_path = "/etc/openai_api_key.txt"
-    if key_path and Path(key_path).exists():
-        try:
-            api_key = Path(key_path).read_text(encoding="utf-8").strip()
-        except Exception:
-            api_key = None
-
-    if not api_key:
-        api_key = os.getenv("OPENAI_API_KEY")
-
-    if not api_key or "$(" in str(api_key):
-        raise RuntimeError("No valid OPENAI_API_KEY or /etc/openai_api_key.txt found")
-
-    os.environ["OPENAI_API_KEY"] = api_key
-    return OpenAI(api_key=api_key)
-
+LOG_RCA_SCHEMA = """## Output JSON schema
+{
+  "rules": [
+    {
+      "id": "rule_nginx_404_agi",
+      "pattern": "Nginx /agi/ 404 or bad status in Self-Check/Autoheal logs",
+      "source": "autoheal,selfcheck,nginx_error",
+      "match_examples": ["간단한 한국어/영어 예시 1-2줄"],
+      "root_cause": "가장 가능성 높은 원인 설명 (한국어, 1-2문장)",
+      "confidence": 0.0-1.0
+    }
+  ],
+  "incidents": [
+    {
+      "id": "incident_2025_agi_404",
+      "time_range": "대략적인 발생 시간대 (예: 2025-11-18T12:00:00Z~2025-11-18T13:00:00Z)",
+      "severity": "low|medium|high|critical",
+      "services": ["nginx", "dashboard", "fastapi"],
+      "likely_root_cause": "요약된 원인 설명 (한국어, 1-2문장)",
+      "evidence": ["어떤 로그 라인이 근거인지 간단히 인용"],
+      "suggested_actions": [
+        "이 incident를 줄이기 위해 어떤 액션(task)이 필요한지 간단히 나열"
+      ]
+    }
+  ]
+}
 
-def _tail_lines(path: Path, n: int = 200) -> List[str]:
-    if not path.exists():
-        return []
-    try:
-        return path.read_text(encoding="utf-8", errors="ignore").splitlines()[-n:]
-    except Exception:
-        return []
+규칙 설명과 incident 설명은 한국어 중심으로 작성해도 된다.
+단, JSON 바깥에 자연어를 추가하지 말고, 위 schema에 맞는 하나의 JSON만 출력하라."""
 
 
 def _collect_log_snapshot() -> Dict[str, Any]:
@@ -74,10 +76,10 @@ def _collect_log_snapshot() -> Dict[str, Any]:
     """
     snapshot: Dict[str, Any] = {"logs": {}, "meta": {}}
     for name, path in LOG_FILES.items():
-        snapshot["logs"][name] = _tail_lines(path, n=120)
+        snapshot["logs"][name] = tail_lines(path, n=120)
     # world_state 일부도 같이 전달 (signals / last_actions / system)
     try:
-        ws = load_world_state()
+        ws = load_sections("planner", "last_actions", "system")
     except Exception:
         ws = {}
     snapshot["meta"]["planner_signals"] = (ws.get("planner") or {}).get("signals") or {}
@@ -89,10 +91,12 @@ def _collect_log_snapshot() -> Dict[str, Any]:
 def _build_prompt(snapshot: Dict[str, Any]) -> str:
     """
     LogRules / OpenRCA 스타일을 참고한 RCA 분석 프롬프트를 생성한다.
+    - 로그는 파일별 섹션(최근 줄 우선), world_state 요약은 meta 섹션으로 넣고
+      토큰 예산(RC25S_PROMPT_BUDGET_LOG_RCA)을 넘으면 로그 앞부분부터 줄인다.
     """
-    logs_json = json.dumps(snapshot, ensure_ascii=False, indent=2)
-    prompt = f"""
-You are RC25S LogRCAAgent.
+    builder = PromptBuilder(budget_for("log_rca", LOG_RCA_PROMPT_BUDGET))
+    builder.text(
+        """You are RC25S LogRCAAgent.
 
 Your job:
 - Read recent system logs and signals.
@@ -100,64 +104,33 @@ Your job:
 - Perform root cause analysis (RCA) for recent incidents.
 - Output ONLY valid JSON with the schema below.
 
-## Input snapshot
-{logs_json}
-
-## Output JSON schema
-{{
-  "rules": [
-    {{
-      "id": "rule_nginx_404_agi",
-      "pattern": "Nginx /agi/ 404 or bad status in Self-Check/Autoheal logs",
-      "source": "autoheal,selfcheck,nginx_error",
-      "match_examples": ["간단한 한국어/영어 예시 1-2줄"],
-      "root_cause": "가장 가능성 높은 원인 설명 (한국어, 1-2문장)",
-      "confidence": 0.0-1.0
-    }}
-  ],
-  "incidents": [
-    {{
-      "id": "incident_2025_agi_404",
-      "time_range": "대략적인 발생 시간대 (예: 2025-11-18T12:00:00Z~2025-11-18T13:00:00Z)",
-      "severity": "low|medium|high|critical",
-      "services": ["nginx", "dashboard", "fastapi"],
-      "likely_root_cause": "요약된 원인 설명 (한국어, 1-2문장)",
-      "evidence": ["어떤 로그 라인이 근거인지 간단히 인용"],
-      "suggested_actions": [
-        "이 incident를 줄이기 위해 어떤 액션(task)이 필요한지 간단히 나열"
-      ]
-    }}
-  ]
-}}
-
-규칙 설명과 incident 설명은 한국어 중심으로 작성해도 된다.
-단, JSON 바깥에 자연어를 추가하지 말고, 위 schema에 맞는 하나의 JSON만 출력하라.
-"""
-    return prompt
+## Input snapshot"""
+    )
+    for name, lines in snapshot["logs"].items():
+        if lines:
+            builder.section(f"log:{name}", "\n".join(lines), priority=30, keep="tail", header=f"### log: {name}")
+    meta = snapshot["meta"]
+    builder.section("planner_signals", meta.get("planner_signals"), priority=60, header="### planner_signals")
+    builder.section("last_actions", meta.get("last_actions"), priority=40, keep="tail", header="### last_actions")
+    builder.section("system", meta.get("system"), priority=50, header="### system")
+    builder.text(LOG_RCA_SCHEMA)
+    built = builder.build(caller="log_rca")
+    return built.text
 
 
 def _safe_parse_response(text: str) -> Dict[str, Any]:
     """
     LLM 응답을 최대한 안전하게 JSON으로 파싱한다.
     """
-    if not text or not isinstance(text, str):
-        return {"rules": [], "incidents": []}
-    # 가장 바깥쪽 { ... } 블록만 추출
-    start = text.find("{")
-    end = text.rfind("}")
-    if start == -1 or end == -1 or end <= start:
-        return {"rules": [], "incidents": []}
-    try:
-        obj = json.loads(text[start : end + 1])
-        if not isinstance(obj, dict):
-            return {"rules": [], "incidents": []}
-        if "rules" not in obj or not isinstance(obj.get("rules"), list):
-            obj["rules"] = []
-        if "incidents" not in obj or not isinstance(obj.get("incidents"), list):
-            obj["incidents"] = []
-        return obj
-    except Exception:
+    # 첫 번째로 완성된 top-level { ... } 객체 (코드펜스 / 설명 문장 속 중괄호는 건너뛴다)
+    obj = extract_json(text)
+    if not isinstance(obj, dict):
         return {"rules": [], "incidents": []}
+    if "rules" not in obj or not isinstance(obj.get("rules"), list):
+        obj["rules"] = []
+    if "incidents" not in obj or not isinstance(obj.get("incidents"), list):
+        obj["incidents"] = []
+    return obj
 
 
 def run_log_rca_agent() -> Dict[str, Any]:
@@ -168,29 +141,24 @@ def run_log_rca_agent() -> Dict[str, Any]:
     snapshot = _collect_log_snapshot()
     prompt = _build_prompt(snapshot)
 
-    # 직접 OpenAI 클라이언트를 사용해 LLM 호출
-    client = _get_openai_client()
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {
-                "role": "system",
-                "content": "너는 RC25S 시스템의 LogRCA 에이전트이다. 로그에서 규칙과 원인을 찾아 JSON으로만 답한다.",
-            },
-            {"role": "user", "content": prompt},
-        ],
-    )
+    # 공용 OpenAI 클라이언트(keep-alive 풀)로 LLM 호출
+    client = get_openai_client()
+    messages = [
+        {
+            "role": "system",
+            "content": "너는 RC25S 시스템의 LogRCA 에이전트이다. 로그에서 규칙과 원인을 찾아 JSON으로만 답한다.",
+        },
+        {"role": "user", "content": prompt},
+    ]
+    with get_gateway().slot("rca", estimate_tokens(messages), caller="log_rca") as lease:
+        response = client.chat.completions.create(model="gpt-4o-mini", messages=messages)
+        lease.used_tokens = getattr(getattr(response, "usage", None), "total_tokens", None)
     raw = response.choices[0].message.content
     parsed = _safe_parse_response(raw)
 
     rules = parsed.get("rules") or []
     incidents = parsed.get("incidents") or []
 
-    # world_state에 반영
-    ws = load_world_state()
-    existing_rules: List[Dict[str, Any]] = ws.get("log_rules") or []
-    existing_incidents: List[Dict[str, Any]] = ws.get("rca_history") or []
-
     now_iso = datetime.now(timezone.utc).isoformat()
 
     # rule / incident에 created_at 필드 보강
@@ -207,11 +175,8 @@ def run_log_rca_agent() -> Dict[str, Any]:
     rules = _ensure_created_at(rules)
     incidents = _ensure_created_at(incidents)
 
-    # 너무 길어지지 않도록 최근 N개만 유지
-    ws["log_rules"] = (existing_rules + rules)[-100:]
-    ws["rca_history"] = (existing_incidents + incidents)[-100:]
-
-    save_world_state(ws)
+    # world_state에 반영 (log_rules / rca_history 섹션만 갱신)
+    append_log_rca(rules, incidents)
 
     return {"rules_added": len(rules), "incidents_added": len(incidents)}
 
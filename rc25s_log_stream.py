@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+📡 RC25S Log Stream
+
+/ws/logs 구독자 전체가 공유하는 로그 follow 엔진 (프로세스당 1개).
+
+- 파일당 follower 1개 (rc25s_log_tail.read_since 커서 사용, 로테이션/truncate 처리)
+  - 구독자가 있는 파일만 따라가고, 마지막 구독자가 나가면 멈춘다.
+- FLUSH_MS(기본 100ms)마다 한 번: 파일 stat → 바뀐 파일만 새 줄을 읽음 → 구독자별 배치 프레임 전송
+  - 같은 필터(level/contains)를 쓰는 구독자들은 필터링도 한 번만 한다.
+  → 시청자가 20명이어도 파일 읽기는 1명일 때와 같다.
+- 구독자별 전송 큐는 크기 제한이 있고, 넘치면 가장 오래된 프레임을 버리고 dropped 수를 알려준다.
+
+프레임:
+- {"type": "log_sources", "sources": [...]}                 접속 직후, 구독 가능한 로그 이름
+- {"type": "log_lines", "lines": [{"source", "line", "level"}], "dropped": N}
+- {"type": "log_reset", "source": 이름}                      로테이션/truncate 감지
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from rc25s_log_tail import make_cursor, read_since, tail
+
+FLUSH_MS = float(os.getenv("RC25S_LOG_STREAM_FLUSH_MS", "100"))
+CLIENT_QUEUE = int(os.getenv("RC25S_LOG_STREAM_CLIENT_QUEUE", "16"))
+MAX_BATCH_LINES = 1000
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40, "CRITICAL": 50}
+_LEVEL_RE = re.compile(r"\b(DEBUG|INFO|WARN(?:ING)?|ERROR|CRITICAL|FATAL)\b", re.IGNORECASE)
+# 로그에 레벨 대신 이모지를 쓰는 스크립트가 많다.
+_EMOJI_LEVELS = (("❌", "ERROR"), ("🔥", "ERROR"), ("⚠️", "WARNING"), ("⚠", "WARNING"))
+
+FilterKey = Tuple[int, str]
+
+
+def line_level(line: str) -> str:
+    """줄에서 로그 레벨을 추정한다 (못 찾으면 INFO)."""
+    m = _LEVEL_RE.search(line)
+    if m:
+        word = m.group(1).upper()
+        return {"WARN": "WARNING", "FATAL": "CRITICAL"}.get(word, word)
+    for mark, level in _EMOJI_LEVELS:
+        if mark in line:
+            return level
+    return "INFO"
+
+
+def _filter_key(level: Optional[str], contains: Optional[str]) -> FilterKey:
+    return LEVELS.get(str(level or "").upper(), 0), str(contains or "").lower()
+
+
+class _Follower:
+    def __init__(self, name: str, path: str):
+        self.name = name
+        self.path = path
+        self.cursor: Optional[str] = None
+        self.stat_key: Optional[Tuple[int, int, int]] = None
+        self.start: Optional[Tuple[int, int]] = None  # 따라가기 시작한 시점의 (inode, 크기)
+        self.subscribers: Set["_Subscriber"] = set()
+
+
+class _Subscriber:
+    def __init__(self, websocket: Any, queue_size: int):
+        self.websocket = websocket
+        self.sources: Set[str] = set()
+        self.filter: FilterKey = (0, "")
+        self.pending: List[Dict[str, Any]] = []
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=max(1, queue_size))
+        self.dropped = 0
+        self.task: Optional[asyncio.Task] = None
+
+
+class LogStreamHub:
+    def __init__(self, sources: Dict[str, str], logs_dir: Optional[Path] = None, flush_ms: float = FLUSH_MS):
+        """
+        - sources: 고정 로그 {이름: 경로}
+        - logs_dir: 이 디렉터리의 *.log 도 "logs/<파일명>" 이름으로 구독할 수 있다.
+        """
+        self.fixed_sources = dict(sources)
+        self.logs_dir = Path(logs_dir) if logs_dir else None
+        self.interval = max(0.02, flush_ms / 1000.0)
+        self.followers: Dict[str, _Follower] = {}
+        self.subscribers: Dict[Any, _Subscriber] = {}
+        self.reads = 0
+        self._task: Optional[asyncio.Task] = None
+
+    # ---------- 소스 ----------
+    def available_sources(self) -> Dict[str, str]:
+        sources = dict(self.fixed_sources)
+        if self.logs_dir is not None and self.logs_dir.is_dir():
+            for p in sorted(self.logs_dir.glob("*.log")):
+                sources[f"logs/{p.name}"] = str(p)
+        return sources
+
+    # ---------- 구독 ----------
+    async def subscribe(
+        self,
+        websocket: Any,
+        sources: Iterable[str],
+        level: Optional[str] = None,
+        contains: Optional[str] = None,
+        backlog: int = 0,
+    ) -> List[str]:
+        """구독(또는 구독 변경). 알 수 없는 이름은 무시하고, 실제로 구독한 이름 목록을 돌려준다."""
+        sub = self.subscribers.get(websocket)
+        if sub is None:
+            sub = _Subscriber(websocket, CLIENT_QUEUE)
+            sub.task = asyncio.create_task(self._sender(sub))
+            self.subscribers[websocket] = sub
+        available = self.available_sources()
+        wanted = {s for s in sources if s in available}
+        sub.filter = _filter_key(level, contains)
+
+        for name in sub.sources - wanted:
+            self._detach(sub, name)
+        added = sorted(wanted - sub.sources)
+        for name in added:
+            follower = self.followers.get(name)
+            if follower is None:
+                follower = self.followers[name] = _Follower(name, available[name])
+                if self._changed(follower):
+                    follower.start = follower.stat_key[:2]
+            follower.subscribers.add(sub)
+        sub.sources = wanted
+        if backlog > 0 and added:
+            # 새로 구독한 파일의 마지막 backlog줄 (파일 읽기는 이벤트 루프 밖에서)
+            tails = await asyncio.to_thread(lambda: [tail(available[name], backlog)[0] for name in added])
+            for name, lines in zip(added, tails):
+                sub.pending.extend(self._filtered(name, lines, sub.filter))
+
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        return sorted(wanted)
+
+    def _detach(self, sub: _Subscriber, name: str) -> None:
+        follower = self.followers.get(name)
+        if follower is None:
+            return
+        follower.subscribers.discard(sub)
+        if not follower.subscribers:
+            del self.followers[name]
+
+    def unsubscribe(self, websocket: Any) -> None:
+        sub = self.subscribers.pop(websocket, None)
+        if sub is None:
+            return
+        for name in list(sub.sources):
+            self._detach(sub, name)
+        if sub.task is not None and sub.task is not asyncio.current_task():
+            sub.task.cancel()
+
+    # ---------- follow 루프 ----------
+    @staticmethod
+    def _filtered(name: str, lines: List[str], key: FilterKey) -> List[Dict[str, Any]]:
+        min_level, needle = key
+        out = []
+        for line in lines:
+            level = line_level(line)
+            if LEVELS[level] < min_level:
+                continue
+            if needle and needle not in line.lower():
+                continue
+            out.append({"source": name, "line": line, "level": level})
+        return out
+
+    def _changed(self, follower: _Follower) -> bool:
+        try:
+            st = os.stat(follower.path)
+        except FileNotFoundError:
+            return False
+        key = (st.st_ino, st.st_size, st.st_mtime_ns)
+        if key == follower.stat_key:
+            return False
+        follower.stat_key = key
+        return True
+
+    def _read(self, follower: _Follower) -> Dict[str, Any]:
+        if follower.cursor is None:
+            # 따라가기 시작할 때 이미 있던 내용은 보내지 않는다 (backlog는 subscribe에서 따로 보냄).
+            # 그 뒤에 생긴 파일은 처음부터 읽는다.
+            follower.cursor = make_cursor(*(follower.start or (follower.stat_key[0], 0)))
+        result = read_since(follower.path, follower.cursor)
+        follower.cursor = result["cursor"]
+        return result
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self._tick()
+            except Exception as e:
+                print(f"⚠️ log stream 오류: {e}")
+
+    async def _tick(self) -> None:
+        changed = [f for f in list(self.followers.values()) if self._changed(f)]
+        if changed:
+            results = await asyncio.to_thread(lambda: [self._read(f) for f in changed])
+            self.reads += len(changed)
+            for follower, result in zip(changed, results):
+                if result["reset"]:
+                    for sub in follower.subscribers:
+                        self._offer(sub, {"type": "log_reset", "source": follower.name})
+                if not result["lines"]:
+                    continue
+                # 같은 필터를 쓰는 구독자끼리는 필터링 결과를 공유한다.
+                by_filter: Dict[FilterKey, List[Dict[str, Any]]] = {}
+                for sub in follower.subscribers:
+                    if sub.filter not in by_filter:
+                        by_filter[sub.filter] = self._filtered(follower.name, result["lines"], sub.filter)
+                    sub.pending.extend(by_filter[sub.filter])
+        for sub in self.subscribers.values():
+            if sub.pending:
+                lines, sub.pending = sub.pending[-MAX_BATCH_LINES:], []
+                self._offer(sub, {"type": "log_lines", "lines": lines})
+
+    # ---------- 전송 ----------
+    @staticmethod
+    def _offer(sub: _Subscriber, frame: Dict[str, Any]) -> None:
+        if sub.queue.full():
+            old = sub.queue.get_nowait()
+            sub.dropped += len(old.get("lines") or [])
+        sub.queue.put_nowait(frame)
+
+    async def _sender(self, sub: _Subscriber) -> None:
+        while True:
+            frame = await sub.queue.get()
+            if frame.get("type") == "log_lines":
+                frame["dropped"], sub.dropped = sub.dropped, 0
+            try:
+                await sub.websocket.send_json(frame)
+            except Exception:
+                self.unsubscribe(sub.websocket)
+                return
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": len(self.subscribers),
+            "followed_files": sorted(self.followers),
+            "file_reads": self.reads,
+        }
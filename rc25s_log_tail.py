@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+📜 RC25S Log Tail
+
+`tail -n` / `tail -f`를 프로세스 안에서 대신하는 로그 읽기 유틸리티.
+
+- tail_lines(path, n): 파일 끝에서부터 BLOCK_SIZE 단위로 거꾸로 읽어 마지막 n줄만 돌려준다
+  (파일 전체를 읽지 않는다, 셸/프로세스 생성 없음).
+- tail(path, n) → (lines, cursor)
+- read_since(path, cursor) → 커서 이후에 추가된 줄만 읽는다.
+  - 커서: "<inode>:<바이트 오프셋>" 문자열 (호출자는 내용을 해석하지 말고 그대로 돌려주면 된다)
+  - 로테이션(inode 변경): <path>.1 이 이전 inode이면 거기 남은 부분을 먼저 읽고, 새 파일은 처음부터 읽는다.
+  - truncate(크기 < 오프셋): 처음부터 다시 읽는다.
+  - 한 번에 최대 max_bytes까지만 읽고, 끝이 줄 중간이면 그 줄은 다음 호출로 넘긴다.
+- encode_cursors / decode_cursors: 여러 파일의 커서를 URL에 넣기 좋은 토큰 하나로 묶는다.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+BLOCK_SIZE = 64 * 1024
+MAX_READ_BYTES = 512 * 1024
+
+PathLike = Union[str, Path]
+
+
+def _decode(data: bytes) -> List[str]:
+    return data.decode("utf-8", errors="replace").splitlines()
+
+
+def make_cursor(inode: int, offset: int) -> str:
+    return f"{inode}:{offset}"
+
+
+def parse_cursor(cursor: Optional[str]) -> Optional[Tuple[int, int]]:
+    try:
+        inode, offset = str(cursor).split(":", 1)
+        return int(inode), int(offset)
+    except (AttributeError, ValueError):
+        return None
+
+
+def _tail_fd(f: Any, size: int, n: int, block_size: int = BLOCK_SIZE) -> List[str]:
+    """열린 파일의 [0, size) 구간에서 마지막 n줄."""
+    if n <= 0 or size <= 0:
+        return []
+    pos = size
+    buf = b""
+    # 마지막 줄이 개행으로 끝나면 그 개행은 세지 않는다.
+    f.seek(size - 1)
+    wanted = n + 1 if f.read(1) == b"\n" else n
+    while pos > 0 and buf.count(b"\n") < wanted:
+        step = min(block_size, pos)
+        pos -= step
+        f.seek(pos)
+        buf = f.read(step) + buf
+    lines = _decode(buf)
+    if pos > 0 and len(lines) > n:
+        # 블록 경계에서 잘린 첫 줄은 버린다.
+        lines = lines[1:]
+    return lines[-n:]
+
+
+def tail(path: PathLike, n: int = 40, block_size: int = BLOCK_SIZE) -> Tuple[List[str], Optional[str]]:
+    """마지막 n줄과 현재 끝 위치 커서. 파일이 없으면 ([], None)."""
+    try:
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            return _tail_fd(f, st.st_size, n, block_size), make_cursor(st.st_ino, st.st_size)
+    except FileNotFoundError:
+        return [], None
+
+
+def tail_lines(path: PathLike, n: int = 200) -> List[str]:
+    """마지막 n줄 (파일이 없거나 읽을 수 없으면 빈 리스트)."""
+    try:
+        return tail(path, n)[0]
+    except OSError:
+        return []
+
+
+def _read_range(f: Any, offset: int, end: int, capped: bool) -> Tuple[bytes, int]:
+    """
+    [offset, end) 를 읽되, 끝이 줄 중간이면 마지막 개행까지만. → (데이터, 다음 오프셋)
+    capped: 읽기 한도 때문에 end가 잘린 경우 (개행이 없으면 아주 긴 한 줄로 보고 그대로 넘긴다)
+    """
+    f.seek(offset)
+    data = f.read(max(0, end - offset))
+    cut = data.rfind(b"\n")
+    if cut == -1:
+        return (data, offset + len(data)) if capped else (b"", offset)
+    return data[: cut + 1], offset + cut + 1
+
+
+def read_since(path: PathLike, cursor: Optional[str], max_bytes: int = MAX_READ_BYTES, n: int = 40) -> Dict[str, Any]:
+    """
+    cursor 이후 새로 추가된 줄.
+    - 반환: {"lines": [...], "cursor": 다음 커서, "reset": 로테이션/truncate 여부, "more": 아직 남은 데이터 여부}
+    - cursor가 없거나 해석할 수 없으면 tail(n)과 같다.
+    """
+    parsed = parse_cursor(cursor)
+    path = Path(path)
+    if parsed is None:
+        lines, new_cursor = tail(path, n)
+        return {"lines": lines, "cursor": new_cursor, "reset": False, "more": False}
+    inode, offset = parsed
+    lines: List[str] = []
+    reset = False
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return {"lines": [], "cursor": cursor, "reset": False, "more": False}
+    with f:
+        st = os.fstat(f.fileno())
+        if st.st_ino != inode:
+            reset = True
+            # 로테이션: 이전 파일(<path>.1)에 못 읽은 부분이 남아 있으면 먼저 읽는다.
+            rotated = path.with_name(path.name + ".1")
+            try:
+                with open(rotated, "rb") as old:
+                    old_st = os.fstat(old.fileno())
+                    if old_st.st_ino == inode and old_st.st_size > offset:
+                        # 회전된 파일에는 더 이상 쓰이지 않으므로 끝까지(한도 안에서) 읽는다.
+                        data, _ = _read_range(old, offset, min(old_st.st_size, offset + max_bytes), True)
+                        lines.extend(_decode(data))
+            except FileNotFoundError:
+                pass
+            offset = 0
+        elif st.st_size < offset:
+            reset = True  # truncate
+            offset = 0
+        end = min(st.st_size, offset + max_bytes)
+        data, next_offset = _read_range(f, offset, end, end < st.st_size)
+        lines.extend(_decode(data))
+        return {
+            "lines": lines,
+            "cursor": make_cursor(st.st_ino, next_offset),
+            "reset": reset,
+            "more": end < st.st_size,
+        }
+
+
+def encode_cursors(cursors: Dict[str, Optional[str]]) -> str:
+    """{이름: 커서} → URL-safe 토큰."""
+    raw = json.dumps({k: v for k, v in cursors.items() if v}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursors(token: Optional[str]) -> Dict[str, str]:
+    if not token:
+        return {}
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        data = json.loads(raw)
+        return {str(k): str(v) for k, v in data.items()} if isinstance(data, dict) else {}
+    except (ValueError, TypeError):
+        return {}
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+🔌 RC25S OpenAI Clients
+
+프로세스 안에서 같이 쓰는 OpenAI 클라이언트 (sync 1개 + 이벤트 루프별 async 1개).
+
+- 예전에는 호출마다 /etc/openai_api_key.txt 를 읽고 OpenAI() 를 새로 만들어서
+  매번 새 커넥션 풀 → TCP + TLS 핸드셰이크를 다시 했다. 이제는 keep-alive 풀을 재사용한다.
+- API 키는 키 파일의 mtime/size 가 바뀌었을 때만 다시 읽는다 (stat 한 번).
+  키가 바뀌면 클라이언트를 새로 만든다. 진행 중인 호출은 예전 클라이언트로 끝까지 간다.
+- 키 우선순위: 1) 키 파일  2) 환경변수 OPENAI_API_KEY  ("$(" 가 들어간 값은 미치환 셸 문자열로 보고 무시)
+- OPENAI_BASE_URL 은 openai 패키지가 그대로 읽는다 (로컬 stand-in 서버 벤치 등).
+- get_async_openai_client() 는 호출한 이벤트 루프마다 따로 만든다 (httpx AsyncClient는 루프에 묶인다).
+- RC25S_LLM_RECORD 가 설정돼 있으면 transport 를 rc25s_llm_cassette 녹화 transport 로 감싼다 (요청/응답 cassette).
+- stats(): 클라이언트 생성 수 / 재사용 수 / 키 재로드 수
+
+환경변수:
+- RC25S_OPENAI_KEY_FILE        (기본 /etc/openai_api_key.txt)
+- RC25S_OPENAI_TIMEOUT         (기본 120초)
+- RC25S_OPENAI_MAX_CONNECTIONS (기본 20)
+- RC25S_OPENAI_KEEPALIVE       (기본 10, 풀에 남겨 두는 idle 커넥션 수)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+KEY_FILE = os.getenv("RC25S_OPENAI_KEY_FILE", "/etc/openai_api_key.txt")
+TIMEOUT = float(os.getenv("RC25S_OPENAI_TIMEOUT", "120"))
+MAX_CONNECTIONS = int(os.getenv("RC25S_OPENAI_MAX_CONNECTIONS", "20"))
+KEEPALIVE = int(os.getenv("RC25S_OPENAI_KEEPALIVE", "10"))
+
+_lock = threading.Lock()
+_key_cache: Dict[str, Any] = {"stamp": None, "key": None}
+_sync_client: Optional[Tuple[str, Any]] = None  # (api_key, OpenAI)
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[str, Any]]" = weakref.WeakKeyDictionary()
+_counters = {"builds": 0, "reuses": 0, "key_reloads": 0}
+
+
+def _valid(key: Optional[str]) -> bool:
+    return bool(key) and "$(" not in str(key)
+
+
+def _file_key() -> Optional[str]:
+    """키 파일이 바뀌었을 때만 다시 읽는다. 호출 측에서 _lock 을 잡고 있어야 한다."""
+    try:
+        st = os.stat(KEY_FILE)
+    except OSError:
+        _key_cache.update(stamp=None, key=None)
+        return None
+    stamp = (st.st_mtime_ns, st.st_size, st.st_ino)
+    if stamp != _key_cache["stamp"]:
+        try:
+            with open(KEY_FILE, encoding="utf-8") as f:
+                key = f.read().strip()
+        except OSError:
+            key = None
+        _key_cache.update(stamp=stamp, key=key)
+        _counters["key_reloads"] += 1
+    return _key_cache["key"]
+
+
+def resolve_api_key() -> Optional[str]:
+    """현재 유효한 API 키 (없으면 None). 찾으면 OPENAI_API_KEY 환경변수도 맞춰 둔다."""
+    with _lock:
+        key = _file_key()
+    if not _valid(key):
+        key = os.getenv("OPENAI_API_KEY")
+    if not _valid(key):
+        return None
+    os.environ["OPENAI_API_KEY"] = key
+    return key
+
+
+def _require_key() -> str:
+    key = resolve_api_key()
+    if key is None:
+        raise RuntimeError(f"No valid OPENAI_API_KEY or {KEY_FILE} found")
+    return key
+
+
+def _limits():
+    import httpx
+
+    return httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=KEEPALIVE)
+
+
+def _http_client(is_async: bool):
+    """keep-alive 풀이 있는 httpx 클라이언트 (녹화 중이면 cassette transport 로 감싼다)."""
+    import httpx
+
+    from rc25s_llm_cassette import AsyncRecordingTransport, RecordingTransport, get_writer
+
+    writer = get_writer()
+    if is_async:
+        transport = httpx.AsyncHTTPTransport(limits=_limits())
+        if writer is not None:
+            transport = AsyncRecordingTransport(transport, writer)
+        return httpx.AsyncClient(transport=transport, timeout=TIMEOUT)
+    transport = httpx.HTTPTransport(limits=_limits())
+    if writer is not None:
+        transport = RecordingTransport(transport, writer)
+    return httpx.Client(transport=transport, timeout=TIMEOUT)
+
+
+def get_openai_client():
+    """프로세스 공용 sync OpenAI 클라이언트 (키가 바뀌면 새로 만든다)."""
+    global _sync_client
+    key = _require_key()
+    with _lock:
+        if _sync_client is not None and _sync_client[0] == key:
+            _counters["reuses"] += 1
+            return _sync_client[1]
+        from openai import OpenAI
+
+        client = OpenAI(api_key=key, timeout=TIMEOUT, http_client=_http_client(is_async=False))
+        _sync_client = (key, client)
+        _counters["builds"] += 1
+        return client
+
+
+def get_async_openai_client():
+    """현재 이벤트 루프용 AsyncOpenAI 클라이언트 (루프마다 1개, 키가 바뀌면 새로 만든다)."""
+    loop = asyncio.get_running_loop()
+    key = _require_key()
+    with _lock:
+        cached = _async_clients.get(loop)
+        if cached is not None and cached[0] == key:
+            _counters["reuses"] += 1
+            return cached[1]
+        from openai import AsyncOpenAI
+
+        client = AsyncOpenAI(api_key=key, timeout=TIMEOUT, http_client=_http_client(is_async=True))
+        _async_clients[loop] = (key, client)
+        _counters["builds"] += 1
+        return client
+
+
+def stats() -> Dict[str, Any]:
+    with _lock:
+        return {
+            **_counters,
+            "key_file": KEY_FILE,
+            "sync_client": _sync_client is not None,
+            "async_clients": len(_async_clients),
+            "recording": os.getenv("RC25S_LLM_RECORD") or None,
+        }
@@ -1,52 +1,36 @@
+import asyncio
+import collections
 import os
+import threading
 import time
 import json
 from pathlib import Path
+from typing import Any, AsyncIterator, Iterator, List, Optional, Tuple
 
-import psutil
-from openai import OpenAI
 from vibecoding.rc25_kernel_RC25S import RC25SKernel
+from rc25s_llm_cache import LLMResponseCache, normalize_prompt
+from rc25s_llm_gateway import estimate_tokens, get_gateway
+from rc25s_openai_clients import get_async_openai_client, get_openai_client
+from rc25s_system_stats import get_system_stats_sampler
+from world_state import current_revision, load_sections, run_io
+from world_state_store import file_lock
 
 
 kernel = RC25SKernel()
-
-
-def _get_openai_client() -> OpenAI:
-    """
-    항상 /etc/openai_api_key.txt 를 우선 사용해 OpenAI 클라이언트를 생성한다.
-    - 순서:
-      1) /etc/openai_api_key.txt가 있으면 그 값을 사용
-      2) 없을 때만 환경변수 OPENAI_API_KEY 사용
-    """
-    api_key = None
-    key_path = "/etc/openai_api_key.txt"
-    if os.path.exists(key_path):
-        try:
-            api_key = open(key_path).read().strip()
-        except Exception:
-            api_key = None
-
-    if not api_key:
-        api_key = os.getenv("OPENAI_API_KEY")
-
-    if not api_key or "$(" in str(api_key):
-        raise RuntimeError("No valid OPENAI_API_KEY or /etc/openai_api_key.txt found")
-
-    # 환경변수도 최신 값으로 맞춰 둔다 (다른 코드 호환용)
-    os.environ["OPENAI_API_KEY"] = api_key
-    return OpenAI(api_key=api_key)
+# 같은/거의 같은 질문 + 같은 world_state revision 이면 OpenAI를 다시 부르지 않는다.
+llm_cache = LLMResponseCache()
+# 헬스 체크용 프롬프트 (selfcheck / autotest / executor 가 /llm 에 보내는 "ping" 등): provider까지 가지 않고 바로 답한다.
+HEALTH_PROBE_PROMPTS = {"ping", "health", "healthcheck", "health check"}
 
 
 def _load_world_state_snapshot() -> str:
     """
-    world_state.json에서 LLM이 이해하기 쉬운 요약만 뽑아서 JSON 문자열로 반환한다.
-    파일이 없거나 파싱에 실패해도 에러를 내지 않고 빈 객체를 돌려준다.
+    world_state에서 LLM이 이해하기 쉬운 요약만 뽑아서 JSON 문자열로 반환한다.
+    - world_state의 프로세스 로컬 캐시를 사용하므로, 상태가 바뀌지 않았으면 다시 파싱하지 않는다.
+    - 로드에 실패해도 에러를 내지 않고 빈 객체를 돌려준다.
     """
     try:
-        ws_path = Path("/srv/repo/vibecoding/world_state.json")
-        if not ws_path.exists():
-            return "{}"
-        data = json.loads(ws_path.read_text(encoding="utf-8"))
+        data = load_sections("updated_at", "core", "reflection", "planner")
         # 너무 장황하지 않게 핵심만 요약
         summary = {
             "updated_at": data.get("updated_at"),
@@ -66,32 +50,101 @@ def _load_world_state_snapshot() -> str:
 def _get_system_stats_summary() -> str:
     """
     현재 서버의 간단한 상태 요약을 문자열로 반환한다.
+    /ws/system2 와 같은 SystemStatsSampler 의 마지막 샘플을 쓴다 (psutil.cpu_percent 의 전역 기준점을 건드리지 않는다).
     psutil 사용이 실패해도 안전하게 빈 문자열을 돌려준다.
     """
+    return get_system_stats_sampler().summary()
+
+
+# 요청별 TTFT / 전체 지연 기록 (최근 LATENCY_WINDOW건은 메모리, 전부 logs/llm_latency.jsonl)
+# 파일이 LATENCY_LOG_MAX_BYTES를 넘으면 llm_latency.jsonl.1 … .LATENCY_LOG_BACKUPS 로 밀어낸다 (logrotate 형식, /ws/logs tail 이 따라간다).
+LATENCY_WINDOW = 500
+LATENCY_LOG_PATH = Path(__file__).resolve().parent / "logs" / "llm_latency.jsonl"
+LATENCY_LOG_MAX_BYTES = int(os.getenv("RC25S_LLM_LATENCY_LOG_MAX_BYTES", str(8 * 1024 * 1024)))
+LATENCY_LOG_BACKUPS = int(os.getenv("RC25S_LLM_LATENCY_LOG_BACKUPS", "3"))
+_latency = collections.deque(maxlen=LATENCY_WINDOW)
+_latency_lock = threading.Lock()
+
+
+def record_latency(source: str, ttft: Optional[float], total: float, model: str, stream: bool) -> dict:
+    """LLM 요청 1건의 첫 토큰까지 시간(ttft)과 전체 시간(total)을 기록한다 (초 단위)."""
+    entry = {
+        "ts": time.time(),
+        "source": source,
+        "model": model,
+        "stream": stream,
+        "ttft": round(ttft, 3) if ttft is not None else None,
+        "total": round(total, 3),
+    }
+    with _latency_lock:
+        _latency.append(entry)
     try:
-        cpu = psutil.cpu_percent(interval=None)
-        mem = psutil.virtual_memory().percent
-        disk = psutil.disk_usage("/").percent
-        return f"CPU={cpu}%, MEM={mem}%, DISK={disk}%"
-    except Exception:
-        return ""
+        path = LATENCY_LOG_PATH
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            size = os.fstat(f.fileno()).st_size
+        if size > LATENCY_LOG_MAX_BYTES:
+            _rotate_latency_log(path)
+    except OSError:
+        pass
+    return entry
+
+
+def _rotate_latency_log(path: Path) -> None:
+    """path → path.1 → … → path.N (가장 오래된 것은 버린다). 여러 프로세스가 같은 파일에 쓰므로 flock 아래에서 크기를 다시 본다."""
+    with file_lock(path.with_name(path.name + ".lock")):
+        try:
+            if path.stat().st_size <= LATENCY_LOG_MAX_BYTES:
+                return  # 다른 프로세스가 먼저 돌렸다
+        except FileNotFoundError:
+            return
+        if LATENCY_LOG_BACKUPS <= 0:
+            os.truncate(path, 0)
+            return
+        for i in range(LATENCY_LOG_BACKUPS - 1, 0, -1):
+            older = path.with_name(f"{path.name}.{i}")
+            if older.exists():
+                os.replace(older, path.with_name(f"{path.name}.{i + 1}"))
+        os.replace(path, path.with_name(path.name + ".1"))
+
+
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(round(pct / 100.0 * (len(values) - 1))))], 3)
 
 
-def rc25s_chat(prompt: str, history=None, model: str = "gpt-4o-mini") -> dict:
+def latency_summary() -> dict:
+    """최근 요청들의 TTFT / 전체 지연 p50·p95 (/health 용)."""
+    with _latency_lock:
+        entries = list(_latency)
+    ttft = [e["ttft"] for e in entries if e["ttft"] is not None]
+    total = [e["total"] for e in entries]
+    return {
+        "count": len(entries),
+        "ttft_p50": _percentile(ttft, 50),
+        "ttft_p95": _percentile(ttft, 95),
+        "total_p50": _percentile(total, 50),
+        "total_p95": _percentile(total, 95),
+    }
+
+
+def _build_messages(prompt: str, world_state_json: Optional[str] = None, system_stats: Optional[str] = None) -> List[dict]:
     """
-    RC25S용 LLM 래퍼 (안정성 우선 버전):
-    - RC25S Kernel 메타컨트롤(mode, self_reflect)을 먼저 적용
-    - world_state 스냅샷과 서버 상태 요약을 system 프롬프트에 포함
-    - 항상 한국어로 답변하고, 자신을 'RC25S Self-Improvement 시스템의 LLM 모듈'로 인식하도록 안내
-    - 아직은 안전을 위해 actions 기반 자동 실행은 사용하지 않고, 답변만 돌려준다.
+    RC25S Kernel 메타컨트롤(mode, self_reflect) + world_state 스냅샷 + 서버 상태 요약을 넣은 messages.
+    (rc25s_chat / rc25s_chat_stream / rc25s_achat 공통. async 경로는 미리 읽어 둔 요약을 넘긴다.)
     """
-    start = time.time()
     mode = kernel.detect_mode(prompt)
     reflection = kernel.self_reflect(prompt)
     meta_prompt = f"[MODE:{mode}] [REFLECT:{reflection}]\n{prompt}"
 
-    world_state_json = _load_world_state_snapshot()
-    system_stats = _get_system_stats_summary()
+    if world_state_json is None:
+        world_state_json = _load_world_state_snapshot()
+    if system_stats is None:
+        system_stats = _get_system_stats_summary()
 
     system_message = (
         "너는 'RC25S Self-Improvement System'의 일부인 LLM 모듈이다. "
@@ -112,18 +165,74 @@ def rc25s_chat(prompt: str, history=None, model: str = "gpt-4o-mini") -> dict:
         "- Planner/Executor/Self-Check를 실제로 실행해야 한다고 판단되면, "
         "사용자에게 어떤 버튼(Planner 실행 / Executor 1회 실행 / Self-Check)을 눌러야 하는지 구체적으로 안내한다.\n"
     )
+    return [
+        {"role": "system", "content": system_message},
+        {"role": "user", "content": meta_prompt},
+    ]
 
-    client = _get_openai_client()
-    response = client.chat.completions.create(
-        model=model,
-        messages=[
-            {"role": "system", "content": system_message},
-            {"role": "user", "content": meta_prompt},
-        ],
-    )
+
+def _is_health_probe(prompt: str) -> bool:
+    return normalize_prompt(prompt) in HEALTH_PROBE_PROMPTS
+
+
+def _current_revision() -> Any:
+    try:
+        return current_revision()
+    except Exception:
+        return None
+
+
+def _cached_reply(prompt: str, model: str, bypass: bool, revision: Any = None):
+    """
+    provider 없이 답할 수 있으면 (응답 텍스트, 출처 "probe"|"exact"|"near", revision), 아니면 (None, None, revision).
+    revision 을 안 주면 world_state에서 읽는다.
+    """
+    if _is_health_probe(prompt):
+        return "pong", "probe", None
+    if revision is None:
+        revision = _current_revision()
+    hit = llm_cache.get(prompt, model, revision, bypass=bypass)
+    if hit is None:
+        return None, None, revision
+    return hit[1], hit[0], revision
+
+
+def _cached_result(text: str, source: str, start: float) -> dict:
+    metrics = kernel.report_kpi()
+    metrics["response_time"] = round(time.time() - start, 3)
+    metrics["cache"] = source
+    return {"response": text, "actions": [], "metrics": metrics}
+
+
+def rc25s_chat(
+    prompt: str, history=None, model: str = "gpt-4o-mini", cache: bool = True, priority: str = "interactive", caller: str = "rc25s_chat"
+) -> dict:
+    """
+    RC25S용 LLM 래퍼 (안정성 우선 버전):
+    - RC25S Kernel 메타컨트롤(mode, self_reflect)을 먼저 적용
+    - world_state 스냅샷과 서버 상태 요약을 system 프롬프트에 포함
+    - 항상 한국어로 답변하고, 자신을 'RC25S Self-Improvement 시스템의 LLM 모듈'로 인식하도록 안내
+    - 아직은 안전을 위해 actions 기반 자동 실행은 사용하지 않고, 답변만 돌려준다.
+    - 헬스 체크 프롬프트는 로컬에서 바로 답하고, 같은/거의 같은 질문은 llm_cache 에서 돌려준다
+      (cache=False 이면 캐시를 건너뛴다, metrics["cache"]에 출처 표시).
+    - provider 호출은 rc25s_llm_gateway 의 priority 슬롯 안에서 한다
+      (background 호출은 interactive 부하가 높으면 LLMShedError로 버려질 수 있다).
+    """
+    start = time.time()
+    cached, source, revision = _cached_reply(prompt, model, bypass=not cache)
+    if cached is not None:
+        return _cached_result(cached, source, start)
+    messages = _build_messages(prompt)
+
+    client = get_openai_client()
+    with get_gateway().slot(priority, estimate_tokens(messages), caller) as lease:
+        response = client.chat.completions.create(model=model, messages=messages)
+        lease.used_tokens = getattr(getattr(response, "usage", None), "total_tokens", None)
 
     text = response.choices[0].message.content
+    llm_cache.put(prompt, model, text, revision)
     elapsed = round(time.time() - start, 3)
+    record_latency("rc25s_chat", None, elapsed, model, stream=False)
     metrics = kernel.report_kpi()
     metrics["response_time"] = elapsed
 
@@ -131,3 +240,179 @@ def rc25s_chat(prompt: str, history=None, model: str = "gpt-4o-mini") -> dict:
     return {"response": text, "actions": [], "metrics": metrics}
 
 
+def rc25s_chat_stream(
+    prompt: str,
+    history=None,
+    model: str = "gpt-4o-mini",
+    source: str = "rc25s_chat",
+    cache: bool = True,
+    priority: str = "interactive",
+) -> Iterator[dict]:
+    """
+    rc25s_chat 의 스트리밍 버전 (같은 프롬프트 구성, 같은 캐시).
+    - {"type": "delta", "text": ...} 를 토큰이 오는 대로 yield 하고,
+    - 마지막에 {"type": "done", "response": 전체 답변, "actions": [], "metrics": {..., "ttft", "response_time"}}.
+    - TTFT(첫 토큰까지 시간)와 전체 시간은 record_latency 로 기록된다.
+    - 캐시 hit이면 delta 한 번 + done 으로 바로 끝난다.
+    """
+    start = time.time()
+    cached, cache_source, revision = _cached_reply(prompt, model, bypass=not cache)
+    if cached is not None:
+        yield {"type": "delta", "text": cached}
+        yield {"type": "done", **_cached_result(cached, cache_source, start)}
+        return
+    messages = _build_messages(prompt)
+
+    client = get_openai_client()
+    ttft = None
+    parts: List[str] = []
+    # 스트림이 끝날 때까지 gateway 슬롯을 잡고 있는다.
+    with get_gateway().slot(priority, estimate_tokens(messages), source):
+        stream = client.chat.completions.create(model=model, messages=messages, stream=True)
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            if ttft is None:
+                ttft = time.time() - start
+            parts.append(delta)
+            yield {"type": "delta", "text": delta}
+
+    text = "".join(parts)
+    llm_cache.put(prompt, model, text, revision)
+    elapsed = time.time() - start
+    entry = record_latency(source, ttft, elapsed, model, stream=True)
+    metrics = kernel.report_kpi()
+    metrics["response_time"] = entry["total"]
+    metrics["ttft"] = entry["ttft"]
+    yield {"type": "done", "response": text, "actions": [], "metrics": metrics}
+
+
+# ---------- async 버전 (mcp_server_realtime 이벤트 루프에서 직접 await) ----------
+# 호출이 진행되는 동안 스레드를 잡지 않는다 (AsyncOpenAI + gateway aslot).
+# world_state 요약 / 서버 리소스 요약 / revision 은 CONTEXT_TTL초 동안 재사용하는 캐시에서 가져온다.
+CONTEXT_TTL = float(os.getenv("RC25S_LLM_CONTEXT_TTL", "1.0"))
+
+
+def _context_snapshot() -> Tuple[str, str, Any]:
+    return _load_world_state_snapshot(), _get_system_stats_summary(), _current_revision()
+
+
+class _AsyncContext:
+    """
+    async 경로의 system 프롬프트 재료 (world_state 요약, 서버 리소스 요약, revision).
+    - CONTEXT_TTL초 안이면 메모리 값을 그대로 돌려준다.
+    - 만료되면 world_state I/O 스레드(run_io)에서 한 번만 다시 읽고, 그동안 온 요청은 같은 갱신을 기다린다.
+    """
+
+    def __init__(self, ttl: float = CONTEXT_TTL):
+        self.ttl = ttl
+        self._value: Optional[Tuple[str, str, Any]] = None
+        self._loaded_at = 0.0
+        self._refresh: Optional[asyncio.Future] = None
+        self.hits = 0
+        self.refreshes = 0
+
+    async def get(self) -> Tuple[str, str, Any]:
+        if self._value is not None and time.monotonic() - self._loaded_at < self.ttl:
+            self.hits += 1
+            return self._value
+        task = self._refresh
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = self._refresh = asyncio.ensure_future(self._load())
+        return await asyncio.shield(task)
+
+    async def _load(self) -> Tuple[str, str, Any]:
+        value = await run_io(_context_snapshot)
+        self._value, self._loaded_at = value, time.monotonic()
+        self.refreshes += 1
+        return value
+
+    def stats(self) -> dict:
+        return {"ttl": self.ttl, "hits": self.hits, "refreshes": self.refreshes}
+
+
+async_context = _AsyncContext()
+
+
+async def _aprepare(prompt: str, model: str, cache: bool):
+    """(캐시/probe 답, 출처, revision, messages) — 캐시 hit이면 messages 는 None."""
+    if _is_health_probe(prompt):
+        return "pong", "probe", None, None
+    world_state_json, system_stats, revision = await async_context.get()
+    cached, source, revision = _cached_reply(prompt, model, bypass=not cache, revision=revision)
+    if cached is not None:
+        return cached, source, revision, None
+    return None, None, revision, _build_messages(prompt, world_state_json, system_stats)
+
+
+async def rc25s_achat(
+    prompt: str, history=None, model: str = "gpt-4o-mini", cache: bool = True, priority: str = "interactive", caller: str = "rc25s_achat"
+) -> dict:
+    """rc25s_chat 의 coroutine 버전 (같은 프롬프트 구성 / 캐시 / gateway, AsyncOpenAI 클라이언트)."""
+    start = time.time()
+    cached, source, revision, messages = await _aprepare(prompt, model, cache)
+    if cached is not None:
+        return _cached_result(cached, source, start)
+
+    client = get_async_openai_client()
+    async with get_gateway().aslot(priority, estimate_tokens(messages), caller) as lease:
+        response = await client.chat.completions.create(model=model, messages=messages)
+        lease.used_tokens = getattr(getattr(response, "usage", None), "total_tokens", None)
+
+    text = response.choices[0].message.content
+    llm_cache.put(prompt, model, text, revision)
+    elapsed = round(time.time() - start, 3)
+    await run_io(record_latency, caller, None, elapsed, model, False)
+    metrics = kernel.report_kpi()
+    metrics["response_time"] = elapsed
+    return {"response": text, "actions": [], "metrics": metrics}
+
+
+async def rc25s_achat_stream(
+    prompt: str,
+    history=None,
+    model: str = "gpt-4o-mini",
+    source: str = "rc25s_chat",
+    cache: bool = True,
+    priority: str = "interactive",
+) -> AsyncIterator[dict]:
+    """
+    rc25s_chat_stream 의 async generator 버전 (같은 이벤트 형식).
+    소비 측이 중간에 닫으면(aclose) provider 스트림도 닫고 gateway 슬롯을 돌려준다.
+    """
+    start = time.time()
+    cached, cache_source, revision, messages = await _aprepare(prompt, model, cache)
+    if cached is not None:
+        yield {"type": "delta", "text": cached}
+        yield {"type": "done", **_cached_result(cached, cache_source, start)}
+        return
+
+    client = get_async_openai_client()
+    ttft = None
+    parts: List[str] = []
+    async with get_gateway().aslot(priority, estimate_tokens(messages), source):
+        stream = await client.chat.completions.create(model=model, messages=messages, stream=True)
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                if ttft is None:
+                    ttft = time.time() - start
+                parts.append(delta)
+                yield {"type": "delta", "text": delta}
+        finally:
+            await stream.close()
+
+    text = "".join(parts)
+    llm_cache.put(prompt, model, text, revision)
+    entry = await run_io(record_latency, source, ttft, time.time() - start, model, True)
+    metrics = kernel.report_kpi()
+    metrics["response_time"] = entry["total"]
+    metrics["ttft"] = entry["ttft"]
+    yield {"type": "done", "response": text, "actions": [], "metrics": metrics}
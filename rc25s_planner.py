@@ -14,20 +14,28 @@
 
 from __future__ import annotations
 
+import fcntl
 import json
+import os
 import sys
-from dataclasses import dataclass, asdict
+import time
+from dataclasses import dataclass, asdict, fields
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
-from world_state import update_planner, load_world_state
+from rc25s_log_tail import tail_lines as log_tail_lines
+from world_state import update_planner, load_sections
 
 ROOT = Path(__file__).resolve().parent
 AUTOHEAL_AI_LOG = Path("/var/log/rc25s-autoheal-ai.log")
 SELF_CHECK_LOG = Path("/var/log/rc25s-autoheal.log")
 NGINX_ERROR_LOG = Path("/var/log/nginx/error.log")
 PLANNER_STATE_PATH = ROOT / "memory_store" / "rc25s_planner_state.json"
+# 프로세스 간 single-flight 잠금. 내용은 마지막 planner 실행이 끝난 시각(time.time()).
+PLANNER_LOCK_PATH = ROOT / "memory_store" / "rc25s_planner.lock"
+# 이 시간(초) 안에 끝난 planner 결과가 있으면 다시 계산하지 않는다 (0: 동시 호출만 합침)
+PLANNER_FRESH_SECONDS = float(os.getenv("RC25S_PLANNER_FRESH_SECONDS", "0"))
 
 
 @dataclass
@@ -64,15 +72,23 @@ class PlannerState:
       "tasks": [asdict(t) for t in self.tasks],
     }
 
+  @classmethod
+  def from_dict(cls, data: Dict[str, Any]) -> "PlannerState":
+    # approve_goal_tasks 가 붙이는 approved 같은 추가 필드는 무시한다.
+    def build(kind, item):
+      return kind(**{f.name: item.get(f.name) for f in fields(kind)})
+
+    return cls(
+      generated_at=data.get("generated_at") or "",
+      signals=data.get("signals") or {},
+      goals=[build(Goal, g) for g in data.get("goals") or []],
+      tasks=[build(Task, t) for t in data.get("tasks") or []],
+    )
+
 
 def tail_lines(path: Path, n: int = 200) -> List[str]:
-  if not path.exists():
-    return []
-  try:
-    data = path.read_text(encoding="utf-8", errors="ignore").splitlines()
-    return data[-n:]
-  except Exception:
-    return []
+  # 파일 전체를 읽지 않고 끝에서부터 n줄만 읽는다.
+  return log_tail_lines(path, n)
 
 
 def analyze_signals() -> Dict[str, Any]:
@@ -113,7 +129,7 @@ def generate_goals_from_signals(signals: Dict[str, Any]) -> List[Goal]:
 
   # 1) world_state.long_term_goals를 우선 Goal 리스트로 주입 (Step 1: Long-term goals)
   try:
-    ws = load_world_state()
+    ws = load_sections("long_term_goals")
     lt_goals = ws.get("long_term_goals") or []
   except Exception:
     lt_goals = []
@@ -251,7 +267,7 @@ def apply_reflection_to_goals(goals: List[Goal]) -> None:
   - insight / improvement_goal 안의 키워드 기반으로 관련 goal priority를 +5.
   """
   try:
-    ws = load_world_state()
+    ws = load_sections("reflection", "core", "system", "last_actions")
   except Exception:
     return
 
@@ -313,7 +329,41 @@ def apply_reflection_to_goals(goals: List[Goal]) -> None:
       g.priority = min(100, g.priority + 10)
 
 
-def run_planner() -> PlannerState:
+def run_planner(fresh_within: Optional[float] = None) -> PlannerState:
+  """
+  플래너 1회 실행 (프로세스 간 single-flight).
+  - 대시보드 작업(서브프로세스), cron, 다른 에이전트가 동시에 실행해도 PLANNER_LOCK_PATH(fcntl) 잠금으로 한 번에 하나만 돈다.
+  - 잠금을 기다리는 동안 다른 프로세스가 실행을 끝냈으면 다시 계산하지 않고 그 결과(PLANNER_STATE_PATH)를 돌려준다.
+  - fresh_within(기본 PLANNER_FRESH_SECONDS)초 안에 끝난 결과가 있어도 그대로 돌려준다.
+  """
+  if fresh_within is None:
+    fresh_within = PLANNER_FRESH_SECONDS
+  requested_at = time.time()
+  PLANNER_LOCK_PATH.parent.mkdir(parents=True, exist_ok=True)
+  with open(PLANNER_LOCK_PATH, "a+", encoding="utf-8") as lock:
+    fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+    try:
+      lock.seek(0)
+      try:
+        finished_at = float(lock.read().strip() or 0)
+      except ValueError:
+        finished_at = 0.0
+      if finished_at >= requested_at - max(0.0, fresh_within):
+        try:
+          return PlannerState.from_dict(json.loads(PLANNER_STATE_PATH.read_text(encoding="utf-8")))
+        except (OSError, ValueError, TypeError):
+          pass  # 결과 파일이 없거나 깨졌으면 새로 계산한다.
+      state = _run_planner()
+      lock.seek(0)
+      lock.truncate()
+      lock.write(str(time.time()))
+      lock.flush()
+      return state
+    finally:
+      fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+
+def _run_planner() -> PlannerState:
   signals = analyze_signals()
   goals = generate_goals_from_signals(signals)
   # 최근 리플렉션 결과를 반영해 goal priority를 미세 조정
@@ -333,6 +383,27 @@ def run_planner() -> PlannerState:
   return state
 
 
+def approve_goal_tasks(goal_id: str) -> bool:
+  """
+  로컬 플래너 상태 파일에서 goal_id에 속한 작업을 approved=True로 표시한다.
+  - 실제로 바뀐 작업이 있을 때만 파일을 다시 쓰고, 변경 여부를 돌려준다.
+  """
+  try:
+    planner_state = json.loads(PLANNER_STATE_PATH.read_text(encoding="utf-8"))
+  except FileNotFoundError:
+    planner_state = {}
+
+  changed = False
+  for t in planner_state.get("tasks", []):
+    if t.get("goal_id") == goal_id and not t.get("approved"):
+      t["approved"] = True
+      changed = True
+
+  if changed:
+    PLANNER_STATE_PATH.write_text(json.dumps(planner_state, ensure_ascii=False, indent=2), encoding="utf-8")
+  return changed
+
+
 def main(argv: List[str]) -> int:
   state = run_planner()
   # 요약 출력
@@ -1,4 +1,6 @@
-import os, json, time, datetime, subprocess, traceback, requests
+import os, json, time, datetime, subprocess, traceback
+
+from rc25s_llm_http import LLMShedError, call_background_llm
 
 LOG_PATH = "/srv/repo/vibecoding/logs/project_orchestrator.log"
 PROJECTS_PATH = "/srv/repo/projects"
@@ -12,10 +14,12 @@ def log(msg):
         f.write(f"[{t}] {msg}\n")
 
 def call_llm(prompt, model="qwen2.5"):
+    """LLM 답변. gateway가 background 호출을 버리면 None."""
     try:
-        r = requests.post("http://127.0.0.1:4545/llm", json={"prompt": prompt}, timeout=180)
-        out = r.json().get("output", "")
+        out = call_background_llm(prompt, caller="project_orchestrator")
         return out or "❌ LLM 응답 없음"
+    except LLMShedError:
+        return None
     except Exception as e:
         return f"❌ LLM 호출 실패: {e}"
 
@@ -70,15 +74,23 @@ def main_loop():
             if "앱" in reflection_text or "프로젝트" in reflection_text:
                 proj_name = "project_" + datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
                 log(f"🧩 새 프로젝트 감지 → {proj_name}")
-                path = create_project_structure(proj_name)
-
                 spec = generate_spec(reflection_text)
-                log(f"📐 설계 생성 완료 → {path}/docs/spec.json")
+                codes = {}
+                if spec is not None:
+                    for section in ["backend", "frontend"]:
+                        codes[section] = generate_code(spec, section)
+                if spec is None or None in codes.values():
+                    # LLM 부하로 미뤄짐: 빈 결과로 프로젝트를 만들지 않고, 트리거도 남겨 두고 다음 주기에 다시 시도한다.
+                    log("⏳ LLM 부하로 background 호출이 미뤄짐 — 다음 주기에 다시 시도.")
+                    time.sleep(300)
+                    continue
+
+                path = create_project_structure(proj_name)
                 with open(os.path.join(path, "docs", "spec.json"), "w") as f:
                     f.write(spec)
+                log(f"📐 설계 생성 완료 → {path}/docs/spec.json")
 
-                for section in ["backend", "frontend"]:
-                    code = generate_code(spec, section)
+                for section, code in codes.items():
                     file_path = os.path.join(path, section, f"{section}_main.txt")
                     with open(file_path, "w") as f:
                         f.write(code)
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+🧱 RC25S Prompt Builder
+
+여러 이름 붙은 섹션으로 프롬프트를 조립하고, 토큰 예산 안에 맞춘다 (reflection / LogRCA / knowledge_fusion 공통).
+
+- count_tokens(text): 로컬 토큰 수 추정 (tokenizer 없이: ASCII ~4자/토큰, 한글 등 ~1.5자/토큰).
+- compact_json(value): 들여쓰기 없는 JSON + 빈 필드(None, "", [], {}) 제거.
+- PromptBuilder(budget):
+  - text(...)  : 지시문 / 출력 schema 같은 고정 텍스트 (줄이지 않는다)
+  - section(name, content, priority, keep="head"|"tail", min_tokens, header)
+    - content 는 문자열(줄 단위) 또는 JSON 값
+    - 예산을 넘으면 priority가 낮은 섹션부터 줄인다 (같은 priority끼리는 크기에 비례해서):
+      - 리스트는 keep 방향(tail이면 최근 항목)으로 남기고 "(N items omitted)" 표시를 넣는다
+      - 긴 문자열은 잘라서 "…(+N chars)" 표시
+      - 텍스트는 keep 방향 줄만 남기고 "(N lines omitted)"
+      - 그래도 넘치면 min_tokens 까지, min_tokens=0 이면 섹션 내용을 통째로 생략
+  - build(caller) → BuiltPrompt(text, tokens, budget, sections=[{name, tokens_in, tokens_out, kept}])
+    섹션별 남긴 비율은 logs/prompt_budget.jsonl 에 한 줄씩 기록된다 (report() 는 로그용 한 줄 요약).
+
+환경변수:
+- RC25S_PROMPT_BUDGET_<CALLER> (caller별 토큰 예산, 예: RC25S_PROMPT_BUDGET_REFLECTION=6000)
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+PROMPT_LOG_PATH = Path(__file__).resolve().parent / "logs" / "prompt_budget.jsonl"
+MAX_SHRINK_STEPS = 200
+
+
+def count_tokens(text: Any) -> int:
+    """로컬 토큰 수 추정: ASCII는 ~4자/토큰, 한글 등은 ~1.5자/토큰."""
+    text = text if isinstance(text, str) else json.dumps(text, ensure_ascii=False)
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return int(ascii_chars / 4.0 + (len(text) - ascii_chars) / 1.5 + 0.999)
+
+
+def budget_for(caller: str, default: int) -> int:
+    return int(os.getenv(f"RC25S_PROMPT_BUDGET_{caller.upper()}", str(default)))
+
+
+def _drop_empty(value: Any) -> Any:
+    if isinstance(value, dict):
+        out = {k: _drop_empty(v) for k, v in value.items()}
+        return {k: v for k, v in out.items() if v not in (None, "", [], {})}
+    if isinstance(value, (list, tuple)):
+        items = [_drop_empty(v) for v in value]
+        return [v for v in items if v not in (None, "", [], {})]
+    return value
+
+
+def compact_json(value: Any) -> str:
+    return json.dumps(_drop_empty(value), ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+# ---------- 줄이기 ----------
+_MARKER_RE = re.compile(r"^…\((\d+) items omitted\)$")
+
+
+def _real_items(items: List[Any]) -> Tuple[List[Any], int]:
+    """(생략 표시를 뺀 항목들, 이미 생략된 개수)"""
+    real, omitted = [], 0
+    for item in items:
+        match = _MARKER_RE.match(item) if isinstance(item, str) else None
+        if match:
+            omitted += int(match.group(1))
+        else:
+            real.append(item)
+    return real, omitted
+
+
+def _size(value: Any, kind: type) -> int:
+    if kind is list:
+        return len(_real_items(value)[0])
+    return len(value)
+
+
+def _largest(value: Any, kind: type, path: Tuple = ()) -> Optional[Tuple[int, Tuple]]:
+    """value 안에서 더 줄일 수 있는 kind(list/str) 중 가장 큰 것의 (크기, 경로)."""
+    best: Optional[Tuple[int, Tuple]] = None
+    if isinstance(value, kind):
+        size = _size(value, kind)
+        if size > 1:
+            best = (size, path)
+    children = value.items() if isinstance(value, dict) else enumerate(value) if isinstance(value, list) else ()
+    for key, child in children:
+        found = _largest(child, kind, path + (key,))
+        if found is not None and (best is None or found[0] > best[0]):
+            best = found
+    return best
+
+
+def _get(value: Any, path: Tuple) -> Any:
+    for key in path:
+        value = value[key]
+    return value
+
+
+def _set(value: Any, path: Tuple, new: Any) -> Any:
+    if not path:
+        return new
+    _get(value, path[:-1])[path[-1]] = new
+    return value
+
+
+def _shrink_list(items: List[Any], keep: str) -> List[Any]:
+    real, omitted = _real_items(items)
+    half = max(1, len(real) // 2)
+    marker = f"…({omitted + len(real) - half} items omitted)"
+    return [marker] + real[-half:] if keep == "tail" else real[:half] + [marker]
+
+
+def _shrink_str(text: str, keep: str) -> str:
+    half = max(16, len(text) // 2)
+    if len(text) <= half:
+        return text
+    note = f"…(+{len(text) - half} chars)"
+    return note + text[-half:] if keep == "tail" else text[:half] + note
+
+
+def _shrink_value(value: Any, target: int, keep: str) -> Tuple[Any, str]:
+    """JSON 값을 target 토큰 이하가 될 때까지 큰 리스트부터 반씩, 그다음 긴 문자열을 반씩 줄인다."""
+    value = copy.deepcopy(_drop_empty(value))
+    rendered = compact_json(value)
+    for _ in range(MAX_SHRINK_STEPS):
+        if count_tokens(rendered) <= target:
+            return value, rendered
+        found = _largest(value, list)
+        if found is not None:
+            value = _set(value, found[1], _shrink_list(_get(value, found[1]), keep))
+        else:
+            found = _largest(value, str)
+            if found is None or found[0] <= 32:
+                break
+            value = _set(value, found[1], _shrink_str(_get(value, found[1]), keep))
+        rendered = compact_json(value)
+    return value, _cut(rendered, target, keep)
+
+
+def _shrink_text(text: str, target: int, keep: str) -> str:
+    lines = text.splitlines()
+    dropped = 0
+
+    def render() -> str:
+        note = [f"…({dropped} lines omitted)"] if dropped else []
+        return "\n".join(note + lines if keep == "tail" else lines + note)
+
+    while len(lines) > 1 and count_tokens(render()) > target:
+        half = max(1, len(lines) // 2)
+        dropped += len(lines) - half
+        lines = lines[-half:] if keep == "tail" else lines[:half]
+    return _cut(render(), target, keep)
+
+
+def _cut(text: str, target: int, keep: str) -> str:
+    """마지막 수단: 글자 단위로 자른다."""
+    if count_tokens(text) <= target:
+        return text
+    if target <= 0:
+        return ""
+    ratio = target / float(max(1, count_tokens(text)))
+    n = max(1, int(len(text) * ratio) - 16)
+    return ("…" + text[-n:]) if keep == "tail" else (text[:n] + "…")
+
+
+# ---------- 빌더 ----------
+@dataclass
+class _Part:
+    name: Optional[str]
+    content: Any
+    priority: int = 0
+    keep: str = "head"
+    min_tokens: int = 0
+    header: Optional[str] = None
+    rendered: str = ""
+    tokens_in: int = 0
+
+    @property
+    def fixed(self) -> bool:
+        return self.name is None
+
+
+@dataclass
+class BuiltPrompt:
+    text: str
+    tokens: int
+    budget: int
+    sections: List[Dict[str, Any]] = field(default_factory=list)
+
+    def report(self) -> str:
+        parts = [f"{s['name']} {s['tokens_in']}→{s['tokens_out']} ({int(s['kept'] * 100)}%)" for s in self.sections]
+        return f"prompt {self.tokens}/{self.budget} tokens: " + ", ".join(parts)
+
+
+class PromptBuilder:
+    def __init__(self, budget: int):
+        self.budget = budget
+        self._parts: List[_Part] = []
+
+    def text(self, text: str) -> "PromptBuilder":
+        self._parts.append(_Part(None, text))
+        return self
+
+    def section(
+        self,
+        name: str,
+        content: Any,
+        priority: int = 50,
+        keep: str = "head",
+        min_tokens: int = 0,
+        header: Optional[str] = None,
+    ) -> "PromptBuilder":
+        """priority가 높을수록 나중에 줄인다. keep="tail"이면 리스트/줄의 뒤쪽(최근)을 남긴다."""
+        self._parts.append(_Part(name, content, priority, keep, min_tokens, header if header is not None else f"## {name}"))
+        return self
+
+    @staticmethod
+    def _render(part: _Part, target: Optional[int] = None) -> str:
+        if target is not None and target <= 0:
+            return "(omitted: prompt budget)"
+        if isinstance(part.content, str):
+            body = part.content.strip("\n")
+            return body if target is None else _shrink_text(body, target, part.keep)
+        return compact_json(part.content) if target is None else _shrink_value(part.content, target, part.keep)[1]
+
+    def _join(self) -> str:
+        chunks = []
+        for part in self._parts:
+            if part.fixed:
+                chunks.append(part.rendered.strip("\n"))
+            else:
+                chunks.append(f"{part.header}\n{part.rendered}")
+        return "\n\n".join(chunks) + "\n"
+
+    def build(self, caller: str = "prompt", record: bool = True) -> BuiltPrompt:
+        for part in self._parts:
+            part.rendered = part.content if part.fixed else self._render(part)
+            part.tokens_in = count_tokens(part.rendered)
+        text = self._join()
+        total = count_tokens(text)
+        over = total - self.budget
+        # 낮은 priority부터 줄이고, 같은 priority 섹션들은 크기에 비례해서 나눠 줄인다.
+        for priority in sorted({p.priority for p in self._parts if not p.fixed}):
+            if over <= 0:
+                break
+            group = [p for p in self._parts if not p.fixed and p.priority == priority]
+            sizes = [count_tokens(p.rendered) for p in group]
+            total_size = sum(sizes) or 1
+            for part, current in zip(group, sizes):
+                target = max(part.min_tokens, current - -(-over * current // total_size))
+                if target >= current:
+                    continue
+                part.rendered = self._render(part, target)
+            over = count_tokens(self._join()) - self.budget
+        text = self._join()
+        built = BuiltPrompt(text=text, tokens=count_tokens(text), budget=self.budget)
+        for part in self._parts:
+            if part.fixed:
+                continue
+            tokens_out = count_tokens(part.rendered)
+            built.sections.append(
+                {
+                    "name": part.name,
+                    "tokens_in": part.tokens_in,
+                    "tokens_out": tokens_out,
+                    "kept": round(min(1.0, tokens_out / float(part.tokens_in)), 3) if part.tokens_in else 1.0,
+                }
+            )
+        if record:
+            _record(caller, built)
+        return built
+
+
+def _record(caller: str, built: BuiltPrompt) -> None:
+    entry = {"ts": time.time(), "caller": caller, "tokens": built.tokens, "budget": built.budget, "sections": built.sections}
+    try:
+        PROMPT_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(PROMPT_LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    except OSError:
+        pass
@@ -1,4 +1,6 @@
-import os, time, json, psutil, subprocess, datetime, requests
+import os, time, json, psutil, subprocess, datetime
+
+from rc25s_llm_http import LLMShedError, call_background_llm
 
 LOG_PATH = "/srv/repo/vibecoding/logs/selfevo_agent.log"
 MEMORY_FILE = "/srv/repo/vibecoding/memory_store/memory_vector.json"
@@ -37,9 +39,12 @@ def save_memory(event, data):
         log(f"❌ Memory 저장 실패: {e}")
 
 def call_llm(prompt):
+    """LLM 답변. gateway가 background 호출을 버리면 None (빈 답을 결과로 저장하지 않는다)."""
     try:
-        res = requests.post("http://127.0.0.1:4545/llm", json={"prompt": prompt}, timeout=60)
-        return res.json().get("output", "")
+        return call_background_llm(prompt, caller="selfevo")
+    except LLMShedError:
+        log("⏳ LLM 부하로 background 호출이 미뤄짐 — 이번 주기는 건너뜀.")
+        return None
     except Exception as e:
         return f"❌ LLM 호출 실패: {e}"
 
@@ -51,14 +56,17 @@ def auto_fix_check():
     if bad:
         log(f"⚠️ 비활성 서비스 감지: {bad}")
         fix_code = call_llm(f"서비스 {bad} 가 비활성 상태야. 재시작 코드나 원인 분석해줘.")
-        log(f"💡 LLM 제안: {fix_code}")
-        save_memory("auto_fix", {"services": bad, "suggestion": fix_code})
+        if fix_code is not None:
+            log(f"💡 LLM 제안: {fix_code}")
+            save_memory("auto_fix", {"services": bad, "suggestion": fix_code})
         for svc in bad:
             subprocess.run(["systemctl", "restart", svc])
         log("🔁 서비스 재시작 완료.")
 
 def reflection_cycle():
     summary = call_llm("최근 로그와 상태를 기반으로 AGI 자기성찰 보고서를 만들어줘.")
+    if summary is None:
+        return  # 이전 자기성찰을 빈 내용으로 덮어쓰지 않는다.
     with open(REFLECTION_FILE, "w") as f:
         json.dump({"time": datetime.datetime.now().isoformat(), "reflection": summary}, f, indent=2)
     log("🧠 자기성찰 저장 완료.")
@@ -1,4 +1,6 @@
-import os, json, subprocess, time, datetime, requests, psutil, difflib
+import os, json, subprocess, time, datetime, psutil, difflib
+
+from rc25s_llm_http import LLMShedError, call_background_llm
 
 LOG = "/srv/repo/vibecoding/logs/selfupdate_agent.log"
 SRC_PATH = "/srv/repo/vibecoding"
@@ -19,9 +21,11 @@ def list_python_files():
     return result
 
 def call_llm(prompt):
+    """LLM 답변. gateway가 background 호출을 버리면 None."""
     try:
-        r = requests.post("http://127.0.0.1:4545/llm", json={"prompt": prompt}, timeout=120)
-        return r.json().get("output", "")
+        return call_background_llm(prompt, caller="selfupdate")
+    except LLMShedError:
+        return None
     except Exception as e:
         return f"❌ LLM 호출 실패: {e}"
 
@@ -49,6 +53,9 @@ def analyze_and_refactor(path):
 {code}
 """
     new_code = call_llm(prompt)
+    if new_code is None:
+        log(f"⏳ LLM 부하로 background 호출이 미뤄짐 — {path} 건너뜀.")
+        return
     if "def " not in new_code and "import " not in new_code:
         log(f"⚠️ LLM 결과가 코드 형식이 아님 — 변경 건너뜀.")
         return
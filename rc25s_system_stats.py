@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+🖥️ RC25S System Stats Sampler
+
+/ws/system2 구독자 전체가 공유하는 시스템 상태 샘플러 (프로세스당 1개).
+
+- INTERVAL초마다 한 번만 CPU / 메모리 / 디스크를 샘플링한다.
+  - CPU는 직전 샘플과의 psutil.cpu_times() 차이로 계산한다
+    (psutil.cpu_percent(interval=None)의 전역 기준점을 다른 호출과 공유하지 않는다).
+- 마지막 샘플을 보관해 새로 접속한 클라이언트에 바로 보내준다 (첫 화면 대기 없음).
+- 클라이언트는 전송 주기(RATES: 1/5/30초)를 고를 수 있고, 서버는 같은 샘플을 그 주기로 down-sample 한다.
+  cpu 값은 해당 주기 동안의 평균이다.
+- 클라이언트별 전송 큐는 크기 1: 느린 클라이언트에는 최신 샘플만 간다.
+- summary(): LLM system 프롬프트용 "CPU=..%, MEM=..%, DISK=..%" 한 줄 (rc25s_openai_wrapper).
+  마지막 샘플이 INTERVAL×2 안이면 그대로 쓰고, 구독자가 없어 오래됐으면 그 자리에서 한 번 샘플링한다
+  (cpu는 직전 샘플과의 cpu_times 차이 — 기다리지 않는다). 프로세스 공용 인스턴스는 get_system_stats_sampler().
+
+환경변수:
+- RC25S_SYSTEM_STATS_INTERVAL (기본 1초)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import datetime
+import os
+import threading
+import time
+from typing import Any, Deque, Dict, Optional, Tuple
+
+import psutil
+
+INTERVAL = float(os.getenv("RC25S_SYSTEM_STATS_INTERVAL", "1"))
+RATES = (1, 5, 30)
+DEFAULT_RATE = 5
+
+
+def normalize_rate(rate: Any) -> int:
+    """요청한 주기를 지원하는 값(1/5/30초) 중 가장 가까운 것으로 맞춘다."""
+    try:
+        value = float(rate)
+    except (TypeError, ValueError):
+        return DEFAULT_RATE
+    return min(RATES, key=lambda r: abs(r - value))
+
+
+class _Subscriber:
+    def __init__(self, websocket: Any, rate: int):
+        self.websocket = websocket
+        self.rate = rate
+        self.next_due = 0.0
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=1)
+        self.task: Optional[asyncio.Task] = None
+
+
+class SystemStatsSampler:
+    def __init__(self, interval: float = INTERVAL, disk_path: str = "/"):
+        self.interval = max(0.2, interval)
+        self.disk_path = disk_path
+        self.latest: Optional[Dict[str, Any]] = None
+        self.samples = 0
+        self._subscribers: Dict[Any, _Subscriber] = {}
+        self._cpu_history: Deque[Tuple[float, float]] = collections.deque(maxlen=int(max(RATES) / self.interval) + 2)
+        self._prev_cpu = psutil.cpu_times()
+        self._sample_lock = threading.Lock()  # 샘플러 태스크(to_thread)와 summary() 호출 스레드가 _prev_cpu 를 같이 쓴다
+        self.latest_at = 0.0  # 마지막 샘플의 time.monotonic()
+        self._task: Optional[asyncio.Task] = None
+
+    # ---------- 샘플링 ----------
+    def _cpu_percent(self) -> float:
+        now = psutil.cpu_times()
+        prev, self._prev_cpu = self._prev_cpu, now
+        total = sum(now) - sum(prev)
+        idle = (now.idle + getattr(now, "iowait", 0.0)) - (prev.idle + getattr(prev, "iowait", 0.0))
+        if total <= 0:
+            return 0.0
+        return round(max(0.0, min(100.0, 100.0 * (1.0 - idle / total))), 1)
+
+    def _sample(self) -> Dict[str, Any]:
+        with self._sample_lock:
+            cpu = self._cpu_percent()
+            now = time.monotonic()
+            self._cpu_history.append((now, cpu))
+            sample = {
+                "type": "system_stats",
+                "cpu": cpu,
+                "memory": psutil.virtual_memory().percent,
+                "disk": psutil.disk_usage(self.disk_path).percent,
+                "time": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            }
+            self.latest, self.latest_at = sample, now
+            return sample
+
+    def summary(self) -> str:
+        """마지막 샘플 요약 (오래됐으면 지금 한 번 샘플링). 실패하면 빈 문자열."""
+        try:
+            sample = self.latest
+            if sample is None or time.monotonic() - self.latest_at > self.interval * 2:
+                sample = self._sample()
+            return f"CPU={sample['cpu']}%, MEM={sample['memory']}%, DISK={sample['disk']}%"
+        except Exception:
+            return ""
+
+    def _cpu_average(self, window: float) -> Optional[float]:
+        cutoff = time.monotonic() - window - self.interval / 2
+        values = [cpu for t, cpu in self._cpu_history if t >= cutoff]
+        return round(sum(values) / len(values), 1) if values else None
+
+    def _payload_for(self, sub: _Subscriber) -> Dict[str, Any]:
+        payload = dict(self.latest or {})
+        avg = self._cpu_average(sub.rate)
+        if avg is not None:
+            payload["cpu"] = avg
+        payload["rate"] = sub.rate
+        return payload
+
+    async def _run(self) -> None:
+        while True:
+            if self._subscribers:
+                try:
+                    # disk_usage 등이 느린 파일시스템에서 멈춰도 이벤트 루프는 막지 않는다.
+                    await asyncio.to_thread(self._sample)
+                    self.samples += 1
+                    now = time.monotonic()
+                    for sub in list(self._subscribers.values()):
+                        if now >= sub.next_due:
+                            sub.next_due = now + sub.rate - self.interval / 2
+                            self._offer(sub, self._payload_for(sub))
+                except Exception as e:
+                    print(f"⚠️ system stats 샘플링 실패: {e}")
+            await asyncio.sleep(self.interval)
+
+    # ---------- 구독 ----------
+    @staticmethod
+    def _offer(sub: _Subscriber, payload: Dict[str, Any]) -> None:
+        if sub.queue.full():
+            sub.queue.get_nowait()  # 아직 못 보낸 이전 샘플은 버리고 최신 것만 보낸다.
+        sub.queue.put_nowait(payload)
+
+    async def _sender(self, sub: _Subscriber) -> None:
+        while True:
+            payload = await sub.queue.get()
+            try:
+                await sub.websocket.send_json(payload)
+            except Exception:
+                self.unsubscribe(sub.websocket)
+                return
+
+    def subscribe(self, websocket: Any, rate: Any = DEFAULT_RATE) -> None:
+        """구독 시작. 마지막 샘플이 있으면 바로 보낸다."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        sub = _Subscriber(websocket, normalize_rate(rate))
+        sub.task = asyncio.create_task(self._sender(sub))
+        self._subscribers[websocket] = sub
+        if self.latest is not None:
+            sub.next_due = time.monotonic() + sub.rate - self.interval / 2
+            self._offer(sub, self._payload_for(sub))
+
+    def set_rate(self, websocket: Any, rate: Any) -> int:
+        sub = self._subscribers.get(websocket)
+        if sub is None:
+            return normalize_rate(rate)
+        sub.rate = normalize_rate(rate)
+        sub.next_due = min(sub.next_due, time.monotonic() + sub.rate)
+        return sub.rate
+
+    def unsubscribe(self, websocket: Any) -> None:
+        sub = self._subscribers.pop(websocket, None)
+        if sub is not None and sub.task is not None and sub.task is not asyncio.current_task():
+            sub.task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        rates: Dict[int, int] = {}
+        for sub in self._subscribers.values():
+            rates[sub.rate] = rates.get(sub.rate, 0) + 1
+        return {"subscribers": len(self._subscribers), "by_rate": rates, "samples": self.samples}
+
+
+_sampler: Optional[SystemStatsSampler] = None
+_sampler_lock = threading.Lock()
+
+
+def get_system_stats_sampler() -> SystemStatsSampler:
+    global _sampler
+    with _sampler_lock:
+        if _sampler is None:
+            _sampler = SystemStatsSampler()
+        return _sampler
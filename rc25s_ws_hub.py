@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+📡 RC25S WebSocket Hub
+
+/ws/agi 클라이언트 전체에 world_state 변경을 한 번에 밀어주는 백그라운드 broadcaster.
+
+- 감시: POLL_MS마다 world_state revision(change log 파일 stat 기반, 디스크 읽기 거의 없음)을 확인한다.
+  어느 프로세스가 커밋하든 revision이 오르므로 그대로 감지된다.
+- 변경 시: 새 상태(또는 직전 broadcast 이후 패치)를 한 번만 읽고 한 번만 직렬화해서
+  구독 중인 모든 소켓의 큐에 넣는다.
+- 클라이언트마다 크기 제한이 있는 전송 큐 + 전송 task:
+  - 느린 대시보드 하나가 다른 클라이언트 전송을 막지 않는다.
+  - 큐가 가득 차면 쌓인 프레임을 버리고 최신 전체 상태 프레임 하나로 대체한다 (delta 사슬이 끊기지 않도록).
+- 세션의 "lock"으로 world_state 전송을 직렬화하고, 보내기 직전에 세션 revision을 확인한다.
+  (명령 응답으로 이미 받은 패치를 broadcast가 다시 보내 중복 적용되는 일을 막는다.)
+
+환경변수:
+- RC25S_WS_BROADCAST_POLL_MS (기본 500)
+- RC25S_WS_CLIENT_QUEUE      (기본 8)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from world_state import achanges_since, acurrent_revision, aload_world_state, run_io
+
+POLL_MS = float(os.getenv("RC25S_WS_BROADCAST_POLL_MS", "500"))
+CLIENT_QUEUE = int(os.getenv("RC25S_WS_CLIENT_QUEUE", "8"))
+
+# 큐에 들어가는 프레임: (종류 "full"|"delta", from_revision, revision, 직렬화된 텍스트)
+Frame = Tuple[str, Optional[int], int, str]
+
+
+def _dumps(message: Dict[str, Any]) -> str:
+    return json.dumps(message, ensure_ascii=False, separators=(",", ":"))
+
+
+class ClientChannel:
+    """소켓 하나의 전송 큐와 전송 task."""
+
+    def __init__(self, websocket: Any, session: Dict[str, Any], queue_size: int):
+        self.websocket = websocket
+        self.session = session
+        self.queue: "asyncio.Queue[Frame]" = asyncio.Queue(maxsize=max(1, queue_size))
+        self.task: Optional[asyncio.Task] = None
+        self.sent = 0
+        self.skipped = 0
+        self.overflows = 0
+
+
+class WorldStateBroadcaster:
+    def __init__(
+        self,
+        message_builder: Callable[[Dict[str, Any]], Dict[str, Any]],
+        catch_up: Callable[[Any, Dict[str, Any]], Awaitable[None]],
+        poll_ms: float = POLL_MS,
+        queue_size: int = CLIENT_QUEUE,
+    ):
+        """
+        - message_builder(state): 전체 상태 프레임(dict) 생성 (서버의 world_state 메시지 형식)
+        - catch_up(websocket, session): 세션 revision이 broadcast 흐름과 어긋났을 때
+          그 세션에 맞춰 직접 보내는 함수 (세션 lock을 잡은 상태에서 호출됨)
+        """
+        self.message_builder = message_builder
+        self.catch_up = catch_up
+        self.poll_interval = max(0.05, poll_ms / 1000.0)
+        self.queue_size = queue_size
+        self.channels: Dict[Any, ClientChannel] = {}
+        self.revision: Optional[int] = None
+        self.broadcasts = 0
+        self._task: Optional[asyncio.Task] = None
+
+    # ---------- 구독 ----------
+    def register(self, websocket: Any, session: Dict[str, Any]) -> ClientChannel:
+        session.setdefault("lock", asyncio.Lock())
+        session.setdefault("subscribed", True)
+        channel = ClientChannel(websocket, session, self.queue_size)
+        channel.task = asyncio.create_task(self._sender(channel))
+        self.channels[websocket] = channel
+        return channel
+
+    def unregister(self, websocket: Any) -> None:
+        channel = self.channels.pop(websocket, None)
+        if channel is not None and channel.task is not None:
+            channel.task.cancel()
+
+    # ---------- 감시 루프 ----------
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                revision = await acurrent_revision()
+                if self.revision is None:
+                    self.revision = revision
+                elif revision != self.revision:
+                    await self._broadcast(self.revision, revision)
+            except Exception as e:
+                print(f"⚠️ world_state broadcast 실패: {e}")
+
+    async def _broadcast(self, previous: int, revision: int) -> None:
+        subscribers = [c for c in self.channels.values() if c.session.get("subscribed")]
+        if not subscribers:
+            self.revision = revision
+            return
+
+        frames: Dict[str, Frame] = {}
+        if any(c.session.get("delta") for c in subscribers):
+            feed = await achanges_since(previous)
+            if not feed["resync"]:
+                revision = feed["revision"]
+                message = {
+                    "type": "world_state_delta",
+                    "from_revision": previous,
+                    "revision": revision,
+                    "changes": feed["changes"],
+                }
+                frames["delta"] = ("delta", previous, revision, await run_io(_dumps, message))
+        if "delta" not in frames or any(not c.session.get("delta") for c in subscribers):
+            state = await aload_world_state()
+            revision = int(state.get("revision") or revision)
+            message = self.message_builder(state)
+            frames["full"] = ("full", None, revision, await run_io(_dumps, message))
+
+        for channel in subscribers:
+            frame = frames.get("delta") if channel.session.get("delta") else None
+            self._enqueue(channel, frame or frames.get("full") or frames["delta"])
+        self.revision = revision
+        self.broadcasts += 1
+
+    def _enqueue(self, channel: ClientChannel, frame: Frame) -> None:
+        try:
+            channel.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            # 밀린 프레임은 모두 낡은 상태다: 비우고 최신 상태 하나만 보내게 한다.
+            channel.overflows += 1
+            while not channel.queue.empty():
+                channel.queue.get_nowait()
+            if frame[0] == "delta":
+                # delta를 건너뛰었으므로 전송 task가 catch_up으로 세션 revision부터 다시 맞춘다.
+                frame = ("resync", None, frame[2], "")
+            channel.queue.put_nowait(frame)
+
+    # ---------- 클라이언트별 전송 ----------
+    async def _sender(self, channel: ClientChannel) -> None:
+        session = channel.session
+        while True:
+            kind, from_revision, revision, text = await channel.queue.get()
+            try:
+                async with session["lock"]:
+                    current = session.get("revision")
+                    if current is not None and int(current) >= revision:
+                        channel.skipped += 1  # 명령 응답 등으로 이미 받은 상태
+                        continue
+                    if kind == "full" or (kind == "delta" and current == from_revision):
+                        await channel.websocket.send_text(text)
+                        session["revision"] = revision
+                    else:
+                        await self.catch_up(channel.websocket, session)
+                    channel.sent += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️ world_state push 실패: {e}")
+                return
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "clients": len(self.channels),
+            "subscribed": sum(1 for c in self.channels.values() if c.session.get("subscribed")),
+            "revision": self.revision,
+            "broadcasts": self.broadcasts,
+            "sent": sum(c.sent for c in self.channels.values()),
+            "skipped": sum(c.skipped for c in self.channels.values()),
+            "overflows": sum(c.overflows for c in self.channels.values()),
+        }
@@ -1,4 +1,7 @@
 from rc25s_openai_wrapper import rc25s_chat
+from rc25s_openai_clients import resolve_api_key
+from rc25s_json_extract import extract_json
+from rc25s_prompt_builder import PromptBuilder, budget_for
 
 #!/usr/bin/env python3
 # =======================================================
@@ -10,7 +13,6 @@ from rc25s_openai_wrapper import rc25s_chat
 import os
 import json
 import datetime
-import re
 import traceback
 import sys
 
@@ -22,6 +24,42 @@ from world_state import load_world_state, update_reflection_memory
 LOG_PATH = "/srv/repo/vibecoding/logs/agi_reflection.log"
 MEMORY_PATH = "/srv/repo/vibecoding/memory_store/memory_vector.json"
 REFLECTION_PATH = "/srv/repo/vibecoding/memory_store/reflection.json"
+REFLECTION_PROMPT_BUDGET = 6000  # RC25S_PROMPT_BUDGET_REFLECTION 으로 덮어쓴다
+
+REFLECTION_SCHEMA = """\
+Return JSON with the following structure (Korean is allowed/preferred in text fields):
+{
+  "insight": "short Korean summary of current system situation",
+  "improvement_goal": "1-2 concrete next improvement directions (Korean allowed)",
+  "confidence": 0.0-1.0,
+  "self_critique": "간단한 자기 평가: 최근 의사결정/행동 루프에서 무엇이 잘/못 되었는지에 대한 한국어 설명",
+  "last_decision_score": 0.0-1.0,
+  "long_term_goals": [
+    {
+      "id": "ltg_2025_agi",
+      "title": "장기적인 시스템 개선 목표 (예: RC25S AGI 상용 수준 안정화)",
+      "description": "이 목표가 왜 중요한지, 어떤 방향으로 개선해야 하는지에 대한 짧은 설명 (한국어 가능)",
+      "horizon": "3-6 months",
+      "priority": 0-100,
+      "status": "active|paused|completed"
+    }
+  ],
+  "weekly_summary": {
+    "week_of": "YYYY-MM-DD (이번 주 시작 날짜)",
+    "summary": "이번 주에 RC25S 시스템이 어떤 변화/개선을 했는지 한 줄 요약 (한국어)",
+    "key_wins": ["주요 성공 1", "주요 성공 2"],
+    "key_issues": ["문제/장애 1", "문제/장애 2"]
+  },
+  "failures_learned": [
+    {
+      "time": "ISO8601 datetime (예: 2025-11-18T12:34:56Z)",
+      "context": "어떤 상황/기능에서 실패가 발생했는지",
+      "root_cause": "추정되는 근본 원인 (간단히)",
+      "lesson": "다음에 같은 문제가 안 나도록 배우게 된 교훈 (한국어)"
+    }
+  ]
+}
+"""
 
 os.makedirs(os.path.dirname(LOG_PATH), exist_ok=True)
 os.makedirs(os.path.dirname(MEMORY_PATH), exist_ok=True)
@@ -49,13 +87,9 @@ def safe_parse_json(text: str) -> dict:
             "weekly_summary": {},
             "failures_learned": [],
         }
-    text = re.sub(r"[\u200B-\u200D\uFEFF]", "", text)
-    text = re.sub(r"```[a-zA-Z]*", "", text).replace("```", "").strip()
-    match = re.search(r"\{[\s\S]*\}", text)
-    if match:
-        text = match.group(0).strip()
-    try:
-        parsed = json.loads(text)
+    # 코드펜스 / zero-width 문자 / 설명 문장 속 중괄호는 rc25s_json_extract 가 한 번 훑으면서 걸러낸다.
+    parsed = extract_json(text)
+    if isinstance(parsed, dict):
         log("✅ JSON successfully parsed.")
         # 누락된 필드는 기본값으로 채워서 world_state와의 호환성을 유지
         if "self_critique" not in parsed:
@@ -69,18 +103,17 @@ def safe_parse_json(text: str) -> dict:
         if "failures_learned" not in parsed:
             parsed["failures_learned"] = []
         return parsed
-    except json.JSONDecodeError as e:
-        log(f"⚠️ JSONDecodeError: {e} | text snippet: {text[:200]}")
-        return {
-            "insight": "Failed to decode LLM reflection",
-            "improvement_goal": "Improve parsing resilience",
-            "confidence": 0.0,
-            "self_critique": "",
-            "last_decision_score": 0.0,
-            "long_term_goals": [],
-            "weekly_summary": {},
-            "failures_learned": [],
-        }
+    log(f"⚠️ No JSON object found | text snippet: {text[:200]}")
+    return {
+        "insight": "Failed to decode LLM reflection",
+        "improvement_goal": "Improve parsing resilience",
+        "confidence": 0.0,
+        "self_critique": "",
+        "last_decision_score": 0.0,
+        "long_term_goals": [],
+        "weekly_summary": {},
+        "failures_learned": [],
+    }
 
 
 def run_reflection() -> None:
@@ -91,17 +124,10 @@ def run_reflection() -> None:
     """
     log("🚀 AGI Reflection Engine started.")
 
-    # OPENAI_API_KEY 없으면 /etc/openai_api_key.txt에서 한 번 더 시도
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key or "$(" in api_key:
-        key_path = "/etc/openai_api_key.txt"
-        if os.path.exists(key_path):
-            api_key = open(key_path).read().strip()
-            os.environ["OPENAI_API_KEY"] = api_key
-            log("✅ Loaded API key from /etc/openai_api_key.txt")
-        else:
-            log("❌ No valid API key found for rc25s_chat.")
-            return
+    # 키 파일(/etc/openai_api_key.txt) → OPENAI_API_KEY 순서, 파일이 바뀌었을 때만 다시 읽는다.
+    if not resolve_api_key():
+        log("❌ No valid API key found for rc25s_chat.")
+        return
 
     if not os.path.exists(MEMORY_PATH):
         log("⚠️ No memory file found.")
@@ -125,58 +151,24 @@ def run_reflection() -> None:
     last_actions = ws.get("last_actions") or []
     system = ws.get("system") or {}
 
-    prompt = f"""
-You are the RC25S AGI Reflection Engine.
-Analyze the following memory and world state, then output ONLY valid JSON.
-
-## Memory (long-term/context)
-{json.dumps(memory, ensure_ascii=False, indent=2)}
+    # 섹션별 priority: planner > system > 최근 행동 > memory 순으로 남긴다 (예산 초과 시 memory부터 줄인다).
+    builder = PromptBuilder(budget_for("reflection", REFLECTION_PROMPT_BUDGET))
+    builder.text(
+        "You are the RC25S AGI Reflection Engine.\n"
+        "Analyze the following memory and world state, then output ONLY valid JSON."
+    )
+    builder.section("memory", memory, priority=20, keep="tail", header="## Memory (long-term/context)")
+    builder.section("planner", planner, priority=60, header="## Planner state (goals/tasks/signals)")
+    builder.section("last_actions", last_actions, priority=40, keep="tail", header="## Recent actions")
+    builder.section("system", system, priority=50, header="## System summary (health/autotest/etc.)")
+    builder.text(REFLECTION_SCHEMA)
+    built = builder.build(caller="reflection")
+    log(f"🧱 {built.report()}")
+    prompt = built.text
 
-## Planner state (goals/tasks/signals)
-{json.dumps(planner, ensure_ascii=False, indent=2)}
-
-## Recent actions
-{json.dumps(last_actions, ensure_ascii=False, indent=2)}
-
-## System summary (health/autotest/etc.)
-{json.dumps(system, ensure_ascii=False, indent=2)}
-
-Return JSON with the following structure (Korean is allowed/preferred in text fields):
-{{
-  "insight": "short Korean summary of current system situation",
-  "improvement_goal": "1-2 concrete next improvement directions (Korean allowed)",
-  "confidence": 0.0-1.0,
-  "self_critique": "간단한 자기 평가: 최근 의사결정/행동 루프에서 무엇이 잘/못 되었는지에 대한 한국어 설명",
-  "last_decision_score": 0.0-1.0,
-  "long_term_goals": [
-    {{
-      "id": "ltg_2025_agi",
-      "title": "장기적인 시스템 개선 목표 (예: RC25S AGI 상용 수준 안정화)",
-      "description": "이 목표가 왜 중요한지, 어떤 방향으로 개선해야 하는지에 대한 짧은 설명 (한국어 가능)",
-      "horizon": "3-6 months",
-      "priority": 0-100,
-      "status": "active|paused|completed"
-    }}
-  ],
-  "weekly_summary": {{
-    "week_of": "YYYY-MM-DD (이번 주 시작 날짜)",
-    "summary": "이번 주에 RC25S 시스템이 어떤 변화/개선을 했는지 한 줄 요약 (한국어)",
-    "key_wins": ["주요 성공 1", "주요 성공 2"],
-    "key_issues": ["문제/장애 1", "문제/장애 2"]
-  }},
-  "failures_learned": [
-    {{
-      "time": "ISO8601 datetime (예: 2025-11-18T12:34:56Z)",
-      "context": "어떤 상황/기능에서 실패가 발생했는지",
-      "root_cause": "추정되는 근본 원인 (간단히)",
-      "lesson": "다음에 같은 문제가 안 나도록 배우게 된 교훈 (한국어)"
-    }}
-  ]
-}}
-"""
 
     try:
-        llm_result = rc25s_chat(prompt)
+        llm_result = rc25s_chat(prompt, priority="reflection", caller="reflection_engine")
         text = (llm_result or {}).get("response", "")
         if not text:
             log("⚠️ LLM returned empty content. Check API key or server.")
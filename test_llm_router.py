@@ -0,0 +1,143 @@
+"""llm_router 테스트: circuit breaker (open / cooldown / half_open), failover, hedge. provider는 가짜 객체."""
+
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("requests")
+
+import llm_router
+from llm_router import LLMRouter, ProviderError, ProviderHealth
+
+
+class FakeProvider:
+    def __init__(self, name, fail=False, delay=0.0, text=None):
+        self.name = name
+        self.fail = fail
+        self.delay = delay
+        self.text = text
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate(self, prompt, timeout, priority):
+        with self._lock:
+            self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        if self.fail:
+            raise ProviderError(f"{self.name} down")
+        return self.text if self.text is not None else f"{self.name}: {prompt}"
+
+
+def _router(*providers, **policy):
+    fields = {"providers": [p.name for p in providers], "order": "policy", "hedge": False, "timeout": 5.0}
+    fields.update(policy)
+    return LLMRouter(providers={p.name: p for p in providers}, policies={"default": fields})
+
+
+def _cool_down(health):
+    health.opened_at -= llm_router.COOLDOWN
+
+
+def test_breaker_opens_after_consecutive_failures():
+    health = ProviderHealth()
+    for _ in range(llm_router.FAILURE_THRESHOLD - 1):
+        health.record(0.1, False)
+    assert health.state == "closed" and health.allow()
+    health.record(0.1, False)
+    assert health.state == "open"
+    assert not health.allow()
+
+
+def test_breaker_opens_on_error_rate():
+    health = ProviderHealth()
+    for i in range(llm_router.MIN_SAMPLES):
+        health.record(0.1, i % 2 == 0)  # 마지막(10번째)이 5번째 실패
+    assert health.state == "open"
+    assert health.snapshot()["error_rate"] == 0.5
+
+
+def test_half_open_allows_one_trial_then_closes_on_success():
+    health = ProviderHealth()
+    for _ in range(llm_router.FAILURE_THRESHOLD):
+        health.record(0.1, False)
+    _cool_down(health)
+    assert health.allow()
+    assert health.state == "half_open"
+    assert not health.allow()  # 시험 호출은 1건만
+    health.record(0.2, True)
+    snapshot = health.snapshot()
+    assert (snapshot["state"], snapshot["error_rate"], snapshot["samples"]) == ("closed", 0.0, 1)
+    assert health.allow()
+
+
+def test_half_open_failure_reopens():
+    health = ProviderHealth()
+    for _ in range(llm_router.FAILURE_THRESHOLD):
+        health.record(0.1, False)
+    _cool_down(health)
+    assert health.allow()
+    health.record(0.1, False)
+    assert health.state == "open"
+    assert not health.allow()
+
+
+def test_failover_to_next_provider():
+    a, b = FakeProvider("a", fail=True), FakeProvider("b")
+    router = _router(a, b)
+    result = router.route("hi")
+    assert (result.text, result.provider, result.attempts) == ("b: hi", "b", ["a", "b"])
+    assert result.errors == ["a: a down"]
+    assert router.stats()["failovers"] == 1
+
+
+def test_open_circuit_is_skipped_until_cooldown_then_recovers():
+    a, b = FakeProvider("a", fail=True), FakeProvider("b")
+    router = _router(a, b)
+    for _ in range(llm_router.FAILURE_THRESHOLD):
+        assert router.route("x").provider == "b"
+    assert router.stats()["providers"]["a"]["state"] == "open"
+
+    result = router.route("x")
+    assert result.attempts == ["b"]
+    assert "a: circuit open" in result.errors
+    assert a.calls == llm_router.FAILURE_THRESHOLD
+
+    a.fail = False
+    _cool_down(router.health["a"])
+    result = router.route("x")
+    assert (result.provider, result.attempts) == ("a", ["a"])
+    assert router.stats()["providers"]["a"]["state"] == "closed"
+
+
+def test_empty_response_counts_as_failure():
+    a, b = FakeProvider("a", text="  "), FakeProvider("b")
+    router = _router(a, b)
+    assert router.route("x").provider == "b"
+    assert router.stats()["providers"]["a"]["failures"] == 1
+
+
+def test_all_providers_failing_raises():
+    router = _router(FakeProvider("a", fail=True), FakeProvider("b", fail=True))
+    with pytest.raises(ProviderError, match="all providers failed"):
+        router.route("x")
+    assert router.stats()["failures"] == 1
+
+
+def test_slow_primary_is_hedged():
+    slow, fast = FakeProvider("slow", delay=0.5), FakeProvider("fast")
+    router = _router(slow, fast, hedge=True, hedge_after=0.05)
+    result = router.route("x")
+    assert (result.provider, result.hedged, result.attempts) == ("fast", True, ["slow", "fast"])
+    stats = router.stats()
+    assert stats["hedged"] == 1 and stats["hedge_wins"] == 1
+
+
+def test_latency_order_prefers_healthy_provider():
+    a, b = FakeProvider("a"), FakeProvider("b")
+    router = _router(a, b, order="latency")
+    for _ in range(3):
+        router.health["a"].record(2.0, True)
+        router.health["b"].record(0.1, True)
+    assert router.route("x").provider == "b"
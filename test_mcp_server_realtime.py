@@ -0,0 +1,39 @@
+"""mcp_server_realtime /ws/agi 테스트: 잘못된 명령 payload는 그 명령만 거절하고 연결은 유지한다."""
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+import mcp_server_realtime
+
+
+@pytest.fixture
+def submitted(monkeypatch):
+    calls = []
+    monkeypatch.setattr(mcp_server_realtime.jobs, "submit", lambda kind, runner, **kwargs: calls.append((kind, kwargs)))
+    return calls
+
+
+def _command(command, payload, correlation_id):
+    return {"type": "command", "command": command, "payload": payload, "correlation_id": correlation_id}
+
+
+@pytest.mark.parametrize("value", ["abc", [1], {"s": 1}, "nan", -5])
+def test_invalid_fresh_within_is_rejected_without_dropping_the_socket(submitted, value):
+    client = TestClient(mcp_server_realtime.app)
+    with client.websocket_connect("/ws/agi") as ws:
+        ws.send_json(_command("command_planner", {"fresh_within": value}, "c-1"))
+        reply = ws.receive_json()
+        assert reply["type"] == "error"
+        assert (reply["ok"], reply["error"], reply["correlation_id"]) == (False, "invalid_fresh_within", "c-1")
+        assert submitted == []
+
+        # 같은 연결에서 다음 명령도 그대로 처리된다
+        ws.send_json(_command("command_planner", {"fresh_within": "30"}, "c-2"))
+        ws.send_json(_command("list_jobs", {}, "c-3"))
+        reply = ws.receive_json()
+        assert (reply["type"], reply["correlation_id"]) == ("jobs", "c-3")
+    assert [(kind, kwargs["fresh_within"], kwargs["correlation_id"]) for kind, kwargs in submitted] == [("planner", 30.0, "c-2")]
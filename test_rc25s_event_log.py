@@ -0,0 +1,110 @@
+"""rc25s_event_log 테스트: 세그먼트 교체 / 보존 한도, tail, range, read_seqs, at_or_before, 다시 열기."""
+
+import threading
+
+import pytest
+
+import rc25s_event_log
+from rc25s_event_log import SegmentedEventLog
+
+T0 = 1_700_000_000.0
+
+
+@pytest.fixture(autouse=True)
+def small_index(monkeypatch):
+    monkeypatch.setattr(rc25s_event_log, "INDEX_EVERY", 8)  # 세그먼트 안에서도 인덱스 seek 를 타도록
+
+
+def _fill(log, n, start=1):
+    for i in range(start, start + n):
+        assert log.append({"i": i}, ts=T0 + i) == i
+
+
+def test_rollover_and_retention(tmp_path):
+    log = SegmentedEventLog(tmp_path / "stream", segment_bytes=1000, max_segments=3)
+    _fill(log, 300)
+
+    segments = log.segments()
+    assert len(segments) == 3
+    assert all(p.stat().st_size < 1000 + 200 for p in segments)
+    assert [int(p.stem) for p in segments] == sorted(int(p.stem) for p in segments)
+    assert all(p.with_suffix(".idx").exists() for p in segments)
+    assert len(list((tmp_path / "stream").glob("*.idx"))) == 3
+
+    assert log.last_seq() == 300
+    first_kept = int(segments[0].stem)
+    assert log.read_seqs(1, first_kept - 1) == []
+    assert log.stats()["segments"] == 3 and log.stats()["last_seq"] == 300
+
+
+def test_tail_spans_segments(tmp_path):
+    log = SegmentedEventLog(tmp_path, segment_bytes=500)
+    _fill(log, 100)
+    assert [e["data"]["i"] for e in log.tail(30)] == list(range(71, 101))
+    assert len(log.tail(1000)) == 100
+    assert log.tail(0) == []
+
+
+def test_range_and_read_seqs(tmp_path):
+    log = SegmentedEventLog(tmp_path, segment_bytes=700)
+    _fill(log, 200)
+
+    assert [e["seq"] for e in log.range(T0 + 37, T0 + 151)] == list(range(37, 152))
+    assert [e["seq"] for e in log.range(T0 + 190)] == list(range(190, 201))
+    assert [e["seq"] for e in log.range(end=T0 + 3)] == [1, 2, 3]
+    assert [e["seq"] for e in log.range(T0 + 50, limit=4)] == [50, 51, 52, 53]
+    assert log.range(T0 + 500) == []
+    assert [e["seq"] for e in log.range("2023-11-14T22:13:30Z", "2023-11-14T22:13:32Z")] == [10, 11, 12]
+
+    assert [e["seq"] for e in log.read_seqs(63, 130)] == list(range(63, 131))
+    assert [e["data"]["i"] for e in log.read_seqs(200, 500)] == [200]
+
+
+def test_at_or_before(tmp_path):
+    log = SegmentedEventLog(tmp_path, segment_bytes=600)
+    _fill(log, 120)
+    assert log.at_or_before(T0 + 77)["seq"] == 77
+    assert log.at_or_before(T0 + 77.5)["seq"] == 77
+    assert log.at_or_before(T0 + 10_000)["seq"] == 120
+    assert log.at_or_before(T0) is None
+    with pytest.raises(ValueError):
+        log.at_or_before("not a time")
+
+
+def test_reopen_continues_sequence(tmp_path):
+    log = SegmentedEventLog(tmp_path, segment_bytes=400)
+    _fill(log, 40)
+    again = SegmentedEventLog(tmp_path, segment_bytes=400)
+    assert again.last_seq() == 40
+    assert again.append_many([{"i": 41}, {"i": 42}], ts=T0 + 41) == [41, 42]
+    assert [e["seq"] for e in log.tail(3)] == [40, 41, 42]
+
+
+def test_truncated_last_line_is_skipped(tmp_path):
+    log = SegmentedEventLog(tmp_path)
+    _fill(log, 5)
+    with open(log.segments()[-1], "ab") as f:
+        f.write(b'{"seq": 6, "t": ')
+    assert [e["seq"] for e in log.tail(2)] == [4, 5]
+    assert log.at_or_before(T0 + 100)["seq"] == 5
+
+
+def test_concurrent_appends_get_unique_seqs(tmp_path):
+    log = SegmentedEventLog(tmp_path, segment_bytes=800)
+    seen = []
+    lock = threading.Lock()
+
+    def writer(n):
+        for i in range(25):
+            seq = log.append({"w": n, "i": i}, ts=T0)
+            with lock:
+                seen.append(seq)
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(seen) == list(range(1, 101))
+    assert [e["seq"] for e in log.read_seqs(1, 100)] == list(range(1, 101))
@@ -0,0 +1,118 @@
+"""rc25s_intent 빠른 경로 분류 테스트 (오탐: 질문을 작업 실행으로 잡지 않는지)."""
+
+import pytest
+
+from rc25s_intent import IntentRouter
+
+
+@pytest.fixture
+def router():
+    return IntentRouter(threshold=0.8, max_chars=80, enabled=True)
+
+
+@pytest.mark.parametrize(
+    "message, name",
+    [
+        ("플래너 실행", "planner"),
+        ("셀프체크 돌려줘", "selfcheck"),
+        ("익스큐터 한 번 돌려", "executor"),
+        ("다음 작업 실행", "executor"),
+        ("Run planner", "planner"),
+        ("planner를 다시 실행해", "planner"),
+        ("서버 상태 알려줘", "status"),
+        ("서버 상태 어때?", "status"),
+        ("cpu 사용량 확인", "status"),
+    ],
+)
+def test_commands_take_fast_path(router, message, name):
+    intent = router.route(message)
+    assert intent is not None
+    assert intent.name == name
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        # 작업 대상 + 조회 동사 → 작업을 띄우지 않는다
+        "executor 로그 보여줘",
+        "셀프체크 결과 알려줘",
+        "플래너 목표 보여줘",
+        "planner 결과 확인",
+        # 질문 / 부정 / 여러 대상
+        "플래너가 왜 실패했어?",
+        "셀프체크 말고 플래너 실행",
+        "메모리 누수 잡는 방법 알려줘",
+        "planner 어떻게 동작해?",
+        # 완료 / 진행 확인, 허락을 묻는 질문, 부정 → 작업을 새로 띄우지 않는다
+        "플래너 시작됐어?",
+        "플래너 실행됐어?",
+        "셀프체크 실행 중이야?",
+        "executor 실행 끝났어?",
+        "플래너 실행해도 돼?",
+        "planner run 했어?",
+        "셀프체크 다시 해야 할까?",
+        "익스큐터 실행 결과는?",
+        "다음 작업 실행은 언제?",
+        "플래너 실행 안 해도 돼",
+        "셀프체크 켜져 있어?",
+        "플래너 실행했어",
+        "executor 실행하지 않아도 돼",
+        # 라틴 키워드는 단어 경계에서만
+        "running 중인 테스트 알려줘",
+        "rerun 할까",
+        "planners 비교 시작",
+        # 대상 없음
+        "오늘 일정 정리해줘",
+        "안녕",
+    ],
+)
+def test_questions_fall_back_to_llm(router, message):
+    assert router.route(message) is None
+
+
+def test_job_target_with_query_verb_reports_query_reason(router):
+    intent = router.classify("executor 로그 보여줘")
+    assert intent.name == "executor"
+    assert not intent.confident
+    assert intent.reason == "query"
+
+
+def test_question_about_job_reports_question_reason(router):
+    intent = router.classify("플래너 실행됐어?")
+    assert intent.name == "planner"
+    assert not intent.confident
+    assert intent.reason == "question"
+
+
+def test_run_verb_does_not_boost_status(router):
+    intent = router.classify("status 실행")
+    assert intent.name == "status"
+    assert not intent.confident
+
+
+def test_task_id_slot_routes_to_executor(router):
+    intent = router.route("goal_stability_check_health_endpoints 실행")
+    assert intent is not None
+    assert intent.name == "executor"
+    assert intent.slots == {"task_id": "goal_stability_check_health_endpoints"}
+
+
+def test_long_messages_never_take_fast_path(router):
+    intent = router.classify("플래너 실행 " + "그리고 이것저것 " * 20)
+    assert intent.reason == "too_long"
+    assert router.route("플래너 실행 " + "그리고 이것저것 " * 20) is None
+
+
+def test_stats_hit_rate(router):
+    router.route("플래너 실행")
+    router.route("셀프체크 결과 알려줘")
+    stats = router.stats()
+    assert stats["total"] == 2
+    assert stats["hits"] == 1
+    assert stats["hit_rate"] == 0.5
+    assert stats["by_intent"] == {"planner": 1}
+    assert stats["fallbacks"] == {"query": 1}
+
+
+def test_disabled_router_always_falls_back():
+    assert IntentRouter(enabled=False).route("플래너 실행") is None
@@ -0,0 +1,111 @@
+"""rc25s_jobs 테스트: 구독자 제거 경쟁, 서브프로세스 정리."""
+
+import asyncio
+import os
+import time
+
+import pytest
+
+import rc25s_jobs
+from rc25s_jobs import JobManager, run_subprocess
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+def _wait_pid(path) -> int:
+    for _ in range(100):
+        if path.exists() and path.read_text().strip():
+            return int(path.read_text())
+        time.sleep(0.02)
+    raise AssertionError("child did not start")
+
+
+def test_dead_listener_on_both_streams_does_not_fail_job():
+    """stdout / stderr pump 가 같은 죽은 구독자에서 동시에 실패해도 작업은 끝까지 돈다."""
+    events = []
+
+    async def dead_listener(message):
+        if message["event"] == "output":
+            await asyncio.sleep(0)
+            raise ConnectionError("socket closed")
+        events.append(message)
+
+    async def runner(job):
+        return await run_subprocess(job, ["sh", "-c", "for i in 1 2 3; do echo out$i; echo err$i >&2; done; sleep 0.2"])
+
+    async def main():
+        jobs = JobManager(limits={})
+        job = jobs.submit("selfcheck", runner, listener=dead_listener)
+        await job.task
+        return job
+
+    job = asyncio.run(main())
+    assert job.status == "succeeded"
+    assert job.returncode == 0
+    assert job.listeners == []
+    assert {m["event"] for m in events} == {"accepted", "started"}
+    assert len(job.output) == 6
+
+
+def test_emit_removes_listener_once():
+    calls = []
+
+    async def dead(message):
+        calls.append(message["event"])
+        await asyncio.sleep(0)  # 두 emit 이 모두 이 구독자를 붙잡은 뒤에 실패하도록
+        raise RuntimeError("gone")
+
+    async def main():
+        job = rc25s_jobs.Job("planner")
+        job.add_listener(dead)
+        await asyncio.gather(job.emit("output", text="a"), job.emit("output", text="b"))
+        return job
+
+    job = asyncio.run(main())
+    assert job.listeners == []
+    assert calls == ["output", "output"]
+
+
+def test_cancel_kills_process_group(tmp_path):
+    pid_file = tmp_path / "pid"
+
+    async def runner(job):
+        return await run_subprocess(job, ["sh", "-c", f"echo $$ > {pid_file}; sleep 30"])
+
+    async def main():
+        jobs = JobManager(limits={})
+        job = jobs.submit("executor", runner)
+        pid = await asyncio.get_running_loop().run_in_executor(None, _wait_pid, pid_file)
+        jobs.cancel(job.id)
+        await job.task
+        return job, pid
+
+    job, pid = asyncio.run(main())
+    assert job.status == "cancelled"
+    assert not _alive(pid)
+
+
+def test_pump_error_kills_process_group(tmp_path, monkeypatch):
+    """취소가 아닌 예외로 pump 가 끝나도 파이프를 아무도 읽지 않는 자식 프로세스를 남기지 않는다."""
+    pid_file = tmp_path / "pid"
+
+    async def broken_pump(job, stream, name):
+        await asyncio.get_running_loop().run_in_executor(None, _wait_pid, pid_file)
+        raise RuntimeError("pump failed")
+
+    monkeypatch.setattr(rc25s_jobs, "_pump", broken_pump)
+
+    async def main():
+        job = rc25s_jobs.Job("executor")
+        with pytest.raises(RuntimeError):
+            await run_subprocess(job, ["sh", "-c", f"echo $$ > {pid_file}; sleep 30"])
+
+    asyncio.run(main())
+    pid = int(pid_file.read_text())
+    assert not _alive(pid)
@@ -0,0 +1,115 @@
+"""rc25s_json_extract 테스트: 설명 / 코드펜스 속 객체, 잘린 top-level 값, 스트리밍 분할."""
+
+import asyncio
+import json
+import random
+
+import pytest
+
+from rc25s_json_extract import JSONExtractor, aextract_json_stream, extract_json, extract_json_stream
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ('{"a": 1}', {"a": 1}),
+        ('설명입니다.\n```json\n{"plan": {"x": [1, {"y": 2}]}, "ok": true}\n```\n끝.', {"plan": {"x": [1, {"y": 2}]}, "ok": True}),
+        ('use {placeholder} then {"a": 1}', {"a": 1}),
+        ('설명 {"key"는 이름} 그리고 {"a": 1}', {"a": 1}),
+        ('format {"name": ...} e.g. {"name": "x"}', {"name": "x"}),
+        ('{"code": "def f():\n    return {\\"x\\": 1}"}', {"code": 'def f():\n    return {"x": 1}'}),
+        ('​{"a":‍ 1}﻿', {"a": 1}),
+        ('{{"a": 1}}', {"a": 1}),
+        ('{"first": 1} {"second": 2}', {"first": 1}),
+    ],
+)
+def test_extracts_first_complete_object(text, expected):
+    assert extract_json(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        '{"a": {"b": 1}, "c": [1, 2',
+        '{"a": {"b": 1}, "c": "xx',
+        '{"a": {"b": 1}, "c": 3 (truncated)',
+        '{"a": {"b": 1}, "c": 3\n```',
+        '{"a": {"b": 1}, "c": 3]',
+        '{"a": {"b": 1} xyz',
+        '{"a": [{"b": 1}, {"c": 2}] ... more',
+        '{"a": {"b": 1}, ',
+    ],
+)
+def test_truncated_top_level_value_never_returns_inner_object(text):
+    assert extract_json(text) is None
+    assert extract_json_stream(list(text)) is None
+
+
+def test_broken_top_level_value_still_finds_a_later_object():
+    assert extract_json('{"a": {"b": 1}, "c": 3 oops} then {"d": 4}') == {"d": 4}
+
+
+def test_default_and_non_string():
+    assert extract_json("no json here", default={}) == {}
+    assert extract_json("", default="x") == "x"
+    assert extract_json(None) is None
+
+
+def test_stream_split_at_every_position_matches_whole_text():
+    texts = [
+        'Here:\n```json\n{"s": "a \\"quoted\\" {brace}", "n": [1, 2.5e3, null], "t": true}\n```',
+        'prefix {not json} {"k": {"deep": ["x", {"y": "z\\\\"}]}} trailing',
+        '{"a": {"b": 1}, "c": 3 (truncated)',
+    ]
+    for text in texts:
+        whole = extract_json(text)
+        for cut in range(len(text) + 1):
+            assert extract_json_stream([text[:cut], text[cut:]]) == whole, (text, cut)
+
+
+def test_stream_stops_reading_after_object_closes():
+    consumed = []
+
+    def chunks():
+        for chunk in ['{"a"', ": 1}", " tail", " never read"]:
+            consumed.append(chunk)
+            yield chunk
+
+    assert extract_json_stream(chunks()) == {"a": 1}
+    assert consumed == ['{"a"', ": 1}"]
+
+
+def test_async_stream():
+    async def chunks():
+        for chunk in ["x {", '"a": [1', ", 2]}"]:
+            yield chunk
+
+    assert asyncio.run(aextract_json_stream(chunks())) == {"a": [1, 2]}
+
+
+def _random_value(rng, depth=0):
+    kind = rng.choice(["int", "str", "list", "dict", "bool", "null"] if depth < 3 else ["int", "str"])
+    if kind == "int":
+        return rng.randint(-1000, 1000)
+    if kind == "str":
+        return "".join(rng.choice('ab {}[]":\\\n한') for _ in range(rng.randint(0, 8)))
+    if kind == "list":
+        return [_random_value(rng, depth + 1) for _ in range(rng.randint(0, 3))]
+    if kind == "dict":
+        return {f"k{i}": _random_value(rng, depth + 1) for i in range(rng.randint(0, 3))}
+    return {"bool": rng.random() < 0.5, "null": None}[kind]
+
+
+def test_random_objects_in_prose_round_trip():
+    rng = random.Random(25)
+    for _ in range(200):
+        value = {"root": _random_value(rng)}
+        text = f"설명 {{x}} 입니다.\n```json\n{json.dumps(value, ensure_ascii=False)}\n```\n끝 {{y}}"
+        assert extract_json(text) == value
+        extractor = JSONExtractor()
+        pos = 0
+        while pos < len(text) and not extractor.done:
+            step = rng.randint(1, 7)
+            extractor.feed(text[pos:pos + step])
+            pos += step
+        assert extractor.value == value
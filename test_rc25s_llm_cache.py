@@ -0,0 +1,110 @@
+"""rc25s_llm_cache 테스트: exact / near hit, TTL, LRU 제거, revision 범위, bypass."""
+
+import types
+
+import pytest
+
+import rc25s_llm_cache
+from rc25s_llm_cache import LLMResponseCache, normalize_prompt
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000.0]
+    monkeypatch.setattr(rc25s_llm_cache, "time", types.SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+def test_normalize_prompt():
+    assert normalize_prompt("  서버  상태\n알려줘!! ") == "서버 상태 알려줘"
+    assert normalize_prompt("Ｈｅｌｌｏ​ World?") == "hello world"
+    assert normalize_prompt(None) == ""
+
+
+def test_exact_hit_after_normalization(clock):
+    cache = LLMResponseCache(ttl=60, near_threshold=1.0)
+    cache.put("서버 상태 알려줘!", "gpt-4o-mini", "A", revision=3)
+    assert cache.get("서버  상태 알려줘", "gpt-4o-mini", revision=3) == ("exact", "A")
+    assert cache.get("서버 상태 알려줘", "gpt-4o", revision=3) is None
+    stats = cache.stats()
+    assert (stats["exact_hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+
+def test_near_hit_and_miss(clock):
+    cache = LLMResponseCache(ttl=60, near_threshold=0.8)
+    cache.put("rc25s 커널 작업 큐 상태를 자세히 돌려줘", "m", "queue", revision=1)
+    assert cache.get("rc25s 커널 작업 큐 상태를 자세히 돌려줘요", "m", revision=1) == ("near", "queue")
+    assert cache.get("rc25s 커널 작업 중지", "m", revision=1) is None
+    assert cache.get("rc25s 커널 작업 큐 상태를 자세히 돌려줘요", "m", revision=2) is None
+    assert cache.stats()["near_hits"] == 1
+
+
+@pytest.mark.parametrize(
+    "cached, asked",
+    [
+        ("Explain the executor failure for task 1234", "Explain the executor failure for task 1235"),
+        ("reflection confidence가 왜 0.2야?", "reflection confidence가 왜 0.9야?"),
+        ("goal_stability_check_health 실패 원인 분석해줘", "goal_stability_check_disk 실패 원인 분석해줘"),
+        ("compare run 12 with run 21", "compare run 21 with run 12"),
+    ],
+)
+def test_near_tier_never_mixes_ids_or_numbers(clock, cached, asked):
+    cache = LLMResponseCache(ttl=60, near_threshold=0.8)
+    cache.put(cached, "m", "cached answer", revision=1)
+    assert cache.get(asked, "m", revision=1) is None
+    assert cache.get(cached + "요", "m", revision=1) == ("near", "cached answer")
+
+
+def test_ttl_expiry(clock):
+    cache = LLMResponseCache(ttl=10, near_threshold=0.8)
+    cache.put("hello there", "m", "v")
+    clock[0] += 9
+    assert cache.get("hello there", "m") == ("exact", "v")
+    clock[0] += 2
+    assert cache.get("hello there", "m") is None
+    assert cache.get("hello there!!", "m") is None
+    cache.put("other", "m", "w")
+    assert cache.stats()["entries"] == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lru_eviction(clock):
+    cache = LLMResponseCache(ttl=60, max_entries=2, near_threshold=1.0)
+    cache.put("a", "m", 1)
+    cache.put("b", "m", 2)
+    assert cache.get("a", "m") == ("exact", 1)  # a가 최근 사용으로 올라간다
+    cache.put("c", "m", 3)
+    assert cache.get("b", "m") is None
+    assert cache.get("a", "m") == ("exact", 1)
+    assert cache.get("c", "m") == ("exact", 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_evicted_entries_leave_no_band_keys(clock):
+    cache = LLMResponseCache(ttl=60, max_entries=3, near_threshold=0.8)
+    for i in range(20):
+        cache.put(f"question number {i} about the kernel", "m", i)
+    live = set(cache._entries)
+    assert all(keys <= live for keys in cache._bands.values())
+    assert cache.get("question number 18 about the kernel!!", "m") == ("exact", 18)
+    assert cache.get("question number 20 about the kernel", "m") is None  # 17~19 중 어느 답도 아니다
+
+
+def test_bypass_and_disabled(clock):
+    cache = LLMResponseCache(ttl=60)
+    cache.put("q", "m", "v")
+    assert cache.get("q", "m", bypass=True) is None
+    assert cache.stats()["bypassed"] == 1
+    assert cache.stats()["lookups"] == 0
+
+    disabled = LLMResponseCache(ttl=0)
+    disabled.put("q", "m", "v")
+    assert disabled.get("q", "m") is None
+    assert disabled.stats()["entries"] == 0
+
+
+def test_clear(clock):
+    cache = LLMResponseCache(ttl=60)
+    cache.put("q", "m", "v")
+    cache.clear()
+    assert cache.get("q", "m") is None
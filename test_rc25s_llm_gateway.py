@@ -0,0 +1,121 @@
+"""rc25s_llm_gateway 테스트: 동시 실행 한도, 잠금 없는 stats, 대기 중 ledger 재작성 없음."""
+
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+import rc25s_llm_gateway
+from rc25s_llm_gateway import LLMGateway, LLMShedError
+
+
+@pytest.fixture
+def gateway(tmp_path):
+    return LLMGateway(state_path=tmp_path / "gateway.json", max_concurrency=2, tpm_budget=0)
+
+
+def test_concurrency_limit(gateway):
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def call():
+        with gateway.slot("interactive", caller="test"):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+
+    threads = [threading.Thread(target=call) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert peak[0] == 2
+    assert gateway.stats()["this_process"]["interactive"]["admitted"] == 6
+
+
+def test_stats_does_not_lock_or_write(gateway):
+    def no_lock(path):
+        raise AssertionError("stats() must not take the ledger lock")
+
+    with gateway.slot("planner"):
+        mtime = gateway.state_path.stat().st_mtime_ns
+        with pytest.MonkeyPatch.context() as patch:
+            patch.setattr(rc25s_llm_gateway, "file_lock", no_lock)
+            stats = gateway.stats()
+        assert stats["in_flight"] == {"planner": 1}
+        assert gateway.state_path.stat().st_mtime_ns == mtime
+
+
+def test_blocked_waiter_does_not_rewrite_ledger(gateway, monkeypatch):
+    writes = []
+    real_replace = os.replace
+    monkeypatch.setattr(rc25s_llm_gateway.os, "replace", lambda a, b: (writes.append(b), real_replace(a, b)))
+    leases = [gateway.acquire("interactive"), gateway.acquire("interactive")]
+    writes.clear()
+    with pytest.raises(LLMShedError):
+        gateway.acquire("background", timeout=0.6)
+    # 등록 1번 + 포기 1번. 기다리는 동안의 poll은 ledger를 다시 쓰지 않는다.
+    assert len(writes) == 2
+    for lease in leases:
+        gateway.release(lease)
+
+
+def test_release_wakes_waiter_in_same_process(gateway):
+    leases = [gateway.acquire("interactive"), gateway.acquire("interactive")]
+    threading.Timer(0.1, gateway.release, args=(leases[0],)).start()
+    started = time.monotonic()
+    lease = gateway.acquire("interactive", timeout=5)
+    assert time.monotonic() - started < 1.0
+    gateway.release(lease)
+    gateway.release(leases[1])
+
+
+def test_async_path_uses_io_pool_not_default_executor(gateway, monkeypatch):
+    def forbidden(*args, **kwargs):
+        raise AssertionError("asyncio.to_thread must not be used")
+
+    monkeypatch.setattr(asyncio, "to_thread", forbidden)
+
+    async def main():
+        async with gateway.aslot("interactive", caller="async") as lease:
+            assert rc25s_llm_gateway.current_caller.get() == "async"
+            return lease.priority
+
+    assert asyncio.run(main()) == "interactive"
+    assert gateway.stats()["in_flight"] == {}
+
+
+def test_saturated_gateway_does_not_starve_world_state_io(gateway, monkeypatch):
+    from world_state import run_io
+
+    real_read = gateway._read
+
+    def slow_read():
+        time.sleep(0.02)  # 느린 디스크: 대기자 poll 하나하나가 I/O 스레드를 잡는다
+        return real_read()
+
+    monkeypatch.setattr(gateway, "_read", slow_read)
+    leases = [gateway.acquire("interactive"), gateway.acquire("interactive")]
+
+    async def main():
+        waiters = [asyncio.ensure_future(gateway.aacquire("interactive", timeout=1.5)) for _ in range(60)]
+        await asyncio.sleep(0.3)  # 대기자들이 poll 하는 중
+        latencies = []
+        for _ in range(5):
+            started = time.monotonic()
+            await run_io(lambda: None)
+            latencies.append(time.monotonic() - started)
+            await asyncio.sleep(0.05)
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        return latencies, results
+
+    latencies, results = asyncio.run(main())
+    for lease in leases:
+        gateway.release(lease)
+    assert all(isinstance(r, LLMShedError) for r in results)
+    assert max(latencies) < 0.1
@@ -0,0 +1,71 @@
+"""rc25s_llm_http 테스트: 버려진(503 llm_shed) 호출은 빈 결과가 아니라 재시도 / LLMShedError."""
+
+import pytest
+
+pytest.importorskip("requests")
+
+import rc25s_llm_http
+from rc25s_llm_gateway import BACKGROUND_MAX_DEFER, LLMShedError
+
+
+class FakeResponse:
+    def __init__(self, status, body, headers=None):
+        self.status_code = status
+        self._body = body
+        self.headers = headers or {}
+
+    def json(self):
+        return self._body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+SHED = FakeResponse(503, {"error": "llm_shed", "message": "busy", "output": ""}, {"Retry-After": "7"})
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    recorded = {"posts": [], "sleeps": [], "responses": []}
+
+    def post(url, json, timeout):
+        recorded["posts"].append({"url": url, "json": json, "timeout": timeout})
+        return recorded["responses"].pop(0)
+
+    monkeypatch.setattr(rc25s_llm_http.requests, "post", post)
+    monkeypatch.setattr(rc25s_llm_http.time, "sleep", recorded["sleeps"].append)
+    return recorded
+
+
+def test_success_returns_output(calls):
+    calls["responses"] = [FakeResponse(200, {"output": "hello"})]
+    assert rc25s_llm_http.call_background_llm("hi", caller="selfevo") == "hello"
+    assert calls["posts"][0]["json"] == {"prompt": "hi", "priority": "background", "caller": "selfevo"}
+
+
+def test_shed_then_success_retries_after_header(calls):
+    calls["responses"] = [SHED, FakeResponse(200, {"output": "later"})]
+    assert rc25s_llm_http.call_background_llm("hi", caller="fusion", retries=1) == "later"
+    assert calls["sleeps"] == [7.0]
+    assert len(calls["posts"]) == 2
+
+
+def test_shed_every_time_raises(calls):
+    calls["responses"] = [SHED, SHED, SHED]
+    with pytest.raises(LLMShedError):
+        rc25s_llm_http.call_background_llm("hi", caller="selfupdate", retries=2)
+    assert len(calls["posts"]) == 3
+    assert len(calls["sleeps"]) == 2
+
+
+def test_other_errors_are_not_swallowed(calls):
+    calls["responses"] = [FakeResponse(500, {"error": "boom"})]
+    with pytest.raises(RuntimeError):
+        rc25s_llm_http.call_background_llm("hi", caller="selfevo")
+
+
+def test_timeout_covers_defer_window(calls):
+    calls["responses"] = [FakeResponse(200, {"output": "ok"})]
+    rc25s_llm_http.call_background_llm("hi", caller="selfevo", timeout=60)
+    assert calls["posts"][0]["timeout"] > BACKGROUND_MAX_DEFER
@@ -0,0 +1,61 @@
+"""rc25s_openai_wrapper.record_latency 테스트: logs/llm_latency.jsonl 크기 로테이션."""
+
+import json
+import threading
+
+import pytest
+
+wrapper = pytest.importorskip("rc25s_openai_wrapper")
+
+
+@pytest.fixture
+def latency_log(tmp_path, monkeypatch):
+    path = tmp_path / "llm_latency.jsonl"
+    monkeypatch.setattr(wrapper, "LATENCY_LOG_PATH", path)
+    monkeypatch.setattr(wrapper, "LATENCY_LOG_MAX_BYTES", 1000)
+    monkeypatch.setattr(wrapper, "LATENCY_LOG_BACKUPS", 2)
+    return path
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()] if path.exists() else []
+
+
+def test_rotates_by_size_and_keeps_bounded_backups(latency_log):
+    for i in range(200):
+        wrapper.record_latency(f"test{i}", 0.1, 0.2, "gpt-4o-mini", stream=False)
+
+    files = sorted(p.name for p in latency_log.parent.iterdir() if not p.name.endswith(".lock"))
+    assert files == ["llm_latency.jsonl", "llm_latency.jsonl.1", "llm_latency.jsonl.2"]
+    for name in files:
+        assert (latency_log.parent / name).stat().st_size <= 1000 + 200  # 한 줄 넘친 만큼까지만
+
+    # 최신 기록은 현재 파일에, 바로 앞 기록은 .1 에 (순서 유지)
+    assert _lines(latency_log)[-1]["source"] == "test199"
+    current_first = int(_lines(latency_log)[0]["source"][4:])
+    assert int(_lines(latency_log.with_name("llm_latency.jsonl.1"))[-1]["source"][4:]) == current_first - 1
+
+
+def test_no_backups_truncates(latency_log, monkeypatch):
+    monkeypatch.setattr(wrapper, "LATENCY_LOG_BACKUPS", 0)
+    for i in range(100):
+        wrapper.record_latency("t", None, 0.2, "m", stream=True)
+    assert latency_log.stat().st_size <= 1000
+    assert not latency_log.with_name("llm_latency.jsonl.1").exists()
+
+
+def test_concurrent_writers_lose_no_lines_before_oldest_backup(latency_log, monkeypatch):
+    monkeypatch.setattr(wrapper, "LATENCY_LOG_BACKUPS", 50)
+
+    def writer(n):
+        for i in range(50):
+            wrapper.record_latency(f"w{n}", 0.1, 0.2, "m", stream=False)
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    total = sum(len(_lines(p)) for p in latency_log.parent.glob("llm_latency.jsonl*") if not p.name.endswith(".lock"))
+    assert total == 200
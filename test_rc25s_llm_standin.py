@@ -0,0 +1,56 @@
+"""rc25s_llm_standin 테스트: chat completions, Ollama / free_llm_server 흉내, 에러 주입, 카운터 reset."""
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+from rc25s_llm_standin import StandInConfig, create_app
+
+FAST = dict(ttfb="1:0", rate="1:1000000", completion_tokens="1:3")
+
+
+def client(**overrides):
+    return TestClient(create_app(StandInConfig(**{**FAST, **overrides})))
+
+
+def test_chat_completion_shape():
+    with client() as c:
+        r = c.post("/v1/chat/completions", json={"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "hi"}]})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["choices"][0]["message"]["content"]
+    assert body["usage"]["total_tokens"] >= body["usage"]["completion_tokens"]
+
+
+def test_ollama_and_free_llm_endpoints():
+    with client() as c:
+        ollama = c.post("/api/generate", json={"model": "qwen", "prompt": "hi", "stream": False})
+        free = c.post("/generate", json={"prompt": "hi"})
+        stats = c.get("/stats").json()
+    assert ollama.status_code == 200 and ollama.json()["done"] is True and ollama.json()["response"]
+    assert free.status_code == 200 and free.json()["response"]
+    assert stats["requests"] == 2 and stats["in_flight"] == 0
+
+
+def test_injected_failures_on_every_endpoint():
+    with client(error_rate=1.0) as c:
+        codes = [
+            c.post("/v1/chat/completions", json={"messages": [{"role": "user", "content": "hi"}]}).status_code,
+            c.post("/api/generate", json={"prompt": "hi"}).status_code,
+            c.post("/generate", json={"prompt": "hi"}).status_code,
+        ]
+        stats = c.get("/stats").json()
+    assert codes == [500, 500, 500]
+    assert stats["errors"] == 3 and stats["in_flight"] == 0
+
+
+def test_reset_clears_counters():
+    app = create_app(StandInConfig(**FAST))
+    with TestClient(app) as c:
+        c.post("/generate", json={"prompt": "hi"})
+        app.state.stand_in.reset()
+        stats = c.get("/stats").json()
+    assert stats["requests"] == 0 and stats["peak_in_flight"] == 0 and stats["sources"] == {}
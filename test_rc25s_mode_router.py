@@ -0,0 +1,84 @@
+"""rc25_kernel_RC25S.ModeRouter 테스트: best-match, 공유 키워드, 표 형식 검사, hot reload."""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from rc25_kernel_RC25S import DEFAULT_ROUTING, ROUTING_CONFIG, ModeRouter, validate_routing
+
+
+def router(routing):
+    return ModeRouter(routing=routing, config_path=None)
+
+
+def test_best_match_not_first_match():
+    r = router(DEFAULT_ROUTING)
+    # EMPATHY 가 표 앞쪽이지만 CODE 키워드가 더 많다
+    assert r.detect("불안해요, 코드 오류 Error 가 나요") == "CODE"
+    assert r.detect("오늘 날씨") == "AUTO"
+    assert r.detect("") == "AUTO"
+
+
+def test_tie_goes_to_table_order():
+    assert router({"A": ["x"], "B": ["y"]}).detect("y x") == "A"
+
+
+def test_longest_keyword_wins_at_same_position():
+    r = router({"SHORT": ["API"], "LONG": ["API 키"]})
+    assert r.scores("API 키 발급") == {"LONG": 1.0}
+
+
+def test_shared_keyword_scores_every_mode():
+    r = router({"CODE": {"API": 1.0}, "RAG": {"API": 2.0, "뉴스": 1.0}})
+    assert r.scores("API 뉴스 API") == {"CODE": 2.0, "RAG": 5.0}
+    assert r.detect("API") == "RAG"
+
+
+@pytest.mark.parametrize(
+    "routing",
+    [
+        ["CODE"],
+        {"CODE": "코드"},
+        {"CODE": {"코드": "2"}},
+        {"CODE": {"코드": True}},
+        {"CODE": [1, 2]},
+        {"": ["코드"]},
+        {"CODE": None},
+    ],
+)
+def test_invalid_tables_are_rejected(routing):
+    with pytest.raises(ValueError):
+        validate_routing(routing)
+    with pytest.raises(ValueError):
+        router(routing)
+
+
+def test_weighted_and_list_forms():
+    assert validate_routing({"A": ["x", ""], "B": {"y": 2}}) == [("A", [("x", 1.0)]), ("B", [("y", 2.0)])]
+
+
+def test_shipped_config_is_valid():
+    path = Path(ROUTING_CONFIG)
+    if "RC25S_ROUTING_CONFIG" in os.environ or not path.exists():
+        pytest.skip("저장소 기본 config 가 아님")
+    with open(path, encoding="utf-8") as f:
+        validate_routing(json.load(f))
+
+
+def test_hot_reload_keeps_previous_table_on_invalid_file(tmp_path):
+    config = tmp_path / "routing.json"
+    config.write_text(json.dumps({"CODE": ["파이썬"]}), encoding="utf-8")
+    r = ModeRouter(config_path=config, reload_interval=0)
+    assert r.detect("파이썬") == "CODE"
+
+    config.write_text(json.dumps({"CODE": "코드"}), encoding="utf-8")
+    os.utime(config, (1, 1))
+    assert r.maybe_reload(force=True)
+    assert r.detect("파이썬") == "CODE"
+    assert r.detect("코") == "AUTO"
+
+    config.unlink()
+    assert r.maybe_reload(force=True)
+    assert r.routing == DEFAULT_ROUTING
@@ -0,0 +1,86 @@
+"""rc25s_planner.run_planner 프로세스 간 single-flight 테스트."""
+
+import json
+import multiprocessing
+import time
+
+import pytest
+
+import rc25s_planner
+from rc25s_planner import Goal, PlannerState, Task
+
+
+@pytest.fixture
+def planner_paths(tmp_path, monkeypatch):
+    monkeypatch.setattr(rc25s_planner, "PLANNER_STATE_PATH", tmp_path / "state.json")
+    monkeypatch.setattr(rc25s_planner, "PLANNER_LOCK_PATH", tmp_path / "planner.lock")
+    return tmp_path
+
+
+def _fake_run(runs_path, delay):
+    def run():
+        with open(runs_path, "a") as f:
+            f.write("run\n")
+        time.sleep(delay)
+        state = PlannerState(
+            generated_at=str(time.time()),
+            signals={"x": 1},
+            goals=[Goal("goal_a", "A", "a", 50, "active")],
+            tasks=[Task("task_a", "goal_a", "A", "a", 50, "pending")],
+        )
+        rc25s_planner.PLANNER_STATE_PATH.write_text(json.dumps(state.to_dict()), encoding="utf-8")
+        return state
+
+    return run
+
+
+def _child(tmp_path, start_at, results):
+    rc25s_planner.PLANNER_STATE_PATH = tmp_path / "state.json"
+    rc25s_planner.PLANNER_LOCK_PATH = tmp_path / "planner.lock"
+    rc25s_planner._run_planner = _fake_run(tmp_path / "runs", 0.5)
+    time.sleep(max(0.0, start_at - time.time()))
+    state = rc25s_planner.run_planner(fresh_within=0)
+    results.put(state.generated_at)
+
+
+def test_concurrent_processes_share_one_run(tmp_path):
+    ctx = multiprocessing.get_context("fork")
+    results = ctx.Queue()
+    start_at = time.time() + 0.3
+    procs = [ctx.Process(target=_child, args=(tmp_path, start_at, results)) for _ in range(3)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(10)
+    generated = {results.get(timeout=1) for _ in procs}
+    assert (tmp_path / "runs").read_text().count("run") == 1
+    assert len(generated) == 1
+
+
+def test_sequential_calls_rerun_without_fresh_window(planner_paths, monkeypatch):
+    monkeypatch.setattr(rc25s_planner, "_run_planner", _fake_run(planner_paths / "runs", 0))
+    rc25s_planner.run_planner(fresh_within=0)
+    time.sleep(0.01)
+    rc25s_planner.run_planner(fresh_within=0)
+    assert (planner_paths / "runs").read_text().count("run") == 2
+
+
+def test_fresh_result_is_reused(planner_paths, monkeypatch):
+    monkeypatch.setattr(rc25s_planner, "_run_planner", _fake_run(planner_paths / "runs", 0))
+    first = rc25s_planner.run_planner(fresh_within=60)
+    second = rc25s_planner.run_planner(fresh_within=60)
+    assert (planner_paths / "runs").read_text().count("run") == 1
+    assert second.generated_at == first.generated_at
+    assert second.tasks[0].id == "task_a"
+
+
+def test_from_dict_ignores_approved_flag():
+    state = PlannerState.from_dict(
+        {
+            "generated_at": "t",
+            "signals": {},
+            "goals": [{"id": "g", "title": "G", "description": "", "priority": 1, "status": "active"}],
+            "tasks": [{"id": "t", "goal_id": "g", "title": "T", "description": "", "priority": 1, "status": "pending", "approved": True}],
+        }
+    )
+    assert state.tasks[0].goal_id == "g"
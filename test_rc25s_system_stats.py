@@ -0,0 +1,63 @@
+"""rc25s_system_stats 테스트: summary()는 마지막 샘플을 재사용하고, psutil.cpu_percent 를 부르지 않는다."""
+
+import pytest
+
+psutil = pytest.importorskip("psutil")
+
+import rc25s_system_stats
+from rc25s_system_stats import SystemStatsSampler, get_system_stats_sampler
+
+
+@pytest.fixture
+def no_cpu_percent(monkeypatch):
+    def forbidden(*args, **kwargs):
+        raise AssertionError("psutil.cpu_percent must not be called")
+
+    monkeypatch.setattr(psutil, "cpu_percent", forbidden)
+
+
+def test_summary_reuses_fresh_sample(monkeypatch, no_cpu_percent):
+    sampler = SystemStatsSampler(interval=60)
+    calls = []
+    real_sample = sampler._sample
+    monkeypatch.setattr(sampler, "_sample", lambda: calls.append(1) or real_sample())
+
+    first = sampler.summary()
+    second = sampler.summary()
+
+    assert first == second
+    assert first.startswith("CPU=") and "MEM=" in first and "DISK=" in first
+    assert len(calls) == 1
+
+
+def test_summary_resamples_when_stale(monkeypatch):
+    sampler = SystemStatsSampler(interval=1)
+    sampler.summary()
+    sampler.latest = {"cpu": 1.0, "memory": 2.0, "disk": 3.0}
+    assert sampler.summary() == "CPU=1.0%, MEM=2.0%, DISK=3.0%"
+    sampler.latest_at -= 10
+    assert sampler.summary() != "CPU=1.0%, MEM=2.0%, DISK=3.0%"
+
+
+def test_summary_failure_is_empty(monkeypatch):
+    sampler = SystemStatsSampler()
+
+    def broken():
+        raise OSError("no /proc")
+
+    monkeypatch.setattr(sampler, "_sample", broken)
+    assert sampler.summary() == ""
+
+
+def test_process_wide_sampler(monkeypatch):
+    monkeypatch.setattr(rc25s_system_stats, "_sampler", None)
+    assert get_system_stats_sampler() is get_system_stats_sampler()
+
+
+def test_llm_prompt_summary_uses_shared_sampler(monkeypatch, no_cpu_percent):
+    wrapper = pytest.importorskip("rc25s_openai_wrapper")
+    sampler = SystemStatsSampler(interval=60)
+    sampler.latest = {"cpu": 12.5, "memory": 40.0, "disk": 70.0}
+    sampler.latest_at = rc25s_system_stats.time.monotonic()
+    monkeypatch.setattr(rc25s_system_stats, "_sampler", sampler)
+    assert wrapper._get_system_stats_summary() == "CPU=12.5%, MEM=40.0%, DISK=70.0%"
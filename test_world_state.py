@@ -0,0 +1,39 @@
+"""world_state 테스트: 스냅샷의 revision 과 이벤트 로그 섹션 뷰가 같은 커밋 시점을 가리키는지."""
+
+import pytest
+
+import world_state
+from world_state_patch import apply_patch
+
+
+@pytest.fixture(params=["json", "sqlite", "sharded"])
+def ws(request, tmp_path, monkeypatch):
+    path = tmp_path / "world_state.json"
+    monkeypatch.setattr(world_state, "BACKEND", request.param)
+    monkeypatch.setattr(world_state, "STATE_PATH", path)
+    monkeypatch.setattr(world_state, "DB_PATH", path.with_suffix(".db"))
+    monkeypatch.setattr(world_state, "EVENTS_DIR", path.with_suffix(".events"))
+    monkeypatch.setattr(world_state, "HISTORY_INTERVAL", 0)
+    monkeypatch.setattr(world_state, "_store", None)
+    monkeypatch.setattr(world_state, "_event_logs", {})
+    world_state._cache.invalidate()
+    yield world_state
+    world_state._cache.invalidate()
+
+
+def test_snapshot_event_view_is_pinned_to_its_revision(ws):
+    ws.update_sections({"core": {"n": 1}})
+    ws.append_action_log({"id": "a1"})
+    snapshot = ws.load_world_state()
+    revision = snapshot["revision"]
+
+    ws.append_action_log({"id": "a2"})  # 스냅샷을 만든 뒤, 이벤트 섹션을 읽기 전에 추가
+    assert [a["id"] for a in snapshot["last_actions"]] == ["a1"]
+
+    # delta 클라이언트: 스냅샷 + revision 이후 패치 = 최신 상태 (a2가 두 번 들어가지 않는다)
+    state = ws.thaw(snapshot)
+    state.pop("revision")
+    for change in ws.changes_since(revision)["changes"]:
+        state = apply_patch(state, change["patch"])
+    assert [a["id"] for a in state["last_actions"]] == ["a1", "a2"]
+    assert [a["id"] for a in ws.load_world_state()["last_actions"]] == ["a1", "a2"]
@@ -0,0 +1,67 @@
+"""world_state_history 테스트: keyframe + delta 기록, state_at 복원, 같은 revision 중복 기록 방지."""
+
+import pytest
+
+from world_state_history import WorldStateHistory
+
+T0 = 1_700_000_000.0
+
+
+def _state(i):
+    return {
+        "core": {"n": i, "mode": "auto" if i % 2 else "manual"},
+        "last_actions": list(range(i, i + 30)),
+        "memory": {"facts": [f"fact-{j}" for j in range(40)]},
+    }
+
+
+def test_keyframes_and_deltas(tmp_path):
+    history = WorldStateHistory(tmp_path, keyframe_every=4)
+    for i in range(1, 11):
+        assert history.record(_state(i), revision=i, ts=T0 + i) == i
+
+    kinds = [r["kind"] for r in history.revisions()]
+    assert kinds == ["key", "delta", "delta", "delta", "delta", "key", "delta", "delta", "delta", "delta"]
+    revisions = history.revisions(T0 + 3, T0 + 5)
+    assert [r["revision"] for r in revisions] == [3, 4, 5]
+    assert all(r["stored_bytes"] < r["bytes"] for r in revisions)
+
+
+def test_state_at_replays_any_point(tmp_path):
+    history = WorldStateHistory(tmp_path, keyframe_every=3)
+    for i in range(1, 13):
+        history.record({**_state(i), "revision": 999}, revision=i, ts=T0 + i)
+
+    for i in range(1, 13):
+        state = history.state_at(T0 + i + 0.5)
+        assert state.pop("revision") == i
+        assert state.pop("history_ts").endswith("Z")
+        assert state == _state(i)
+
+    # 다른 인스턴스(다른 프로세스)에서도 같은 결과
+    assert WorldStateHistory(tmp_path).state_at(T0 + 7)["core"] == _state(7)["core"]
+
+
+def test_same_revision_is_recorded_once(tmp_path):
+    history = WorldStateHistory(tmp_path)
+    assert history.record(_state(1), revision=5, ts=T0) == 1
+    assert history.record(_state(2), revision=5, ts=T0 + 1) is None
+    assert WorldStateHistory(tmp_path).record(_state(2), revision=5, ts=T0 + 2) is None
+    assert history.stats()["last_seq"] == 1
+
+
+def test_missing_history_raises_lookup_error(tmp_path):
+    history = WorldStateHistory(tmp_path)
+    with pytest.raises(LookupError):
+        history.state_at(T0)
+    history.record(_state(1), revision=1, ts=T0 + 10)
+    with pytest.raises(LookupError):
+        history.state_at(T0)
+
+
+def test_delta_chain_without_retained_keyframe_raises(tmp_path):
+    history = WorldStateHistory(tmp_path, keyframe_every=1000, segment_bytes=1500, max_segments=2)
+    for i in range(1, 60):
+        history.record(_state(i), revision=i, ts=T0 + i)
+    with pytest.raises(LookupError):
+        history.state_at(T0 + 59)
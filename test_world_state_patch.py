@@ -0,0 +1,111 @@
+"""world_state_patch 테스트: diff → apply_patch 왕복, 포인터 이스케이프, 슬라이딩 윈도우."""
+
+import copy
+import random
+
+import pytest
+
+from world_state_patch import apply_patch, diff, escape_pointer, unescape_pointer
+
+
+@pytest.mark.parametrize(
+    "old, new",
+    [
+        ({"a": 1}, {"a": 2}),
+        ({"a": 1, "b": 2}, {"b": 2, "c": 3}),
+        ({"a": {"x": [1, 2, 3]}}, {"a": {"x": [1, 2, 3, 4]}}),
+        ({"a": [1, 2, 3]}, {"a": [3]}),
+        ({"a": [1, {"k": 1}]}, {"a": [1, {"k": 2}]}),
+        ({"a": 1}, {"a": "1"}),
+        ({"a": 1}, {"a": True}),
+        ({"a": None}, {"a": {}}),
+        ([1, 2], {"x": 1}),
+        ({}, {}),
+    ],
+)
+def test_round_trip(old, new):
+    assert apply_patch(old, diff(old, new)) == new
+
+
+def test_equal_values_make_empty_patch():
+    assert diff({"a": [1, {"b": 2}]}, {"a": [1, {"b": 2}]}) == []
+
+
+def test_pointer_escaping():
+    assert escape_pointer("a/b~c") == "a~1b~0c"
+    assert unescape_pointer(escape_pointer("~1/~0")) == "~1/~0"
+    old = {"a/b": 1, "~x": {"c/d~": 2}}
+    new = {"a/b": 2, "~x": {"c/d~": 3, "e/": 4}}
+    patch = diff(old, new)
+    assert {op["path"] for op in patch} == {"/a~1b", "/~0x/c~1d~0", "/~0x/e~1"}
+    assert apply_patch(old, patch) == new
+
+
+def test_sliding_window_is_remove_front_add_back():
+    old = {"last_actions": list(range(50))}
+    new = {"last_actions": list(range(3, 53))}
+    patch = diff(old, new)
+    assert patch == [{"op": "remove", "path": "/last_actions/0"}] * 3 + [
+        {"op": "add", "path": "/last_actions/-", "value": v} for v in (50, 51, 52)
+    ]
+    assert apply_patch(old, patch) == new
+
+
+def test_apply_patch_does_not_mutate_input_or_share_values():
+    old = {"a": {"b": [1, 2]}}
+    snapshot = copy.deepcopy(old)
+    value = {"nested": [1]}
+    patch = [{"op": "add", "path": "/a/c", "value": value}, {"op": "add", "path": "/a/b/-", "value": 3}]
+    out = apply_patch(old, patch)
+    assert old == snapshot
+    out["a"]["c"]["nested"].append(2)
+    assert value == {"nested": [1]}
+
+
+def test_invalid_ops():
+    with pytest.raises(ValueError):
+        apply_patch({"a": 1}, [{"op": "move", "path": "/a"}])
+    with pytest.raises(ValueError):
+        apply_patch({"a": 1}, [{"op": "remove", "path": "a"}])
+
+
+def _random_value(rng, depth=0):
+    kind = rng.choice(["int", "str", "list", "dict", "null"] if depth < 3 else ["int", "str"])
+    if kind == "int":
+        return rng.randint(0, 5)
+    if kind == "str":
+        return rng.choice(["a", "b/c", "~d", "한"])
+    if kind == "list":
+        return [_random_value(rng, depth + 1) for _ in range(rng.randint(0, 5))]
+    if kind == "dict":
+        return {rng.choice(["x", "y", "z/w", "~v"]): _random_value(rng, depth + 1) for _ in range(rng.randint(0, 4))}
+    return None
+
+
+def _mutate(rng, value):
+    if isinstance(value, dict) and value and rng.random() < 0.7:
+        key = rng.choice(list(value))
+        value = dict(value)
+        value[key] = _mutate(rng, value[key])
+        return value
+    if isinstance(value, list) and value and rng.random() < 0.7:
+        value = list(value)
+        choice = rng.random()
+        if choice < 0.3:
+            return value[rng.randint(1, len(value)):] + [_random_value(rng, 2)]
+        if choice < 0.6:
+            i = rng.randrange(len(value))
+            value[i] = _mutate(rng, value[i])
+            return value
+        return value[: rng.randrange(len(value))]
+    return _random_value(rng)
+
+
+def test_random_round_trip():
+    rng = random.Random(2025)
+    for _ in range(500):
+        old = {"root": _random_value(rng)}
+        new = {"root": _mutate(rng, old["root"])}
+        snapshot = copy.deepcopy(old)
+        assert apply_patch(old, diff(old, new)) == new
+        assert old == snapshot
@@ -0,0 +1,200 @@
+"""world_state_store 테스트: json / sqlite / sharded 엔진의 revision, changes_since 패치 재생, batch, ChangeLog 압축."""
+
+import threading
+
+import pytest
+
+from world_state_patch import apply_patch
+from world_state_store import ChangeLog, create_store
+
+T0 = "2025-01-01T00:00:00Z"
+
+
+def _default():
+    return {"updated_at": T0, "core": {}, "planner": {"tasks": []}, "last_actions": []}
+
+
+@pytest.fixture(params=["json", "sqlite", "sharded"])
+def store(request, tmp_path):
+    return create_store(request.param, tmp_path / "world_state.json", tmp_path / "world_state.db", _default)
+
+
+def _ts(i):
+    return f"2025-01-01T00:00:{i:02d}Z"
+
+
+def _without_revision(state):
+    return {k: v for k, v in state.items() if k != "revision"}
+
+
+def test_write_and_read_bumps_revision(store):
+    assert store.revision() == 0
+    store.write_sections({"core": {"mode": "auto"}}, _ts(1))
+    state = store.read_all()
+    assert state["core"] == {"mode": "auto"}
+    assert state["planner"] == {"tasks": []}
+    assert state["updated_at"] == _ts(1)
+    assert state["revision"] == store.revision() == 1
+    assert store.read_sections(["core", "missing"]) == {"core": {"mode": "auto"}}
+
+    store.update(["planner"], lambda cur: {"planner": {"tasks": cur["planner"]["tasks"] + ["t1"]}}, _ts(2))
+    assert store.read_all()["planner"] == {"tasks": ["t1"]}
+    assert store.revision() == 2
+
+
+def test_changes_since_replays_to_current_state(store):
+    store.write_sections({"core": {"n": 0}}, _ts(1))
+    base_rev = store.revision()
+    base = _without_revision(store.read_all())
+
+    for i in range(2, 12):
+        store.update(
+            ["core", "last_actions"],
+            lambda cur, i=i: {"core": {"n": i, "k/~": i % 3}, "last_actions": (cur["last_actions"] + [i])[-5:]},
+            _ts(i),
+        )
+    store.write_sections({"memory": {"facts": ["a"]}}, _ts(12))
+
+    changes = store.changes_since(base_rev)
+    assert [c["rev"] for c in changes] == list(range(base_rev + 1, store.revision() + 1))
+    replayed = base
+    for change in changes:
+        replayed = apply_patch(replayed, change["patch"])
+    assert replayed == _without_revision(store.read_all())
+
+    assert store.changes_since(store.revision()) == []
+    assert store.changes_since(store.revision() + 5) is None
+
+
+def test_replace_all_removes_sections(store):
+    store.write_sections({"core": {"a": 1}, "memory": {"b": 2}}, _ts(1))
+    rev = store.revision()
+    store.replace_all({"core": {"a": 2}, "revision": 99, "updated_at": "ignored"}, _ts(2))
+    state = store.read_all()
+    assert "memory" not in state and "planner" not in state
+    assert state["core"] == {"a": 2}
+    assert state["revision"] == rev + 1
+
+    (change,) = store.changes_since(rev)
+    assert {"op": "remove", "path": "/memory"} in change["patch"]
+
+
+def test_batch_commits_once(store):
+    with store.batch():
+        store.write_sections({"core": {"a": 1}}, _ts(1))
+        store.write_sections({"memory": {"b": 2}}, _ts(2))
+        store.update(["planner"], lambda cur: {"planner": {"tasks": ["x"]}}, _ts(3))
+        assert store.revision() == 0  # 블록이 끝나기 전에는 커밋하지 않는다
+    state = store.read_all()
+    assert state["revision"] == 1
+    assert (state["core"], state["memory"], state["planner"]) == ({"a": 1}, {"b": 2}, {"tasks": ["x"]})
+
+
+def test_batch_discards_on_error(store):
+    with pytest.raises(RuntimeError):
+        with store.batch():
+            store.write_sections({"core": {"a": 1}}, _ts(1))
+            raise RuntimeError("boom")
+    assert store.revision() == 0
+    assert store.read_all()["core"] == {}
+
+
+def test_noop_update_keeps_revision(store):
+    store.write_sections({"core": {"a": 1}}, _ts(1))
+    store.write_sections({"core": {"a": 1}}, _ts(2))
+    store.update(["core"], lambda cur: None, _ts(3))
+    assert store.revision() == 1
+    assert store.read_all()["updated_at"] == _ts(1)
+
+
+def test_concurrent_updates_all_land(store):
+    def worker(n):
+        for i in range(10):
+            store.update(["last_actions"], lambda cur, v=f"{n}-{i}": {"last_actions": cur["last_actions"] + [v]}, _ts(i))
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    actions = store.read_all()["last_actions"]
+    assert sorted(actions) == sorted(f"{n}-{i}" for n in range(4) for i in range(10))
+    replayed = _default()
+    for change in store.changes_since(0):
+        replayed = apply_patch(replayed, change["patch"])
+    assert replayed["last_actions"] == actions
+
+
+def test_changelog_compaction_truncates_old_revisions(tmp_path):
+    log = ChangeLog(tmp_path / "changes.jsonl", max_entries=5, max_bytes=2000)
+    for i in range(100):
+        assert log.append([{"op": "replace", "path": "/core/n", "value": i}], _ts(i % 60)) == i + 1
+    assert log.head() == 100
+    assert (tmp_path / "changes.jsonl").stat().st_size <= 2000
+    assert log.since(10) is None
+    recent = log.since(97)
+    assert [e["rev"] for e in recent] == [98, 99, 100]
+    assert recent[-1]["patch"][0]["value"] == 99
+    assert ChangeLog(tmp_path / "changes.jsonl").head() == 100
+
+
+def test_concurrent_reader_sees_revision_matching_content(store):
+    # 커밋마다 last_actions 에 하나씩 추가 → 읽은 상태의 개수 == revision 이어야 한다.
+    done = threading.Event()
+
+    def writer():
+        try:
+            for i in range(150):
+                store.update(["last_actions"], lambda cur, i=i: {"last_actions": cur["last_actions"] + [i]}, _ts(i % 60))
+        finally:
+            done.set()
+
+    reads = []
+    thread = threading.Thread(target=writer)
+    thread.start()
+    while not done.is_set():
+        state = store.read_all()
+        reads.append((state["revision"], list(state["last_actions"])))
+    thread.join()
+
+    final = _without_revision(store.read_all())
+    assert final["last_actions"] == list(range(150))
+    for revision, actions in reads:
+        assert len(actions) == revision
+    # delta 클라이언트: 읽은 상태 + 그 revision 이후 패치 = 최신 상태 (같은 패치를 두 번 적용하지 않는다)
+    for revision, actions in reads[:: max(1, len(reads) // 20)]:
+        state = dict(final, last_actions=actions, updated_at=None)
+        for change in store.changes_since(revision):
+            state = apply_patch(state, change["patch"])
+        assert state["last_actions"] == final["last_actions"]
+
+
+def test_crash_before_changelog_append_keeps_revision(store, monkeypatch):
+    store.write_sections({"core": {"n": 1}}, _ts(1))
+
+    def crash(*args, **kwargs):
+        raise OSError("killed before the change log append")
+
+    with monkeypatch.context() as m:
+        m.setattr(store.changelog, "append", crash)
+        with pytest.raises(OSError):
+            store.write_sections({"core": {"n": 2}}, _ts(2))
+
+    state = store.read_all()
+    assert (state["core"], state["revision"]) == ({"n": 2}, 2)  # 상태와 함께 저장된 revision
+
+    # 다음 커밋은 번호를 다시 쓰지 않는다. revision 2의 패치가 빠진 자리는 resync 신호가 된다.
+    store.write_sections({"core": {"n": 3}}, _ts(3))
+    assert store.read_all()["revision"] == 3
+    assert [c["rev"] for c in store.changes_since(2)] == [3]
+    assert store.changes_since(1) is None
+
+
+def test_external_changes_bump_revision_for_readers(store):
+    store.write_sections({"core": {"n": 1}}, _ts(1))
+    store.record_external(lambda: [{"op": "add", "path": "/last_actions/-", "value": "x"}], _ts(2))
+    assert store.read_all()["revision"] == 2
+    assert store.read_sections(["revision"]) == {"revision": 2}
+    store.write_sections({"core": {"n": 2}}, _ts(3))
+    assert store.read_all()["revision"] == 3
@@ -12,18 +12,74 @@ RC25S 전체 시스템이 공유하는 단일 상태 파일을 관리한다.
   - planner: rc25s_planner 상태(goals/tasks/signals)
   - last_actions: 최근 실행된 액션(Task) 기록
   - system: 기타 헬스/버전 정보
+
+- revision / 변경 피드:
+  - 모든 커밋은 revision을 1 올리고 변경분을 RFC 6902 패치로 world_state.changes.jsonl에 남긴다.
+  - changes_since(revision) → 그 이후 패치 목록 (너무 오래된 revision이면 resync 필요 신호)
+- 저장 엔진 (world_state_store.py):
+  - RC25S_WORLD_STATE_BACKEND=json (기본): world_state.json 단일 파일
+  - RC25S_WORLD_STATE_BACKEND=sqlite: 섹션별 행을 가진 WAL 모드 world_state.db
+  - RC25S_WORLD_STATE_BACKEND=sharded: world_state.d/ 아래 섹션별 파일 + manifest.json
+    (load_world_state()는 접근한 섹션만 디코딩하는 LazyWorldState를 돌려준다)
+  - sqlite / sharded 에서 world_state.json 은 export_world_state_json()으로 재생성
+- 이벤트 로그 섹션 (rc25s_event_log.py):
+  - last_actions / failures_learned / rca_history / log_rules 는 world_state.events/<섹션>/ 아래
+    append-only 세그먼트 로그에 쌓고, world_state에는 최근 N개(EVENT_SECTIONS)만 보여준다.
+  - 추가는 O(1)이며 상태 전체를 다시 쓰지 않는다. 전체 기록은 event_history()로 시간 범위 조회.
+- 과거 상태 (world_state_history.py):
+  - world_state.history/ 에 keyframe + 압축 delta 스냅샷을 쌓는다.
+    쓰기 후 자동(RC25S_WORLD_STATE_HISTORY_INTERVAL 초에 최대 1번) + record_history() 직접 호출.
+  - load_world_state(at=시각) → 그 시각의 상태, world_state_history(start, end) → revision 목록
+- async API (FastAPI 핸들러용):
+  - aload_world_state / aload_sections / asave_world_state / aupdate_* 등
+  - 디스크 I/O는 world_state 전용 작은 스레드 풀(RC25S_WORLD_STATE_IO_WORKERS)에서 실행해
+    이벤트 루프가 디스크 지연에 멈추지 않도록 한다.
 """
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from rc25s_event_log import SegmentedEventLog
+from world_state_history import WorldStateHistory
+from world_state_store import WorldStateStore, create_store
 
 
 ROOT = Path(__file__).resolve().parent
-STATE_PATH = ROOT / "world_state.json"
+STATE_PATH = Path(os.getenv("RC25S_WORLD_STATE_PATH") or ROOT / "world_state.json")
+DB_PATH = STATE_PATH.with_suffix(".db")
+BACKEND = os.getenv("RC25S_WORLD_STATE_BACKEND", "json")
+IO_WORKERS = int(os.getenv("RC25S_WORLD_STATE_IO_WORKERS", "4"))
+EVENTS_DIR = STATE_PATH.with_suffix(".events")
+HISTORY_DIR = STATE_PATH.with_suffix(".history")
+# 쓰기 후 자동 history 기록 최소 간격(초). 0 이하이면 자동 기록하지 않는다.
+HISTORY_INTERVAL = float(os.getenv("RC25S_WORLD_STATE_HISTORY_INTERVAL", "30"))
+
+# 이벤트 로그로 옮긴 섹션 → world_state 뷰에 보여줄 최근 기록 수
+EVENT_SECTIONS: Dict[str, int] = {
+    "last_actions": 50,
+    "failures_learned": 50,
+    "rca_history": 100,
+    "log_rules": 100,
+}
+
+_store: Optional[WorldStateStore] = None
+_io_pool: Optional[ThreadPoolExecutor] = None
+_io_pool_lock = threading.Lock()
+_event_logs: Dict[str, SegmentedEventLog] = {}
+_event_logs_lock = threading.Lock()
+_history: Optional[WorldStateHistory] = None
+_history_last = 0.0
 
 
 def _now_iso() -> str:
@@ -59,68 +115,462 @@ def _default_state() -> Dict[str, Any]:
     }
 
 
-def load_world_state() -> Dict[str, Any]:
-    if not STATE_PATH.exists():
-        return _default_state()
-    try:
-        data = json.loads(STATE_PATH.read_text(encoding="utf-8"))
-        if not isinstance(data, dict):
-            return _default_state()
-        return data
-    except Exception:
-        return _default_state()
+def get_store() -> WorldStateStore:
+    """설정된 저장 엔진 인스턴스(프로세스당 1개)."""
+    global _store
+    if _store is None:
+        _store = create_store(BACKEND, STATE_PATH, DB_PATH, _default_state)
+    return _store
+
+
+# ---------- 이벤트 로그 섹션 ----------
+def get_event_log(name: str) -> SegmentedEventLog:
+    """
+    섹션 하나의 이벤트 로그 (프로세스당 1개).
+    처음 열 때 로그가 비어 있으면 저장소에 남아 있던 기존 섹션 값을 한 번 옮겨 담는다.
+    """
+    if name not in EVENT_SECTIONS:
+        raise KeyError(f"Not an event log section: {name}")
+    log = _event_logs.get(name)
+    if log is not None:
+        return log
+    with _event_logs_lock:
+        log = _event_logs.get(name)
+        if log is None:
+            log = SegmentedEventLog(EVENTS_DIR / name)
+            store = get_store()
+
+            def _migrate() -> list:
+                if log.last_seq() == 0:
+                    legacy = store.read_sections([name]).get(name)
+                    for item in legacy if isinstance(legacy, list) else []:
+                        log.append(item, ts=item.get("time") if isinstance(item, dict) else None)
+                # 뷰에 보이는 값은 그대로이므로 change log에 남길 패치는 없다.
+                return []
+
+            store.record_external(_migrate, _now_iso())
+            _event_logs[name] = log
+    return log
+
+
+def _event_view(name: str, upto: Optional[int] = None) -> List[Any]:
+    """
+    이벤트 로그 섹션의 뷰 (최근 N개).
+    upto(seq)를 주면 그 seq까지만 본다 — 스냅샷을 읽은 시점 이후의 추가가 섞이지 않게 (revision과 맞춘다).
+    """
+    log = get_event_log(name)
+    if upto is None:
+        return [entry["data"] for entry in log.tail(EVENT_SECTIONS[name])]
+    if upto <= 0:
+        return []
+    return [entry["data"] for entry in log.read_seqs(max(1, upto - EVENT_SECTIONS[name] + 1), upto)]
+
+
+def _append_events(name: str, records: List[Any]) -> None:
+    """records를 이벤트 로그에 추가하고, 뷰(최근 N개)의 변화를 패치로 change log에 남긴다."""
+    if not records:
+        return
+    log = get_event_log(name)
+    limit = EVENT_SECTIONS[name]
+    now = _now_iso()
+
+    def _append() -> list:
+        count = min(log.last_seq(), limit)
+        log.append_many(records, ts=now)
+        patch = []
+        for record in records:
+            if count >= limit:
+                patch.append({"op": "remove", "path": f"/{name}/0"})
+            else:
+                count += 1
+            patch.append({"op": "add", "path": f"/{name}/-", "value": record})
+        return patch
+
+    get_store().record_external(_append, now)
+    _cache.invalidate()
+    _maybe_record_history()
+
+
+def event_history(name: str, start: Any = None, end: Any = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    이벤트 로그 섹션의 전체 기록을 시간 범위로 조회한다 (start/end: epoch 또는 ISO8601).
+    - 반환: [{"seq", "t", "data"}, ...] (오래된 것 → 최신 순)
+    """
+    return get_event_log(name).range(start, end, limit)
+
+
+# ---------- 읽기 전용 뷰 ----------
+class FrozenDict(dict):
+    """캐시된 스냅샷을 공유하기 위한 읽기 전용 dict (json.dumps 등은 그대로 동작)."""
+
+    def _readonly(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError("world_state snapshot is read-only; use thaw() or load_world_state(mutable=True)")
+
+    __setitem__ = __delitem__ = _readonly  # type: ignore[assignment]
+    clear = pop = popitem = setdefault = update = _readonly  # type: ignore[assignment]
+    __ior__ = _readonly  # type: ignore[assignment]
+
+
+class FrozenList(list):
+    """FrozenDict와 짝을 이루는 읽기 전용 list."""
+
+    def _readonly(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError("world_state snapshot is read-only; use thaw() or load_world_state(mutable=True)")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly  # type: ignore[assignment]
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly  # type: ignore[assignment]
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return FrozenDict((k, _freeze(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return FrozenList(_freeze(v) for v in value)
+    return value
+
+
+class LazyWorldState(FrozenDict):
+    """
+    섹션 값을 처음 접근할 때 읽어 디코딩하는 읽기 전용 world_state (sharded 엔진용).
+    - state["planner"], state.get("core") 등은 그 섹션만 읽는다.
+    - items()/values()/json.dumps/thaw 처럼 전체를 훑으면 모든 섹션을 읽는다.
+    """
+
+    def __init__(self, eager: Dict[str, Any], loaders: Dict[str, Callable[[], Any]]):
+        dict.__init__(self, eager)
+        self._loaders = dict(loaders)
+        self._order = list(eager) + [k for k in loaders if k not in eager]
+        self._load_lock = threading.Lock()
+
+    def _load(self, key: str) -> Any:
+        with self._load_lock:
+            loader = self._loaders.pop(key, None)
+            if loader is not None:
+                dict.__setitem__(self, key, _freeze(loader()))
+        return dict.__getitem__(self, key)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._loaders:
+            return self._load(key)
+        return dict.__getitem__(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in self else default
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._loaders or dict.__contains__(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._order)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def keys(self) -> List[str]:  # type: ignore[override]
+        return list(self._order)
+
+    def values(self) -> List[Any]:  # type: ignore[override]
+        return [self[k] for k in self._order]
+
+    def items(self) -> List[Tuple[str, Any]]:  # type: ignore[override]
+        return [(k, self[k]) for k in self._order]
+
+    def __eq__(self, other: object) -> bool:
+        return dict(self.items()) == other
+
+    def __ne__(self, other: object) -> bool:
+        return not self == other
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        shown = ", ".join(f"{k!r}: {'<lazy>' if k in self._loaders else repr(dict.__getitem__(self, k))}" for k in self._order)
+        return f"LazyWorldState({{{shown}}})"
+
+    def load_all(self) -> "LazyWorldState":
+        """남은 섹션을 전부 디코딩한다."""
+        for key in list(self._loaders):
+            self._load(key)
+        return self
+
+    def loaded_sections(self) -> List[str]:
+        """지금까지 실제로 디코딩된 키 목록 (진단용)."""
+        return [k for k in self._order if k not in self._loaders]
+
+
+def thaw(value: Any) -> Any:
+    """읽기 전용 뷰를 자유롭게 수정 가능한 dict/list 사본으로 되돌린다."""
+    if isinstance(value, dict):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [thaw(v) for v in value]
+    return value
+
+
+# ---------- 프로세스 로컬 스냅샷 캐시 ----------
+Signature = Tuple[Optional[Tuple[int, int, int, int]], ...]
+
+
+def _stat_signature(paths: List[Path]) -> Signature:
+    """백엔드 파일들의 (inode, mtime_ns, ctime_ns, size). 하나라도 바뀌면 다시 파싱한다."""
+    sig = []
+    for p in paths:
+        try:
+            st = os.stat(p)
+            sig.append((st.st_ino, st.st_mtime_ns, st.st_ctime_ns, st.st_size))
+        except OSError:
+            sig.append(None)
+    return tuple(sig)
+
+
+class _SnapshotCache:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.signature: Optional[Signature] = None
+        self.snapshot: Optional[FrozenDict] = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, signature: Signature) -> Optional[FrozenDict]:
+        with self.lock:
+            if self.snapshot is not None and signature == self.signature:
+                self.hits += 1
+                return self.snapshot
+            self.misses += 1
+            return None
+
+    def put(self, signature: Signature, snapshot: FrozenDict) -> None:
+        with self.lock:
+            self.signature = signature
+            self.snapshot = snapshot
+
+    def invalidate(self) -> None:
+        with self.lock:
+            self.signature = None
+            self.snapshot = None
+
+
+_cache = _SnapshotCache()
+
+
+def _cached_snapshot() -> FrozenDict:
+    store = get_store()
+    # stat을 먼저 찍고 읽어야, 읽는 도중 바뀐 경우 다음 호출에서 다시 파싱된다.
+    signature = _stat_signature(store.paths())
+    snapshot = _cache.get(signature)
+    if snapshot is None:
+        logs = {name: get_event_log(name) for name in EVENT_SECTIONS}  # 처음 열 때 커밋할 수 있으므로 읽기 잠금 전에
+        # 상태 / revision / 이벤트 로그 끝 seq 를 같은 커밋 시점에서 읽는다.
+        with store.reading():
+            eager, loaders = store.read_lazy()
+            heads = {name: log.last_seq() for name, log in logs.items()}
+        for name in EVENT_SECTIONS:
+            # 저장소에 남아 있는 옛 값 대신 이벤트 로그의 최근 기록을 보여준다.
+            eager.pop(name, None)
+            loaders[name] = functools.partial(_event_view, name, heads[name])
+        snapshot = LazyWorldState(_freeze(eager), loaders)
+        _cache.put(signature, snapshot)
+    return snapshot
+
+
+def world_state_cache_stats() -> Dict[str, Any]:
+    """스냅샷 캐시 hit/miss 카운터."""
+    with _cache.lock:
+        total = _cache.hits + _cache.misses
+        return {
+            "hits": _cache.hits,
+            "misses": _cache.misses,
+            "hit_rate": round(_cache.hits / total, 4) if total else 0.0,
+        }
+
+
+def load_world_state(mutable: bool = False, at: Any = None) -> Dict[str, Any]:
+    """
+    world_state 전체를 읽는다.
+    - at(epoch 또는 ISO8601)을 주면 history에서 그 시각의 상태를 복원한다 (없으면 LookupError).
+    - 기본: 파일 stat이 그대로면 메모리에 캐시된 읽기 전용 스냅샷을 돌려준다 (파싱 없음).
+      sharded 엔진에서는 접근한 섹션만 디코딩하는 LazyWorldState.
+    - mutable=True: 호출자가 마음대로 수정해도 되는 사본을 돌려준다.
+    """
+    if at is not None:
+        state = get_history().state_at(at)
+        return state if mutable else _freeze(state)
+    snapshot = _cached_snapshot()
+    return thaw(snapshot) if mutable else snapshot
+
+
+def load_sections(*names: str) -> Dict[str, Any]:
+    """필요한 섹션만 읽는다 (sqlite 엔진은 해당 행만, sharded 엔진은 해당 섹션 파일만 조회)."""
+    store = get_store()
+    if not store.partial_reads:
+        snapshot = _cached_snapshot()
+        return {n: snapshot[n] for n in names if n in snapshot}
+    snapshot = _cache.get(_stat_signature(store.paths()))
+    if snapshot is not None:
+        return {n: snapshot[n] for n in names if n in snapshot}
+    logs = {name: get_event_log(name) for name in names if name in EVENT_SECTIONS}
+    with store.reading():
+        result = store.read_sections([n for n in names if n not in EVENT_SECTIONS])
+        for name in logs:
+            result[name] = _event_view(name)
+    return _freeze(result)
+
+
+def load_section(name: str, default: Any = None) -> Any:
+    return load_sections(name).get(name, default)
 
 
 def save_world_state(state: Dict[str, Any]) -> None:
+    """
+    상태 전체를 교체 저장한다.
+    이벤트 로그 섹션은 append_* 로만 바뀌므로 여기서는 무시하고, 저장소에 남아 있는 옛 값도 그대로 둔다.
+    """
+    state = {k: v for k, v in state.items() if k not in EVENT_SECTIONS}
+    state.update(get_store().read_sections(list(EVENT_SECTIONS)))
     state["updated_at"] = _now_iso()
-    STATE_PATH.write_text(json.dumps(state, ensure_ascii=False, indent=2), encoding="utf-8")
+    get_store().replace_all(state, state["updated_at"])
+    _cache.invalidate()
+    _maybe_record_history()
+
+
+def update_sections(sections: Dict[str, Any]) -> None:
+    """주어진 최상위 섹션만 교체 저장한다."""
+    events = [name for name in sections if name in EVENT_SECTIONS]
+    if events:
+        raise ValueError(f"{events} are append-only event log sections; use the append_* helpers")
+    get_store().write_sections(sections, _now_iso())
+    _cache.invalidate()
+    _maybe_record_history()
+
+
+def _mutate_sections(names: List[str], mutator: Callable[[Dict[str, Any]], Dict[str, Any]]) -> None:
+    """names 섹션을 읽고 → mutator로 변경 → 변경된 섹션만 저장 (엔진이 원자성 보장)."""
+    get_store().update(names, mutator, _now_iso())
+    _cache.invalidate()
+    _maybe_record_history()
+
+
+def current_revision() -> int:
+    """마지막 커밋의 revision (커밋마다 1씩 증가)."""
+    return get_store().revision()
+
+
+def changes_since(revision: int) -> Dict[str, Any]:
+    """
+    revision 이후의 변경 패치 목록 (RFC 6902).
+    - 반환: {"revision": 최신 rev, "resync": False, "changes": [{"rev", "ts", "patch"}, ...]}
+    - 요청한 revision이 change log에서 이미 밀려났으면 {"resync": True, ...} → 전체 상태를 다시 받아야 한다.
+    """
+    store = get_store()
+    entries = store.changes_since(int(revision))
+    if entries is None:
+        return {"revision": store.revision(), "resync": True, "changes": []}
+    head = int(entries[-1]["rev"]) if entries else int(revision)
+    return {"revision": head, "resync": False, "changes": entries}
+
+
+def get_history() -> WorldStateHistory:
+    global _history
+    if _history is None:
+        _history = WorldStateHistory(HISTORY_DIR)
+    return _history
+
+
+def record_history() -> Optional[int]:
+    """현재 상태를 history에 스냅샷으로 남긴다 (마지막 기록과 revision이 같으면 아무것도 하지 않음)."""
+    state = thaw(load_world_state())
+    revision = int(state.pop("revision", 0) or 0)
+    return get_history().record(state, revision)
+
+
+def _maybe_record_history() -> None:
+    """쓰기 직후 호출: HISTORY_INTERVAL 안에 이미 기록했으면 건너뛴다 (남은 변경은 다음 기록/주기 기록이 담는다)."""
+    global _history_last
+    if HISTORY_INTERVAL <= 0:
+        return
+    now = time.monotonic()
+    if now - _history_last < HISTORY_INTERVAL:
+        return
+    _history_last = now
+    try:
+        record_history()
+    except Exception as e:
+        print(f"⚠️ world_state history 기록 실패: {e}")
+
+
+def world_state_history(start: Any = None, end: Any = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    start~end(epoch 또는 ISO8601) 사이에 기록된 스냅샷 목록.
+    - 반환: [{"revision", "ts", "kind": "key"|"delta", "bytes", "stored_bytes"}, ...]
+    """
+    return get_history().revisions(start, end, limit)
+
+
+def batch():
+    """
+    여러 update_*를 한 번의 커밋으로 묶는다.
+
+        with world_state.batch():
+            update_planner(...)
+            append_action_log(...)
+    """
+    return get_store().batch()
+
+
+def export_world_state_json(path: Optional[Path] = None) -> Path:
+    """현재 상태(이벤트 로그 섹션 포함)를 단일 world_state.json 형식으로 내보낸다 (호환용)."""
+    return get_store().export_json(Path(path) if path else STATE_PATH, thaw(load_world_state()))
 
 
 def update_reflection_memory(reflection: Any, memory: Any) -> None:
     """reflection.json / memory_vector.json 내용을 world_state에 반영."""
-    state = load_world_state()
     reflection = reflection or {}
-    state["reflection"] = reflection
-    state["memory"] = memory or []
+    changes: Dict[str, Any] = {
+        "reflection": reflection,
+        "memory": memory or [],
+    }
 
     # Reflection 결과에 장기 목표 / 주간 요약 / 실패 학습이 포함되어 있으면 world_state에 반영
     lt_goals = reflection.get("long_term_goals")
     if isinstance(lt_goals, list):
-        state["long_term_goals"] = lt_goals
+        changes["long_term_goals"] = lt_goals
 
     weekly = reflection.get("weekly_summary")
     if isinstance(weekly, dict):
-        state["weekly_summary"] = weekly
+        changes["weekly_summary"] = weekly
+
+    update_sections(changes)
 
+    # 실패 학습은 이벤트 로그에 쌓는다 (world_state에는 최근 50개만 보임)
     failures = reflection.get("failures_learned")
     if isinstance(failures, list):
-        existing = state.get("failures_learned") or []
-        # 너무 길어지지 않도록 최근 50개만 유지
-        state["failures_learned"] = (existing + failures)[-50:]
-
-    save_world_state(state)
+        _append_events("failures_learned", failures)
 
 
 def update_core_decision(decision: str) -> None:
     """중앙 코어의 최근 결정 기록."""
-    state = load_world_state()
-    core = state.get("core") or {}
-    core["last_decision"] = decision
-    core["last_decision_time"] = _now_iso()
-    state["core"] = core
-    save_world_state(state)
+
+    def _apply(current: Dict[str, Any]) -> Dict[str, Any]:
+        core = dict(current.get("core") or {})
+        core["last_decision"] = decision
+        core["last_decision_time"] = _now_iso()
+        return {"core": core}
+
+    _mutate_sections(["core"], _apply)
 
 
 def update_planner(planner_state: Dict[str, Any]) -> None:
     """rc25s_planner 상태를 world_state.planner에 반영."""
-    state = load_world_state()
-    state["planner"] = {
-        "generated_at": planner_state.get("generated_at"),
-        "signals": planner_state.get("signals") or {},
-        "goals": planner_state.get("goals") or [],
-        "tasks": planner_state.get("tasks") or [],
-    }
-    save_world_state(state)
+    update_sections(
+        {
+            "planner": {
+                "generated_at": planner_state.get("generated_at"),
+                "signals": planner_state.get("signals") or {},
+                "goals": planner_state.get("goals") or [],
+                "tasks": planner_state.get("tasks") or [],
+            }
+        }
+    )
 
 
 def append_action_log(action: Dict[str, Any]) -> None:
@@ -135,12 +585,129 @@ def append_action_log(action: Dict[str, Any]) -> None:
         "result": "success|failed",
         "time": iso8601,
       }
+    전체 기록은 이벤트 로그에 남고, world_state.last_actions에는 최근 50개만 보인다.
+    """
+    _append_events("last_actions", [action])
+
+
+def append_log_rca(rules: List[Dict[str, Any]], incidents: List[Dict[str, Any]]) -> None:
+    """rc25s_log_rca_agent 결과(rules/incidents)를 world_state.log_rules / rca_history 이벤트 로그에 추가."""
+    _append_events("log_rules", rules)
+    _append_events("rca_history", incidents)
+
+
+# ---------- async API (이벤트 루프에서 호출) ----------
+def _get_io_pool() -> ThreadPoolExecutor:
+    global _io_pool
+    if _io_pool is None:
+        with _io_pool_lock:
+            if _io_pool is None:
+                _io_pool = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="world_state_io")
+    return _io_pool
+
+
+async def run_io(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    블로킹 파일 I/O 함수를 world_state 전용 I/O 스레드 풀에서 실행한다.
+    (asyncio.to_thread의 기본 풀과 분리해, 오래 걸리는 planner/LLM 작업이 I/O를 막지 않게 한다.)
     """
-    state = load_world_state()
-    actions: List[Dict[str, Any]] = state.get("last_actions") or []
-    actions.append(action)
-    # 너무 길어지지 않도록 최근 50개만 유지
-    state["last_actions"] = actions[-50:]
-    save_world_state(state)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_io_pool(), functools.partial(func, *args, **kwargs))
+
+
+def _load_world_state_eager(mutable: bool, at: Any = None) -> Dict[str, Any]:
+    state = load_world_state(mutable, at)
+    # 지연 섹션이 이벤트 루프에서 디스크를 읽지 않도록, I/O 스레드에서 미리 전부 디코딩한다.
+    if isinstance(state, LazyWorldState):
+        state.load_all()
+    return state
+
+
+async def aload_world_state(mutable: bool = False, at: Any = None) -> Dict[str, Any]:
+    """
+    load_world_state()의 async 버전. 모든 섹션을 I/O 스레드에서 읽어 둔 상태로 돌려준다.
+    섹션 몇 개만 필요하면 aload_sections()가 더 싸다.
+    """
+    return await run_io(_load_world_state_eager, mutable, at)
+
+
+async def aload_sections(*names: str) -> Dict[str, Any]:
+    return await run_io(load_sections, *names)
+
+
+async def aload_section(name: str, default: Any = None) -> Any:
+    return await run_io(load_section, name, default)
+
+
+async def asave_world_state(state: Dict[str, Any]) -> None:
+    await run_io(save_world_state, state)
+
+
+async def aupdate_sections(sections: Dict[str, Any]) -> None:
+    await run_io(update_sections, sections)
+
+
+async def acurrent_revision() -> int:
+    return await run_io(current_revision)
+
+
+async def achanges_since(revision: int) -> Dict[str, Any]:
+    return await run_io(changes_since, revision)
+
+
+async def aupdate_reflection_memory(reflection: Any, memory: Any) -> None:
+    await run_io(update_reflection_memory, reflection, memory)
+
+
+async def aupdate_core_decision(decision: str) -> None:
+    await run_io(update_core_decision, decision)
+
+
+async def aupdate_planner(planner_state: Dict[str, Any]) -> None:
+    await run_io(update_planner, planner_state)
+
+
+async def aappend_action_log(action: Dict[str, Any]) -> None:
+    await run_io(append_action_log, action)
+
+
+async def aappend_log_rca(rules: List[Dict[str, Any]], incidents: List[Dict[str, Any]]) -> None:
+    await run_io(append_log_rca, rules, incidents)
+
+
+async def arecord_history() -> Optional[int]:
+    return await run_io(record_history)
+
+
+async def aworld_state_history(start: Any = None, end: Any = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    return await run_io(world_state_history, start, end, limit)
+
+
+async def aevent_history(name: str, start: Any = None, end: Any = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    return await run_io(event_history, name, start, end, limit)
+
+
+def main(argv: List[str]) -> int:
+    """
+    사용:
+      python3 world_state.py export [경로]   # 현재 엔진의 상태를 world_state.json 형식으로 내보내기
+      python3 world_state.py show <섹션>     # 섹션 하나만 출력
+    """
+    if not argv or argv[0] not in ("export", "show"):
+        print(main.__doc__)
+        return 1
+    if argv[0] == "export":
+        path = export_world_state_json(Path(argv[1]) if len(argv) > 1 else None)
+        print(f"📄 world_state exported ({get_store().name}) → {path}")
+        return 0
+    if len(argv) < 2:
+        print(main.__doc__)
+        return 1
+    print(json.dumps(load_section(argv[1]), ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
 
 
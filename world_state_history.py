@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+🕰️ RC25S world_state History
+
+world_state의 과거 모습을 되돌려 보기 위한 스냅샷 기록.
+
+- 저장: world_state.history/ 의 SegmentedEventLog 한 스트림 (rc25s_event_log.py)
+  - keyframe: 상태 전체 (zlib 압축)
+  - delta:    직전 스냅샷 대비 RFC 6902 패치 (zlib 압축, world_state_patch.diff)
+  - 한 줄 = {"seq", "t", "data": {"rev", "kind": "key"|"delta", "base": keyframe seq, "bytes", "z"}}
+- KEYFRAME_EVERY개의 delta마다, 또는 delta가 keyframe 크기의 절반을 넘으면 새 keyframe을 쓴다.
+  → 임의 시각 복원 비용은 keyframe 1개 + delta 최대 KEYFRAME_EVERY개로 제한된다.
+- 같은 revision은 두 번 기록하지 않는다 (여러 프로세스가 동시에 record 해도 안전).
+- 오래된 세그먼트는 event log 보존 한도에 따라 삭제되며, 그보다 이전 시각은 복원할 수 없다.
+
+환경변수:
+- RC25S_WORLD_STATE_HISTORY_KEYFRAME_EVERY (기본 50)
+- RC25S_WORLD_STATE_HISTORY_SEGMENT_BYTES  (기본 8MB)
+- RC25S_WORLD_STATE_HISTORY_MAX_SEGMENTS   (기본 64)
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import os
+import threading
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from rc25s_event_log import SegmentedEventLog
+from world_state_patch import apply_patch, diff
+from world_state_store import file_lock
+
+KEYFRAME_EVERY = int(os.getenv("RC25S_WORLD_STATE_HISTORY_KEYFRAME_EVERY", "50"))
+SEGMENT_BYTES = int(os.getenv("RC25S_WORLD_STATE_HISTORY_SEGMENT_BYTES", str(8 * 1024 * 1024)))
+MAX_SEGMENTS = int(os.getenv("RC25S_WORLD_STATE_HISTORY_MAX_SEGMENTS", "64"))
+
+
+def _encode(value: Any) -> Tuple[str, int]:
+    raw = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return base64.b64encode(zlib.compress(raw, 6)).decode("ascii"), len(raw)
+
+
+def _decode(blob: str) -> Any:
+    return json.loads(zlib.decompress(base64.b64decode(blob)).decode("utf-8"))
+
+
+def _iso(t: float) -> str:
+    return datetime.fromtimestamp(t, tz=timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+class WorldStateHistory:
+    """keyframe + delta 방식의 world_state 스냅샷 기록."""
+
+    def __init__(
+        self,
+        directory: Path,
+        keyframe_every: int = KEYFRAME_EVERY,
+        segment_bytes: int = SEGMENT_BYTES,
+        max_segments: int = MAX_SEGMENTS,
+    ):
+        self.directory = Path(directory)
+        self.keyframe_every = max(1, keyframe_every)
+        self.log = SegmentedEventLog(self.directory, segment_bytes=segment_bytes, max_segments=max_segments)
+        self.lock_path = self.directory / ".record.lock"
+        self._local_lock = threading.Lock()
+        # 마지막으로 기록한 스냅샷: (seq, 상태, keyframe seq, keyframe 압축 크기)
+        self._head: Optional[Tuple[int, Dict[str, Any], int, int]] = None
+
+    # ---------- 복원 ----------
+    def _replay(self, entry: Dict[str, Any]) -> Tuple[Dict[str, Any], int, int]:
+        """entry 시점의 상태를 keyframe부터 delta를 적용해 만든다. → (상태, keyframe seq, keyframe 압축 크기)"""
+        data = entry["data"]
+        base = int(entry["seq"]) if data["kind"] == "key" else int(data["base"])
+        chain = self.log.read_seqs(base, int(entry["seq"]))
+        if not chain or int(chain[0]["seq"]) != base or chain[0]["data"]["kind"] != "key":
+            raise LookupError(f"world_state history keyframe #{base} is no longer retained")
+        state = _decode(chain[0]["data"]["z"])
+        for item in chain[1:]:
+            state = apply_patch(state, _decode(item["data"]["z"]))
+        return state, base, len(chain[0]["data"]["z"])
+
+    def state_at(self, ts: Any) -> Dict[str, Any]:
+        """
+        시각 ts(epoch 또는 ISO8601) 시점의 world_state.
+        - 반환 상태에는 "revision"(당시 revision)과 "history_ts"(실제 스냅샷 시각)가 들어 있다.
+        - 그 시각 이전 기록이 없거나 이미 보존 기간이 지났으면 LookupError.
+        """
+        entry = self.log.at_or_before(ts)
+        if entry is None:
+            raise LookupError(f"No world_state history at or before {ts!r}")
+        state, _base, _size = self._replay(entry)
+        state["revision"] = entry["data"]["rev"]
+        state["history_ts"] = _iso(float(entry["t"]))
+        return state
+
+    def revisions(self, start: Any = None, end: Any = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """시간 범위 안의 스냅샷 목록 (내용 없이 메타데이터만)."""
+        out = []
+        for entry in self.log.range(start, end, limit):
+            data = entry["data"]
+            out.append(
+                {
+                    "revision": data["rev"],
+                    "ts": _iso(float(entry["t"])),
+                    "kind": data["kind"],
+                    "bytes": data.get("bytes"),
+                    "stored_bytes": len(data["z"]),
+                }
+            )
+        return out
+
+    # ---------- 기록 ----------
+    def record(self, state: Dict[str, Any], revision: int, ts: Any = None) -> Optional[int]:
+        """
+        상태를 기록하고 history seq를 돌려준다. 마지막 기록과 revision이 같으면 기록하지 않고 None.
+        state에는 "revision" 키가 없어야 한다 (있으면 무시).
+        """
+        state = {k: v for k, v in state.items() if k != "revision"}
+        with self._local_lock, file_lock(self.lock_path):
+            last = self.log.tail(1)
+            if last and last[0]["data"]["rev"] == revision:
+                return None
+            head = None
+            if last:
+                seq = int(last[0]["seq"])
+                if self._head is not None and self._head[0] == seq:
+                    head = self._head
+                else:
+                    try:
+                        prev, base, key_size = self._replay(last[0])
+                        head = (seq, prev, base, key_size)
+                    except LookupError:
+                        head = None
+
+            record: Dict[str, Any] = {"rev": revision}
+            if head is not None and int(last[0]["seq"]) - head[2] < self.keyframe_every:
+                z, size = _encode(diff(head[1], state))
+                if len(z) * 2 <= head[3]:
+                    record.update({"kind": "delta", "base": head[2], "bytes": size, "z": z})
+            if "kind" not in record:
+                z, size = _encode(state)
+                record.update({"kind": "key", "base": None, "bytes": size, "z": z})
+
+            seq = self.log.append(record, ts=ts)
+            if record["kind"] == "key":
+                self._head = (seq, state, seq, len(record["z"]))
+            else:
+                self._head = (seq, state, head[2], head[3])
+            return seq
+
+    def stats(self) -> Dict[str, Any]:
+        return self.log.stats()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+🩹 RC25S world_state JSON Patch
+
+world_state 변경분을 RFC 6902 형식(add / remove / replace)의 패치로 만들고 적용한다.
+
+- diff(old, new): 두 JSON 값의 차이를 패치(op 리스트)로 계산
+  - dict는 키 단위로 재귀 비교
+  - list는 "앞쪽이 잘리고 뒤에 추가되는" 슬라이딩 윈도우(last_actions[-50:] 등)를
+    remove /0 + add /- 로 표현해, 매번 전체 리스트를 보내지 않도록 한다.
+- apply_patch(doc, patch): 패치를 적용한 새 값을 돌려준다 (입력은 건드리지 않음).
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List
+
+Patch = List[Dict[str, Any]]
+
+# 슬라이딩 윈도우 탐색 시 앞에서 잘려나간 원소를 최대 몇 개까지 찾아볼지
+MAX_WINDOW_SHIFT = 64
+
+
+def escape_pointer(token: str) -> str:
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def unescape_pointer(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def diff(old: Any, new: Any, path: str = "") -> Patch:
+    ops: Patch = []
+    _diff(old, new, path, ops)
+    return ops
+
+
+def _diff(old: Any, new: Any, path: str, ops: Patch) -> None:
+    if old == new and type(old) is type(new):
+        return
+    if isinstance(old, dict) and isinstance(new, dict):
+        _diff_dict(old, new, path, ops)
+    elif isinstance(old, list) and isinstance(new, list):
+        _diff_list(old, new, path, ops)
+    else:
+        ops.append({"op": "replace", "path": path, "value": new})
+
+
+def _diff_dict(old: Dict[str, Any], new: Dict[str, Any], path: str, ops: Patch) -> None:
+    for key in old:
+        if key not in new:
+            ops.append({"op": "remove", "path": f"{path}/{escape_pointer(key)}"})
+    for key, value in new.items():
+        child = f"{path}/{escape_pointer(key)}"
+        if key not in old:
+            ops.append({"op": "add", "path": child, "value": value})
+        else:
+            _diff(old[key], value, child, ops)
+
+
+def _diff_list(old: List[Any], new: List[Any], path: str, ops: Patch) -> None:
+    n_old, n_new = len(old), len(new)
+
+    # 1) 슬라이딩 윈도우: old[k:] 가 new의 앞부분과 같으면 앞에서 k개 제거 + 뒤에 추가
+    for k in range(0, min(n_old, MAX_WINDOW_SHIFT) + 1):
+        kept = n_old - k
+        if kept <= n_new and old[k:] == new[:kept]:
+            ops.extend({"op": "remove", "path": f"{path}/0"} for _ in range(k))
+            ops.extend({"op": "add", "path": f"{path}/-", "value": v} for v in new[kept:])
+            return
+
+    # 2) 위치별 비교. 결과가 리스트 통째 교체보다 커지면 교체로 대신한다.
+    local: Patch = []
+    for i in range(min(n_old, n_new)):
+        _diff(old[i], new[i], f"{path}/{i}", local)
+    if n_new > n_old:
+        local.extend({"op": "add", "path": f"{path}/-", "value": v} for v in new[n_old:])
+    else:
+        local.extend({"op": "remove", "path": f"{path}/{i}"} for i in reversed(range(n_new, n_old)))
+    if len(local) > 1 and len(json.dumps(local, ensure_ascii=False)) > len(json.dumps(new, ensure_ascii=False)):
+        ops.append({"op": "replace", "path": path, "value": new})
+    else:
+        ops.extend(local)
+
+
+def _copy(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _copy(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy(v) for v in value]
+    return value
+
+
+def _split(path: str) -> List[str]:
+    if path == "":
+        return []
+    if not path.startswith("/"):
+        raise ValueError(f"Invalid JSON pointer: {path!r}")
+    return [unescape_pointer(t) for t in path[1:].split("/")]
+
+
+def apply_patch(doc: Any, patch: Patch) -> Any:
+    """patch를 적용한 사본을 돌려준다."""
+    doc = _copy(doc)
+    for op in patch:
+        kind = op.get("op")
+        tokens = _split(op.get("path", ""))
+        if not tokens:
+            if kind in ("add", "replace"):
+                doc = _copy(op.get("value"))
+                continue
+            raise ValueError(f"Unsupported root op: {kind}")
+        parent = doc
+        for token in tokens[:-1]:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+        last = tokens[-1]
+        if isinstance(parent, list):
+            if kind == "add":
+                value = _copy(op.get("value"))
+                if last == "-":
+                    parent.append(value)
+                else:
+                    parent.insert(int(last), value)
+            elif kind == "remove":
+                del parent[int(last)]
+            elif kind == "replace":
+                parent[int(last)] = _copy(op.get("value"))
+            else:
+                raise ValueError(f"Unsupported patch op: {kind}")
+        else:
+            if kind in ("add", "replace"):
+                parent[last] = _copy(op.get("value"))
+            elif kind == "remove":
+                del parent[last]
+            else:
+                raise ValueError(f"Unsupported patch op: {kind}")
+    return doc
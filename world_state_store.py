@@ -0,0 +1,1000 @@
+#!/usr/bin/env python3
+"""
+🗄️ RC25S World State Store
+
+world_state.py 뒤에서 실제 저장을 담당하는 스토리지 엔진 모음.
+
+- JsonFileStore: 기존과 동일한 단일 world_state.json 파일 (기본값)
+  - 여러 프로세스의 쓰기는 fcntl 잠금(world_state.json.lock)으로 직렬화하고,
+    임시 파일 + os.replace 로 교체해 읽는 쪽이 반쯤 쓰인 파일을 보지 않는다.
+  - 같은 프로세스에서 짧은 시간(RC25S_WORLD_STATE_COALESCE_MS) 안에 들어온 갱신은
+    한 번의 쓰기(fsync 1회)로 합쳐진다.
+- SqliteStore: 최상위 섹션(core/planner/reflection/memory/last_actions/...)을
+  섹션당 한 행으로 저장하는 WAL 모드 SQLite 파일
+  - 쓰기는 변경된 섹션 행만 갱신하고, 읽기는 필요한 섹션만 가져올 수 있다.
+  - world_state.json 은 export_json()으로 언제든 다시 만들 수 있다 (호환용).
+- ShardedStore: world_state.d/ 아래 섹션당 JSON 파일 하나 + 작은 manifest.json
+  - 읽기는 manifest만 파싱하고, 섹션 파일은 실제로 접근할 때 디코딩한다 (read_lazy).
+  - 섹션 파일 이름에 세대 번호가 붙어 있어, manifest 교체 한 번이 곧 커밋이다.
+
+엔진 선택: 환경변수 RC25S_WORLD_STATE_BACKEND=json|sqlite|sharded
+
+공통: 모든 커밋은 revision을 1씩 올리고, 변경분을 RFC 6902 패치로
+world_state.changes.jsonl (ChangeLog, 최근 N개만 유지)에 남긴다.
+- revision은 상태와 같은 원자적 쓰기로 저장한다 (json: 파일의 "revision" 키, sqlite: meta 행, sharded: manifest).
+  상태를 쓴 뒤 ChangeLog에 남기기 전에 죽어도 revision이 되돌아가지 않는다 (그 revision의 패치만 빠져 resync 신호가 된다).
+- 읽기(read_all / read_sections / read_lazy)는 커밋 잠금을 공유 모드로 잡고 상태와 revision을 함께 읽는다.
+  → 읽은 상태에는 정확히 그 revision까지의 패치가 반영되어 있다 (delta 클라이언트가 같은 패치를 두 번 적용하지 않는다).
+"""
+
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from world_state_patch import Patch, diff
+
+# updated_at / revision은 섹션이 아니라 상태 전체의 메타데이터로 취급한다.
+META_KEYS = ("updated_at", "revision")
+
+# update()에 넘기는 콜백: 현재 섹션 값들을 받아 변경된 섹션만 돌려준다.
+SectionMutator = Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]
+# 한 번의 커밋에 포함되는 갱신 묶음: [(섹션 이름들, mutator), ...] (이름 None = 전체 교체)
+UpdateItems = List[Tuple[Optional[List[str]], SectionMutator]]
+
+COALESCE_MS = float(os.getenv("RC25S_WORLD_STATE_COALESCE_MS", "10"))
+CHANGELOG_MAX = int(os.getenv("RC25S_WORLD_STATE_CHANGELOG_MAX", "500"))
+CHANGELOG_MAX_BYTES = int(os.getenv("RC25S_WORLD_STATE_CHANGELOG_MAX_BYTES", str(8 * 1024 * 1024)))
+
+_MISSING = object()
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def write_json_atomic(path: Path, data: Dict[str, Any], indent: Optional[int] = 2) -> None:
+    """임시 파일에 쓴 뒤 os.replace로 교체해, 읽는 쪽이 반쯤 쓰인 파일을 보지 않게 한다."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+@contextmanager
+def file_lock(path: Path, shared: bool = False) -> Iterator[None]:
+    """프로세스 간 advisory 잠금 (fcntl.flock, 기본 배타적 / shared=True 면 읽기용 공유 잠금)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(str(path), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        yield
+    finally:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+
+def _as_revision(value: Any) -> int:
+    try:
+        return max(0, int(value or 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _copy(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _copy(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy(v) for v in value]
+    return value
+
+
+def section_patch(name: str, old: Any, new: Any) -> Patch:
+    """섹션 하나의 변경을 /<name> 아래 패치로 만든다."""
+    path = "/" + name.replace("~", "~0").replace("/", "~1")
+    if old is _MISSING and new is _MISSING:
+        return []
+    if old is _MISSING:
+        return [{"op": "add", "path": path, "value": new}]
+    if new is _MISSING:
+        return [{"op": "remove", "path": path}]
+    return diff(old, new, path)
+
+
+def iter_lines_reverse(path: Path, block_size: int = 64 * 1024) -> Iterator[bytes]:
+    """파일 끝에서부터 한 줄씩(개행 제외) 거꾸로 읽는다."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        buf = b""
+        while pos > 0:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            buf = f.read(step) + buf
+            lines = buf.split(b"\n")
+            buf = lines[0]
+            for line in reversed(lines[1:]):
+                if line:
+                    yield line
+        if buf:
+            yield buf
+
+
+class ChangeLog:
+    """
+    revision별 변경 패치 기록 (JSONL, 한 줄 = {"rev", "ts", "patch"}).
+
+    - append()는 커밋 잠금을 잡은 상태에서만 호출한다 (revision 순서 보장).
+    - 파일이 max_bytes를 넘으면 최근 max_entries개만 남기고 다시 쓴다.
+    - head()/since()는 파일 끝에서부터 필요한 만큼만 읽는다.
+    """
+
+    def __init__(self, path: Path, max_entries: int = CHANGELOG_MAX, max_bytes: int = CHANGELOG_MAX_BYTES):
+        self.path = Path(path)
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max_bytes
+        self._head_sig: Any = None
+        self._head = 0
+
+    def _signature(self) -> Any:
+        try:
+            st = os.stat(self.path)
+            return (st.st_ino, st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def head(self) -> int:
+        """현재(마지막) revision. 기록이 없으면 0."""
+        sig = self._signature()
+        if sig is None:
+            return 0
+        if sig != self._head_sig:
+            head = 0
+            for line in iter_lines_reverse(self.path):
+                try:
+                    head = int(json.loads(line)["rev"])
+                    break
+                except Exception:
+                    continue
+            self._head_sig, self._head = sig, head
+        return self._head
+
+    def append(self, patch: Patch, ts: str, revision: Optional[int] = None) -> int:
+        """기록을 하나 추가한다. revision을 주면 그 번호로 (head보다 커야 한다), 없으면 head + 1."""
+        rev = max(self.head() + 1, revision or 0)
+        line = json.dumps({"rev": rev, "ts": ts, "patch": patch}, ensure_ascii=False, separators=(",", ":"))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+            size = f.tell()
+        if size > self.max_bytes:
+            self._compact()
+        self._head_sig, self._head = self._signature(), rev
+        return rev
+
+    def _compact(self) -> None:
+        keep: List[bytes] = []
+        budget = self.max_bytes // 2
+        for line in iter_lines_reverse(self.path):
+            if len(keep) >= self.max_entries or budget - len(line) < 0:
+                break
+            keep.append(line)
+            budget -= len(line) + 1
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            for line in reversed(keep):
+                f.write(line + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def since(self, revision: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        revision 이후의 기록을 오래된 순서로 돌려준다.
+        요청한 revision이 이미 잘려나갔거나(head보다 크면 로그가 초기화된 것) None.
+        """
+        head = self.head()
+        if revision == head:
+            return []
+        if revision > head or revision < 0:
+            return None
+        entries: List[Dict[str, Any]] = []
+        for line in iter_lines_reverse(self.path):
+            try:
+                entry = json.loads(line)
+            except Exception:
+                continue
+            if int(entry["rev"]) <= revision:
+                break
+            entries.append(entry)
+        entries.reverse()
+        # 첫 기록이 revision+1이 아니면 중간 기록이 이미 잘려나간 것
+        if not entries or int(entries[0]["rev"]) != revision + 1:
+            return None
+        return entries
+
+
+class _PendingCommit:
+    def __init__(self, items: UpdateItems, updated_at: str):
+        self.items = items
+        self.updated_at = updated_at
+        self.done = False
+        self.error: Optional[BaseException] = None
+
+
+class GroupCommitter:
+    """
+    같은 프로세스의 동시 갱신을 모아 한 번에 커밋한다 (group commit).
+
+    - 먼저 도착한 스레드가 leader가 되어 debounce 시간만큼 기다린 뒤,
+      그동안 쌓인 갱신을 commit_fn 한 번으로 처리한다.
+    - 나머지 스레드는 자기 갱신이 디스크에 반영될 때까지 기다린다
+      (update()가 돌아오면 항상 저장이 끝난 상태라는 기존 의미는 유지).
+    """
+
+    def __init__(self, commit_fn: Callable[[List[_PendingCommit]], None], debounce_ms: float):
+        self.commit_fn = commit_fn
+        self.debounce = max(0.0, debounce_ms) / 1000.0
+        self._cv = threading.Condition()
+        self._queue: List[_PendingCommit] = []
+        self._leader_active = False
+        self.commits = 0
+        self.updates = 0
+
+    def submit(self, items: UpdateItems, updated_at: str) -> None:
+        req = _PendingCommit(items, updated_at)
+        with self._cv:
+            self._queue.append(req)
+            while self._leader_active and not req.done:
+                self._cv.wait()
+            if not req.done:
+                self._leader_active = True
+        if not req.done:
+            self._lead()
+        if not req.done:
+            raise RuntimeError("world_state commit aborted before this update was written")
+        if req.error is not None:
+            raise req.error
+
+    def _lead(self) -> None:
+        try:
+            if self.debounce:
+                time.sleep(self.debounce)
+            while True:
+                with self._cv:
+                    batch, self._queue = self._queue, []
+                    if not batch:
+                        self._leader_active = False
+                        self._cv.notify_all()
+                        return
+                try:
+                    self.commit_fn(batch)
+                except Exception as e:  # 같은 커밋에 묶인 호출자 모두에게 같은 에러를 전달
+                    for r in batch:
+                        r.error = e
+                with self._cv:
+                    self.commits += 1
+                    self.updates += len(batch)
+                    for r in batch:
+                        r.done = True
+                    self._cv.notify_all()
+        except BaseException:
+            # leader가 중간에 빠지면 기다리던 스레드 중 하나가 이어받는다.
+            with self._cv:
+                self._leader_active = False
+                self._cv.notify_all()
+            raise
+
+
+class WorldStateStore:
+    """스토리지 엔진 공통 인터페이스."""
+
+    name = "base"
+    # read_sections()가 전체 읽기보다 실제로 싼지 여부 (캐시 채우기 전략에 사용)
+    partial_reads = False
+
+    def __init__(
+        self,
+        default_factory: Callable[[], Dict[str, Any]],
+        lock_path: Optional[Path] = None,
+        changelog: Optional[ChangeLog] = None,
+    ):
+        self.default_factory = default_factory
+        self.lock_path = lock_path
+        self.changelog = changelog
+        self._batch = threading.local()
+        self._held = threading.local()  # 이 스레드가 잡은 잠금: None | "shared" | "exclusive" (재진입 시 다시 잡지 않는다)
+
+    def revision(self) -> int:
+        """ChangeLog의 마지막 revision (잠금 없이 싸게 읽는 값 — 변경 감지용)."""
+        return self.changelog.head() if self.changelog else 0
+
+    def _stored_revision(self) -> int:
+        """커밋 잠금 안에서 호출: 상태와 함께 저장된 revision (엔진별로 재정의)."""
+        return 0
+
+    def _next_revision(self, stored: Any = None) -> int:
+        """
+        커밋 잠금 안에서 호출: 이번 커밋의 revision.
+        저장된 revision과 ChangeLog head 중 큰 값 + 1 (상태만 쓰고 죽은 커밋의 번호를 다시 쓰지 않는다).
+        """
+        if stored is None:
+            stored = self._stored_revision()
+        return max(_as_revision(stored), self.revision()) + 1
+
+    def _with_revision(self, state: Dict[str, Any], stored: Any = None) -> Dict[str, Any]:
+        """읽기 잠금 안에서 호출: 상태와 함께 읽은 revision (상태 밖 변경이 더 최근이면 ChangeLog head)."""
+        state["revision"] = max(_as_revision(stored), self.revision())
+        return state
+
+    def _record(self, patch: Patch, updated_at: str, revision: int, touch_updated_at: bool = True) -> None:
+        """커밋 잠금 안에서 호출: 변경 패치를 revision 번호로 ChangeLog에 남긴다."""
+        if self.changelog is None or not patch:
+            return
+        if touch_updated_at:
+            patch = patch + [{"op": "replace", "path": "/updated_at", "value": updated_at}]
+        self.changelog.append(patch, updated_at, revision)
+
+    def record_external(self, write_fn: Callable[[], Patch], updated_at: str) -> None:
+        """
+        world_state 밖(append-only 이벤트 로그 등)에 쓰는 변경을 커밋 잠금 안에서 실행하고,
+        write_fn이 돌려준 패치를 ChangeLog에 남긴다 (revision 순서 = 실제 쓰기 순서).
+        저장 파일 자체는 바뀌지 않으므로 updated_at은 건드리지 않는다.
+        """
+        with self._locked():
+            patch = write_fn()
+            if patch:
+                self._record(patch, updated_at, self._next_revision(), touch_updated_at=False)
+
+    @contextmanager
+    def _locked(self, shared: bool = False) -> Iterator[None]:
+        held = getattr(self._held, "mode", None)
+        if held == "shared" and not shared:
+            raise RuntimeError("world_state commit inside reading(): the shared lock cannot be upgraded")
+        if self.lock_path is None or held is not None:
+            yield
+            return
+        with file_lock(self.lock_path, shared=shared):
+            self._held.mode = "shared" if shared else "exclusive"
+            try:
+                yield
+            finally:
+                self._held.mode = None
+
+    @contextmanager
+    def reading(self) -> Iterator[None]:
+        """
+        읽기용 공유 잠금: 블록 안에서 읽은 상태 / revision / 상태 밖 기록(이벤트 로그)이 같은 커밋 시점을 가리킨다.
+        커밋은 블록이 끝날 때까지 기다린다. 이미 잠금을 잡은 스레드에서는 그냥 통과한다.
+        """
+        with self._locked(shared=True):
+            yield
+
+    # ---------- 읽기 ----------
+    def read_all(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def read_sections(self, names: Iterable[str]) -> Dict[str, Any]:
+        """요청한 섹션 중 존재하는 것만 돌려준다."""
+        state = self.read_all()
+        return {n: state[n] for n in names if n in state}
+
+    def read_lazy(self) -> Tuple[Dict[str, Any], Dict[str, Callable[[], Any]]]:
+        """
+        (바로 읽은 값, 섹션 이름 → 나중에 값을 읽어오는 함수)를 돌려준다.
+        기본 구현은 전부 바로 읽는다. 섹션을 따로 디코딩할 수 있는 엔진만 재정의한다.
+        """
+        return self.read_all(), {}
+
+    def changes_since(self, revision: int) -> Optional[List[Dict[str, Any]]]:
+        return self.changelog.since(revision) if self.changelog else None
+
+    # ---------- 쓰기 ----------
+    def write_sections(self, sections: Dict[str, Any], updated_at: str) -> None:
+        """주어진 섹션만 교체한다 (나머지 섹션은 그대로)."""
+        self.update(list(sections), lambda _current: sections, updated_at)
+
+    def replace_all(self, state: Dict[str, Any], updated_at: str) -> None:
+        """상태 전체를 교체한다 (state에 없는 섹션은 삭제)."""
+        raise NotImplementedError
+
+    def update(self, names: Iterable[str], mutator: SectionMutator, updated_at: str) -> None:
+        """names 섹션을 읽어 mutator에 넘기고, 돌려받은 섹션만 원자적으로 저장한다."""
+        pending = getattr(self._batch, "items", None)
+        if pending is not None:
+            pending.append((list(names), mutator))
+            self._batch.updated_at = updated_at
+            return
+        self._commit([(list(names), mutator)], updated_at)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        블록 안의 update()를 모았다가 블록이 끝날 때 한 번에 커밋한다.
+        - 블록 안에서 예외가 나면 모은 갱신은 버린다.
+        - 블록 안의 읽기는 아직 커밋되지 않은 갱신을 보지 못한다.
+        """
+        if getattr(self._batch, "items", None) is not None:
+            yield  # 중첩 batch는 바깥 batch에 합친다.
+            return
+        self._batch.items = []
+        self._batch.updated_at = None
+        try:
+            yield
+            items, updated_at = self._batch.items, self._batch.updated_at
+        finally:
+            self._batch.items = None
+        if items:
+            self._commit(items, updated_at)
+
+    def _commit(self, items: UpdateItems, updated_at: str) -> None:
+        raise NotImplementedError
+
+    # ---------- 호환 ----------
+    def export_json(self, path: Path, state: Optional[Dict[str, Any]] = None) -> Path:
+        """state(없으면 read_all())를 단일 JSON 파일로 쓴다."""
+        write_json_atomic(path, self.read_all() if state is None else state)
+        return path
+
+    def paths(self) -> List[Path]:
+        """이 엔진이 실제로 사용하는 파일 목록 (캐시 무효화 판단에 사용)."""
+        return [self.changelog.path] if self.changelog else []
+
+
+class JsonFileStore(WorldStateStore):
+    """기존 world_state.json 단일 파일 엔진."""
+
+    name = "json"
+
+    def __init__(
+        self,
+        path: Path,
+        default_factory: Callable[[], Dict[str, Any]],
+        coalesce_ms: float = COALESCE_MS,
+        changelog: Optional[ChangeLog] = None,
+    ):
+        super().__init__(default_factory, lock_path=Path(f"{path}.lock"), changelog=changelog)
+        self.path = Path(path)
+        self.committer = GroupCommitter(self._apply_pending, coalesce_ms)
+        self._stored: Tuple[Any, int] = (None, 0)  # (파일 stat, 그때 파일에 저장된 revision)
+
+    def _read_file(self) -> Tuple[Dict[str, Any], int]:
+        """(상태, 파일에 함께 저장된 revision)."""
+        if not self.path.exists():
+            return self.default_factory(), 0
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if not isinstance(data, dict):
+                return self.default_factory(), 0
+            return data, _as_revision(data.pop("revision", 0))
+        except Exception:
+            return self.default_factory(), 0
+
+    def _stored_revision(self) -> int:
+        # 이벤트 로그 추가(record_external)마다 파일 전체를 파싱하지 않도록 stat이 같으면 지난 값을 쓴다.
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return 0
+        sig = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if self._stored[0] != sig:
+            self._stored = (sig, self._read_file()[1])
+        return self._stored[1]
+
+    def read_all(self) -> Dict[str, Any]:
+        with self.reading():
+            state, stored = self._read_file()
+            return self._with_revision(state, stored)
+
+    def replace_all(self, state: Dict[str, Any], updated_at: str) -> None:
+        replacement = {k: v for k, v in state.items() if k not in META_KEYS}
+
+        def _replace(_current: Dict[str, Any]) -> Dict[str, Any]:
+            return replacement
+
+        # 이름 목록 None = 전체 교체 (기존 섹션 중 replacement에 없는 것은 삭제)
+        self.committer.submit([(None, _replace)], updated_at)
+
+    def _commit(self, items: UpdateItems, updated_at: str) -> None:
+        self.committer.submit(items, updated_at)
+
+    def _apply_pending(self, batch: List[_PendingCommit]) -> None:
+        """잠금을 잡은 상태에서 디스크의 최신 상태를 읽고, 모인 갱신을 순서대로 적용해 한 번만 쓴다."""
+        with self._locked():
+            state, stored = self._read_file()
+            before = dict(state)
+            touched = set()
+            updated_at = None
+            for req in batch:
+                for names, mutator in req.items:
+                    if names is None:
+                        changes = mutator({}) or {}
+                        touched.update(k for k in state if k not in META_KEYS)
+                        state = {k: v for k, v in state.items() if k in META_KEYS}
+                    else:
+                        # mutator가 입력을 직접 고쳐도 diff가 깨지지 않도록 사본을 넘긴다.
+                        changes = mutator({n: _copy(state[n]) for n in names if n in state}) or {}
+                    if changes or names is None:
+                        state.update(changes)
+                        touched.update(changes)
+                        updated_at = req.updated_at
+            patch: Patch = []
+            for name in sorted(touched):
+                patch += section_patch(name, before.get(name, _MISSING), state.get(name, _MISSING))
+            # 실제로 바뀐 값이 없으면 파일도 revision도 건드리지 않는다.
+            if patch:
+                revision = self._next_revision(stored)
+                state["updated_at"] = updated_at
+                state["revision"] = revision
+                write_json_atomic(self.path, state)
+                self._record(patch, updated_at, revision)
+
+    def export_json(self, path: Path, state: Optional[Dict[str, Any]] = None) -> Path:
+        if Path(path) == self.path:
+            return self.path
+        return super().export_json(path, state)
+
+    def paths(self) -> List[Path]:
+        return [self.path] + super().paths()
+
+
+class SqliteStore(WorldStateStore):
+    """
+    섹션당 한 행을 저장하는 WAL 모드 SQLite 엔진.
+
+    - sections(name, data, updated_at): 최상위 섹션 하나 = 행 하나 (data는 압축 JSON)
+    - meta(key, value): updated_at / revision 등 상태 전체 메타데이터 (revision은 섹션과 같은 트랜잭션에서 갱신)
+    - DB가 비어 있고 legacy_json 파일이 있으면 최초 오픈 시 한 번 가져온다.
+    """
+
+    name = "sqlite"
+    partial_reads = True
+
+    def __init__(
+        self,
+        path: Path,
+        default_factory: Callable[[], Dict[str, Any]],
+        legacy_json: Optional[Path] = None,
+        lock_path: Optional[Path] = None,
+        changelog: Optional[ChangeLog] = None,
+    ):
+        super().__init__(default_factory, lock_path=lock_path, changelog=changelog)
+        self.path = Path(path)
+        self.legacy_json = Path(legacy_json) if legacy_json else None
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    # ---------- 연결 관리 ----------
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # isolation_level=None: 트랜잭션은 BEGIN IMMEDIATE로 직접 연다.
+            conn = sqlite3.connect(str(self.path), timeout=10.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=10000")
+            self._local.conn = conn
+        if not self._initialized:
+            self._initialize(conn)
+        return conn
+
+    def _initialize(self, conn: sqlite3.Connection) -> None:
+        with self._init_lock:
+            if self._initialized:
+                return
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sections ("
+                "name TEXT PRIMARY KEY, data TEXT NOT NULL, updated_at TEXT NOT NULL)"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self._import_legacy(conn)
+            self._initialized = True
+
+    def _import_legacy(self, conn: sqlite3.Connection) -> None:
+        if self.legacy_json is None or not self.legacy_json.exists():
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            (count,) = conn.execute("SELECT COUNT(*) FROM sections").fetchone()
+            if count == 0:
+                try:
+                    data = json.loads(self.legacy_json.read_text(encoding="utf-8"))
+                except Exception:
+                    data = None
+                if isinstance(data, dict):
+                    updated_at = str(data.get("updated_at") or "")
+                    self._put_sections(conn, {k: v for k, v in data.items() if k not in META_KEYS}, updated_at)
+                    self._put_meta(conn, "updated_at", updated_at)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _put_sections(conn: sqlite3.Connection, sections: Dict[str, Any], updated_at: str) -> None:
+        conn.executemany(
+            "INSERT INTO sections(name, data, updated_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET data=excluded.data, updated_at=excluded.updated_at",
+            [(name, _dumps(value), updated_at) for name, value in sections.items()],
+        )
+
+    @staticmethod
+    def _put_meta(conn: sqlite3.Connection, key: str, value: Any) -> None:
+        conn.execute(
+            "INSERT INTO meta(key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value=excluded.value",
+            (key, _dumps(value)),
+        )
+
+    @staticmethod
+    def _get_sections(conn: sqlite3.Connection, names: Optional[List[str]] = None) -> Dict[str, Any]:
+        if names is None:
+            rows = conn.execute("SELECT name, data FROM sections").fetchall()
+        elif not names:
+            return {}
+        else:
+            marks = ",".join("?" for _ in names)
+            rows = conn.execute(f"SELECT name, data FROM sections WHERE name IN ({marks})", names).fetchall()
+        return {name: json.loads(data) for name, data in rows}
+
+    @staticmethod
+    def _get_meta(conn: sqlite3.Connection, key: str) -> Any:
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def _stored_revision(self) -> int:
+        return _as_revision(self._get_meta(self._conn(), "revision"))
+
+    # ---------- 읽기 ----------
+    def read_all(self) -> Dict[str, Any]:
+        conn = self._conn()
+        with self.reading():
+            sections = self._get_sections(conn)
+            if not sections:
+                return self._with_revision(self.default_factory())
+            state: Dict[str, Any] = {}
+            for key, value in conn.execute("SELECT key, value FROM meta").fetchall():
+                state[key] = json.loads(value)
+            state.update(sections)
+            return self._with_revision(state, state.pop("revision", 0))
+
+    def read_sections(self, names: Iterable[str]) -> Dict[str, Any]:
+        names = list(names)
+        conn = self._conn()
+        wanted = [n for n in names if n not in META_KEYS]
+        with self.reading():
+            result = self._get_sections(conn, wanted)
+            if not result and conn.execute("SELECT 1 FROM sections LIMIT 1").fetchone() is None:
+                # 아직 아무것도 저장되지 않았으면 기본 상태에서 꺼내준다.
+                default = self._with_revision(self.default_factory())
+                return {n: default[n] for n in names if n in default}
+            for key in names:
+                if key == "revision":
+                    result[key] = self._with_revision({}, self._get_meta(conn, "revision"))["revision"]
+                elif key in META_KEYS:
+                    value = self._get_meta(conn, key)
+                    if value is not None:
+                        result[key] = value
+        return result
+
+    # ---------- 쓰기 ----------
+    def replace_all(self, state: Dict[str, Any], updated_at: str) -> None:
+        sections = {k: v for k, v in state.items() if k not in META_KEYS}
+        conn = self._conn()
+        with self._locked():
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                before = self._get_sections(conn)
+                patch: Patch = []
+                for name in sorted(set(before) | set(sections)):
+                    patch += section_patch(name, before.get(name, _MISSING), sections.get(name, _MISSING))
+                revision = self._next_revision()
+                if patch:
+                    conn.execute("DELETE FROM sections")
+                    self._put_sections(conn, sections, updated_at)
+                    self._put_meta(conn, "updated_at", updated_at)
+                    self._put_meta(conn, "revision", revision)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            self._record(patch, updated_at, revision)
+
+    def _commit(self, items: UpdateItems, updated_at: str) -> None:
+        conn = self._conn()
+        with self._locked():
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if conn.execute("SELECT 1 FROM sections LIMIT 1").fetchone() is None:
+                    # 빈 DB에 첫 쓰기: 기본 상태를 먼저 깔아 load 결과가 기존과 같게 유지되도록 한다.
+                    default = self.default_factory()
+                    self._put_sections(conn, {k: v for k, v in default.items() if k not in META_KEYS}, updated_at)
+                before: Dict[str, Any] = {}
+                after: Dict[str, Any] = {}
+                for names, mutator in items:
+                    names = [n for n in names if n not in META_KEYS]
+                    current = self._get_sections(conn, names)
+                    changes = mutator(_copy(current)) or {}
+                    for n in changes:
+                        if n not in before:
+                            before[n] = current[n] if n in current else self._get_sections(conn, [n]).get(n, _MISSING)
+                    if changes:
+                        self._put_sections(conn, changes, updated_at)
+                        after.update(changes)
+                patch: Patch = []
+                for name in sorted(after):
+                    patch += section_patch(name, before[name], after[name])
+                revision = self._next_revision()
+                if patch:
+                    self._put_meta(conn, "updated_at", updated_at)
+                    self._put_meta(conn, "revision", revision)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            self._record(patch, updated_at, revision)
+
+    def paths(self) -> List[Path]:
+        return [self.path, Path(f"{self.path}-wal")] + super().paths()
+
+
+class ShardedStore(WorldStateStore):
+    """
+    섹션당 파일 하나로 나눈 엔진 (world_state.d/).
+
+    - manifest.json: {"generation", "revision", "updated_at", "sections": {이름: {"file", "bytes"}}}
+    - <섹션>.<generation>.json: 섹션 값 (압축 JSON)
+    - 커밋: 바뀐 섹션만 새 세대 파일로 쓰고 → manifest를 원자적으로 교체 → 이전 세대 파일 삭제.
+      manifest 교체 전에 죽으면 이전 manifest가 가리키는 파일이 그대로 남아 있으므로 상태가 섞이지 않는다.
+    - manifest가 없고 legacy_json 파일이 있으면 최초 접근 시 한 번 가져온다.
+    """
+
+    name = "sharded"
+    MANIFEST = "manifest.json"
+
+    def __init__(
+        self,
+        directory: Path,
+        default_factory: Callable[[], Dict[str, Any]],
+        legacy_json: Optional[Path] = None,
+        lock_path: Optional[Path] = None,
+        coalesce_ms: float = COALESCE_MS,
+        changelog: Optional[ChangeLog] = None,
+    ):
+        directory = Path(directory)
+        super().__init__(default_factory, lock_path=lock_path or directory / ".lock", changelog=changelog)
+        self.directory = directory
+        self.manifest_path = directory / self.MANIFEST
+        self.legacy_json = Path(legacy_json) if legacy_json else None
+        self.committer = GroupCommitter(self._apply_pending, coalesce_ms)
+        self._imported = False
+
+    # ---------- 파일 배치 ----------
+    @staticmethod
+    def _shard_name(section: str, generation: int) -> str:
+        # 파일 이름으로 안전하지 않은 섹션 이름은 hex로 바꾼다.
+        stem = section if re.fullmatch(r"[A-Za-z0-9_\-]+", section) else "x" + section.encode("utf-8").hex()
+        return f"{stem}.{generation}.json"
+
+    def _read_manifest(self) -> Optional[Dict[str, Any]]:
+        try:
+            data = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except Exception:
+            return None
+        return data if isinstance(data, dict) and isinstance(data.get("sections"), dict) else None
+
+    def _read_shard(self, name: str, file: str) -> Any:
+        try:
+            return json.loads((self.directory / file).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            # 읽는 사이 다른 커밋이 이 세대를 지웠다: 최신 manifest가 가리키는 파일로 다시 읽는다.
+            manifest = self._read_manifest() or {}
+            entry = manifest.get("sections", {}).get(name)
+            if not entry or entry.get("file") == file:
+                return None
+            return json.loads((self.directory / entry["file"]).read_text(encoding="utf-8"))
+
+    def _ensure_imported(self) -> None:
+        if self._imported:
+            return
+        if not self.manifest_path.exists() and self.legacy_json is not None and self.legacy_json.exists():
+            with self._locked():
+                if not self.manifest_path.exists():
+                    try:
+                        data = json.loads(self.legacy_json.read_text(encoding="utf-8"))
+                    except Exception:
+                        data = None
+                    if isinstance(data, dict):
+                        sections = {k: v for k, v in data.items() if k not in META_KEYS}
+                        self._write_generation({"generation": 0, "sections": {}}, sections, str(data.get("updated_at") or ""))
+        self._imported = True
+
+    def _write_generation(
+        self, manifest: Dict[str, Any], changes: Dict[str, Any], updated_at: str, revision: Optional[int] = None
+    ) -> None:
+        """changes(값이 _MISSING이면 삭제)를 새 세대로 쓰고 manifest를 교체한다. 잠금 안에서 호출."""
+        generation = int(manifest.get("generation") or 0) + 1
+        sections = dict(manifest.get("sections") or {})
+        superseded = []
+        for name, value in changes.items():
+            old = sections.pop(name, None)
+            if old:
+                superseded.append(old["file"])
+            if value is _MISSING:
+                continue
+            file = self._shard_name(name, generation)
+            body = _dumps(value)
+            path = self.directory / file
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(body)
+                f.flush()
+                os.fsync(f.fileno())
+            sections[name] = {"file": file, "bytes": len(body.encode("utf-8"))}
+        write_json_atomic(
+            self.manifest_path,
+            {
+                "generation": generation,
+                "revision": manifest.get("revision", 0) if revision is None else revision,
+                "updated_at": updated_at,
+                "sections": sections,
+            },
+        )
+        for file in superseded:
+            try:
+                (self.directory / file).unlink()
+            except FileNotFoundError:
+                pass
+
+    def _stored_revision(self) -> int:
+        return _as_revision((self._read_manifest() or {}).get("revision"))
+
+    # ---------- 읽기 ----------
+    def read_lazy(self) -> Tuple[Dict[str, Any], Dict[str, Callable[[], Any]]]:
+        """
+        manifest와 revision은 읽기 잠금 안에서 함께 읽는다. 섹션 파일은 나중에 읽으므로,
+        그 사이 다른 커밋이 섹션을 바꿨다면 더 새로운 값이 보일 수 있다 (정확한 시점이 필요하면 reading() 안에서 모두 읽는다).
+        """
+        self._ensure_imported()
+        with self.reading():
+            manifest = self._read_manifest()
+            if manifest is None:
+                return self._with_revision(self.default_factory()), {}
+            eager = self._with_revision({"updated_at": manifest.get("updated_at")}, manifest.get("revision"))
+        loaders = {
+            name: (lambda name=name, file=entry["file"]: self._read_shard(name, file))
+            for name, entry in manifest["sections"].items()
+        }
+        return eager, loaders
+
+    def read_all(self) -> Dict[str, Any]:
+        self._ensure_imported()  # 가져오기는 배타 잠금이 필요하므로 읽기 잠금 전에
+        with self.reading():
+            state, loaders = self.read_lazy()
+            for name, load in loaders.items():
+                state[name] = load()
+        return state
+
+    def read_sections(self, names: Iterable[str]) -> Dict[str, Any]:
+        self._ensure_imported()
+        with self.reading():
+            state, loaders = self.read_lazy()
+            return {n: loaders[n]() if n in loaders else state[n] for n in names if n in loaders or n in state}
+
+    # ---------- 쓰기 ----------
+    def replace_all(self, state: Dict[str, Any], updated_at: str) -> None:
+        replacement = {k: v for k, v in state.items() if k not in META_KEYS}
+        self.committer.submit([(None, lambda _current: replacement)], updated_at)
+
+    def _commit(self, items: UpdateItems, updated_at: str) -> None:
+        self.committer.submit(items, updated_at)
+
+    def _apply_pending(self, batch: List[_PendingCommit]) -> None:
+        """JsonFileStore와 같은 방식이지만, 실제로 만진 섹션 파일만 읽고 쓴다."""
+        self._ensure_imported()
+        with self._locked():
+            manifest = self._read_manifest()
+            if manifest is None:
+                # 아직 아무것도 저장되지 않았으면 기본 상태를 첫 세대로 깐다.
+                # (JsonFileStore처럼 기본 상태를 "이전 값"으로 보고 패치를 만든다.)
+                default = {k: v for k, v in self.default_factory().items() if k not in META_KEYS}
+                manifest = {"generation": 0, "sections": {}}
+                current = dict(default)
+                before: Dict[str, Any] = _copy(default)
+            else:
+                current = {}
+                before = {}
+            first_write = not manifest["sections"]
+            entries = manifest["sections"]
+
+            def _get(name: str) -> Any:
+                if name not in current:
+                    current[name] = self._read_shard(name, entries[name]["file"]) if name in entries else _MISSING
+                    before.setdefault(name, current[name])
+                return current[name]
+
+            touched = set(before)
+            updated_at = None
+            for req in batch:
+                for names, mutator in req.items:
+                    if names is None:
+                        changes = mutator({}) or {}
+                        for name in set(entries) | set(current):
+                            _get(name)
+                            current[name] = _MISSING
+                            touched.add(name)
+                    else:
+                        values = {n: _get(n) for n in names if n not in META_KEYS}
+                        changes = mutator({n: _copy(v) for n, v in values.items() if v is not _MISSING}) or {}
+                    for name, value in changes.items():
+                        if name in META_KEYS:
+                            continue
+                        _get(name)
+                        current[name] = value
+                        touched.add(name)
+                    if changes or names is None:
+                        updated_at = req.updated_at
+            patch: Patch = []
+            changed: Dict[str, Any] = {}
+            for name in sorted(touched):
+                ops = section_patch(name, before.get(name, _MISSING), current.get(name, _MISSING))
+                if ops:
+                    patch += ops
+                    changed[name] = current[name]
+                elif first_write and current.get(name, _MISSING) is not _MISSING:
+                    changed[name] = current[name]
+            # 실제로 바뀐 섹션이 없으면 파일도 revision도 건드리지 않는다.
+            if patch:
+                revision = self._next_revision(manifest.get("revision"))
+                self._write_generation(manifest, changed, updated_at, revision)
+                self._record(patch, updated_at, revision)
+
+    def paths(self) -> List[Path]:
+        # 섹션 파일은 manifest 교체와 함께만 바뀌므로 manifest stat만 보면 된다.
+        return [self.manifest_path] + super().paths()
+
+
+def create_store(
+    backend: str,
+    json_path: Path,
+    db_path: Path,
+    default_factory: Callable[[], Dict[str, Any]],
+) -> WorldStateStore:
+    backend = (backend or "json").strip().lower()
+    json_path = Path(json_path)
+    changelog = ChangeLog(json_path.with_name(f"{json_path.stem}.changes.jsonl"))
+    if backend == "sqlite":
+        return SqliteStore(
+            db_path,
+            default_factory,
+            legacy_json=json_path,
+            lock_path=Path(f"{json_path}.lock"),
+            changelog=changelog,
+        )
+    if backend == "sharded":
+        return ShardedStore(
+            json_path.with_suffix(".d"),
+            default_factory,
+            legacy_json=json_path,
+            lock_path=Path(f"{json_path}.lock"),
+            changelog=changelog,
+        )
+    if backend == "json":
+        return JsonFileStore(json_path, default_factory, changelog=changelog)
+    raise ValueError(f"Unknown world_state backend: {backend}")